@@ -48,7 +48,7 @@ def upgrade() -> None:
     )
     op.create_index('idx_join_codes_is_active', 'join_codes', ['is_active'], unique=False)
     op.create_index('idx_join_codes_run_id', 'join_codes', ['run_id'], unique=False)
-    op.create_index('idx_join_codes_unique_active', 'join_codes', ['code'], unique=True, postgresql_where=sa.text('is_active = 1'), sqlite_where=sa.text('is_active = 1'))
+    op.create_index('idx_join_codes_unique_active', 'join_codes', ['code'], unique=True, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
     op.create_index(op.f('ix_join_codes_code'), 'join_codes', ['code'], unique=False)
     op.create_index(op.f('ix_join_codes_id'), 'join_codes', ['id'], unique=False)
     op.create_index(op.f('ix_join_codes_is_active'), 'join_codes', ['is_active'], unique=False)
@@ -62,7 +62,7 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_join_codes_is_active'), table_name='join_codes')
     op.drop_index(op.f('ix_join_codes_id'), table_name='join_codes')
     op.drop_index(op.f('ix_join_codes_code'), table_name='join_codes')
-    op.drop_index('idx_join_codes_unique_active', table_name='join_codes', postgresql_where=sa.text('is_active = 1'), sqlite_where=sa.text('is_active = 1'))
+    op.drop_index('idx_join_codes_unique_active', table_name='join_codes', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
     op.drop_index('idx_join_codes_run_id', table_name='join_codes')
     op.drop_index('idx_join_codes_is_active', table_name='join_codes')
     op.drop_table('join_codes')
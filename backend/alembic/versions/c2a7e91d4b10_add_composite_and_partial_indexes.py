@@ -0,0 +1,32 @@
+"""Add composite indexes for dashboard queries
+
+Revision ID: c2a7e91d4b10
+Revises: 14d5a3bca78f
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a7e91d4b10'
+down_revision: Union[str, None] = '14d5a3bca78f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_activity_logs_run_created', 'activity_logs', ['run_id', 'created_at'], unique=False)
+    op.create_index('idx_activity_logs_run_student_created', 'activity_logs', ['run_id', 'student_name', 'created_at'], unique=False)
+    op.create_index('idx_enrollments_run_last_seen', 'enrollments', ['run_id', 'last_seen_at'], unique=False)
+    op.create_index('idx_session_runs_template_created', 'session_runs', ['template_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_session_runs_template_created', table_name='session_runs')
+    op.drop_index('idx_enrollments_run_last_seen', table_name='enrollments')
+    op.drop_index('idx_activity_logs_run_student_created', table_name='activity_logs')
+    op.drop_index('idx_activity_logs_run_created', table_name='activity_logs')
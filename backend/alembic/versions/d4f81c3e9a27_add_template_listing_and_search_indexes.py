@@ -0,0 +1,72 @@
+"""Add template listing indexes and title search index
+
+Revision ID: d4f81c3e9a27
+Revises: c2a7e91d4b10
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+import sqlite3
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f81c3e9a27'
+down_revision: Union[str, None] = 'c2a7e91d4b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_TABLE = "session_templates_fts"
+
+SQLITE_FTS_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, content='session_templates', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON session_templates BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title) VALUES (new.id, new.title); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON session_templates BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title ON session_templates BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title) VALUES (new.id, new.title); END",
+    # 기존 템플릿 색인
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_FTS_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def upgrade() -> None:
+    op.create_index('idx_session_templates_teacher_created', 'session_templates', ['teacher_id', 'created_at', 'id'], unique=False)
+    op.create_index('idx_session_templates_teacher_updated', 'session_templates', ['teacher_id', 'updated_at', 'id'], unique=False)
+    op.create_index('idx_session_templates_teacher_title', 'session_templates', ['teacher_id', 'title', 'id'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite' and sqlite3.sqlite_version_info >= (3, 34, 0):
+        for statement in SQLITE_FTS_CREATE:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_session_templates_title_trgm "
+            "ON session_templates USING gin (title gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_FTS_DROP:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_session_templates_title_trgm")
+
+    op.drop_index('idx_session_templates_teacher_title', table_name='session_templates')
+    op.drop_index('idx_session_templates_teacher_updated', table_name='session_templates')
+    op.drop_index('idx_session_templates_teacher_created', table_name='session_templates')
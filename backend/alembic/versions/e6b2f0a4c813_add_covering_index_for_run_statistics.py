@@ -0,0 +1,29 @@
+"""Add covering partial index for per-student run statistics
+
+Revision ID: e6b2f0a4c813
+Revises: d4f81c3e9a27
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b2f0a4c813'
+down_revision: Union[str, None] = 'd4f81c3e9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HAS_STUDENT_INPUT = "student_input IS NOT NULL AND student_input <> ''"
+
+
+def upgrade() -> None:
+    op.create_index('idx_activity_logs_run_student_input_turns', 'activity_logs', ['run_id', 'student_name'], unique=False,
+                    postgresql_where=sa.text(HAS_STUDENT_INPUT), sqlite_where=sa.text(HAS_STUDENT_INPUT))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_activity_logs_run_student_input_turns', table_name='activity_logs')
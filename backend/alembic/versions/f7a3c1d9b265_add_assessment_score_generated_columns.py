@@ -0,0 +1,71 @@
+"""Add generated assessment score columns to activity_logs
+
+Revision ID: f7a3c1d9b265
+Revises: e6b2f0a4c813
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a3c1d9b265'
+down_revision: Union[str, None] = 'e6b2f0a4c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIMENSIONS = ("depth", "breadth", "application", "metacognition", "engagement")
+SCORE_COLUMNS = [("overall_score", ("overall_score", "understanding_score"))] + [
+    (dimension, (f"dimensions.{dimension}", dimension)) for dimension in DIMENSIONS
+]
+
+
+def number_expression(dialect: str, paths) -> str:
+    if dialect == "postgresql":
+        cases = " ".join(
+            f"WHEN json_typeof(third_eval_json #> '{{{p.replace('.', ',')}}}') = 'number' "
+            f"THEN (third_eval_json #>> '{{{p.replace('.', ',')}}}')::double precision"
+            for p in paths
+        )
+    else:
+        cases = " ".join(
+            f"WHEN json_type(third_eval_json, '$.{p}') IN ('integer', 'real') "
+            f"THEN json_extract(third_eval_json, '$.{p}')"
+            for p in paths
+        )
+    return f"CASE {cases} END"
+
+
+def completed_expression(dialect: str) -> str:
+    if dialect == "postgresql":
+        return ("CASE WHEN json_typeof(third_eval_json #> '{is_completed}') = 'boolean' "
+                "THEN (third_eval_json #>> '{is_completed}')::boolean END")
+    return "CASE json_type(third_eval_json, '$.is_completed') WHEN 'true' THEN 1 WHEN 'false' THEN 0 END"
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    # SQLite는 VIRTUAL(기존 행 재작성 없음), PostgreSQL은 STORED(테이블 재작성)
+    for name, paths in SCORE_COLUMNS:
+        op.add_column('activity_logs', sa.Column(name, sa.Float(), sa.Computed(sa.text(number_expression(dialect, paths)))))
+    op.add_column('activity_logs', sa.Column('is_completed', sa.Boolean(), sa.Computed(sa.text(completed_expression(dialect)))))
+
+    for name, _ in SCORE_COLUMNS:
+        op.create_index(f'idx_activity_logs_run_{name}', 'activity_logs', ['run_id', name], unique=False)
+    op.create_index('idx_activity_logs_run_completed', 'activity_logs', ['run_id', 'is_completed'], unique=False)
+    op.create_index('idx_activity_logs_run_student_scored', 'activity_logs', ['run_id', 'student_name', 'id'], unique=False,
+                    postgresql_where=sa.text("overall_score IS NOT NULL"),
+                    sqlite_where=sa.text("overall_score IS NOT NULL"))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_activity_logs_run_student_scored', table_name='activity_logs')
+    op.drop_index('idx_activity_logs_run_completed', table_name='activity_logs')
+    for name, _ in SCORE_COLUMNS:
+        op.drop_index(f'idx_activity_logs_run_{name}', table_name='activity_logs')
+    op.drop_column('activity_logs', 'is_completed')
+    for name, _ in reversed(SCORE_COLUMNS):
+        op.drop_column('activity_logs', name)
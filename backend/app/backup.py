@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 백업 실행 (수동/cron용)
+
+    python -m app.backup                 # 전체 백업 + 보관 기간 정리 + 증분 백업
+    python -m app.backup --mode full
+    python -m app.backup --mode incremental
+    python -m app.backup --verify        # 모든 백업 파일 체크섬 검증
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from app.core.database import ReadSessionLocal
+from app.core.runtime import create_backup_service
+from app.services.backup_service import verify_checksum
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SQLite 데이터베이스 백업")
+    parser.add_argument("--mode", choices=["all", "full", "incremental"], default="all")
+    parser.add_argument("--verify", action="store_true", help="백업 파일 체크섬 검증만 수행")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    logger = logging.getLogger("backup")
+
+    service = create_backup_service()
+    if service is None:
+        logger.error("ERROR: 파일 기반 SQLite 데이터베이스에서만 백업할 수 있습니다")
+        return 1
+
+    if args.verify:
+        files = service.full_backups() + sorted(service.run_archive_dir.glob("run_*.json.gz"))
+        failed = [path for path in files if not verify_checksum(path)]
+        for path in failed:
+            logger.error(f"ERROR: 체크섬 불일치: {path}")
+        logger.info(f"검증 완료: {len(files)}개 중 {len(failed)}개 실패")
+        return 1 if failed else 0
+
+    if args.mode in ("all", "full"):
+        result = service.full_backup()
+        logger.info(f"백업 완료: {result['path']} ({result['size_bytes']} bytes, {result['duration_sec']}s)")
+        deleted = service.apply_retention()
+        logger.info(f"오래된 백업 파일 정리 완료 (삭제된 파일: {deleted}개)")
+
+    if args.mode in ("all", "incremental"):
+        db = ReadSessionLocal()
+        try:
+            archived = service.incremental_backup(db)
+        finally:
+            db.close()
+        logger.info(f"종료 세션 보관 완료: {len(archived)}개")
+
+    logger.info(f"현재 전체 백업 파일 개수: {len(service.full_backups())}개 ({Path(service.backup_dir).resolve()})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
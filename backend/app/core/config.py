@@ -14,12 +14,54 @@ class Settings(BaseSettings):
     app_name: str = "LLM Class Platform"
     debug: bool = False
     
-    # 데이터베이스
+    # 서버 프로세스
+    web_concurrency: int = 1  # 워커 프로세스 수 (gunicorn/uvicorn 공통 WEB_CONCURRENCY)
+    
+    # 데이터베이스 (sqlite:///... 또는 postgresql://...)
     database_url: str = "sqlite:///./data/app.db"
-    db_pool_size: int = 20
+    db_pool_size: int = 20  # PostgreSQL 전용 - 워커당 커넥션 수
     db_max_overflow: int = 30
+    db_pool_timeout_sec: int = 10
+    db_pool_recycle_sec: int = 1800
+    db_statement_timeout_ms: int = 15000  # PostgreSQL 쿼리 타임아웃 (0이면 제한 없음)
     db_echo: bool = False
     
+    # SQLite 성능 프로파일 (PostgreSQL에서는 무시)
+    sqlite_synchronous: str = "NORMAL"  # WAL에서는 NORMAL도 커밋 내구성 보장 (전원 장애 시 마지막 트랜잭션만 유실 가능)
+    sqlite_busy_timeout_ms: int = 5000  # 쓰기 락 대기 시간 (즉시 실패 대신 잠시 대기)
+    sqlite_cache_size_kb: int = 65536  # 연결당 페이지 캐시 (64MB)
+    sqlite_mmap_size_mb: int = 256
+    sqlite_wal_autocheckpoint_pages: int = 1000  # 자동 체크포인트 기준 (페이지 수)
+    sqlite_checkpoint_interval_sec: int = 30  # 백그라운드 체크포인트 주기
+    sqlite_checkpoint_quiet_sec: float = 5.0  # 마지막 쓰기 후 이 시간이 지나야 체크포인트
+    sqlite_wal_truncate_mb: int = 64  # WAL이 이보다 크면 TRUNCATE 체크포인트
+    sqlite_optimize_interval_sec: int = 3600  # PRAGMA optimize 주기
+    sqlite_incremental_vacuum_pages: int = 500  # optimize 시 회수할 최대 빈 페이지 수
+    sqlite_split_read_write: bool = True  # 단일 쓰기 연결 + 읽기 전용 연결 풀로 분리
+    sqlite_read_pool_size: int = 8
+    sqlite_read_pool_overflow: int = 8
+    
+    # 백업 (SQLite 파일 DB, 앱 내부 스케줄러)
+    backup_enabled: bool = True
+    backup_dir: str = "./data/backups"
+    backup_full_hour: int = 3  # 매일 전체 백업 시각 (0-23시)
+    backup_incremental_interval_min: int = 60  # 종료 세션 증분 백업 주기
+    backup_pages_per_step: int = 256  # 한 번에 복사할 페이지 수 (단계 사이에 쓰기 허용)
+    backup_step_sleep_ms: int = 20  # 단계 사이 대기 시간
+    backup_max_restarts: int = 3  # 쓰기 때문에 처음부터 다시 복사한 횟수가 넘으면 한 번에 복사
+    backup_max_duration_sec: int = 600  # 단계별 복사 시간이 넘으면 한 번에 복사
+    backup_retention_days: int = 180
+    backup_keep_min: int = 7  # 보관 기간과 무관하게 유지할 최근 전체 백업 수
+    activity_log_batch_max: int = 100  # 활동 로그 일괄 저장 시 최대 건수
+    
+    # 모드 카탈로그 캐시
+    modes_catalogue_ttl_sec: int = 60  # 다른 프로세스에서 시드한 변경을 반영하는 주기
+    modes_cache_max_age_sec: int = 60  # 브라우저 캐시 시간 (이후 ETag로 재검증)
+    run_count_cache_ttl_sec: int = 30  # 세션 목록 전체 개수 캐시 (다른 워커의 변경 반영 주기)
+    ended_run_cache_max_mb: int = 64  # 종료된 세션 응답 캐시 크기 (워커별, 압축 후 기준)
+    ended_run_cache_max_age_sec: int = 86400  # 종료된 세션 응답 브라우저 캐시 시간
+    score_analytics_cache_max_runs: int = 256  # 점수 분석 결과를 보관할 세션 수 (워커별)
+    
     # 인증 관련
     min_teacher_password_len: int = 6
     auth_login_rate_per_min: int = 5
@@ -39,14 +81,27 @@ class Settings(BaseSettings):
     max_students_per_run: int = 60
     
     # 학생 입장 관련
-    join_attempt_rate_per_min: int = 30
+    join_attempt_rate_per_min: int = 30  # IP 백스톱 기준값 (관측된 주체 수만큼 확장)
     rejoin_pin_length: int = 4  # 숫자 4자리
     session_temp_cache_minutes: int = 30  # localStorage 임시 캐시 유지 시간 (분)
     
     # 활동 로그 관련
-    activity_write_rate_per_min: int = 120  # 활동 로그 저장 레이트리밋
+    activity_write_rate_per_min: int = 120  # 활동 로그 저장 레이트리밋 (학생별, IP 백스톱 기준값)
     activity_token_secret: str = "activity-token-secret-change-in-production"  # JWT 서명용
     
+    # 레이트리밋 저장소
+    rate_limit_storage_url: str = "memory://"  # memory:// | sqlite:///./data/rate_limit.db | redis://host:6379/0
+    rate_limit_max_keys: int = 50000  # 메모리 상한 (초과 시 가장 오래된 키부터 제거)
+    rate_limit_sweep_interval_sec: int = 60  # 유휴 키 정리 주기 (초)
+    rate_limit_principal_window_sec: int = 300  # IP별 동시 주체 수 집계 윈도우 (초)
+    rate_limit_ip_backstop_max_scale: int = 60  # IP 백스톱 한도 최대 배수 (반 정원 기준)
+    
+    # 주체(학생/교사) 단위 레이트리밋
+    join_attempt_rate_per_student_per_min: int = 10  # 같은 이름 재시도 (PIN 대입 방지)
+    join_attempt_rate_per_run_per_min: int = 300  # 세션 전체 입장 시도 상한
+    activity_write_rate_per_run_per_min: int = 3000  # 세션 전체 활동 로그 저장 상한
+    dashboard_poll_rate_per_min: int = 12  # 교사별 라이브 현황 조회
+    
     # 기능 플래그
     enable_test_routes: bool = True
     enable_debug_routes: bool = True
@@ -6,6 +6,7 @@ from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from .database import get_db
 from .session import SessionManager
+from .rate_limit import observe_principal
 from ..models.teacher import Teacher
 
 
@@ -21,6 +22,8 @@ def get_current_teacher(request: Request, db: Session = Depends(get_db)) -> Opti
         return None
     
     teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
+    if teacher:
+        observe_principal(request, f"teacher:{teacher.id}")
     return teacher
 
 
@@ -0,0 +1,80 @@
+"""
+키셋(커서) 페이지네이션 유틸리티
+
+OFFSET은 건너뛴 행을 모두 읽어야 하므로 뒤쪽 페이지일수록 느려집니다.
+커서는 이전 페이지 마지막 행의 id와 정렬 조건을 담은 불투명 문자열이며,
+다음 페이지는 (정렬 컬럼, id)가 그 행보다 뒤인 행부터 인덱스로 바로 읽습니다.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, select
+
+
+def encode_cursor(last_id: int, **params: Any) -> str:
+    payload = json.dumps({"id": last_id, **params}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, **expected: Any) -> int:
+    """
+    커서 해석
+
+    Args:
+        cursor: encode_cursor로 만든 문자열
+        expected: 커서를 만들 때와 같아야 하는 조건 (정렬 등)
+
+    Returns:
+        이전 페이지 마지막 행 id
+
+    Raises:
+        HTTPException: 형식이 잘못되었거나 조건이 다른 경우 (400)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload: Dict[str, Any] = json.loads(base64.urlsafe_b64decode(padded))
+        last_id = int(payload["id"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    for key, value in expected.items():
+        if payload.get(key) != value:
+            raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+    return last_id
+
+
+def after_anchor(sort_column, id_column, anchor_id: int, descending: bool, *anchor_filters):
+    """
+    (정렬 컬럼, id) 기준으로 기준 행 다음에 오는 행 조건
+
+    기준 행의 값은 서브쿼리로 읽으므로 저장 형식(SQLite의 날짜 문자열 등)
+    그대로 비교됩니다.
+    """
+    anchor_value = select(sort_column).where(id_column == anchor_id, *anchor_filters).scalar_subquery()
+    if descending:
+        return or_(sort_column < anchor_value, and_(sort_column == anchor_value, id_column < anchor_id))
+    return or_(sort_column > anchor_value, and_(sort_column == anchor_value, id_column > anchor_id))
+
+
+def ensure_anchor_exists(db, id_column, anchor_id: int, *anchor_filters):
+    """
+    커서 페이지가 비었을 때 기준 행이 삭제되었는지 확인
+
+    기준 행이 없으면 after_anchor의 서브쿼리가 NULL이 되어 모든 페이지가 비므로,
+    조용히 빈 목록을 주는 대신 400으로 처음부터 다시 조회하게 합니다.
+
+    Raises:
+        HTTPException: 기준 행이 없는 경우 (400)
+    """
+    if db.query(id_column).filter(id_column == anchor_id, *anchor_filters).first() is None:
+        raise HTTPException(status_code=400, detail="Cursor is no longer valid")
+
+
+def next_cursor_for(rows, size: int, **params: Any) -> Optional[str]:
+    """가져온 행이 size보다 많으면(다음 페이지 존재) 마지막 행 기준 커서 반환"""
+    if len(rows) <= size:
+        return None
+    return encode_cursor(rows[size - 1].id, **params)
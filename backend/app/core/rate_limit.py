@@ -2,18 +2,34 @@
 레이트 리밋 시스템
 """
 import time
-from typing import Dict
-from collections import defaultdict, deque
+import logging
+import threading
+from typing import Optional
+from collections import OrderedDict
 from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import Scope
 from .config import settings
+from .rate_limit_backends import (
+    RateLimitStore,
+    InMemoryRateLimitStore,
+    SQLiteRateLimitStore,
+    RedisRateLimitStore,
+    SlidingWindowCounter,
+    create_rate_limit_store,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    """메모리 기반 레이트 리미터"""
+    """키 단위 레이트 리미터 (저장소 백엔드 위의 얇은 래퍼)"""
     
-    def __init__(self):
-        # IP별 요청 기록: {ip: deque([timestamp, ...])}
-        self.requests: Dict[str, deque] = defaultdict(lambda: deque())
+    def __init__(self, store: Optional[RateLimitStore] = None, namespace: str = "ip"):
+        # 저장소 미지정 시 독립된 인메모리 저장소 사용
+        self.store = store if store is not None else InMemoryRateLimitStore()
+        self.namespace = namespace
     
     def check_rate_limit(self, ip: str, limit: int, window_seconds: int = 60) -> bool:
         """레이트 리밋 확인
@@ -26,40 +42,185 @@ class RateLimiter:
         Returns:
             True: 허용, False: 제한 초과
         """
-        current_time = time.time()
-        requests = self.requests[ip]
-        
-        # 윈도우 밖의 오래된 요청 제거
-        while requests and requests[0] < current_time - window_seconds:
-            requests.popleft()
-        
-        # 현재 요청 수가 제한을 초과하는지 확인
-        if len(requests) >= limit:
-            return False
-        
-        # 새 요청 기록
-        requests.append(current_time)
-        return True
+        return self.store.hit(f"{self.namespace}|{ip}", limit, window_seconds)
     
     def get_remaining_requests(self, ip: str, limit: int, window_seconds: int = 60) -> int:
         """남은 요청 수 반환"""
-        current_time = time.time()
-        requests = self.requests[ip]
-        
-        # 윈도우 밖의 오래된 요청 제거
-        while requests and requests[0] < current_time - window_seconds:
-            requests.popleft()
-        
-        return max(0, limit - len(requests))
+        return self.store.remaining(f"{self.namespace}|{ip}", limit, window_seconds)
+
+
+class PrincipalTracker:
+    """
+    IP별로 최근 관측된 인증 주체(학생 enrollment, 교사) 수 추적
+
+    학교 NAT 뒤의 한 반 전체가 같은 IP를 공유하므로, IP 단위 백스톱 한도를
+    해당 IP에서 최근 확인된 주체 수만큼 늘리는 데 사용합니다. 토큰/세션으로
+    검증된 주체만 기록하므로 임의 헤더로 한도를 부풀릴 수 없습니다.
+
+    관측 기록은 프로세스 메모리에 있으므로 (``shared = False``) 멀티 워커에서는
+    각 워커가 자기가 본 주체 수만큼만 한도를 늘립니다.
+    """
+
+    shared = False
+
+    def __init__(self, window_seconds: int = 300, max_per_ip: int = 60, max_ips: int = 50000):
+        self.window_seconds = window_seconds
+        self.max_per_ip = max_per_ip
+        self.max_ips = max_ips
+        self.principals: "OrderedDict[str, OrderedDict[str, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def observe(self, ip: str, principal: str, now: Optional[float] = None):
+        """IP에서 인증된 주체 관측 기록"""
+        if now is None:
+            now = time.monotonic()
+
+        with self.lock:
+            seen = self.principals.get(ip)
+            if seen is None:
+                seen = OrderedDict()
+                self.principals[ip] = seen
+                if len(self.principals) > self.max_ips:
+                    self.principals.popitem(last=False)
+            else:
+                self.principals.move_to_end(ip)
+
+            seen[principal] = now
+            seen.move_to_end(principal)
+            if len(seen) > self.max_per_ip:
+                seen.popitem(last=False)
+
+    def count(self, ip: str, now: Optional[float] = None) -> int:
+        """IP에서 윈도우 내 관측된 주체 수"""
+        if now is None:
+            now = time.monotonic()
+
+        with self.lock:
+            seen = self.principals.get(ip)
+            if not seen:
+                return 0
+
+            # 오래된 관측은 앞쪽에 모여 있음
+            threshold = now - self.window_seconds
+            while seen and next(iter(seen.values())) < threshold:
+                seen.popitem(last=False)
+            if not seen:
+                del self.principals[ip]
+                return 0
+            return len(seen)
+
+    def scale(self, ip: str) -> int:
+        """IP 백스톱 한도 배수 (최소 1)"""
+        return max(1, self.count(ip))
+
+    def clear(self):
+        """모든 관측 기록 삭제"""
+        with self.lock:
+            self.principals.clear()
+
+
+def client_ip_from_scope(scope: Scope) -> str:
+    """클라이언트 실제 IP 추출 (Cloudflare/프록시 헤더 우선)"""
+    headers = Headers(scope=scope)
+    for header in ("cf-connecting-ip", "x-forwarded-for", "x-real-ip"):
+        ip = headers.get(header)
+        if ip:
+            # X-Forwarded-For는 여러 IP를 포함할 수 있으므로 첫 번째 사용
+            return ip.split(',')[0].strip()
+
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def get_request_client_ip(request: Request) -> str:
+    """요청 객체에서 클라이언트 IP 추출"""
+    return client_ip_from_scope(request.scope)
+
+
+# 미들웨어와 라우터가 공유하는 카운터 저장소 (RATE_LIMIT_STORAGE_URL로 백엔드 선택)
+rate_limit_store = create_rate_limit_store(
+    settings.rate_limit_storage_url,
+    max_keys=settings.rate_limit_max_keys,
+    sweep_interval=settings.rate_limit_sweep_interval_sec
+)
+
+# 전역 레이트 리미터 인스턴스 (로그인 시도 제한)
+rate_limiter = RateLimiter(rate_limit_store, namespace="auth-login")
+
+# IP별 주체 추적기 (프로세스 내 관측값 - 워커마다 독립적으로 집계)
+principal_tracker = PrincipalTracker(
+    window_seconds=settings.rate_limit_principal_window_sec,
+    max_per_ip=settings.rate_limit_ip_backstop_max_scale,
+    max_ips=settings.rate_limit_max_keys
+)
+
+
+def observe_principal(request: Request, principal: str):
+    """인증된 주체를 요청 IP에 기록 (IP 백스톱 한도 확장용)"""
+    principal_tracker.observe(get_request_client_ip(request), principal)
+
+
+def check_principal_rate_limit(
+    bucket: str,
+    principal: str,
+    limit: int,
+    run_id: Optional[int] = None,
+    run_limit: Optional[int] = None,
+    window_seconds: int = 60,
+    cost: int = 1
+):
+    """
+    주체(학생/교사) 단위 레이트 리밋 및 세션 전체 상한 검사
+
+    Args:
+        bucket: 엔드포인트 구분 키 (e.g., "activity-log")
+        principal: 주체 키 (e.g., "enrollment:12", "teacher:3")
+        limit: 주체별 허용 요청 수
+        run_id: 세션 ID (세션 전체 상한 적용 시)
+        run_limit: 세션 전체 허용 요청 수
+        window_seconds: 시간 윈도우 (초)
+        cost: 이번 요청이 차감할 횟수 (배치 요청은 항목 수)
+
+    Raises:
+        RateLimitExceeded: 429 한도 초과
+    """
+    if not rate_limit_store.hit(f"{bucket}|{principal}", limit, window_seconds, cost=cost):
+        logger.warning(f"Principal rate limit exceeded: bucket={bucket}, principal={principal}, limit={limit}/{window_seconds}s")
+        raise RateLimitExceeded(window_seconds)
+
+    if run_id is not None and run_limit:
+        if not rate_limit_store.hit(f"{bucket}|run:{run_id}", run_limit, window_seconds, cost=cost):
+            logger.warning(f"Run rate limit exceeded: bucket={bucket}, run_id={run_id}, limit={run_limit}/{window_seconds}s")
+            raise RateLimitExceeded(window_seconds)
+
+
+def rate_limit_response(window_seconds: int) -> JSONResponse:
+    """429 응답 (IP 미들웨어와 주체 단위 검사가 같은 본문 사용)"""
+    return JSONResponse(
+        status_code=429,
+        content={
+            "error": "rate_limit_exceeded",
+            "message": "너무 많은 요청입니다. 잠시 후 다시 시도해주세요.",
+            "retry_after": window_seconds
+        },
+        headers={
+            "Retry-After": str(window_seconds),
+            "Cache-Control": "no-store"
+        }
+    )
+
 
+class RateLimitExceeded(HTTPException):
+    """주체 단위 레이트 리밋 초과 - main의 예외 처리기가 rate_limit_response로 응답"""
 
-# 전역 레이트 리미터 인스턴스
-rate_limiter = RateLimiter()
+    def __init__(self, window_seconds: int):
+        super().__init__(status_code=429, detail="rate_limit_exceeded")
+        self.window_seconds = window_seconds
 
 
 def check_auth_rate_limit(request: Request):
     """인증 관련 레이트 리밋 검사"""
-    client_ip = request.client.host
+    client_ip = get_request_client_ip(request)
     limit = settings.auth_login_rate_per_min
     
     if not rate_limiter.check_rate_limit(client_ip, limit, 60):
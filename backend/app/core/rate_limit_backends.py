@@ -0,0 +1,631 @@
+"""
+레이트 리밋 카운터 저장소 (백엔드)
+
+모든 백엔드는 같은 2-버킷 슬라이딩 윈도우 알고리즘을 사용하며
+``hit`` 한 번으로 검사와 증가를 원자적으로 수행합니다.
+
+- memory://                  프로세스 내 저장소 (단일 워커 전용)
+- sqlite:///./data/rl.db     같은 호스트의 여러 워커가 공유하는 파일 저장소
+- redis://host:6379/0        여러 컨테이너/호스트가 공유하는 Redis 프로토콜 저장소
+"""
+import hashlib
+import logging
+import math
+import select
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowCounter:
+    """
+    Two-bucket sliding window counter
+
+    Estimates the number of requests in the trailing window as
+    ``previous * (1 - elapsed / window) + current`` which needs O(1) memory
+    and O(1) time per check instead of a list of timestamps.
+    """
+
+    __slots__ = ("window_start", "current", "previous", "last_seen")
+
+    def __init__(self, now: float, window_seconds: int):
+        self.window_start = now - (now % window_seconds)
+        self.current = 0
+        self.previous = 0
+        self.last_seen = now
+
+    @classmethod
+    def restore(cls, window_start: float, current: int, previous: int, last_seen: float) -> "SlidingWindowCounter":
+        """Rebuild a counter from persisted state"""
+        counter = cls.__new__(cls)
+        counter.window_start = window_start
+        counter.current = current
+        counter.previous = previous
+        counter.last_seen = last_seen
+        return counter
+
+    def _roll(self, now: float, window_seconds: int):
+        elapsed_windows = int((now - self.window_start) // window_seconds)
+        if elapsed_windows >= 1:
+            self.previous = self.current if elapsed_windows == 1 else 0
+            self.current = 0
+            self.window_start += elapsed_windows * window_seconds
+
+    def estimate(self, now: float, window_seconds: int) -> float:
+        """Estimated number of requests in the trailing window"""
+        self._roll(now, window_seconds)
+        weight = 1.0 - (now - self.window_start) / window_seconds
+        return self.previous * weight + self.current
+
+    def hit(self, now: float, max_requests: int, window_seconds: int, cost: int = 1) -> bool:
+        """Record ``cost`` requests if they all fit. Returns True if the request is allowed."""
+        estimated = self.estimate(now, window_seconds)
+        self.last_seen = now
+        if estimated + cost - 1 >= max_requests:
+            return False
+
+        self.current += cost
+        return True
+
+
+class RateLimitStore:
+    """
+    카운터 저장소 공통 인터페이스
+
+    ``shared`` 는 여러 프로세스가 같은 카운터를 보는지 여부입니다.
+    """
+
+    backend = "base"
+    shared = False
+
+    def __init__(self):
+        self.allowed_total = 0
+        self.limited_total = 0
+
+    def hit(self, key: str, max_requests: int, window_seconds: int, now: Optional[float] = None,
+            cost: int = 1) -> bool:
+        """Count ``cost`` requests for ``key`` (e.g. rows in a batch). Returns True if allowed, False if limited."""
+        raise NotImplementedError
+
+    def remaining(self, key: str, max_requests: int, window_seconds: int, now: Optional[float] = None) -> int:
+        """Requests left in the current window without counting one"""
+        raise NotImplementedError
+
+    def reset(self, key: str):
+        """Drop the counter for ``key``"""
+        raise NotImplementedError
+
+    def clear(self, prefix: str = ""):
+        """Drop all counters, or those whose key starts with ``prefix`` (metrics are kept)"""
+        raise NotImplementedError
+
+    def after_fork(self):
+        """Drop resources inherited from the parent process (called in each worker)"""
+
+    def _record(self, allowed: bool) -> bool:
+        if allowed:
+            self.allowed_total += 1
+        else:
+            self.limited_total += 1
+        return allowed
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "backend": self.backend,
+            "allowed_total": self.allowed_total,
+            "limited_total": self.limited_total,
+        }
+
+
+def _remaining(estimated: float, max_requests: int) -> int:
+    return max(0, max_requests - math.ceil(estimated))
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Bounded in-process counter store
+
+    Keys are kept in LRU order. Idle keys are evicted by a periodic sweep and
+    the least recently used keys are dropped once ``max_keys`` is exceeded.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_keys: int = 50000, sweep_interval: float = 60.0):
+        super().__init__()
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self.counters: "OrderedDict[str, tuple[SlidingWindowCounter, int]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.evicted_idle_total = 0
+        self.evicted_capacity_total = 0
+
+    def hit(self, key: str, max_requests: int, window_seconds: int, now: Optional[float] = None,
+            cost: int = 1) -> bool:
+        if now is None:
+            now = time.monotonic()
+
+        with self.lock:
+            entry = self.counters.get(key)
+            if entry is None:
+                counter = SlidingWindowCounter(now, window_seconds)
+                self.counters[key] = (counter, window_seconds)
+                if len(self.counters) > self.max_keys:
+                    self._evict_for_capacity()
+            else:
+                counter = entry[0]
+                self.counters.move_to_end(key)
+
+            allowed = self._record(counter.hit(now, max_requests, window_seconds, cost))
+
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+
+        return allowed
+
+    def remaining(self, key: str, max_requests: int, window_seconds: int, now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.monotonic()
+
+        with self.lock:
+            entry = self.counters.get(key)
+            if entry is None:
+                return max_requests
+            return _remaining(entry[0].estimate(now, window_seconds), max_requests)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Evict keys idle for more than two windows. Returns the number of evicted keys."""
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            return self._sweep(now)
+
+    def _sweep(self, now: float) -> int:
+        self._last_sweep = now
+
+        idle_keys = [
+            key for key, (counter, window_seconds) in self.counters.items()
+            if now - counter.last_seen >= 2 * window_seconds
+        ]
+        for key in idle_keys:
+            del self.counters[key]
+
+        self.evicted_idle_total += len(idle_keys)
+        if idle_keys:
+            logger.info(f"Rate limit sweep: evicted={len(idle_keys)}, keys={len(self.counters)}")
+        return len(idle_keys)
+
+    def _evict_for_capacity(self):
+        """Drop least recently used keys until the store is back under its cap"""
+        while len(self.counters) > self.max_keys:
+            self.counters.popitem(last=False)
+            self.evicted_capacity_total += 1
+
+    def reset(self, key: str):
+        with self.lock:
+            self.counters.pop(key, None)
+
+    def clear(self, prefix: str = ""):
+        with self.lock:
+            if not prefix:
+                self.counters.clear()
+                return
+            for key in [k for k in self.counters if k.startswith(prefix)]:
+                del self.counters[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **super().metrics(),
+            "keys": len(self.counters),
+            "max_keys": self.max_keys,
+            "evicted_idle_total": self.evicted_idle_total,
+            "evicted_capacity_total": self.evicted_capacity_total,
+        }
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    SQLite 파일 기반 공유 저장소 (같은 호스트의 여러 워커용)
+
+    ``BEGIN IMMEDIATE`` 트랜잭션 안에서 읽기-판정-쓰기를 수행하므로 여러
+    프로세스가 동시에 접근해도 검사와 증가가 원자적입니다. 애플리케이션 DB와
+    쓰기 잠금을 다투지 않도록 별도 파일을 사용합니다.
+    """
+
+    backend = "sqlite"
+    shared = True
+
+    def __init__(self, path: str, max_keys: int = 50000, sweep_interval: float = 60.0):
+        super().__init__()
+        self.path = path
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self.lock = threading.Lock()
+        self._last_sweep = time.time()
+        self.errors_total = 0
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connect()
+
+    def _connect(self):
+        self.conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # 카운터는 유실되어도 무방하므로 fsync 생략
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_counters ("
+            " key TEXT PRIMARY KEY,"
+            " window_start REAL NOT NULL,"
+            " current INTEGER NOT NULL,"
+            " previous INTEGER NOT NULL,"
+            " last_seen REAL NOT NULL,"
+            " window_seconds INTEGER NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_rate_limit_counters_last_seen"
+            " ON rate_limit_counters (last_seen)"
+        )
+
+    def after_fork(self):
+        # 부모 프로세스의 SQLite 연결은 자식에서 사용하면 안 되므로 새로 연결
+        self.lock = threading.Lock()
+        self._connect()
+
+    def _load(self, key: str) -> Optional[SlidingWindowCounter]:
+        row = self.conn.execute(
+            "SELECT window_start, current, previous, last_seen FROM rate_limit_counters WHERE key = ?",
+            (key,)
+        ).fetchone()
+        return SlidingWindowCounter.restore(*row) if row else None
+
+    def hit(self, key: str, max_requests: int, window_seconds: int, now: Optional[float] = None,
+            cost: int = 1) -> bool:
+        if now is None:
+            now = time.time()
+
+        with self.lock:
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as e:
+                # 다른 워커가 쓰기 잠금을 busy timeout 넘게 잡고 있으면 요청 허용
+                self.errors_total += 1
+                logger.warning(f"Rate limit backend unavailable, allowing request: {e}")
+                return True
+            try:
+                counter = self._load(key) or SlidingWindowCounter(now, window_seconds)
+                allowed = counter.hit(now, max_requests, window_seconds, cost)
+                self.conn.execute(
+                    "INSERT INTO rate_limit_counters"
+                    " (key, window_start, current, previous, last_seen, window_seconds)"
+                    " VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET"
+                    " window_start = excluded.window_start, current = excluded.current,"
+                    " previous = excluded.previous, last_seen = excluded.last_seen,"
+                    " window_seconds = excluded.window_seconds",
+                    (key, counter.window_start, counter.current, counter.previous, now, window_seconds)
+                )
+                if now - self._last_sweep >= self.sweep_interval:
+                    self._sweep(now)
+                self.conn.execute("COMMIT")
+            except sqlite3.OperationalError as e:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                self.errors_total += 1
+                logger.warning(f"Rate limit backend unavailable, allowing request: {e}")
+                return True
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        return self._record(allowed)
+
+    def remaining(self, key: str, max_requests: int, window_seconds: int, now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.time()
+
+        with self.lock:
+            counter = self._load(key)
+        if counter is None:
+            return max_requests
+        return _remaining(counter.estimate(now, window_seconds), max_requests)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Evict idle keys and enforce ``max_keys``. Returns the number of evicted keys."""
+        if now is None:
+            now = time.time()
+        with self.lock:
+            return self._sweep(now)
+
+    def _sweep(self, now: float) -> int:
+        self._last_sweep = now
+        evicted = self.conn.execute(
+            "DELETE FROM rate_limit_counters WHERE last_seen < ? - 2 * window_seconds",
+            (now,)
+        ).rowcount
+        evicted += self.conn.execute(
+            "DELETE FROM rate_limit_counters WHERE key IN ("
+            " SELECT key FROM rate_limit_counters ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+            (self.max_keys,)
+        ).rowcount
+        return evicted
+
+    def reset(self, key: str):
+        with self.lock:
+            self.conn.execute("DELETE FROM rate_limit_counters WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = ""):
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM rate_limit_counters WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix)
+            )
+
+    def metrics(self) -> Dict[str, Any]:
+        with self.lock:
+            keys = self.conn.execute("SELECT COUNT(*) FROM rate_limit_counters").fetchone()[0]
+        return {**super().metrics(), "keys": keys, "max_keys": self.max_keys, "errors_total": self.errors_total}
+
+
+class RedisProtocolError(Exception):
+    """Redis 서버 오류 응답"""
+
+
+class RespConnection:
+    """
+    최소한의 동기 RESP(Redis 프로토콜) 클라이언트
+
+    레이트리밋에 필요한 명령만 사용하므로 별도 패키지 없이 소켓으로 구현합니다.
+    """
+
+    def __init__(self, host: str, port: int, db: int = 0, password: Optional[str] = None, timeout: float = 1.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.sock: Optional[socket.socket] = None
+        self.reader = None
+
+    def connect(self):
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        try:
+            if self.password:
+                self._call("AUTH", self.password)
+            if self.db:
+                self._call("SELECT", self.db)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.reader.close()
+                self.sock.close()
+            finally:
+                self.sock = None
+                self.reader = None
+
+    def call(self, *args) -> Any:
+        """
+        명령 실행
+
+        서버가 닫은 연결이면 명령을 보내기 전에만 한 번 재연결합니다. 보낸 뒤의
+        오류(응답 대기 시간 초과 등)는 서버가 이미 실행했을 수 있으므로 다시 보내지
+        않고 연결을 닫은 뒤 그대로 올립니다 (호출 측에서 fail-open).
+        """
+        command = encode_command(*args)
+        try:
+            if self.sock is None or self._closed_by_server():
+                self.close()
+                self.connect()
+            try:
+                self.sock.sendall(command)
+            except ConnectionError:
+                # 보내는 도중 끊긴 연결 - 서버가 명령을 받지 못했으므로 한 번만 다시 보냄
+                self.close()
+                self.connect()
+                self.sock.sendall(command)
+            return read_reply(self.reader)
+        except OSError:
+            self.close()
+            raise
+
+    def _closed_by_server(self) -> bool:
+        """유휴 연결을 서버가 닫았는지 확인 (읽을 응답이 없는데 EOF/리셋이면 닫힌 것)"""
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            return bool(readable) and self.sock.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def _call(self, *args) -> Any:
+        self.sock.sendall(encode_command(*args))
+        return read_reply(self.reader)
+
+
+def encode_command(*args) -> bytes:
+    """명령을 RESP 배열로 인코딩"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+def read_reply(reader) -> Any:
+    """RESP 응답 하나를 읽어 파이썬 값으로 변환"""
+    line = reader.readline()
+    if not line:
+        raise ConnectionError("Redis connection closed")
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload.decode()
+    if prefix == b"-":
+        raise RedisProtocolError(payload.decode())
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length == -1:
+            return None
+        data = reader.read(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        if length == -1:
+            return None
+        return [read_reply(reader) for _ in range(length)]
+    raise RedisProtocolError(f"Unknown reply prefix: {prefix!r}")
+
+
+# KEYS[1] = counter key, ARGV = max_requests, window_seconds, now, cost (hit 개수, 0=peek)
+# 반환값: {allowed(0/1), estimated*1000}
+SLIDING_WINDOW_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'ws', 'cur', 'prev')
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local ws = tonumber(state[1])
+local cur = tonumber(state[2]) or 0
+local prev = tonumber(state[3]) or 0
+if not ws then
+  ws = now - (now % window)
+end
+local elapsed = math.floor((now - ws) / window)
+if elapsed >= 1 then
+  if elapsed == 1 then prev = cur else prev = 0 end
+  cur = 0
+  ws = ws + elapsed * window
+end
+local estimated = prev * (1 - (now - ws) / window) + cur
+if cost == 0 then
+  return {1, math.floor(estimated * 1000)}
+end
+local allowed = 0
+if estimated + cost - 1 < limit then
+  cur = cur + cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'ws', ws, 'cur', cur, 'prev', prev)
+redis.call('EXPIRE', KEYS[1], window * 2)
+return {allowed, math.floor(estimated * 1000)}
+"""
+SLIDING_WINDOW_SCRIPT_SHA = hashlib.sha1(SLIDING_WINDOW_SCRIPT.encode()).hexdigest()
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Redis 프로토콜 공유 저장소 (여러 컨테이너/호스트용)
+
+    Lua 스크립트 하나로 검사와 증가를 원자적으로 수행하고, 키 만료(EXPIRE)로
+    유휴 카운터를 정리합니다. 서버에 연결할 수 없으면 서비스 중단 대신
+    요청을 허용하고 경고를 남깁니다 (fail-open).
+    """
+
+    backend = "redis"
+    shared = True
+
+    def __init__(self, url: str, key_prefix: str = "rl:"):
+        super().__init__()
+        parsed = urlparse(url)
+        self.key_prefix = key_prefix
+        self.conn = RespConnection(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=parsed.password
+        )
+        self.lock = threading.Lock()
+        self.errors_total = 0
+
+    def after_fork(self):
+        # 부모와 소켓을 공유하지 않도록 연결을 버리고 다음 호출 때 재연결
+        self.lock = threading.Lock()
+        self.conn.close()
+
+    def _eval(self, key: str, *args) -> List[int]:
+        with self.lock:
+            try:
+                return self.conn.call("EVALSHA", SLIDING_WINDOW_SCRIPT_SHA, 1, self.key_prefix + key, *args)
+            except RedisProtocolError as e:
+                if not str(e).startswith("NOSCRIPT"):
+                    raise
+                return self.conn.call("EVAL", SLIDING_WINDOW_SCRIPT, 1, self.key_prefix + key, *args)
+
+    def hit(self, key: str, max_requests: int, window_seconds: int, now: Optional[float] = None,
+            cost: int = 1) -> bool:
+        if now is None:
+            now = time.time()
+        try:
+            allowed, _ = self._eval(key, max_requests, window_seconds, repr(now), cost)
+        except (OSError, ConnectionError, RedisProtocolError) as e:
+            self.errors_total += 1
+            logger.warning(f"Rate limit backend unavailable, allowing request: {e}")
+            return True
+        return self._record(bool(allowed))
+
+    def remaining(self, key: str, max_requests: int, window_seconds: int, now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.time()
+        try:
+            _, estimated_milli = self._eval(key, max_requests, window_seconds, repr(now), 0)
+        except (OSError, ConnectionError, RedisProtocolError) as e:
+            self.errors_total += 1
+            logger.warning(f"Rate limit backend unavailable: {e}")
+            return max_requests
+        return _remaining(estimated_milli / 1000, max_requests)
+
+    def reset(self, key: str):
+        with self.lock:
+            self.conn.call("DEL", self.key_prefix + key)
+
+    def clear(self, prefix: str = ""):
+        pattern = self.key_prefix + "".join(
+            "\\" + ch if ch in "*?[]\\" else ch for ch in prefix
+        ) + "*"
+        with self.lock:
+            cursor = b"0"
+            while True:
+                cursor, keys = self.conn.call("SCAN", cursor, "MATCH", pattern, "COUNT", 1000)
+                if keys:
+                    self.conn.call("DEL", *keys)
+                if cursor in (b"0", "0"):
+                    break
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**super().metrics(), "errors_total": self.errors_total}
+
+
+def create_rate_limit_store(url: str, max_keys: int = 50000, sweep_interval: float = 60.0) -> RateLimitStore:
+    """
+    URL로 저장소 생성
+
+    Args:
+        url: memory:// | sqlite:///path/to/file.db | redis://host:port/db
+        max_keys: 메모리/SQLite 저장소의 키 상한
+        sweep_interval: 유휴 키 정리 주기 (초)
+    """
+    scheme = url.split("://", 1)[0].lower()
+    if scheme == "memory":
+        return InMemoryRateLimitStore(max_keys=max_keys, sweep_interval=sweep_interval)
+    if scheme == "sqlite":
+        return SQLiteRateLimitStore(url[len("sqlite:///"):], max_keys=max_keys, sweep_interval=sweep_interval)
+    if scheme in ("redis", "rediss"):
+        if scheme == "rediss":
+            raise ValueError("TLS redis (rediss://) is not supported; use a local TLS proxy")
+        return RedisRateLimitStore(url)
+    raise ValueError(f"Unsupported rate limit storage URL: {url}")
@@ -0,0 +1,158 @@
+"""
+서버 프로세스(워커) 관련 설정 및 검사
+"""
+import logging
+from typing import List
+
+from .config import settings
+from .database import ReadSessionLocal, engine, read_engine
+from .rate_limit import principal_tracker, rate_limit_store
+from .sqlite_maintenance import create_sqlite_maintenance
+
+logger = logging.getLogger(__name__)
+
+# 파일 기반 SQLite일 때만 생성 (PostgreSQL/인메모리면 None)
+database_maintenance = create_sqlite_maintenance(engine)
+
+
+def create_backup_service():
+    """파일 기반 SQLite면 백업 서비스 생성, 아니면 None"""
+    from app.services.backup_service import BackupService
+
+    if database_maintenance is None:
+        return None
+    return BackupService(
+        database_maintenance.path,
+        settings.backup_dir,
+        pages_per_step=settings.backup_pages_per_step,
+        step_sleep=settings.backup_step_sleep_ms / 1000,
+        max_restarts=settings.backup_max_restarts,
+        max_duration_sec=settings.backup_max_duration_sec,
+        retention_days=settings.backup_retention_days,
+        keep_min=settings.backup_keep_min,
+    )
+
+
+def create_backup_scheduler():
+    from app.services.backup_service import BackupScheduler
+
+    service = create_backup_service()
+    if service is None or not settings.backup_enabled:
+        return None
+    return BackupScheduler(
+        service,
+        ReadSessionLocal,
+        full_hour=settings.backup_full_hour,
+        incremental_interval=settings.backup_incremental_interval_min * 60,
+    )
+
+
+backup_scheduler = create_backup_scheduler()
+
+
+def find_process_local_state() -> List[str]:
+    """
+    워커 간에 공유되지 않는 상태 목록
+    
+    여러 워커로 실행하면 이 상태들은 워커마다 따로 존재하므로
+    레이트리밋 등이 워커 수만큼 느슨해집니다.
+    """
+    problems = []
+    
+    if not rate_limit_store.shared:
+        problems.append(
+            f"rate limit storage '{rate_limit_store.backend}' is process-local "
+            "(set RATE_LIMIT_STORAGE_URL to sqlite:///... or redis://...)"
+        )
+    
+    if engine.url.get_backend_name() == "sqlite" and engine.url.database in (None, "", ":memory:"):
+        problems.append("in-memory SQLite database cannot be shared between workers")
+    
+    return problems
+
+
+def check_worker_safety(workers: int = None):
+    """
+    멀티 워커 실행 가능 여부 검사
+    
+    Raises:
+        RuntimeError: 워커가 2개 이상인데 프로세스 로컬 상태에 의존하는 경우
+    """
+    workers = workers if workers is not None else settings.web_concurrency
+    if workers <= 1:
+        return
+    
+    problems = find_process_local_state()
+    if problems:
+        message = f"Refusing to start with {workers} workers: " + "; ".join(problems)
+        logger.error(message)
+        raise RuntimeError(message)
+    
+    if not principal_tracker.shared:
+        # IP 카운터는 공유되지만 배수는 워커마다 따로 세므로 NAT 뒤 한 반이 백스톱에 일찍 걸릴 수 있음
+        logger.warning(
+            f"Principal tracker is process-local: each of {workers} workers scales the shared per-IP "
+            "backstop by the principals it has seen itself, so a classroom behind one NAT address can "
+            "hit the IP limits early (raise JOIN_ATTEMPT_RATE_PER_MIN/ACTIVITY_WRITE_RATE_PER_MIN if that happens)"
+        )
+    
+    logger.info(f"Multi-worker mode: workers={workers}, rate_limit_backend={rate_limit_store.backend}")
+
+
+def reinit_after_fork():
+    """
+    fork 직후 각 워커에서 호출 - 부모에게서 물려받은 연결을 버리고 새로 생성
+    
+    preload 모드에서는 앱이 마스터 프로세스에서 한 번 로드된 뒤 fork되므로
+    DB 커넥션 풀과 레이트리밋 저장소 연결을 워커별로 다시 만들어야 합니다.
+    """
+    # close=False: 부모의 연결을 닫지 않고 이 프로세스의 풀만 새로 만듦
+    engine.dispose(close=False)
+    if read_engine is not engine:
+        read_engine.dispose(close=False)
+    rate_limit_store.after_fork()
+    if database_maintenance is not None:
+        database_maintenance.after_fork()
+    if backup_scheduler is not None:
+        backup_scheduler.after_fork()
+
+
+def warm_caches():
+    """첫 요청 전에 준비할 캐시 (모드 카탈로그, 모드별 스키마 검증기)"""
+    from sqlalchemy.exc import SQLAlchemyError
+    from app.services.mode_catalogue_service import mode_catalogue
+    from .validation import warm_validator_cache
+
+    db = ReadSessionLocal()
+    try:
+        catalogue = mode_catalogue.get(db)
+        compiled = warm_validator_cache(db)
+        logger.info(f"Mode caches warmed: catalogue={catalogue.etag}, validators={compiled}")
+    except SQLAlchemyError as e:
+        # 마이그레이션 전 등 테이블이 없으면 첫 요청 때 준비
+        logger.warning(f"Mode cache warm-up skipped: {e}")
+    finally:
+        db.close()
+
+
+def start_background_tasks():
+    """워커별 백그라운드 작업 시작 (앱 startup 시)"""
+    if database_maintenance is not None:
+        database_maintenance.start()
+    if backup_scheduler is not None:
+        backup_scheduler.start()
+
+
+def stop_background_tasks():
+    """워커별 백그라운드 작업 정리 (앱 shutdown 시)"""
+    if database_maintenance is not None:
+        database_maintenance.stop()
+    if backup_scheduler is not None:
+        backup_scheduler.stop()
+
+
+def database_metrics() -> dict:
+    """헬스 체크용 DB 지표"""
+    if database_maintenance is None:
+        return {"backend": engine.url.get_backend_name()}
+    return database_maintenance.metrics()
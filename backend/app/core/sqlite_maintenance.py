@@ -0,0 +1,247 @@
+"""
+SQLite WAL 체크포인트 및 유지보수
+
+자동 체크포인트(wal_autocheckpoint)는 읽기 트랜잭션이 길게 열려 있으면 WAL을
+되감지 못해 파일이 계속 커집니다. 백그라운드 스레드가 쓰기가 잠잠한 시점에
+PASSIVE 체크포인트를, WAL이 커졌으면 TRUNCATE 체크포인트를 실행하고,
+주기적으로 PRAGMA optimize와 incremental_vacuum을 수행합니다.
+
+쓰기 활동 여부는 WAL 파일의 수정 시각으로 판단하므로 여러 워커 프로세스의
+쓰기도 함께 반영됩니다. 스레드는 워커마다 시작되지만 DB 옆 잠금 파일(flock)을
+가진 한 워커만 유지보수를 실행하고, 그 워커가 종료되면 다른 워커가 이어받습니다.
+"""
+import fcntl
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+WAL_HEADER_BYTES = 32
+WAL_FRAME_HEADER_BYTES = 24
+
+
+class SQLiteMaintenance:
+    """SQLite 파일 DB 체크포인트/최적화 작업"""
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 30,
+        quiet_seconds: float = 5.0,
+        truncate_bytes: int = 64 * 1024 * 1024,
+        optimize_interval: float = 3600,
+        vacuum_pages: int = 500,
+        busy_timeout_ms: int = 5000,
+    ):
+        self.path = path
+        self.wal_path = f"{path}-wal"
+        self.interval = interval
+        self.quiet_seconds = quiet_seconds
+        self.truncate_bytes = truncate_bytes
+        self.optimize_interval = optimize_interval
+        self.vacuum_pages = vacuum_pages
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock_file = None  # 유지보수 담당 워커만 보유 (flock)
+        self.lock_path = f"{path}.maintenance.lock"
+        self.page_size = 4096
+
+        self.last_checkpoint_at: Optional[float] = None
+        self.last_checkpoint_mode: Optional[str] = None
+        self.last_optimize_at: float = time.time()
+        self.checkpoint_lag_frames = 0
+        self.checkpoints_total = {"PASSIVE": 0, "TRUNCATE": 0}
+        self.checkpoint_busy_total = 0
+        self.skipped_active_total = 0
+        self.optimize_total = 0
+        self.vacuum_pages_freed_total = 0
+        self.errors_total = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """유지보수 전용 연결 (앱 커넥션 풀과 분리)"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000,
+                                         isolation_level=None, check_same_thread=False)
+            self.page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        return self._conn
+
+    def wal_size(self) -> int:
+        try:
+            return os.path.getsize(self.wal_path)
+        except OSError:
+            return 0
+
+    def seconds_since_write(self, now: Optional[float] = None) -> float:
+        """WAL 파일이 마지막으로 수정된 이후 경과 시간"""
+        now = now if now is not None else time.time()
+        try:
+            return now - os.path.getmtime(self.wal_path)
+        except OSError:
+            return float("inf")
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Tuple[int, int, int]:
+        """
+        체크포인트 실행
+
+        Returns:
+            (busy, WAL 프레임 수, 체크포인트된 프레임 수)
+        """
+        with self.lock:
+            busy, log_frames, checkpointed = self.conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        self.last_checkpoint_at = time.time()
+        self.last_checkpoint_mode = mode
+        self.checkpoints_total[mode] = self.checkpoints_total.get(mode, 0) + 1
+        self.checkpoint_busy_total += busy
+        # WAL 모드가 아니면 -1 반환
+        self.checkpoint_lag_frames = max(log_frames - checkpointed, 0) if log_frames >= 0 else 0
+        return busy, log_frames, checkpointed
+
+    def optimize(self) -> int:
+        """PRAGMA optimize + incremental_vacuum, 회수한 페이지 수 반환"""
+        with self.lock:
+            self.conn.execute("PRAGMA optimize")
+            before = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            self.conn.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+            after = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        freed = max(before - after, 0)
+        self.last_optimize_at = time.time()
+        self.optimize_total += 1
+        self.vacuum_pages_freed_total += freed
+        return freed
+
+    def run_once(self, now: Optional[float] = None, force: bool = False) -> Optional[str]:
+        """
+        유지보수 한 번 실행 (쓰기가 진행 중이면 건너뜀)
+
+        Returns:
+            실행한 체크포인트 모드 또는 None
+        """
+        now = now if now is not None else time.time()
+        if not force and self.seconds_since_write(now) < self.quiet_seconds:
+            self.skipped_active_total += 1
+            return None
+
+        mode = "TRUNCATE" if self.wal_size() >= self.truncate_bytes else "PASSIVE"
+        try:
+            busy, _, _ = self.checkpoint(mode)
+            if busy and mode == "TRUNCATE":
+                logger.info("WAL truncate checkpoint blocked by active readers, will retry")
+            if now - self.last_optimize_at >= self.optimize_interval:
+                self.optimize()
+        except sqlite3.Error as e:
+            self.errors_total += 1
+            logger.warning(f"SQLite maintenance failed: {e}")
+            return None
+        return mode
+
+    @property
+    def is_leader(self) -> bool:
+        """이 프로세스가 유지보수 담당인지"""
+        return self._lock_file is not None
+
+    def _try_lock(self):
+        lock_file = open(self.lock_path, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def _release_lock(self):
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def run_if_leader(self, now: Optional[float] = None, force: bool = False) -> Optional[str]:
+        """
+        잠금을 가진 워커에서만 run_once 실행
+
+        잠금은 프로세스가 끝나거나 stop()할 때까지 유지하므로 워커가 여러 개여도
+        체크포인트/optimize는 한 곳에서만 실행됩니다.
+        """
+        if self._lock_file is None:
+            self._lock_file = self._try_lock()
+            if self._lock_file is None:
+                return None  # 다른 워커가 담당
+            logger.info(f"SQLite maintenance leader: pid={os.getpid()}")
+        return self.run_once(now, force)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_if_leader()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="sqlite-maintenance", daemon=True)
+        self._thread.start()
+        logger.info(f"SQLite maintenance started: path={self.path}, interval={self.interval}s")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._release_lock()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def after_fork(self):
+        # 부모 프로세스의 연결/스레드는 자식에서 사용할 수 없음
+        self.lock = threading.Lock()
+        self._thread = None
+        self._conn = None
+        self._lock_file = None
+
+    def metrics(self) -> Dict[str, Any]:
+        wal_bytes = self.wal_size()
+        return {
+            "backend": "sqlite",
+            "maintenance_leader": self.is_leader,
+            "wal_size_bytes": wal_bytes,
+            "wal_frames": max(wal_bytes - WAL_HEADER_BYTES, 0) // (self.page_size + WAL_FRAME_HEADER_BYTES),
+            "checkpoint_lag_frames": self.checkpoint_lag_frames,
+            "seconds_since_checkpoint": (
+                round(time.time() - self.last_checkpoint_at, 1) if self.last_checkpoint_at else None
+            ),
+            "last_checkpoint_mode": self.last_checkpoint_mode,
+            "checkpoints_total": dict(self.checkpoints_total),
+            "checkpoint_busy_total": self.checkpoint_busy_total,
+            "skipped_active_total": self.skipped_active_total,
+            "optimize_total": self.optimize_total,
+            "vacuum_pages_freed_total": self.vacuum_pages_freed_total,
+            "errors_total": self.errors_total,
+        }
+
+
+def create_sqlite_maintenance(db_engine: Engine) -> Optional[SQLiteMaintenance]:
+    """파일 기반 SQLite 엔진이면 유지보수 작업 생성, 아니면 None"""
+    url = db_engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return SQLiteMaintenance(
+        os.path.abspath(url.database),
+        interval=settings.sqlite_checkpoint_interval_sec,
+        quiet_seconds=settings.sqlite_checkpoint_quiet_sec,
+        truncate_bytes=settings.sqlite_wal_truncate_mb * 1024 * 1024,
+        optimize_interval=settings.sqlite_optimize_interval_sec,
+        vacuum_pages=settings.sqlite_incremental_vacuum_pages,
+        busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+    )
@@ -1,52 +1,126 @@
 """
 JSON Schema validation utilities
+
+Compiled validators are cached per ``(mode.id, mode.version)`` so the meta-schema
+check and validator construction happen once per mode instead of on every
+template creation. The cache is warmed from the ``modes`` table at startup.
 """
+import logging
+import threading
 import jsonschema
-from typing import Dict, Any, List, Tuple
+from jsonschema.protocols import Validator
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy.orm import Session
 from app.schemas.templates import ValidationError
 
+logger = logging.getLogger(__name__)
+
+# (mode_id, version) -> (schema, compiled validator)
+_validator_cache: Dict[Tuple[str, str], Tuple[Dict[str, Any], Validator]] = {}
+_validator_cache_lock = threading.Lock()
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """
+    Check a schema against its meta-schema and build a validator
+
+    Raises:
+        jsonschema.SchemaError: If the schema itself is invalid
+    """
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def get_schema_validator(
+    schema: Dict[str, Any],
+    mode_id: Optional[str] = None,
+    mode_version: Optional[str] = None
+) -> Validator:
+    """
+    Return a compiled validator, cached by mode id and version when given
+
+    A cached entry is rebuilt if the schema no longer matches, so a mode
+    reseeded without a version bump still validates against its new schema.
+    """
+    if mode_id is None:
+        return compile_schema(schema)
+
+    key = (mode_id, mode_version or "")
+    entry = _validator_cache.get(key)
+    if entry is not None and entry[0] == schema:
+        return entry[1]
+
+    validator = compile_schema(schema)
+    with _validator_cache_lock:
+        _validator_cache[key] = (schema, validator)
+    return validator
 
-def validate_settings_against_schema(settings: Dict[str, Any], schema: Dict[str, Any]) -> Tuple[bool, List[ValidationError]]:
+
+def clear_validator_cache():
+    """Drop all compiled validators (e.g. after modes are reseeded)"""
+    with _validator_cache_lock:
+        _validator_cache.clear()
+
+
+def warm_validator_cache(db: Session) -> int:
+    """
+    Compile validators for every mode in the database
+
+    Returns:
+        Number of modes compiled (invalid schemas are logged and skipped)
+    """
+    from app.models.mode import Mode
+
+    compiled = 0
+    for mode in db.query(Mode).all():
+        try:
+            get_schema_validator(mode.options_schema, mode.id, mode.version)
+            compiled += 1
+        except jsonschema.SchemaError as e:
+            logger.error(f"Invalid options_schema for mode {mode.id}: {e.message}")
+    return compiled
+
+
+def validate_settings_against_schema(
+    settings: Dict[str, Any],
+    schema: Dict[str, Any],
+    mode_id: Optional[str] = None,
+    mode_version: Optional[str] = None
+) -> Tuple[bool, List[ValidationError]]:
     """
     Validate settings JSON against mode schema
     
     Args:
         settings: Settings to validate
         schema: JSON schema to validate against
+        mode_id: Mode id, enables the compiled validator cache
+        mode_version: Mode version (part of the cache key)
         
     Returns:
-        Tuple of (is_valid, list_of_errors)
+        Tuple of (is_valid, list_of_errors) - every error is reported, not only the first
     """
-    errors = []
-    
     try:
-        jsonschema.validate(settings, schema)
-        return True, []
-    except jsonschema.ValidationError as e:
-        # Convert jsonschema error to our error format
-        path = ".".join(str(p) for p in e.absolute_path) if e.absolute_path else "root"
-        error = ValidationError(
-            path=path,
-            message=e.message
-        )
-        errors.append(error)
-        return False, errors
+        validator = get_schema_validator(schema, mode_id, mode_version)
     except jsonschema.SchemaError as e:
         # Schema itself is invalid
-        error = ValidationError(
-            path="schema",
-            message=f"Invalid schema: {e.message}"
-        )
-        errors.append(error)
-        return False, errors
+        return False, [ValidationError(path="schema", message=f"Invalid schema: {e.message}")]
+    
+    try:
+        errors = [
+            # Convert jsonschema error to our error format
+            ValidationError(
+                path=".".join(str(p) for p in e.absolute_path) if e.absolute_path else "root",
+                message=e.message
+            )
+            for e in validator.iter_errors(settings)
+        ]
     except Exception as e:
         # Any other validation error
-        error = ValidationError(
-            path="unknown",
-            message=f"Validation error: {str(e)}"
-        )
-        errors.append(error)
-        return False, errors
+        return False, [ValidationError(path="unknown", message=f"Validation error: {str(e)}")]
+    
+    errors.sort(key=lambda error: error.path)
+    return not errors, errors
 
 
 def get_required_fields_from_schema(schema: Dict[str, Any]) -> List[str]:
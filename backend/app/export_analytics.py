@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+분석용 컬럼형 데이터 내보내기 (연구팀용 수동/cron 작업)
+
+    python -m app.export_analytics --teacher teacher@example.com --out ./data/exports
+    python -m app.export_analytics --teacher teacher@example.com --runs 3,5 --format arrow
+"""
+import argparse
+import logging
+import sys
+
+from app.core.database import ReadSessionLocal
+from app.models import Teacher
+from app.services.analytics_export_service import EXPORT_FORMATS, AnalyticsExportService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="세션 데이터 Parquet/Arrow 내보내기")
+    parser.add_argument("--teacher", required=True, help="교사 이메일")
+    parser.add_argument("--out", default="./data/exports", help="출력 폴더")
+    parser.add_argument("--runs", help="내보낼 세션 ID (쉼표로 구분), 생략 시 전체")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    logger = logging.getLogger("export_analytics")
+
+    run_ids = [int(run_id) for run_id in args.runs.split(",")] if args.runs else None
+    db = ReadSessionLocal()
+    try:
+        teacher = db.query(Teacher).filter(Teacher.email == args.teacher).first()
+        if teacher is None:
+            logger.error(f"ERROR: 교사를 찾을 수 없습니다: {args.teacher}")
+            return 1
+        manifest = AnalyticsExportService(db).write_dataset(teacher.id, args.out, run_ids, args.format)
+    finally:
+        db.close()
+
+    rows = manifest["rows"]
+    logger.info(
+        f"내보내기 완료: 세션 {rows['runs']}개, 참여 {rows['enrollments']}행, "
+        f"활동 로그 {rows['activity_logs']}행 → {args.out} ({len(manifest['files'])}개 파일)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
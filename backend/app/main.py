@@ -10,7 +10,16 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from .core.config import settings
 from .routers import auth, modes, templates, runs, join, activity_log, live_snapshot
+from .core.rate_limit import RateLimitExceeded, principal_tracker, rate_limit_response, rate_limit_store
+from .core.runtime import (
+    check_worker_safety,
+    database_metrics,
+    start_background_tasks,
+    stop_background_tasks,
+    warm_caches,
+)
 from .middleware.rate_limit import RateLimitMiddleware
+from .services.ended_run_cache import ended_run_cache
 
 # 로깅 설정
 logging.basicConfig(
@@ -27,15 +36,18 @@ app = FastAPI(
     debug=settings.debug
 )
 
-# Rate limiting middleware (레이트리밋 설정)
+# Rate limiting middleware (IP 백스톱 - 학생/교사 단위 한도는 각 라우터에서 적용)
 app.add_middleware(
     RateLimitMiddleware,
+    store=rate_limit_store,
+    principal_tracker=principal_tracker,
     rates={
+        # requests per minute per IP, multiplied by principals recently seen behind the IP
         "/api/join": (settings.join_attempt_rate_per_min, 60),  # 30 requests per minute
         "/api/auth/login": (settings.auth_login_rate_per_min, 60),  # 5 requests per minute
         "/api/activity-log": (settings.activity_write_rate_per_min, 60),  # 120 requests per minute
-        "/api/runs/.*/live-snapshot": (12, 60),  # 12 requests per minute for live snapshot
-        "/api/runs/.*/recent-logs": (12, 60),  # 12 requests per minute for recent logs
+        "/api/runs/(?P<run_id>[^/]+)/live-snapshot": (settings.dashboard_poll_rate_per_min, 60),  # 12 requests per minute per run for live snapshot
+        "/api/runs/(?P<run_id>[^/]+)/recent-logs": (settings.dashboard_poll_rate_per_min, 60),  # 12 requests per minute per run for recent logs
     }
 )
 
@@ -83,6 +95,20 @@ if static_dir.exists():
         return JSONResponse(status_code=404, content={"error": "Static files not found"})
 
 
+@app.on_event("startup")
+async def verify_worker_configuration():
+    """멀티 워커 실행 시 프로세스 로컬 상태 사용 여부 검사 후 캐시 준비 및 백그라운드 작업 시작"""
+    check_worker_safety()
+    warm_caches()
+    start_background_tasks()
+
+
+@app.on_event("shutdown")
+async def shutdown_background_tasks():
+    """백그라운드 작업 정리"""
+    stop_background_tasks()
+
+
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
@@ -98,10 +124,19 @@ async def health_check():
     """헬스 체크 엔드포인트"""
     return {
         "status": "healthy",
-        "timestamp": "2025-08-02T23:00:00Z"
+        "timestamp": "2025-08-02T23:00:00Z",
+        "rate_limit": rate_limit_store.metrics(),
+        "database": database_metrics(),
+        "ended_run_cache": ended_run_cache.metrics()
     }
 
 
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded):
+    """주체 단위 레이트 리밋 초과 - IP 미들웨어와 같은 429 본문"""
+    return rate_limit_response(exc.window_seconds)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """전역 예외 처리기"""
@@ -1,119 +1,136 @@
 """
 Rate limiting middleware for API endpoints
 """
-import time
+import re
 import logging
-from typing import Dict, Tuple
-from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.rate_limit import (
+    InMemoryRateLimitStore,
+    PrincipalTracker,
+    RateLimitStore,
+    client_ip_from_scope,
+    rate_limit_response,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, rates: Dict[str, Tuple[int, int]] = None):
+NO_CACHE_PATH_PREFIXES = ("/api/join", "/api/activity-log")
+
+
+class RateRule:
+    """
+    Precompiled rate limit rule
+
+    The pattern is matched against the start of the request path (``re.match``),
+    so plain prefixes like ``/api/join`` keep their previous meaning while regex
+    entries such as ``/api/runs/[^/]+/live-snapshot`` now work as expected.
+    Named groups in the pattern become part of the counter key, e.g.
+    ``/api/runs/(?P<run_id>[^/]+)/live-snapshot`` limits each run separately.
+    """
+
+    __slots__ = ("name", "regex", "max_requests", "window_seconds", "scoped")
+
+    def __init__(self, pattern: str, max_requests: int, window_seconds: int):
+        self.name = pattern
+        self.regex: Pattern[str] = re.compile(pattern)
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.scoped = bool(self.regex.groupindex)
+
+    def match(self, path: str) -> Optional[str]:
+        """Return the counter scope for ``path`` or None if the rule does not apply"""
+        m = self.regex.match(path)
+        if m is None:
+            return None
+        if not self.scoped:
+            return self.name
+        groups = ",".join(f"{k}={v}" for k, v in sorted(m.groupdict().items()))
+        return f"{self.name}|{groups}"
+
+
+def compile_rules(rates: Dict[str, Tuple[int, int]]) -> List[RateRule]:
+    """Compile ``{path_pattern: (requests, seconds)}`` into rules (first match wins)"""
+    return [
+        RateRule(pattern, max_requests, window_seconds)
+        for pattern, (max_requests, window_seconds) in rates.items()
+    ]
+
+
+class RateLimitMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        rates: Dict[str, Tuple[int, int]] = None,
+        store: Optional[RateLimitStore] = None,
+        principal_tracker: Optional[PrincipalTracker] = None,
+        no_cache_prefixes: Iterable[str] = NO_CACHE_PATH_PREFIXES,
+    ):
         """
-        Rate limiting middleware
-        
+        Per-IP rate limiting middleware (pure ASGI)
+
+        These limits are a backstop. Student and teacher limits are enforced in
+        the routes once the principal is known (see core.rate_limit). When a
+        principal tracker is given, each IP's limit is multiplied by the number
+        of principals recently seen behind that IP, so a classroom sharing one
+        school NAT address is not squeezed into a single client's budget.
+
         Args:
-            app: FastAPI application
+            app: ASGI application
             rates: Dict of {path_pattern: (requests, seconds)}
                   e.g., {"/api/join": (30, 60)} = 30 requests per 60 seconds
+            store: Counter store, shared so that metrics can be read elsewhere
+            principal_tracker: Scales limits by observed principals per IP
+            no_cache_prefixes: Path prefixes that get no-store cache headers
         """
-        super().__init__(app)
-        self.rates = rates or {}
-        self.client_requests: Dict[str, Dict[str, list]] = {}  # {client_ip: {endpoint: [timestamps]}}
-    
-    def get_client_ip(self, request: Request) -> str:
-        """
-        Get real client IP, considering Cloudflare headers
-        """
-        # Cloudflare real IP headers (in order of preference)
-        cf_headers = [
-            "CF-Connecting-IP",  # Cloudflare
-            "X-Forwarded-For",   # Proxy
-            "X-Real-IP",         # Nginx
-        ]
-        
-        for header in cf_headers:
-            ip = request.headers.get(header)
-            if ip:
-                # X-Forwarded-For can contain multiple IPs, take the first
-                return ip.split(',')[0].strip()
-        
-        # Fallback to direct connection IP
-        client_host = request.client.host if request.client else "unknown"
-        return client_host
-    
-    def is_rate_limited(self, client_ip: str, endpoint: str, max_requests: int, window_seconds: int) -> bool:
-        """
-        Check if client is rate limited for specific endpoint
-        """
-        now = time.time()
-        
-        # Initialize client tracking
-        if client_ip not in self.client_requests:
-            self.client_requests[client_ip] = {}
-        
-        if endpoint not in self.client_requests[client_ip]:
-            self.client_requests[client_ip][endpoint] = []
-        
-        # Clean old requests outside the window
-        requests = self.client_requests[client_ip][endpoint]
-        self.client_requests[client_ip][endpoint] = [
-            req_time for req_time in requests 
-            if now - req_time < window_seconds
-        ]
-        
-        # Check if rate limit exceeded
-        current_requests = len(self.client_requests[client_ip][endpoint])
-        if current_requests >= max_requests:
-            logger.warning(f"Rate limit exceeded: IP={client_ip}, endpoint={endpoint}, requests={current_requests}/{max_requests}")
-            return True
-        
-        # Add current request
-        self.client_requests[client_ip][endpoint].append(now)
-        return False
-    
-    async def dispatch(self, request: Request, call_next):
-        """
-        Process request with rate limiting
-        """
-        path = request.url.path
-        method = request.method
-        
-        # Check if this endpoint needs rate limiting
-        rate_config = None
-        for pattern, (max_req, window) in self.rates.items():
-            if path.startswith(pattern):
-                rate_config = (max_req, window)
-                break
-        
-        if rate_config:
-            client_ip = self.get_client_ip(request)
-            max_requests, window_seconds = rate_config
-            endpoint_key = f"{method}:{path}"
-            
-            if self.is_rate_limited(client_ip, endpoint_key, max_requests, window_seconds):
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": "rate_limit_exceeded",
-                        "message": "너무 많은 요청입니다. 잠시 후 다시 시도해주세요.",
-                        "retry_after": window_seconds
-                    },
-                    headers={
-                        "Retry-After": str(window_seconds),
-                        "Cache-Control": "no-store"
-                    }
-                )
-        
-        response = await call_next(request)
-        
+        self.app = app
+        self.rules = compile_rules(rates or {})
+        self.store = store if store is not None else InMemoryRateLimitStore()
+        self.principal_tracker = principal_tracker
+        self.no_cache_prefixes = tuple(no_cache_prefixes)
+
+    def match_rule(self, path: str) -> Optional[Tuple[RateRule, str]]:
+        """Find the first rule matching ``path``"""
+        for rule in self.rules:
+            scope_key = rule.match(path)
+            if scope_key is not None:
+                return rule, scope_key
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        matched = self.match_rule(path)
+
+        if matched:
+            rule, scope_key = matched
+            client_ip = client_ip_from_scope(scope)
+            key = f"{client_ip}|{scope['method']}|{scope_key}"
+            max_requests = rule.max_requests
+            if self.principal_tracker is not None:
+                max_requests *= self.principal_tracker.scale(client_ip)
+
+            if not self.store.hit(key, max_requests, rule.window_seconds):
+                logger.warning(f"Rate limit exceeded: IP={client_ip}, rule={rule.name}, limit={max_requests}/{rule.window_seconds}s")
+                response = rate_limit_response(rule.window_seconds)
+                await response(scope, receive, send)
+                return
+
+        if not path.startswith(self.no_cache_prefixes):
+            await self.app(scope, receive, send)
+            return
+
         # Add no-cache headers for join and activity-log endpoints
-        if path.startswith(("/api/join", "/api/activity-log")):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-        
-        return response
\ No newline at end of file
+        async def send_with_no_cache(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
+                headers["Pragma"] = "no-cache"
+            await send(message)
+
+        await self.app(scope, receive, send_with_no_cache)
@@ -1,11 +1,59 @@
 """
 Activity Log model - 학생 활동 로그 저장
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint, JSON
+from sqlalchemy import (Boolean, Column, Computed, Integer, Float, String, Text, DateTime, ForeignKey,
+                        UniqueConstraint, JSON, Index, text)
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import ColumnElement
 from app.core.database import Base
 
 
+class EvalJsonField(ColumnElement):
+    """
+    third_eval_json 필드를 꺼내는 생성 열 식 (DDL 전용)
+
+    paths 중 처음으로 JSON 숫자인 경로를 사용하고, 없으면 NULL입니다 (숫자 문자열·bool도 NULL).
+    (문자열 점수 등으로 INSERT가 실패하지 않도록 JSON 타입을 먼저 확인)
+    파이썬 쪽 규칙은 app.services.assessment_scores.extract_scores와 같습니다.
+    """
+    inherit_cache = False
+
+    def __init__(self, type_, *paths: str):
+        self.type = type_
+        self.paths = paths
+
+
+@compiles(EvalJsonField, "sqlite")
+def _eval_json_field_sqlite(element, compiler, **kw):
+    if isinstance(element.type, Boolean):
+        path = element.paths[0]
+        return f"CASE json_type(third_eval_json, '$.{path}') WHEN 'true' THEN 1 WHEN 'false' THEN 0 END"
+    cases = " ".join(
+        f"WHEN json_type(third_eval_json, '$.{path}') IN ('integer', 'real') "
+        f"THEN json_extract(third_eval_json, '$.{path}')"
+        for path in element.paths
+    )
+    return f"CASE {cases} END"
+
+
+@compiles(EvalJsonField, "postgresql")
+def _eval_json_field_postgresql(element, compiler, **kw):
+    def pointer(path):
+        return "{" + path.replace(".", ",") + "}"
+
+    if isinstance(element.type, Boolean):
+        path = pointer(element.paths[0])
+        return (f"CASE WHEN json_typeof(third_eval_json #> '{path}') = 'boolean' "
+                f"THEN (third_eval_json #>> '{path}')::boolean END")
+    cases = " ".join(
+        f"WHEN json_typeof(third_eval_json #> '{pointer(path)}') = 'number' "
+        f"THEN (third_eval_json #>> '{pointer(path)}')::double precision"
+        for path in element.paths
+    )
+    return f"CASE {cases} END"
+
+
 class ActivityLog(Base):
     """학생 활동 로그 테이블"""
     __tablename__ = "activity_logs"
@@ -21,10 +69,43 @@ class ActivityLog(Base):
     ai_output = Column(Text, nullable=True)  # AI 응답
     third_eval_json = Column(JSON, nullable=True)  # 제3 AI 평가 결과
     
+    # 평가 점수 생성 열 (SQLite는 VIRTUAL - 저장 공간 없이 인덱스에만 저장, PostgreSQL은 STORED)
+    # INSERT 대상이 아니므로 일괄 저장(BULK_COLUMNS)/COPY 경로에는 포함하지 않음
+    overall_score = Column(Float, Computed(EvalJsonField(Float(), "overall_score", "understanding_score")))
+    is_completed = Column(Boolean, Computed(EvalJsonField(Boolean(), "is_completed")))
+    depth = Column(Float, Computed(EvalJsonField(Float(), "dimensions.depth", "depth")))
+    breadth = Column(Float, Computed(EvalJsonField(Float(), "dimensions.breadth", "breadth")))
+    application = Column(Float, Computed(EvalJsonField(Float(), "dimensions.application", "application")))
+    metacognition = Column(Float, Computed(EvalJsonField(Float(), "dimensions.metacognition", "metacognition")))
+    engagement = Column(Float, Computed(EvalJsonField(Float(), "dimensions.engagement", "engagement")))
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # 유니크 제약: 한 세션의 같은 학생이 같은 활동의 같은 턴을 중복 저장할 수 없음
     __table_args__ = (
         UniqueConstraint('run_id', 'student_name', 'activity_key', 'turn_index', 
                         name='uq_activity_logs_run_student_activity_turn'),
-    )
\ No newline at end of file
+    )
+
+
+# 대시보드 조회용 복합 인덱스 (최근 로그, 학생별 마지막 활동)
+Index('idx_activity_logs_run_created', ActivityLog.run_id, ActivityLog.created_at)
+Index('idx_activity_logs_run_student_created', ActivityLog.run_id, ActivityLog.student_name, ActivityLog.created_at)
+
+# 통계용 부분 인덱스 - 학생 입력이 있는 턴만 포함, 학생별 턴 수 집계를 인덱스만으로 처리 (커버링)
+# (SQLite는 쿼리 조건이 인덱스 조건과 글자 그대로 같아야 부분 인덱스를 사용하므로 쿼리에서도 이 식을 사용)
+HAS_STUDENT_INPUT = text("student_input IS NOT NULL AND student_input <> ''")
+Index('idx_activity_logs_run_student_input_turns', ActivityLog.run_id, ActivityLog.student_name,
+      postgresql_where=HAS_STUDENT_INPUT,
+      sqlite_where=HAS_STUDENT_INPUT)
+
+# 점수 조건 조회용 인덱스 ("깊이 40점 미만 학생" → (run_id, depth) 범위 검색)
+for _score_column in (ActivityLog.overall_score, ActivityLog.depth, ActivityLog.breadth,
+                      ActivityLog.application, ActivityLog.metacognition, ActivityLog.engagement):
+    Index(f'idx_activity_logs_run_{_score_column.key}', ActivityLog.run_id, _score_column)
+Index('idx_activity_logs_run_completed', ActivityLog.run_id, ActivityLog.is_completed)
+# 학생별 마지막 평가 점수 - 평가가 있는 턴만 담은 부분 인덱스에서 학생별 MAX(id)
+HAS_OVERALL_SCORE = text("overall_score IS NOT NULL")
+Index('idx_activity_logs_run_student_scored', ActivityLog.run_id, ActivityLog.student_name, ActivityLog.id,
+      postgresql_where=HAS_OVERALL_SCORE,
+      sqlite_where=HAS_OVERALL_SCORE)
@@ -27,4 +27,7 @@ class Enrollment(Base):
 Index('idx_enrollments_unique_name_per_run', 
       Enrollment.run_id, 
       Enrollment.normalized_student_name,
-      unique=True)
\ No newline at end of file
+      unique=True)
+
+# 실시간 현황 - Run별 최근 접속 학생 조회
+Index('idx_enrollments_run_last_seen', Enrollment.run_id, Enrollment.last_seen_at)
@@ -13,6 +13,8 @@ class StudentSnapshot(BaseModel):
     turns_total: int = Field(0, description="총 턴 수")
     last_activity_key: Optional[str] = Field(None, description="마지막 활동 키")
     last_turn_index: Optional[int] = Field(None, description="마지막 턴 인덱스")
+    latest_overall_score: Optional[float] = Field(None, description="마지막 평가의 이해도 점수")
+    is_completed: Optional[bool] = Field(None, description="마지막 평가의 학습 완료 여부")
 
 
 class LiveSnapshotResponse(BaseModel):
@@ -43,4 +43,5 @@ class SessionRun(Base):
 # Add indexes for performance
 Index('idx_session_runs_template_id', SessionRun.template_id)
 Index('idx_session_runs_status', SessionRun.status)
-Index('idx_session_runs_created_at', SessionRun.created_at)
\ No newline at end of file
+Index('idx_session_runs_created_at', SessionRun.created_at)
+Index('idx_session_runs_template_created', SessionRun.template_id, SessionRun.created_at)
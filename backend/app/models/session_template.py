@@ -1,7 +1,9 @@
 """
 Session Template model for storing teacher's templates
 """
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index
+import sqlite3
+
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Index, DDL, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -28,4 +30,45 @@ class SessionTemplate(Base):
 
 # Add indexes for performance
 Index('idx_session_templates_teacher_id', SessionTemplate.teacher_id)
-Index('idx_session_templates_title', SessionTemplate.title)
\ No newline at end of file
+Index('idx_session_templates_title', SessionTemplate.title)
+# 목록 정렬/키셋 페이지네이션용 (teacher_id, 정렬 컬럼, id)
+Index('idx_session_templates_teacher_created', SessionTemplate.teacher_id, SessionTemplate.created_at, SessionTemplate.id)
+Index('idx_session_templates_teacher_updated', SessionTemplate.teacher_id, SessionTemplate.updated_at, SessionTemplate.id)
+Index('idx_session_templates_teacher_title', SessionTemplate.teacher_id, SessionTemplate.title, SessionTemplate.id)
+
+
+# 제목 검색 인덱스 (SQLite FTS5 trigram - 3글자 이상 부분 문자열 검색)
+# PostgreSQL은 마이그레이션에서 pg_trgm GIN 인덱스를 생성
+TITLE_FTS_TABLE = "session_templates_fts"
+TITLE_FTS_MIN_QUERY_LENGTH = 3  # trigram은 3글자 미만 검색어를 인덱스로 찾을 수 없음
+SQLITE_TRIGRAM_AVAILABLE = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+TITLE_FTS_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_FTS_TABLE} USING fts5("
+    "title, content='session_templates', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_ai AFTER INSERT ON session_templates BEGIN "
+    f"INSERT INTO {TITLE_FTS_TABLE}(rowid, title) VALUES (new.id, new.title); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_ad AFTER DELETE ON session_templates BEGIN "
+    f"INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_au AFTER UPDATE OF title ON session_templates BEGIN "
+    f"INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title); "
+    f"INSERT INTO {TITLE_FTS_TABLE}(rowid, title) VALUES (new.id, new.title); END",
+]
+TITLE_FTS_DROP = [
+    f"DROP TRIGGER IF EXISTS {TITLE_FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {TITLE_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {TITLE_FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {TITLE_FTS_TABLE}",
+]
+
+if SQLITE_TRIGRAM_AVAILABLE:
+    # metadata.create_all/drop_all(테스트, 초기 설정)에서도 함께 생성/삭제
+    for statement in TITLE_FTS_CREATE:
+        event.listen(SessionTemplate.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    for statement in TITLE_FTS_DROP:
+        event.listen(SessionTemplate.__table__, "before_drop", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def fts_phrase(query: str) -> str:
+    """검색어를 FTS5 구문 검색식으로 변환 (연산자 해석 방지)"""
+    return '"' + query.replace('"', '""') + '"'
@@ -3,16 +3,18 @@ Activity Log API Router - 학생 활동 로그 저장
 """
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel
 
-from app.core.database import get_db
+from app.core.database import get_db, get_write_db
 from app.core.config import settings
 from app.core.guards import assert_run_live
+from app.core.rate_limit import check_principal_rate_limit, observe_principal
 from app.models import SessionRun, RunStatus, Enrollment, ActivityLog, SessionTemplate
+from app.services.activity_log_service import ActivityLogService
 from app.utils.activity_token import verify_activity_token, extract_token_from_header
 
 # 로깅 설정 - 민감값 제외
@@ -35,6 +37,16 @@ class ActivityLogResponse(BaseModel):
     saved: Dict[str, Any]  # activity_key, turn_index 등
 
 
+class ActivityLogBatchRequest(BaseModel):
+    logs: List[ActivityLogRequest]
+
+
+class ActivityLogBatchResponse(BaseModel):
+    ok: bool
+    saved: int       # 새로 저장된 건수
+    duplicates: int  # 이미 저장되어 건너뛴 건수
+
+
 # 의존성: 토큰 인증
 def get_current_student(request: Request, db: Session = Depends(get_db)) -> Dict[str, Any]:
     """
@@ -72,6 +84,8 @@ def get_current_student(request: Request, db: Session = Depends(get_db)) -> Dict
     if not enrollment:
         raise HTTPException(status_code=403, detail="참여 정보가 일치하지 않습니다.")
     
+    observe_principal(request, f"enrollment:{enrollment_id}")
+    
     return {
         "run_id": run_id,
         "enrollment_id": enrollment_id,
@@ -96,7 +110,7 @@ def save_activity_log(
     request: Request,
     response: Response,
     current_student: Dict[str, Any] = Depends(get_current_student),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """학생 활동 로그 자동 저장 (인증: Bearer activity_token)"""
     
@@ -109,6 +123,15 @@ def save_activity_log(
     run_id = current_student["run_id"]
     student_name = current_student["student_name"]
     
+    # 학생별 레이트리밋 및 세션 전체 상한 (IP가 아닌 토큰 기준)
+    check_principal_rate_limit(
+        "activity-log",
+        f"enrollment:{current_student['enrollment_id']}",
+        settings.activity_write_rate_per_min,
+        run_id=run_id,
+        run_limit=settings.activity_write_rate_per_run_per_min
+    )
+    
     # 입력 검증
     if not log_data.activity_key or not log_data.activity_key.strip():
         raise HTTPException(status_code=400, detail="활동 키가 필요합니다.")
@@ -169,6 +192,73 @@ def save_activity_log(
         raise HTTPException(status_code=500, detail="활동 로그 저장 중 오류가 발생했습니다.")
 
 
+@router.post("/activity-log/batch", response_model=ActivityLogBatchResponse)
+def save_activity_log_batch(
+    batch: ActivityLogBatchRequest,
+    request: Request,
+    response: Response,
+    current_student: Dict[str, Any] = Depends(get_current_student),
+    db: Session = Depends(get_write_db)
+):
+    """학생 활동 로그 일괄 저장 - 오프라인/재연결 후 밀린 턴을 한 번에 전송 (중복 턴은 건너뜀)"""
+    
+    response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
+    response.headers["Pragma"] = "no-cache"
+    response.headers["Expires"] = "0"
+    
+    client_ip = get_client_ip(request)
+    run_id = current_student["run_id"]
+    student_name = current_student["student_name"]
+    
+    if not batch.logs:
+        raise HTTPException(status_code=400, detail="저장할 활동 로그가 없습니다.")
+    
+    if len(batch.logs) > settings.activity_log_batch_max:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.activity_log_batch_max}건까지 저장할 수 있습니다."
+        )
+    
+    rows = []
+    for log_data in batch.logs:
+        if not log_data.activity_key or not log_data.activity_key.strip():
+            raise HTTPException(status_code=400, detail="활동 키가 필요합니다.")
+        if log_data.turn_index < 0:
+            raise HTTPException(status_code=400, detail="턴 인덱스는 0 이상이어야 합니다.")
+        rows.append({
+            "run_id": run_id,
+            "student_name": student_name,
+            "activity_key": log_data.activity_key.strip(),
+            "turn_index": log_data.turn_index,
+            "student_input": log_data.student_input,
+            "ai_output": log_data.ai_output,
+            "third_eval_json": log_data.third_eval_json
+        })
+    
+    # 단건 저장과 같은 한도를 쓰도록 건수만큼 차감 (검증을 통과한 배치만)
+    check_principal_rate_limit(
+        "activity-log",
+        f"enrollment:{current_student['enrollment_id']}",
+        settings.activity_write_rate_per_min,
+        run_id=run_id,
+        run_limit=settings.activity_write_rate_per_run_per_min,
+        cost=len(batch.logs)
+    )
+    
+    try:
+        saved = ActivityLogService(db).bulk_insert(rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Activity log batch save error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="활동 로그 저장 중 오류가 발생했습니다.")
+    
+    logger.info(f"Activity log batch saved: run_id={run_id}, student={student_name}, "
+               f"count={len(rows)}, saved={saved}, ip={client_ip}")
+    
+    return ActivityLogBatchResponse(ok=True, saved=saved, duplicates=len(rows) - saved)
+
+
 @router.get("/session/status")
 def check_session_status(
     request: Request,
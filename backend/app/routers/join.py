@@ -8,9 +8,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import func
 
-from app.core.database import get_db
+from app.core.database import get_db, get_write_db
 from app.core.config import settings
 from app.core.guards import assert_run_live
+from app.core.rate_limit import check_principal_rate_limit, observe_principal
 from app.models import SessionRun, RunStatus, JoinCode, Enrollment
 from app.utils.pin_utils import (
     generate_rejoin_pin, 
@@ -89,9 +90,14 @@ def join_session(
     request_data: JoinRequest,
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    write_db: Session = Depends(get_write_db)
 ):
-    """학생 세션 참여 (통합 API - 최초 입장 및 재참여)"""
+    """
+    학생 세션 참여 (통합 API - 최초 입장 및 재참여)
+    
+    조회와 PIN 해시/검증은 읽기 세션에서 하고, 쓰기 연결은 INSERT/UPDATE에만 잠깐 사용
+    """
     
     # Cache-Control 헤더 설정
     response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate"
@@ -121,6 +127,15 @@ def join_session(
     
     # 정규화된 이름으로 기존 참여 확인
     normalized_name = normalize_student_name(request_data.student_name)
+    
+    # 학생(세션+이름)별 시도 제한 및 세션 전체 상한 (같은 NAT의 다른 학생과 분리)
+    check_principal_rate_limit(
+        "join",
+        f"run:{session_run.id}:name:{normalized_name}",
+        settings.join_attempt_rate_per_student_per_min,
+        run_id=session_run.id,
+        run_limit=settings.join_attempt_rate_per_run_per_min
+    )
     existing_enrollment = db.query(Enrollment).filter(
         Enrollment.run_id == session_run.id,
         Enrollment.normalized_student_name == normalized_name
@@ -149,8 +164,11 @@ def join_session(
             raise HTTPException(status_code=401, detail="재참여 PIN이 올바르지 않습니다.")
         
         # 재참여 성공 - last_seen_at 업데이트
-        existing_enrollment.last_seen_at = func.now()
-        db.commit()
+        write_db.query(Enrollment).filter(
+            Enrollment.id == existing_enrollment.id
+        ).update({Enrollment.last_seen_at: func.now()}, synchronize_session=False)
+        write_db.commit()
+        observe_principal(request, f"enrollment:{existing_enrollment.id}")
         
         # 재참여용 activity_token 생성
         activity_token = generate_activity_token(
@@ -185,9 +203,10 @@ def join_session(
                 normalized_student_name=normalized_name,
                 rejoin_pin_hash=pin_hash
             )
-            db.add(enrollment)
-            db.commit()
-            db.refresh(enrollment)
+            write_db.add(enrollment)
+            write_db.commit()
+            write_db.refresh(enrollment)
+            observe_principal(request, f"enrollment:{enrollment.id}")
             
             # 신규 가입용 activity_token 생성
             activity_token = generate_activity_token(
@@ -207,7 +226,7 @@ def join_session(
             )
             
         except IntegrityError:
-            db.rollback()
+            write_db.rollback()
             # 동시성 이슈로 인한 중복 이름 - PIN 입력 요구로 처리
             raise HTTPException(
                 status_code=409, 
@@ -4,8 +4,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import require_auth
+from app.core.rate_limit import check_principal_rate_limit
 from app.models.teacher import Teacher
 from app.models.session_run import SessionRun, RunStatus
 from app.models.live_snapshot import LiveSnapshotResponse, RecentLogsResponse
@@ -58,6 +60,13 @@ async def get_live_snapshot(
     
     권한: 세션을 소유한 교사만 접근 가능
     """
+    # 교사별 조회 제한
+    check_principal_rate_limit(
+        "live-snapshot",
+        f"teacher:{teacher.id}:run:{run_id}",
+        settings.dashboard_poll_rate_per_min
+    )
+    
     # 세션 소유권 확인
     session_run = verify_run_owner(run_id, teacher, db)
     
@@ -96,6 +105,13 @@ async def get_recent_logs(
     
     권한: 세션을 소유한 교사만 접근 가능
     """
+    # 교사별 조회 제한
+    check_principal_rate_limit(
+        "recent-logs",
+        f"teacher:{teacher.id}:run:{run_id}",
+        settings.dashboard_poll_rate_per_min
+    )
+    
     # 세션 소유권 확인
     session_run = verify_run_owner(run_id, teacher, db)
     
@@ -2,21 +2,32 @@
 Modes API router
 """
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.deps import get_db
-from app.models.mode import Mode
 from app.schemas.templates import ModeSchema
+from app.services.mode_catalogue_service import etag_matches, mode_catalogue
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ModeSchema])
-def get_modes(db: Session = Depends(get_db)):
+def get_modes(request: Request, db: Session = Depends(get_db)):
     """
     Get all available modes
     
-    Returns list of all modes with their schemas
+    Returns list of all modes with their schemas.
+    The serialized list is cached in memory and versioned by ETag;
+    a matching If-None-Match is answered with 304.
     """
-    modes = db.query(Mode).order_by(Mode.created_at.asc()).all()
-    return modes
\ No newline at end of file
+    catalogue = mode_catalogue.get(db)
+    headers = {
+        "ETag": catalogue.etag,
+        "Cache-Control": f"public, max-age={settings.modes_cache_max_age_sec}",
+    }
+    
+    if etag_matches(request.headers.get("if-none-match"), catalogue.etag):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=catalogue.body, media_type="application/json", headers=headers)
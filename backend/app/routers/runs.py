@@ -4,14 +4,21 @@ Session Runs API Router - 세션 실행 관리
 import random
 import logging
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
-from app.core.database import get_db
+from app.core.database import get_db, get_write_db
 from app.core.config import settings
-from app.models import SessionRun, RunStatus, JoinCode, Teacher, SessionTemplate, ActivityLog, Enrollment
+from app.core.pagination import after_anchor, decode_cursor, ensure_anchor_exists, next_cursor_for
+from app.models import SessionRun, RunStatus, JoinCode, Teacher, SessionTemplate, ActivityLog
 from app.routers.auth import get_current_teacher
+from app.services.analytics_export_service import EXPORT_FORMATS, AnalyticsExportService
+from app.services.ended_run_cache import ended_run_cache, immutable_response
+from app.services.run_count_cache import run_count_cache
+from app.services.run_statistics_service import RunStatisticsService, parse_include
+from app.services.assessment_scores import SCORE_FIELDS
+from app.services.score_analytics_service import score_analytics_cache, students_below
 from pydantic import BaseModel
 
 # 로깅 설정
@@ -43,9 +50,11 @@ class CodeResponse(BaseModel):
 
 class RunListResponse(BaseModel):
     runs: List[RunResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # include_total=false면 생략
+    page: Optional[int] = None  # 커서 페이지에서는 생략
     size: int
+    has_next: bool = False
+    next_cursor: Optional[str] = None
 
 
 # 유틸리티 함수들
@@ -95,7 +104,7 @@ def create_unique_join_code(db: Session, run_id: int, max_retries: int = 10) ->
 def create_run(
     request: RunCreateRequest,
     current_teacher: Teacher = Depends(get_current_teacher),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """새 세션 실행 생성 (READY 상태)"""
     
@@ -119,6 +128,7 @@ def create_run(
     db.add(session_run)
     db.commit()
     db.refresh(session_run)
+    run_count_cache.invalidate_teacher(current_teacher.id)
     
     logger.info(f"Created new session run {session_run.id} from template {template.id}")
     
@@ -138,7 +148,7 @@ def create_run(
 def start_run(
     run_id: int,
     current_teacher: Teacher = Depends(get_current_teacher),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """세션 시작 (READY → LIVE, 코드 발급)"""
     
@@ -164,6 +174,7 @@ def start_run(
     
     db.commit()
     db.refresh(session_run)
+    run_count_cache.invalidate_teacher(current_teacher.id)
     
     # 참여 코드 생성
     code = create_unique_join_code(db, run_id)
@@ -217,7 +228,7 @@ def end_run(
     run_id: int,
     response: Response,
     current_teacher: Teacher = Depends(get_current_teacher),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """세션 종료 (LIVE → ENDED, 코드 비활성화) - 멱등성 보장"""
     
@@ -260,6 +271,7 @@ def end_run(
     
     db.commit()
     db.refresh(session_run)
+    run_count_cache.invalidate_teacher(current_teacher.id)
     
     # 이벤트 로그
     logger.info({
@@ -282,165 +294,293 @@ def list_runs(
     status: Optional[str] = Query(None, description="필터링할 상태 (READY, LIVE, ENDED)"),
     page: int = Query(1, ge=1, description="페이지 번호"),
     size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor (지정 시 page 무시)"),
+    include_total: bool = Query(True, description="전체 개수 포함 여부"),
     current_teacher: Teacher = Depends(get_current_teacher),
     db: Session = Depends(get_db)
 ):
-    """세션 실행 목록 조회 (페이지네이션)"""
+    """
+    세션 실행 목록 조회 (페이지네이션)
     
-    # 기본 쿼리 (소유한 세션만)
-    query = db.query(SessionRun).join(SessionTemplate).filter(
-        SessionTemplate.teacher_id == current_teacher.id
-    )
+    세션 컬럼과 템플릿 제목만 한 번의 조인 쿼리로 읽습니다.
+    cursor를 넘기면 (created_at, id) 키셋으로 다음 페이지를 읽고,
+    전체 개수는 교사별로 캐시합니다.
+    """
     
-    # 템플릿 필터링
-    if template_id is not None:
-        query = query.filter(SessionRun.template_id == template_id)
-    
-    # 상태 필터링
+    # 상태 확인
+    status_enum = None
     if status:
         try:
             status_enum = RunStatus(status.upper())
-            query = query.filter(SessionRun.status == status_enum)
         except ValueError:
             raise HTTPException(status_code=400, detail="유효하지 않은 상태값입니다.")
     
-    # 전체 개수
-    total = query.count()
-    
-    # 페이지네이션
-    offset = (page - 1) * size
-    runs = query.order_by(SessionRun.created_at.desc()).offset(offset).limit(size).all()
+    # 소유한 세션만 - 필터 조건
+    filters = [SessionTemplate.teacher_id == current_teacher.id]
+    if template_id is not None:
+        filters.append(SessionRun.template_id == template_id)
+    if status_enum is not None:
+        filters.append(SessionRun.status == status_enum)
+    
+    # 목록에 필요한 컬럼만 조회 (템플릿 지연 로딩 없음)
+    query = db.query(
+        SessionRun.id,
+        SessionRun.template_id,
+        SessionRun.name,
+        SessionRun.status,
+        SessionRun.started_at,
+        SessionRun.ended_at,
+        SessionRun.created_at,
+        SessionTemplate.title.label("template_title"),
+    ).join(SessionTemplate, SessionRun.template_id == SessionTemplate.id).filter(*filters)
+    
+    cursor_params = {"template_id": template_id, "status": status_enum.value if status_enum else None}
+    # 기준 행도 소유한 세션으로 한정 - 다른 교사의 세션 id로 존재 여부를 알 수 없게
+    owned_anchor = SessionRun.template_id.in_(
+        select(SessionTemplate.id).where(SessionTemplate.teacher_id == current_teacher.id)
+    )
+    if cursor:
+        anchor_id = decode_cursor(cursor, **cursor_params)
+        query = query.filter(after_anchor(SessionRun.created_at, SessionRun.id, anchor_id, True, owned_anchor))
+    
+    query = query.order_by(SessionRun.created_at.desc(), SessionRun.id.desc())
+    if not cursor:
+        query = query.offset((page - 1) * size)
+    rows = query.limit(size + 1).all()
+    if cursor and not rows:
+        ensure_anchor_exists(db, SessionRun.id, anchor_id, owned_anchor)
+    
+    # 전체 개수 (캐시)
+    total = None
+    if include_total:
+        total = run_count_cache.get_or_count(
+            current_teacher.id,
+            template_id,
+            cursor_params["status"],
+            lambda: db.query(func.count(SessionRun.id)).join(
+                SessionTemplate, SessionRun.template_id == SessionTemplate.id
+            ).filter(*filters).scalar()
+        )
     
     # 응답 변환
-    run_responses = []
-    for run in runs:
-        run_responses.append(RunResponse(
-            id=run.id,
-            template_id=run.template_id,
-            name=run.name,
-            status=run.status.value,
-            started_at=run.started_at.isoformat() if run.started_at else None,
-            ended_at=run.ended_at.isoformat() if run.ended_at else None,
-            created_at=run.created_at.isoformat(),
-            template_title=run.template.title
-        ))
+    run_responses = [
+        RunResponse(
+            id=row.id,
+            template_id=row.template_id,
+            name=row.name,
+            status=row.status.value,
+            started_at=row.started_at.isoformat() if row.started_at else None,
+            ended_at=row.ended_at.isoformat() if row.ended_at else None,
+            created_at=row.created_at.isoformat(),
+            template_title=row.template_title
+        )
+        for row in rows[:size]
+    ]
     
     return RunListResponse(
         runs=run_responses,
         total=total,
-        page=page,
+        page=None if cursor else page,
         size=size,
-        has_next=total > page * size
+        has_next=len(rows) > size,
+        next_cursor=next_cursor_for(rows, size, **cursor_params)
     )
 
 
-@router.get("/{run_id}/statistics")
-def get_run_statistics(
-    run_id: int,
+def check_export_format(format: str) -> str:
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 내보내기 형식입니다: {format}")
+    return format
+
+
+def zip_download(content: bytes, filename: str) -> Response:
+    return Response(
+        content=content,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/export")
+def export_runs(
+    format: str = Query("parquet", description="parquet 또는 arrow (Arrow IPC)"),
+    run_ids: Optional[str] = Query(None, description="내보낼 세션 ID (쉼표로 구분), 생략 시 전체"),
     current_teacher: Teacher = Depends(get_current_teacher),
     db: Session = Depends(get_db)
 ):
-    """세션 통계 정보 조회"""
+    """교사의 세션 데이터를 분석용 컬럼형 파일(zip)로 내보내기"""
     
-    # 세션 소유권 확인
-    session_run = db.query(SessionRun).join(SessionTemplate).filter(
+    fmt = check_export_format(format)
+    selected = None
+    if run_ids:
+        try:
+            selected = [int(run_id) for run_id in run_ids.split(",") if run_id.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="세션 ID 형식이 올바르지 않습니다.")
+    
+    content = AnalyticsExportService(db).export_zip(current_teacher.id, selected, fmt)
+    return zip_download(content, f"runs_export_{fmt}.zip")
+
+
+def get_owned_run_status(db: Session, run_id: int, teacher: Teacher):
+    """소유한 세션의 (id, status) - 없거나 권한이 없으면 404"""
+    session_run = db.query(SessionRun.id, SessionRun.status).join(SessionTemplate).filter(
         SessionRun.id == run_id,
-        SessionTemplate.teacher_id == current_teacher.id
+        SessionTemplate.teacher_id == teacher.id
     ).first()
     
     if not session_run:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    return session_run
+
+
+@router.get("/{run_id}/statistics")
+def get_run_statistics(
+    run_id: int,
+    request: Request,
+    include: Optional[str] = Query(
+        None,
+        description="필요한 항목만 쉼표로 구분 (student_count, total_turns, student_turns, latest_activity), 생략 시 전체"
+    ),
+    current_teacher: Teacher = Depends(get_current_teacher),
+    db: Session = Depends(get_db)
+):
+    """세션 통계 정보 조회 (종료된 세션은 캐시된 응답)"""
     
-    # 참여 학생 수
-    student_count = db.query(Enrollment).filter(Enrollment.run_id == run_id).count()
-    
-    # 총 대화 턴 수 (학생 응답 기준)
-    total_turns = db.query(ActivityLog).filter(
-        ActivityLog.run_id == run_id,
-        ActivityLog.student_input.isnot(None),
-        ActivityLog.student_input != ''
-    ).count()
-    
-    # 학생별 턴 수
-    student_turns = db.query(
-        ActivityLog.student_name,
-        func.count(ActivityLog.id).label('turn_count')
-    ).filter(
-        ActivityLog.run_id == run_id,
-        ActivityLog.student_input.isnot(None),
-        ActivityLog.student_input != ''
-    ).group_by(ActivityLog.student_name).all()
-    
-    # 최신 활동 시간
-    latest_activity = db.query(ActivityLog.created_at).filter(
-        ActivityLog.run_id == run_id
-    ).order_by(ActivityLog.created_at.desc()).first()
+    try:
+        parts = parse_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 통계 항목입니다: {e}")
     
-    return {
-        "run_id": run_id,
-        "student_count": student_count,
-        "total_turns": total_turns,
-        "student_turns": [
-            {
-                "student_name": name,
-                "turn_count": count
-            } for name, count in student_turns
-        ],
-        "latest_activity": latest_activity[0].isoformat() if latest_activity else None
-    }
+    # 세션 소유권 확인
+    session_run = get_owned_run_status(db, run_id, current_teacher)
+    
+    # 요청한 항목을 한 번의 쿼리로 집계
+    def compute():
+        return RunStatisticsService(db).get_statistics(run_id, parts)
+    
+    if session_run.status == RunStatus.ENDED:
+        entry = ended_run_cache.get_or_compute((run_id, "statistics", tuple(sorted(parts))), compute)
+        return immutable_response(request, entry)
+    return compute()
 
 
 @router.get("/{run_id}/activity-logs")
 def get_run_activity_logs(
     run_id: int,
+    request: Request,
     student_name: Optional[str] = Query(None, description="특정 학생의 로그만 필터링"),
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=100),
     current_teacher: Teacher = Depends(get_current_teacher),
     db: Session = Depends(get_db)
 ):
-    """세션의 활동 로그 조회"""
+    """세션의 활동 로그 조회 (종료된 세션은 캐시된 응답)"""
     
     # 세션 소유권 확인
-    session_run = db.query(SessionRun).join(SessionTemplate).filter(
-        SessionRun.id == run_id,
-        SessionTemplate.teacher_id == current_teacher.id
-    ).first()
+    session_run = get_owned_run_status(db, run_id, current_teacher)
     
-    if not session_run:
-        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
-    
-    # 쿼리 구성
-    query = db.query(ActivityLog).filter(ActivityLog.run_id == run_id)
+    def compute():
+        # 쿼리 구성
+        query = db.query(ActivityLog).filter(ActivityLog.run_id == run_id)
+        
+        if student_name:
+            query = query.filter(ActivityLog.student_name == student_name)
+        
+        # 전체 개수
+        total = query.count()
+        
+        # 페이지네이션
+        offset = (page - 1) * size
+        logs = query.order_by(ActivityLog.created_at.desc()).offset(offset).limit(size).all()
+        
+        # 응답 변환
+        log_responses = []
+        for log in logs:
+            log_responses.append({
+                "id": log.id,
+                "student_name": log.student_name,
+                "activity_key": log.activity_key,
+                "turn_index": log.turn_index,
+                "student_input": log.student_input,
+                "ai_output": log.ai_output,
+                "third_eval_json": log.third_eval_json,
+                "created_at": log.created_at.isoformat()
+            })
+        
+        return {
+            "logs": log_responses,
+            "total": total,
+            "page": page,
+            "size": size,
+            "has_next": total > page * size
+        }
     
-    if student_name:
-        query = query.filter(ActivityLog.student_name == student_name)
+    if session_run.status == RunStatus.ENDED:
+        entry = ended_run_cache.get_or_compute((run_id, "activity-logs", student_name, page, size), compute)
+        return immutable_response(request, entry)
+    return compute()
+
+
+@router.get("/{run_id}/score-analytics")
+def get_run_score_analytics(
+    run_id: int,
+    request: Request,
+    trajectories: bool = Query(True, description="학생별 턴 단위 점수 추이 포함 여부"),
+    current_teacher: Teacher = Depends(get_current_teacher),
+    db: Session = Depends(get_db)
+):
+    """세션 평가 점수 분석 (학생별 추이, 반 백분위, 턴당 변화, 완료율, 정체 학생)"""
     
-    # 전체 개수
-    total = query.count()
+    session_run = get_owned_run_status(db, run_id, current_teacher)
+    def compute():
+        return score_analytics_cache.get(db, run_id, trajectories)
     
-    # 페이지네이션
-    offset = (page - 1) * size
-    logs = query.order_by(ActivityLog.created_at.desc()).offset(offset).limit(size).all()
+    if session_run.status == RunStatus.ENDED:
+        entry = ended_run_cache.get_or_compute((run_id, "score-analytics", trajectories), compute)
+        return immutable_response(request, entry)
+    return compute()
+
+
+@router.get("/{run_id}/score-analytics/below")
+def get_students_below(
+    run_id: int,
+    field: str = Query(..., description="overall_score 또는 차원 (depth, breadth, application, metacognition, engagement)"),
+    threshold: float = Query(..., ge=0, le=100, description="이 점수 미만"),
+    current_teacher: Teacher = Depends(get_current_teacher),
+    db: Session = Depends(get_db)
+):
+    """평가 점수가 기준 미만이었던 학생 목록"""
     
-    # 응답 변환
-    log_responses = []
-    for log in logs:
-        log_responses.append({
-            "id": log.id,
-            "student_name": log.student_name,
-            "activity_key": log.activity_key,
-            "turn_index": log.turn_index,
-            "student_input": log.student_input,
-            "ai_output": log.ai_output,
-            "third_eval_json": log.third_eval_json,
-            "created_at": log.created_at.isoformat()
-        })
+    if field not in SCORE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 점수 항목입니다: {field}")
+    get_owned_run_status(db, run_id, current_teacher)
     
     return {
-        "logs": log_responses,
-        "total": total,
-        "page": page,
-        "size": size,
-        "has_next": total > page * size
-    }
\ No newline at end of file
+        "run_id": run_id,
+        "field": field,
+        "threshold": threshold,
+        "students": students_below(db, run_id, field, threshold)
+    }
+
+
+@router.get("/{run_id}/export")
+def export_run(
+    run_id: int,
+    request: Request,
+    format: str = Query("parquet", description="parquet 또는 arrow (Arrow IPC)"),
+    current_teacher: Teacher = Depends(get_current_teacher),
+    db: Session = Depends(get_db)
+):
+    """세션 하나를 분석용 컬럼형 파일(zip)로 내보내기 (종료된 세션은 캐시된 응답)"""
+    
+    fmt = check_export_format(format)
+    session_run = get_owned_run_status(db, run_id, current_teacher)
+    headers = {"Content-Disposition": f'attachment; filename="run_{run_id}_{fmt}.zip"'}
+    def compute():
+        return AnalyticsExportService(db).export_zip(current_teacher.id, [run_id], fmt)
+    
+    if session_run.status == RunStatus.ENDED:
+        entry = ended_run_cache.get_or_compute((run_id, "export", fmt), compute, media_type="application/zip")
+        return immutable_response(request, entry, headers)
+    return zip_download(compute(), f"run_{run_id}_{fmt}.zip")
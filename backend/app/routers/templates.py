@@ -4,13 +4,21 @@ Templates API router
 import math
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from app.core.deps import get_db, get_current_teacher
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import column, func, or_, text
+from app.core.database import get_db, get_write_db
+from app.core.deps import get_current_teacher
+from app.core.pagination import after_anchor, decode_cursor, ensure_anchor_exists, next_cursor_for
 from app.core.validation import validate_settings_against_schema
 from app.models.teacher import Teacher
 from app.models.mode import Mode
-from app.models.session_template import SessionTemplate
+from app.models.session_template import (
+    SessionTemplate,
+    SQLITE_TRIGRAM_AVAILABLE,
+    TITLE_FTS_MIN_QUERY_LENGTH,
+    TITLE_FTS_TABLE,
+    fts_phrase,
+)
 from app.schemas.templates import (
     TemplateCreateRequest, 
     TemplateResponse, 
@@ -25,7 +33,7 @@ router = APIRouter()
 def create_template(
     template_data: TemplateCreateRequest,
     current_teacher: Teacher = Depends(get_current_teacher),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """
     Create a new template
@@ -40,7 +48,9 @@ def create_template(
     # Validate settings against mode schema
     is_valid, errors = validate_settings_against_schema(
         template_data.settings_json, 
-        mode.options_schema
+        mode.options_schema,
+        mode_id=mode.id,
+        mode_version=mode.version
     )
     
     if not is_valid:
@@ -67,6 +77,42 @@ def create_template(
     return template
 
 
+# 정렬 가능한 컬럼 (각각 (teacher_id, 컬럼, id) 인덱스가 있음)
+SORT_COLUMNS = {
+    "created_at": SessionTemplate.created_at,
+    "updated_at": SessionTemplate.updated_at,
+    "title": SessionTemplate.title,
+}
+
+
+def template_search_filter(db: Session, query: str):
+    """
+    제목 또는 모드 이름 검색 조건
+    
+    SQLite는 제목 trigram FTS5 인덱스, PostgreSQL은 pg_trgm 인덱스로 찾습니다.
+    모드는 몇 개뿐이므로 이름이 맞는 모드 id를 먼저 구합니다.
+    """
+    pattern = f"%{query}%"
+    mode_ids = [mode_id for (mode_id,) in db.query(Mode.id).filter(Mode.name.ilike(pattern))]
+    
+    use_fts = (
+        db.get_bind().dialect.name == "sqlite"
+        and SQLITE_TRIGRAM_AVAILABLE
+        and len(query) >= TITLE_FTS_MIN_QUERY_LENGTH
+    )
+    if use_fts:
+        matches = text(
+            f"SELECT rowid FROM {TITLE_FTS_TABLE} WHERE {TITLE_FTS_TABLE} MATCH :fts_query"
+        ).bindparams(fts_query=fts_phrase(query)).columns(column("rowid"))
+        title_filter = SessionTemplate.id.in_(matches)
+    else:
+        title_filter = SessionTemplate.title.ilike(pattern)
+    
+    if mode_ids:
+        return or_(title_filter, SessionTemplate.mode_id.in_(mode_ids))
+    return title_filter
+
+
 @router.get("/", response_model=TemplateListResponse)
 def get_templates(
     query: Optional[str] = Query(None, description="Search query for title or mode name"),
@@ -74,51 +120,63 @@ def get_templates(
     size: int = Query(20, ge=1, le=100, description="Page size"),
     sort: str = Query("created_at", description="Sort field: created_at, title, updated_at"),
     order: str = Query("desc", description="Sort order: asc, desc"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor (page is ignored)"),
     current_teacher: Teacher = Depends(get_current_teacher),
     db: Session = Depends(get_db)
 ):
     """
     Get templates for current teacher with search, pagination and sorting
+    
+    Page numbers are supported for the dashboard; pass ``cursor`` instead to
+    page with a keyset on (sort column, id), which skips the total count.
     """
-    # Base query - only teacher's templates
-    base_query = db.query(SessionTemplate).filter(
-        SessionTemplate.teacher_id == current_teacher.id
-    ).join(Mode)
+    if sort not in SORT_COLUMNS:
+        sort = "created_at"
+    descending = order.lower() != "asc"
+    sort_column = SORT_COLUMNS[sort]
+    query = query.strip() if query else None
     
-    # Apply search filter
+    filters = [SessionTemplate.teacher_id == current_teacher.id]
     if query:
-        search_filter = or_(
-            SessionTemplate.title.ilike(f"%{query}%"),
-            Mode.name.ilike(f"%{query}%")
-        )
-        base_query = base_query.filter(search_filter)
+        filters.append(template_search_filter(db, query))
     
-    # Apply sorting
-    sort_column = getattr(SessionTemplate, sort, SessionTemplate.created_at)
-    if order.lower() == "asc":
-        base_query = base_query.order_by(sort_column.asc())
-    else:
-        base_query = base_query.order_by(sort_column.desc())
+    base_query = db.query(SessionTemplate).options(
+        selectinload(SessionTemplate.mode)
+    ).filter(*filters)
     
-    # Get total count
-    total = base_query.count()
+    if cursor:
+        anchor_id = decode_cursor(cursor, sort=sort, order="desc" if descending else "asc", query=query)
+        base_query = base_query.filter(after_anchor(
+            sort_column, SessionTemplate.id, anchor_id, descending,
+            SessionTemplate.teacher_id == current_teacher.id
+        ))
     
-    # Apply pagination
-    offset = (page - 1) * size
-    templates = base_query.offset(offset).limit(size).all()
+    if descending:
+        base_query = base_query.order_by(sort_column.desc(), SessionTemplate.id.desc())
+    else:
+        base_query = base_query.order_by(sort_column.asc(), SessionTemplate.id.asc())
     
-    # Load mode relationships
-    for template in templates:
-        db.refresh(template, ["mode"])
+    if cursor:
+        total = None
+        templates = base_query.limit(size + 1).all()
+        if not templates:
+            ensure_anchor_exists(db, SessionTemplate.id, anchor_id, SessionTemplate.teacher_id == current_teacher.id)
+    else:
+        # 정렬/조인 없는 카운트 - (teacher_id, ...) 인덱스만 사용
+        total = db.query(func.count(SessionTemplate.id)).filter(*filters).scalar()
+        templates = base_query.offset((page - 1) * size).limit(size + 1).all()
     
-    total_pages = math.ceil(total / size)
+    next_cursor = next_cursor_for(
+        templates, size, sort=sort, order="desc" if descending else "asc", query=query
+    )
     
     return TemplateListResponse(
-        templates=templates,
+        templates=templates[:size],
         total=total,
-        page=page,
+        page=None if cursor else page,
         size=size,
-        total_pages=total_pages
+        total_pages=None if total is None else math.ceil(total / size),
+        next_cursor=next_cursor
     )
 
 
@@ -133,7 +191,9 @@ def get_template(
     
     Only allows access to teacher's own templates
     """
-    template = db.query(SessionTemplate).filter(
+    template = db.query(SessionTemplate).options(
+        selectinload(SessionTemplate.mode)
+    ).filter(
         SessionTemplate.id == template_id,
         SessionTemplate.teacher_id == current_teacher.id
     ).first()
@@ -141,9 +201,6 @@ def get_template(
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
     
-    # Load mode relationship
-    db.refresh(template, ["mode"])
-    
     return template
 
 
@@ -151,7 +208,7 @@ def get_template(
 def delete_template(
     template_id: int,
     current_teacher: Teacher = Depends(get_current_teacher),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """
     Delete a template by ID
@@ -44,10 +44,11 @@ class TemplateResponse(BaseModel):
 class TemplateListResponse(BaseModel):
     """Template list response schema"""
     templates: List[TemplateResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # 커서 페이지에서는 생략
+    page: Optional[int] = None
     size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class ValidationError(BaseModel):
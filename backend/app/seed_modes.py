@@ -5,7 +5,9 @@ Seed modes data for S2
 import asyncio
 from sqlalchemy.orm import Session
 from app.core.database import engine
+from app.core.validation import clear_validator_cache
 from app.models.mode import Mode
+from app.services.mode_catalogue_service import mode_catalogue
 
 
 def seed_modes():
@@ -94,6 +96,22 @@ def seed_modes():
                         "enumNames": ["📊 점수 보기 (실시간 진행률과 동기부여)", "🎯 점수 숨김 (순수한 탐구에 집중)"],
                         "default": "show",
                         "description": "학습 진행률을 표시할지 선택하세요"
+                    },
+                    "assessment_policy": {
+                        "type": "string",
+                        "title": "이해도 평가 주기",
+                        "enum": ["every_turn", "adaptive", "on_demand"],
+                        "enumNames": ["🔁 매 턴 평가", "⚖️ 적응형 (일정 간격 + 충분한 답변)", "✋ 요청할 때만"],
+                        "default": "adaptive",
+                        "description": "학생 답변을 얼마나 자주 5차원 평가할지 선택하세요"
+                    },
+                    "assessment_interval": {
+                        "type": "integer",
+                        "title": "평가 간격",
+                        "minimum": 1,
+                        "maximum": 10,
+                        "default": 3,
+                        "description": "적응형 평가에서 최소 몇 턴마다 평가할지 입력하세요 (1-10)"
                     }
                 },
                 "required": ["topic", "difficulty", "score_display"]
@@ -133,6 +151,10 @@ def seed_modes():
         
         session.commit()
         
+        # 같은 프로세스의 캐시 갱신 (실행 중인 서버는 MODES_CATALOGUE_TTL_SEC 안에 반영)
+        mode_catalogue.invalidate()
+        clear_validator_cache()
+        
         if created_count > 0 or updated_count > 0:
             print(f"\n🎉 결과: 생성 {created_count}개, 업데이트 {updated_count}개")
         else:
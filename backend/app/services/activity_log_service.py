@@ -0,0 +1,135 @@
+"""
+활동 로그 일괄 저장 서비스
+"""
+import io
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models.activity_log import ActivityLog
+
+# 일괄 저장 대상 컬럼 (id, created_at은 DB 기본값 사용)
+BULK_COLUMNS = ("run_id", "student_name", "activity_key", "turn_index",
+                "student_input", "ai_output", "third_eval_json")
+
+# 중복 판정 기준 - uq_activity_logs_run_student_activity_turn
+CONFLICT_COLUMNS = ("run_id", "student_name", "activity_key", "turn_index")
+
+# 이 건수 이상이면 PostgreSQL에서 COPY 사용
+# (일괄 저장 API 한 번의 최대 건수 settings.activity_log_batch_max보다 작아야 API에서 사용됨)
+COPY_THRESHOLD = 50
+
+# 여러 행 INSERT 한 문장당 최대 행 수 (SQLite 바인드 변수 상한 고려)
+INSERT_CHUNK_SIZE = 500
+
+
+def _csv_field(value: Any) -> str:
+    """COPY CSV 필드 - NULL은 따옴표 없는 빈 필드, 문자열은 항상 따옴표로 감쌈"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+def copy_csv_buffer(rows: List[Dict[str, Any]]) -> io.StringIO:
+    """
+    COPY ... FROM STDIN (FORMAT csv)에 보낼 BULK_COLUMNS 순서의 CSV
+
+    csv.QUOTE_NONNUMERIC은 None도 ""로 써서 NULL이 빈 문자열로 저장되므로 직접 씁니다.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        eval_json = row.get("third_eval_json")
+        buffer.write(",".join(_csv_field(value) for value in (
+            row["run_id"],
+            row["student_name"],
+            row["activity_key"],
+            row["turn_index"],
+            row.get("student_input"),
+            row.get("ai_output"),
+            json.dumps(eval_json, ensure_ascii=False) if eval_json is not None else None,
+        )) + "\n")
+    buffer.seek(0)
+    return buffer
+
+
+class ActivityLogService:
+    """활동 로그 저장 서비스"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def bulk_insert(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        활동 로그 여러 건 저장 (중복 턴은 건너뜀)
+
+        PostgreSQL에서 대량(COPY_THRESHOLD 이상)이면 COPY로 임시 테이블에 적재한 뒤
+        한 번에 옮기고, 그 외에는 여러 행 INSERT ... ON CONFLICT DO NOTHING을 사용합니다.
+        커밋은 호출자가 합니다.
+
+        Args:
+            rows: BULK_COLUMNS 키를 가진 딕셔너리 목록
+
+        Returns:
+            실제로 저장된 건수
+        """
+        if not rows:
+            return 0
+
+        if self.dialect == "postgresql" and len(rows) >= COPY_THRESHOLD:
+            return self._copy_insert(rows)
+
+        inserted = 0
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            inserted += self._multi_row_insert(rows[start:start + INSERT_CHUNK_SIZE])
+        return inserted
+
+    def _insert_statement(self):
+        if self.dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif self.dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise NotImplementedError(f"Bulk insert not supported for {self.dialect}")
+        return insert(ActivityLog)
+
+    def _multi_row_insert(self, rows: List[Dict[str, Any]]) -> int:
+        values = [{column: row.get(column) for column in BULK_COLUMNS} for row in rows]
+        statement = (
+            self._insert_statement()
+            .values(values)
+            .on_conflict_do_nothing(index_elements=list(CONFLICT_COLUMNS))
+        )
+        return self.db.execute(statement).rowcount
+
+    def _copy_insert(self, rows: List[Dict[str, Any]]) -> int:
+        """PostgreSQL COPY FROM STDIN 경로"""
+        buffer = copy_csv_buffer(rows)
+
+        columns = ", ".join(BULK_COLUMNS)
+        # ORM 세션과 같은 트랜잭션의 DBAPI 커넥션 사용
+        dbapi_connection = self.db.connection().connection.dbapi_connection
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS activity_logs_staging ("
+                "run_id integer, student_name varchar(20), activity_key varchar(100), "
+                "turn_index integer, student_input text, ai_output text, third_eval_json json"
+                ") ON COMMIT DELETE ROWS"
+            )
+            cursor.execute("TRUNCATE activity_logs_staging")
+            cursor.copy_expert(
+                f"COPY activity_logs_staging ({columns}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+            cursor.execute(
+                f"INSERT INTO activity_logs ({columns}) "
+                f"SELECT {columns} FROM activity_logs_staging "
+                "ON CONFLICT ON CONSTRAINT uq_activity_logs_run_student_activity_turn DO NOTHING"
+            )
+            return cursor.rowcount
@@ -0,0 +1,229 @@
+"""
+분석용 컬럼형(Parquet/Arrow) 내보내기
+
+연구용으로 교사의 세션 데이터를 세 개의 테이블로 내보냅니다.
+    runs.parquet                          세션/템플릿 메타데이터
+    enrollments/run_id=<id>/...           참여 학생 (PIN 해시 제외)
+    activity_logs/run_id=<id>/...         활동 로그 + third_eval_json 점수 열
+학생 이름과 활동 키는 사전(dictionary) 인코딩, 로그/참여 테이블은 run_id로
+파티션합니다 (hive 형식 - pyarrow.dataset, pandas, DuckDB에서 바로 읽힘).
+
+    import pyarrow.dataset as ds
+    logs = ds.dataset("export/activity_logs", format="parquet", partitioning="hive").to_table()
+"""
+import io
+import json
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.dataset as pds
+import pyarrow.parquet as pq
+from sqlalchemy import Text, cast
+from sqlalchemy.orm import Session
+
+from app.models import ActivityLog, Enrollment, SessionRun, SessionTemplate
+from app.services.assessment_scores import EVAL_DIMENSIONS, SCORE_FIELDS
+
+EXPORT_FORMATS = ("parquet", "arrow")
+BATCH_ROWS = 5000
+
+_dictionary_string = pa.dictionary(pa.int32(), pa.string())
+_timestamp = pa.timestamp("us", tz="UTC")  # SQLite는 UTC naive 값으로 저장
+
+RUN_SCHEMA = pa.schema([
+    ("run_id", pa.int64()),
+    ("template_id", pa.int64()),
+    ("template_title", pa.string()),
+    ("mode_id", _dictionary_string),
+    ("name", pa.string()),
+    ("status", _dictionary_string),
+    ("created_at", _timestamp),
+    ("started_at", _timestamp),
+    ("ended_at", _timestamp),
+    ("settings_snapshot_json", pa.string()),
+])
+
+ENROLLMENT_SCHEMA = pa.schema([
+    ("run_id", pa.int64()),
+    ("student_name", _dictionary_string),
+    ("joined_at", _timestamp),
+    ("last_seen_at", _timestamp),
+])
+
+ACTIVITY_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("run_id", pa.int64()),
+    ("student_name", _dictionary_string),
+    ("activity_key", _dictionary_string),
+    ("turn_index", pa.int32()),
+    ("created_at", _timestamp),
+    ("student_input", pa.string()),
+    ("ai_output", pa.string()),
+    ("overall_score", pa.float32()),
+    ("is_completed", pa.bool_()),
+    *[(dimension, pa.float32()) for dimension in EVAL_DIMENSIONS],
+    ("third_eval_json", pa.string()),  # 점수 외 필드(insights 등) 원문
+])
+
+
+def _json_text(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def _batch(schema: pa.Schema, rows: List[Dict[str, Any]]) -> pa.RecordBatch:
+    columns = {field.name: [row[field.name] for row in rows] for field in schema}
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+class AnalyticsExportService:
+    """교사 세션 데이터 컬럼형 내보내기"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def owned_run_ids(self, teacher_id: int, run_ids: Optional[Sequence[int]] = None) -> List[int]:
+        """교사가 소유한 세션 id (run_ids가 있으면 그중 소유한 것만)"""
+        query = self.db.query(SessionRun.id).join(SessionTemplate).filter(
+            SessionTemplate.teacher_id == teacher_id
+        )
+        if run_ids is not None:
+            query = query.filter(SessionRun.id.in_(list(run_ids)))
+        return [run_id for (run_id,) in query.order_by(SessionRun.id)]
+
+    def run_table(self, run_ids: Sequence[int]) -> pa.Table:
+        rows = self.db.query(SessionRun, SessionTemplate.title, SessionTemplate.mode_id).join(
+            SessionTemplate, SessionRun.template_id == SessionTemplate.id
+        ).filter(SessionRun.id.in_(list(run_ids))).order_by(SessionRun.id).all()
+        return pa.Table.from_batches([_batch(RUN_SCHEMA, [
+            {
+                "run_id": run.id,
+                "template_id": run.template_id,
+                "template_title": title,
+                "mode_id": mode_id,
+                "name": run.name,
+                "status": run.status.value,
+                "created_at": run.created_at,
+                "started_at": run.started_at,
+                "ended_at": run.ended_at,
+                "settings_snapshot_json": _json_text(run.settings_snapshot_json),
+            }
+            for run, title, mode_id in rows
+        ])], schema=RUN_SCHEMA)
+
+    def enrollment_batches(self, run_ids: Sequence[int]) -> Iterator[pa.RecordBatch]:
+        for run_id in run_ids:
+            rows = self.db.query(
+                Enrollment.normalized_student_name, Enrollment.joined_at, Enrollment.last_seen_at
+            ).filter(Enrollment.run_id == run_id).order_by(Enrollment.id).all()
+            if rows:
+                yield _batch(ENROLLMENT_SCHEMA, [
+                    {"run_id": run_id, "student_name": name, "joined_at": joined_at, "last_seen_at": last_seen_at}
+                    for name, joined_at, last_seen_at in rows
+                ])
+
+    def activity_batches(self, run_ids: Sequence[int]) -> Iterator[pa.RecordBatch]:
+        """세션별로 BATCH_ROWS씩 읽어 변환 (전체 로그를 메모리에 올리지 않음)"""
+        # 점수는 생성 열에서, 평가 원문은 파싱하지 않고 문자열 그대로
+        columns = (
+            ActivityLog.id, ActivityLog.run_id, ActivityLog.student_name, ActivityLog.activity_key,
+            ActivityLog.turn_index, ActivityLog.created_at, ActivityLog.student_input,
+            ActivityLog.ai_output, ActivityLog.is_completed,
+            *(getattr(ActivityLog, field) for field in SCORE_FIELDS),
+            cast(ActivityLog.third_eval_json, Text).label("third_eval_text"),
+        )
+        for run_id in run_ids:
+            query = self.db.query(*columns).filter(ActivityLog.run_id == run_id).order_by(ActivityLog.id)
+            rows: List[Dict[str, Any]] = []
+            for log in query.yield_per(BATCH_ROWS):
+                row = {
+                    "id": log.id,
+                    "run_id": log.run_id,
+                    "student_name": log.student_name,
+                    "activity_key": log.activity_key,
+                    "turn_index": log.turn_index,
+                    "created_at": log.created_at,
+                    "student_input": log.student_input,
+                    "ai_output": log.ai_output,
+                    "is_completed": log.is_completed,
+                    "third_eval_json": None if log.third_eval_text in (None, "null") else log.third_eval_text,
+                }
+                row.update({field: getattr(log, field) for field in SCORE_FIELDS})
+                rows.append(row)
+                if len(rows) >= BATCH_ROWS:
+                    yield _batch(ACTIVITY_SCHEMA, rows)
+                    rows = []
+            if rows:
+                yield _batch(ACTIVITY_SCHEMA, rows)
+
+    def write_dataset(self, teacher_id: int, out_dir: str, run_ids: Optional[Sequence[int]] = None,
+                      fmt: str = "parquet") -> Dict[str, Any]:
+        """
+        내보내기 파일 작성
+
+        Args:
+            teacher_id: 교사 ID (소유한 세션만 내보냄)
+            out_dir: 출력 폴더 (없으면 생성)
+            run_ids: 특정 세션만 (None이면 전체)
+            fmt: "parquet" (zstd 압축) 또는 "arrow" (Arrow IPC, 압축 없음 - 메모리 매핑용)
+
+        Returns:
+            세션/행 수와 작성한 파일 목록
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        out = Path(out_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        run_ids = self.owned_run_ids(teacher_id, run_ids)
+        suffix = "parquet" if fmt == "parquet" else "arrow"
+
+        runs = self.run_table(run_ids)
+        if fmt == "parquet":
+            pq.write_table(runs, out / f"runs.{suffix}", compression="zstd")
+        else:
+            with pa.ipc.new_file(out / f"runs.{suffix}", runs.schema) as writer:
+                writer.write_table(runs)
+
+        counts = {"runs": runs.num_rows}
+        for name, schema, batches in (
+            ("enrollments", ENROLLMENT_SCHEMA, self.enrollment_batches(run_ids)),
+            ("activity_logs", ACTIVITY_SCHEMA, self.activity_batches(run_ids)),
+        ):
+            counter = {"rows": 0}
+
+            def counted(batches=batches, counter=counter):
+                for batch in batches:
+                    counter["rows"] += batch.num_rows
+                    yield batch
+
+            file_format = pds.ParquetFileFormat() if fmt == "parquet" else pds.IpcFileFormat()
+            options = file_format.make_write_options(compression="zstd") if fmt == "parquet" else None
+            pds.write_dataset(
+                pa.RecordBatchReader.from_batches(schema, counted()),
+                out / name,
+                format=file_format,
+                file_options=options,
+                partitioning=pds.partitioning(pa.schema([("run_id", pa.int64())]), flavor="hive"),
+                basename_template=f"part-{{i}}.{suffix}",
+                existing_data_behavior="delete_matching",
+            )
+            counts[name] = counter["rows"]
+
+        files = sorted(str(path.relative_to(out)) for path in out.rglob(f"*.{suffix}"))
+        manifest = {"format": fmt, "run_ids": run_ids, "rows": counts, "files": files}
+        (out / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2))
+        return manifest
+
+    def export_zip(self, teacher_id: int, run_ids: Optional[Sequence[int]] = None, fmt: str = "parquet") -> bytes:
+        """내보내기 결과를 zip 하나로 (다운로드용)"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.write_dataset(teacher_id, tmp, run_ids, fmt)
+            buffer = io.BytesIO()
+            # Parquet은 이미 압축되어 있으므로 zip은 저장만
+            with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+                for path in sorted(Path(tmp).rglob("*")):
+                    if path.is_file():
+                        archive.write(path, path.relative_to(tmp).as_posix())
+            return buffer.getvalue()
@@ -0,0 +1,58 @@
+"""
+제3 AI 평가(third_eval_json) 점수 추출
+
+SocraticAssessmentService의 5차원 평가 결과는 다음 형태로 저장됩니다.
+    {"understanding_score": 72, "is_completed": false,
+     "dimensions": {"depth": 70, "breadth": 65, ...}, "insights": ...}
+이전 버전/다른 모드는 overall_score 키를 쓰거나 차원 점수를 최상위에 두기도 하므로
+모두 같은 열(overall_score, is_completed, 차원별 점수)로 맞춥니다.
+"""
+from typing import Any, Dict, Optional
+
+EVAL_DIMENSIONS = ("depth", "breadth", "application", "metacognition", "engagement")
+SCORE_FIELDS = ("overall_score",) + EVAL_DIMENSIONS
+
+# 열마다 찾아볼 경로 - 처음으로 숫자인 값을 사용 (ActivityLog 생성 열 EvalJsonField와 같은 순서)
+SCORE_PATHS = {
+    "overall_score": ("overall_score", "understanding_score"),
+    **{dimension: (f"dimensions.{dimension}", dimension) for dimension in EVAL_DIMENSIONS},
+}
+
+
+def as_score(value: Any) -> Optional[float]:
+    """JSON 숫자만 점수로 인정 (bool, 숫자 문자열 제외 - 생성 열 식과 같은 규칙)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _lookup(evaluation: Dict[str, Any], path: str) -> Any:
+    value: Any = evaluation
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def extract_scores(evaluation: Any) -> Dict[str, Any]:
+    """
+    평가 결과에서 점수 열 추출 (ActivityLog 생성 열과 같은 값)
+
+    Returns:
+        overall_score, is_completed, 차원별 점수 (숫자인 값이 없으면 None)
+    """
+    scores: Dict[str, Any] = {field: None for field in SCORE_FIELDS}
+    scores["is_completed"] = None
+    if not isinstance(evaluation, dict):
+        return scores
+
+    for field, paths in SCORE_PATHS.items():
+        scores[field] = next(
+            (score for score in (as_score(_lookup(evaluation, path)) for path in paths) if score is not None),
+            None
+        )
+
+    completed = evaluation.get("is_completed")
+    scores["is_completed"] = completed if isinstance(completed, bool) else None
+    return scores
@@ -0,0 +1,359 @@
+"""
+데이터베이스 온라인 백업 서비스
+
+sqlite3.Connection.backup을 pages/sleep으로 나눠 실행하므로 백업 중에도 쓰기 요청이
+길게 막히지 않습니다. 복사 중 다른 연결이 쓰면 SQLite가 처음부터 다시 복사하므로
+재시작이 max_restarts번을 넘거나 max_duration_sec이 지나면 한 번에 복사(pages=-1)로
+바꿔 끝냅니다 (WAL 모드에서는 읽기 트랜잭션이 쓰기를 막지 않음). 결과는 gzip으로 압축하고 SHA-256 체크섬 파일(.sha256,
+`sha256sum -c` 호환)을 함께 남깁니다.
+
+    전체 백업   app_backup_YYYYMMDD_HHMMSS.db.gz   (보관 기간 지나면 삭제)
+    증분 백업   runs/run_<id>.json.gz              (종료된 세션당 한 번, 이후 변경 없음)
+
+종료된 세션(ENDED)은 더 이상 로그가 추가되지 않으므로 증분 백업은 새로 종료된
+세션만 파일로 보관합니다.
+"""
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime, date
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import ActivityLog, Enrollment, RunStatus, SessionRun, SessionTemplate
+
+logger = logging.getLogger(__name__)
+
+FULL_BACKUP_PREFIX = "app_backup_"
+FULL_BACKUP_SUFFIX = ".db.gz"
+RUN_ARCHIVE_DIR = "runs"
+CHUNK_SIZE = 1024 * 1024
+
+
+class _BackupBudgetExceeded(Exception):
+    """단계별 복사의 재시작 횟수/시간 한도 초과 (진행 콜백에서 발생시켜 복사 중단)"""
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_checksum(path: Path) -> str:
+    """체크섬 파일 작성 (`sha256sum -c` 형식)"""
+    checksum = sha256_file(path)
+    Path(f"{path}.sha256").write_text(f"{checksum}  {path.name}\n")
+    return checksum
+
+
+def verify_checksum(path: Path) -> bool:
+    checksum_path = Path(f"{path}.sha256")
+    if not checksum_path.exists():
+        return False
+    expected = checksum_path.read_text().split()[0]
+    return sha256_file(path) == expected
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    result = {}
+    for column in row.__table__.columns:
+        if column.computed is not None:
+            continue  # 생성 열은 원본 열에서 다시 계산되므로 보관하지 않음
+        value = getattr(row, column.key)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        elif isinstance(value, Enum):
+            value = value.value
+        result[column.key] = value
+    return result
+
+
+class BackupService:
+    """SQLite 파일 DB 백업"""
+
+    def __init__(
+        self,
+        db_path: str,
+        backup_dir: str,
+        pages_per_step: int = 256,
+        step_sleep: float = 0.02,
+        retention_days: int = 180,
+        keep_min: int = 7,
+        compress_level: int = 6,
+        max_restarts: int = 3,
+        max_duration_sec: float = 600,
+    ):
+        self.db_path = db_path
+        self.backup_dir = Path(backup_dir)
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.retention_days = retention_days
+        self.keep_min = keep_min
+        self.compress_level = compress_level
+        self.max_restarts = max_restarts
+        self.max_duration_sec = max_duration_sec
+
+    @property
+    def run_archive_dir(self) -> Path:
+        return self.backup_dir / RUN_ARCHIVE_DIR
+
+    def full_backup(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        전체 백업 (스로틀링된 페이지 복사 → 무결성 검사 → 압축 → 체크섬)
+
+        Returns:
+            백업 파일 경로, 크기, 체크섬, 소요 시간 등
+        """
+        now = now or datetime.now()
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{FULL_BACKUP_PREFIX}{now.strftime('%Y%m%d_%H%M%S')}"
+        snapshot_path = self.backup_dir / f".{name}.db.tmp"
+        archive_path = self.backup_dir / f"{name}{FULL_BACKUP_SUFFIX}"
+        started = time.perf_counter()
+        progress = {"steps": 0, "restarts": 0, "remaining": None, "pages": 0, "single_pass": False}
+
+        def on_progress(status, remaining, total):
+            # 복사 중 원본이 다른 연결에서 변경되면 SQLite가 처음부터 다시 복사함
+            # (남은 페이지가 줄지 않았으면 이번 단계는 재시작된 것)
+            if progress["remaining"] is not None and remaining >= progress["remaining"]:
+                progress["restarts"] += 1
+            progress["steps"] += 1
+            progress["remaining"] = remaining
+            progress["pages"] = total
+            if progress["restarts"] > self.max_restarts or time.perf_counter() - started > self.max_duration_sec:
+                raise _BackupBudgetExceeded()
+            if remaining > 0 and self.step_sleep > 0:
+                # backup()의 sleep 인자는 BUSY/LOCKED 재시도 때만 쓰이므로 단계 사이 대기는 여기서
+                time.sleep(self.step_sleep)
+
+        try:
+            source = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            target = sqlite3.connect(snapshot_path)
+            try:
+                try:
+                    # 단계 사이에는 락을 놓으므로 쓰기 요청이 끼어들 수 있음
+                    source.backup(target, pages=self.pages_per_step, progress=on_progress, sleep=self.step_sleep)
+                except _BackupBudgetExceeded:
+                    # 쓰기가 계속되어 끝나지 않으면 한 번에 복사 (복사하는 동안만 읽기 스냅샷 유지)
+                    logger.warning(
+                        f"Throttled backup restarted {progress['restarts']} times, copying in a single pass"
+                    )
+                    progress["single_pass"] = True
+                    source.backup(target)
+                result = target.execute("PRAGMA quick_check").fetchone()[0]
+                if result != "ok":
+                    raise RuntimeError(f"Backup snapshot failed integrity check: {result}")
+            finally:
+                target.close()
+                source.close()
+
+            tmp_archive = self.backup_dir / f".{name}{FULL_BACKUP_SUFFIX}.tmp"
+            with open(snapshot_path, "rb") as src, gzip.open(tmp_archive, "wb", compresslevel=self.compress_level) as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(tmp_archive, archive_path)
+        finally:
+            snapshot_path.unlink(missing_ok=True)
+
+        checksum = write_checksum(archive_path)
+        result = {
+            "path": str(archive_path),
+            "size_bytes": archive_path.stat().st_size,
+            "sha256": checksum,
+            "pages": progress["pages"],
+            "steps": progress["steps"],
+            "restarts": progress["restarts"],
+            "single_pass": progress["single_pass"],
+            "duration_sec": round(time.perf_counter() - started, 2),
+        }
+        logger.info(f"Full backup completed: {result}")
+        return result
+
+    def incremental_backup(self, db: Session) -> List[Dict[str, Any]]:
+        """
+        증분 백업 - 아직 보관되지 않은 종료 세션을 세션별 파일로 저장
+
+        Returns:
+            새로 보관한 세션 목록
+        """
+        self.run_archive_dir.mkdir(parents=True, exist_ok=True)
+        archived_ids = {
+            int(path.name[len("run_"):-len(".json.gz")])
+            for path in self.run_archive_dir.glob("run_*.json.gz")
+        }
+
+        ended_runs = db.query(SessionRun).filter(
+            SessionRun.status == RunStatus.ENDED
+        ).order_by(SessionRun.id).all()
+
+        results = []
+        for run in ended_runs:
+            if run.id in archived_ids:
+                continue
+            results.append(self._archive_run(db, run))
+
+        if results:
+            logger.info(f"Incremental backup archived {len(results)} ended runs")
+        return results
+
+    def _archive_run(self, db: Session, run: SessionRun) -> Dict[str, Any]:
+        template = db.query(SessionTemplate).filter(SessionTemplate.id == run.template_id).first()
+        enrollments = db.query(Enrollment).filter(Enrollment.run_id == run.id).order_by(Enrollment.id).all()
+        logs = db.query(ActivityLog).filter(ActivityLog.run_id == run.id).order_by(ActivityLog.id).all()
+
+        payload = {
+            "format": 1,
+            "archived_at": datetime.now().isoformat(),
+            "run": _row_to_dict(run),
+            "template": _row_to_dict(template) if template else None,
+            "enrollments": [_row_to_dict(e) for e in enrollments],
+            "activity_logs": [_row_to_dict(log) for log in logs],
+        }
+
+        path = self.run_archive_dir / f"run_{run.id}.json.gz"
+        tmp_path = self.run_archive_dir / f".run_{run.id}.json.gz.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=self.compress_level) as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        return {
+            "run_id": run.id,
+            "path": str(path),
+            "activity_logs": len(logs),
+            "sha256": write_checksum(path),
+        }
+
+    def full_backups(self) -> List[Path]:
+        """전체 백업 파일 목록 (오래된 순)"""
+        return sorted(self.backup_dir.glob(f"{FULL_BACKUP_PREFIX}*{FULL_BACKUP_SUFFIX}"))
+
+    def has_full_backup_on(self, day: date) -> bool:
+        """해당 날짜의 전체 백업 파일이 있는지"""
+        pattern = f"{FULL_BACKUP_PREFIX}{day.strftime('%Y%m%d')}_*{FULL_BACKUP_SUFFIX}"
+        return any(self.backup_dir.glob(pattern))
+
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        """보관 기간이 지난 전체 백업 삭제 (최근 keep_min개는 항상 유지)"""
+        now = now if now is not None else time.time()
+        cutoff = now - self.retention_days * 86400
+        candidates = self.full_backups()[:-self.keep_min] if self.keep_min else self.full_backups()
+
+        deleted = 0
+        for path in candidates:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                Path(f"{path}.sha256").unlink(missing_ok=True)
+                deleted += 1
+
+        if deleted:
+            logger.info(f"Backup retention removed {deleted} files")
+        return deleted
+
+
+class BackupScheduler:
+    """
+    앱 내부 백업 스케줄러
+
+    매일 full_hour 시에 전체 백업, incremental_interval 마다 증분 백업을 실행합니다.
+    여러 워커가 있어도 백업 폴더의 파일 락을 잡은 워커 하나만 실행하고,
+    오늘 전체 백업을 했는지는 락을 잡은 상태에서 백업 폴더의 파일로 판단합니다
+    (다른 워커가 먼저 끝낸 백업을 다시 하지 않도록).
+    """
+
+    def __init__(
+        self,
+        service: BackupService,
+        session_factory: Callable[[], Session],
+        full_hour: int = 3,
+        incremental_interval: float = 3600,
+        poll_interval: float = 60,
+    ):
+        self.service = service
+        self.session_factory = session_factory
+        self.full_hour = full_hour
+        self.incremental_interval = incremental_interval
+        self.poll_interval = poll_interval
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_full_date: Optional[date] = None
+        self.last_incremental_at: float = 0.0
+        self.last_full_result: Optional[Dict[str, Any]] = None
+        self.errors_total = 0
+
+    def _try_lock(self):
+        self.service.backup_dir.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.service.backup_dir / ".backup.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def run_due(self, now: Optional[datetime] = None):
+        """실행할 시점이 된 백업 실행"""
+        now = now or datetime.now()
+        full_due = now.hour == self.full_hour and self.last_full_date != now.date()
+        incremental_due = time.time() - self.last_incremental_at >= self.incremental_interval
+        if not (full_due or incremental_due):
+            return
+
+        lock_file = self._try_lock()
+        if lock_file is None:
+            return  # 다른 워커가 백업 중
+        try:
+            if full_due and self.service.has_full_backup_on(now.date()):
+                full_due = False  # 다른 워커가 이미 백업함
+                self.last_full_date = now.date()
+            if full_due:
+                self.last_full_date = now.date()
+                self.last_full_result = self.service.full_backup(now)
+                self.service.apply_retention()
+            if incremental_due:
+                self.last_incremental_at = time.time()
+                db = self.session_factory()
+                try:
+                    self.service.incremental_backup(db)
+                finally:
+                    db.close()
+        except Exception as e:
+            self.errors_total += 1
+            logger.error(f"Scheduled backup failed: {e}", exc_info=True)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _loop(self):
+        while not self._stop.wait(self.poll_interval):
+            self.run_due()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="backup-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Backup scheduler started: dir={self.service.backup_dir}, full_hour={self.full_hour}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def after_fork(self):
+        self._thread = None
+        self._stop = threading.Event()
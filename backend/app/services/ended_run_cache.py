@@ -0,0 +1,146 @@
+"""
+종료된 세션 응답 캐시
+
+ENDED 세션은 로그 저장이 막혀 있어(guards) 통계, 활동 로그 등 조회 결과가 다시
+바뀌지 않습니다. 채점 기간에 같은 세션을 반복해서 열어도 집계를 다시 하지 않도록
+응답을 한 번만 계산해 직렬화/압축된 상태로 보관합니다.
+    - 워커별 메모리 LRU (전체 크기 상한 max_bytes)
+    - 본문 SHA-256 기반 강한 ETag, 일치하면 304
+    - Cache-Control: private, immutable (교사 본인만 조회하는 데이터)
+소유권 확인은 캐시와 관계없이 매 요청마다 라우터에서 합니다.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.services.mode_catalogue_service import etag_matches
+
+MIN_COMPRESS_BYTES = 1024  # 이보다 작은 응답은 압축 이득이 없음
+COMPRESSIBLE_TYPES = ("application/json", "text/")  # zip/Parquet 등은 이미 압축되어 있음
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """직렬화된 응답 (compressed가 있으면 gzip 본문도 함께 보관)"""
+    body: Optional[bytes]
+    compressed: Optional[bytes]
+    etag: str
+    media_type: str = "application/json"
+
+    @property
+    def size(self) -> int:
+        return len(self.body or b"") + len(self.compressed or b"")
+
+    def raw_body(self) -> bytes:
+        return self.body if self.body is not None else gzip.decompress(self.compressed)
+
+
+def serialize(payload: Any, media_type: str = "application/json", compress_level: int = 6) -> CachedResponse:
+    """응답 데이터를 JSON으로 직렬화하고 크면 gzip만 보관 (이미 압축된 형식은 그대로)"""
+    if isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    if len(body) >= MIN_COMPRESS_BYTES and media_type.startswith(COMPRESSIBLE_TYPES):
+        return CachedResponse(body=None, compressed=gzip.compress(body, compress_level), etag=etag, media_type=media_type)
+    return CachedResponse(body=body, compressed=None, etag=etag, media_type=media_type)
+
+
+class EndedRunCache:
+    """종료된 세션 응답 LRU 캐시"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], media_type: str = "application/json") -> CachedResponse:
+        """
+        캐시된 응답 반환, 없으면 compute()로 만들어 저장
+
+        Args:
+            key: (run_id, 엔드포인트, 파라미터...) 형태의 키 - 첫 요소는 run_id
+            compute: 응답 데이터(직렬화 전 값 또는 bytes)를 반환하는 함수
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        # 계산은 락 밖에서 (같은 키를 동시에 계산해도 결과가 같으므로 무해)
+        self.misses += 1
+        entry = serialize(compute(), media_type)
+        if entry.size > self.max_bytes:
+            return entry
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+        return entry
+
+    def invalidate_run(self, run_id: int):
+        """세션 데이터가 예외적으로 바뀐 경우 (삭제, 복구 등)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == run_id]:
+                self._size -= self._entries.pop(key).size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def metrics(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def immutable_response(request: Request, entry: CachedResponse, headers: Optional[dict] = None) -> Response:
+    """캐시된 응답을 ETag/304, gzip 협상과 함께 반환"""
+    gzipped = entry.compressed is not None and "gzip" in request.headers.get("accept-encoding", "")
+    # 강한 ETag는 바이트 단위 표현마다 달라야 하므로 gzip 본문에는 인코딩을 붙임
+    etag = f'{entry.etag[:-1]}-gzip"' if gzipped else entry.etag
+    headers = {
+        **(headers or {}),
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.ended_run_cache_max_age_sec}, immutable",
+        "Vary": "Accept-Encoding, Cookie",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry.compressed, media_type=entry.media_type, headers=headers)
+    return Response(content=entry.raw_body(), media_type=entry.media_type, headers=headers)
+
+
+ended_run_cache = EndedRunCache(max_bytes=settings.ended_run_cache_max_mb * 1024 * 1024)
@@ -9,7 +9,7 @@ from sqlalchemy import and_, func, desc
 
 from app.models.session_run import SessionRun
 from app.models.enrollment import Enrollment
-from app.models.activity_log import ActivityLog
+from app.models.activity_log import ActivityLog, HAS_OVERALL_SCORE
 
 
 class LiveSnapshotService:
@@ -112,6 +112,25 @@ class LiveSnapshotService:
             .all()
         )
         
+        # 학생별 마지막 평가 점수 (평가가 있는 턴만 담은 부분 인덱스에서 학생별 MAX(id))
+        latest_scored_subq = (
+            self.db.query(
+                ActivityLog.student_name,
+                func.max(ActivityLog.id).label('log_id')
+            )
+            .filter(ActivityLog.run_id == run_id, HAS_OVERALL_SCORE)
+            .group_by(ActivityLog.student_name)
+            .subquery()
+        )
+        latest_scores = {
+            row.student_name: row
+            for row in self.db.query(
+                latest_scored_subq.c.student_name,
+                ActivityLog.overall_score,
+                ActivityLog.is_completed
+            ).join(ActivityLog, ActivityLog.id == latest_scored_subq.c.log_id)
+        }
+        
         students = []
         for result in results:
             # 각 학생의 최신 활동 정보를 별도로 조회 (더 정확한 방법)
@@ -127,6 +146,8 @@ class LiveSnapshotService:
                 .first()
             )
             
+            score = latest_scores.get(result.student_name)
+            
             # 시간이 있을 경우 한국 시간대로 변환하여 반환
             last_seen_formatted = None
             if result.last_seen_at:
@@ -146,7 +167,9 @@ class LiveSnapshotService:
                 "last_seen_at": last_seen_formatted,
                 "turns_total": result.turns_total,
                 "last_activity_key": latest_activity.activity_key if latest_activity else None,
-                "last_turn_index": latest_activity.turn_index if latest_activity else None
+                "last_turn_index": latest_activity.turn_index if latest_activity else None,
+                "latest_overall_score": score.overall_score if score else None,
+                "is_completed": score.is_completed if score else None
             })
         
         return students
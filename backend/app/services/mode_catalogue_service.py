@@ -0,0 +1,83 @@
+"""
+모드 카탈로그 캐시
+
+모드는 seed_modes.py를 실행할 때만 바뀌므로 목록 응답을 한 번 직렬화해 두고
+내용 해시를 ETag(카탈로그 버전)로 사용합니다.
+    - 같은 프로세스에서 다시 시드하면 invalidate()로 즉시 갱신
+    - 별도 프로세스에서 시드한 경우 ttl_sec마다 다시 읽어 해시 비교
+내용이 같으면 다시 읽어도 ETag가 바뀌지 않으므로 클라이언트 캐시는 그대로 유효합니다.
+"""
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.mode import Mode
+from app.schemas.templates import ModeSchema
+
+
+@dataclass(frozen=True)
+class CatalogueSnapshot:
+    """직렬화된 모드 목록과 버전"""
+    body: bytes
+    etag: str
+    loaded_at: float
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+class ModeCatalogue:
+    """프로세스 내 모드 목록 캐시"""
+
+    def __init__(self, ttl_sec: float = 60):
+        self.ttl_sec = ttl_sec
+        self._snapshot: Optional[CatalogueSnapshot] = None
+        self._lock = threading.Lock()
+        self.loads_total = 0
+
+    def get(self, db: Session, now: Optional[float] = None) -> CatalogueSnapshot:
+        """캐시된 목록 반환, 없거나 ttl이 지났으면 DB에서 다시 읽음"""
+        now = now if now is not None else time.time()
+        snapshot = self._snapshot
+        if snapshot is not None and now - snapshot.loaded_at < self.ttl_sec:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or now - snapshot.loaded_at >= self.ttl_sec:
+                snapshot = self._load(db, now)
+                self._snapshot = snapshot
+        return snapshot
+
+    def _load(self, db: Session, now: float) -> CatalogueSnapshot:
+        modes = db.query(Mode).order_by(Mode.created_at.asc(), Mode.id.asc()).all()
+        payload = [ModeSchema.model_validate(mode).model_dump(mode="json") for mode in modes]
+        # FastAPI JSONResponse와 같은 형식
+        body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+        self.loads_total += 1
+        return CatalogueSnapshot(
+            body=body,
+            etag=f'"modes-{hashlib.sha256(body).hexdigest()[:16]}"',
+            loaded_at=now,
+        )
+
+    def invalidate(self):
+        """모드 변경 후 호출 - 다음 요청에서 다시 읽음"""
+        with self._lock:
+            self._snapshot = None
+
+
+mode_catalogue = ModeCatalogue(ttl_sec=settings.modes_catalogue_ttl_sec)
@@ -0,0 +1,63 @@
+"""
+교사별 세션 실행 개수 캐시
+
+세션 목록의 전체 개수는 세션 생성/시작/종료 때만 바뀌므로 (교사, 템플릿, 상태)
+조건별로 저장해 두고 해당 교사의 세션이 바뀌면 무효화합니다.
+워커마다 따로 보관하므로 다른 워커에서 생긴 변경은 ttl_sec 안에 반영됩니다.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+CountKey = Tuple[int, Optional[int], Optional[str]]
+
+
+class RunCountCache:
+    """(teacher_id, template_id, status) -> 세션 수"""
+
+    def __init__(self, ttl_sec: float = 30, max_keys: int = 10000):
+        self.ttl_sec = ttl_sec
+        self.max_keys = max_keys
+        self._counts: Dict[CountKey, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_count(
+        self,
+        teacher_id: int,
+        template_id: Optional[int],
+        status: Optional[str],
+        count: Callable[[], int],
+        now: Optional[float] = None,
+    ) -> int:
+        """캐시된 개수 반환, 없거나 만료되었으면 count()로 계산해 저장"""
+        now = now if now is not None else time.time()
+        key = (teacher_id, template_id, status)
+        cached = self._counts.get(key)
+        if cached is not None and now - cached[1] < self.ttl_sec:
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        total = count()
+        with self._lock:
+            if len(self._counts) >= self.max_keys:
+                self._counts.clear()
+            self._counts[key] = (total, now)
+        return total
+
+    def invalidate_teacher(self, teacher_id: int):
+        """교사의 세션이 생성/시작/종료되면 호출"""
+        with self._lock:
+            for key in [key for key in self._counts if key[0] == teacher_id]:
+                del self._counts[key]
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+run_count_cache = RunCountCache(ttl_sec=settings.run_count_cache_ttl_sec)
@@ -0,0 +1,110 @@
+"""
+세션 통계 집계 서비스
+
+요청한 항목만 한 번의 쿼리로 집계합니다. 활동 로그 집계는 인덱스 하나씩을 타는 두 개의
+학생별 부분 집계를 학생 이름으로 이어 붙입니다.
+총 턴 수와 세션 전체 최신 활동 시간은 학생별 결과에서 계산합니다.
+    참여 학생 수    enrollments.run_id (커버링) - 한 행짜리 집계에 활동 로그 집계를 LEFT JOIN
+    최신 활동 시간  idx_activity_logs_run_student_created (run_id, student_name, created_at)
+                   에서 학생별 MAX(created_at)
+    턴 수          idx_activity_logs_run_student_input_turns - 학생 입력이 있는 턴만 담은
+                   (run_id, student_name) 부분 인덱스라 입력 없는 턴은 읽지 않음 (PostgreSQL은
+                   index-only scan). WHERE 조건이 인덱스 조건과 글자 그대로 같아야 SQLite가
+                   부분 인덱스를 사용함
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Integer, func, null, select, true
+from sqlalchemy.orm import Session
+
+from app.models.activity_log import ActivityLog, HAS_STUDENT_INPUT
+from app.models.enrollment import Enrollment
+
+STATISTICS_PARTS = ("student_count", "total_turns", "student_turns", "latest_activity")
+
+
+def parse_include(include: Optional[str]) -> Set[str]:
+    """
+    include 파라미터 해석 ("student_count,total_turns" 형식, 비어 있으면 전체)
+
+    Raises:
+        ValueError: 알 수 없는 항목이 있는 경우
+    """
+    if not include:
+        return set(STATISTICS_PARTS)
+    parts = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = parts - set(STATISTICS_PARTS)
+    if unknown:
+        raise ValueError(", ".join(sorted(unknown)))
+    return parts
+
+
+class RunStatisticsService:
+    """세션 통계 집계"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_statistics(self, run_id: int, parts: Iterable[str] = STATISTICS_PARTS) -> Dict[str, Any]:
+        """
+        세션 통계 (요청한 항목만)
+
+        Args:
+            run_id: 세션 ID
+            parts: STATISTICS_PARTS 중 필요한 항목
+
+        Returns:
+            run_id와 요청한 항목
+        """
+        parts = set(parts)
+        per_student = "student_turns" in parts
+
+        if "student_count" in parts:
+            base = select(func.count().label("student_count")).select_from(Enrollment).where(
+                Enrollment.run_id == run_id
+            ).subquery()
+        else:
+            base = select(null().cast(Integer).label("student_count")).subquery()
+
+        statement = select(base.c.student_count)
+        if parts & {"total_turns", "student_turns", "latest_activity"}:
+            latest = select(
+                ActivityLog.student_name,
+                func.max(ActivityLog.created_at).label("latest_activity"),
+            ).where(ActivityLog.run_id == run_id).group_by(ActivityLog.run_id, ActivityLog.student_name).subquery()
+            turns = select(
+                ActivityLog.student_name,
+                func.count().label("turns"),
+            ).where(ActivityLog.run_id == run_id, HAS_STUDENT_INPUT).group_by(
+                ActivityLog.run_id, ActivityLog.student_name
+            ).subquery()
+            # 입력이 있는 턴의 학생은 항상 최신 활동 쪽에도 있으므로 최신 활동 기준으로 LEFT JOIN
+            activity = select(latest.c.student_name, turns.c.turns, latest.c.latest_activity).select_from(
+                latest.outerjoin(turns, turns.c.student_name == latest.c.student_name)
+            ).subquery()
+            # 활동이 없는 세션도 참여 학생 수 한 행은 반환되도록 LEFT JOIN
+            statement = select(
+                base.c.student_count, activity.c.student_name, activity.c.turns, activity.c.latest_activity
+            ).select_from(base.outerjoin(activity, true()))
+
+        rows = self.db.execute(statement).all()
+        activity_rows = [row for row in rows if getattr(row, "student_name", None) is not None]
+        student_turns: List[Dict[str, Any]] = sorted(
+            (
+                {"student_name": row.student_name, "turn_count": row.turns}
+                for row in activity_rows if row.turns
+            ),
+            key=lambda item: item["student_name"],
+        )
+
+        result: Dict[str, Any] = {"run_id": run_id}
+        if "student_count" in parts:
+            result["student_count"] = rows[0].student_count
+        if "total_turns" in parts:
+            result["total_turns"] = sum(item["turn_count"] for item in student_turns)
+        if per_student:
+            result["student_turns"] = student_turns
+        if "latest_activity" in parts:
+            latest = max((row.latest_activity for row in activity_rows if row.latest_activity), default=None)
+            result["latest_activity"] = latest.isoformat() if latest else None
+        return result
@@ -0,0 +1,262 @@
+"""
+세션 평가 점수 분석 (5차원 점수 벡터 연산)
+
+세션의 모든 평가 점수(third_eval_json 생성 열)를 한 번의 쿼리로 읽어 NumPy 배열로 만든 뒤 학생별 추이,
+반 백분위, 턴당 점수 변화, 완료율을 배열 연산으로 계산합니다.
+    행 순서   (학생, 로그 id) - 학생별 구간이 연속이라 reduceat/bincount로 집계
+    결측값    점수가 없는 턴은 NaN (평가가 없거나 일부 차원만 있는 경우)
+활동 로그는 추가만 되므로 (로그 수, 마지막 로그 id)를 세션 버전으로 보고
+버전이 같으면 캐시된 결과를 반환합니다.
+"""
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.activity_log import ActivityLog
+from app.services.assessment_scores import SCORE_FIELDS
+
+PERCENTILES = (10, 25, 50, 75, 90)
+STUCK_WINDOW = 3  # 최근 평가 몇 번 동안 점수가 오르지 않으면 정체로 보는지
+
+RunVersion = Tuple[int, Optional[int]]
+
+
+def _float_or_none(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def _group_last(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """학생별 마지막 유효값 (없으면 NaN) - values는 (행, 열) 배열"""
+    valid = ~np.isnan(values)
+    rows = np.arange(len(values))[:, None]
+    last = np.maximum.reduceat(np.where(valid, rows, -1), starts, axis=0)
+    picked = np.take_along_axis(values, np.maximum(last, 0), axis=0)
+    return np.where(last >= 0, picked, np.nan)
+
+
+def _group_first(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """학생별 첫 유효값 (없으면 NaN)"""
+    valid = ~np.isnan(values)
+    n = len(values)
+    rows = np.arange(n)[:, None]
+    first = np.minimum.reduceat(np.where(valid, rows, n), starts, axis=0)
+    picked = np.take_along_axis(values, np.minimum(first, n - 1), axis=0)
+    return np.where(first < n, picked, np.nan)
+
+
+class ScoreAnalyticsService:
+    """세션 평가 점수 분석"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def run_version(self, run_id: int) -> RunVersion:
+        """(로그 수, 마지막 로그 id) - run_id 인덱스만 읽음"""
+        count, last_id = self.db.query(func.count(ActivityLog.id), func.max(ActivityLog.id)).filter(
+            ActivityLog.run_id == run_id
+        ).one()
+        return count, last_id
+
+    def load_scores(self, run_id: int) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        평가가 있는 턴의 점수 배열
+
+        Returns:
+            (학생 이름 목록, 학생 코드, turn_index, 점수 (행, overall + 5차원), 완료 여부)
+        """
+        # 점수는 third_eval_json 생성 열에서 읽음 (평가 원문을 파싱하지 않음)
+        rows = self.db.query(
+            ActivityLog.student_name,
+            ActivityLog.turn_index,
+            ActivityLog.is_completed,
+            *(getattr(ActivityLog, field) for field in SCORE_FIELDS),
+        ).filter(
+            ActivityLog.run_id == run_id, ActivityLog.third_eval_json.isnot(None)
+        ).order_by(ActivityLog.student_name, ActivityLog.id).all()
+
+        n = len(rows)
+        names = np.array([row[0] for row in rows], dtype=object)
+        turns = np.fromiter((row[1] for row in rows), dtype=np.int32, count=n)
+        completed = np.fromiter((bool(row[2]) for row in rows), dtype=bool, count=n)
+        scores = np.array([row[3:] for row in rows], dtype=float).reshape(n, len(SCORE_FIELDS))
+
+        # JSON 열은 None을 'null'로 저장하므로 점수가 하나도 없는 행은 여기서 제외
+        keep = ~np.isnan(scores).all(axis=1) | completed
+        names, turns, scores, completed = names[keep], turns[keep], scores[keep], completed[keep]
+        n = len(names)
+        students, codes = np.unique(names, return_inverse=True) if n else (np.array([]), np.array([], int))
+        return [str(name) for name in students], codes, turns, scores, completed
+
+    def get_analytics(self, run_id: int, trajectories: bool = True) -> Dict[str, Any]:
+        """
+        세션 점수 분석
+
+        Args:
+            run_id: 세션 ID
+            trajectories: 학생별 턴 단위 overall_score 추이 포함 여부
+
+        Returns:
+            반 전체 지표(완료율, 백분위, 턴당 변화)와 학생별 지표, 정체 학생 목록
+        """
+        students, codes, turns, scores, completed = self.load_scores(run_id)
+        result: Dict[str, Any] = {
+            "run_id": run_id,
+            "assessed_turns": int(len(codes)),
+            "dimensions": list(SCORE_FIELDS),
+        }
+        if not students:
+            result.update({"class": None, "students": [], "stuck_students": []})
+            return result
+
+        student_count = len(students)
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        latest = _group_last(scores, starts)
+        first = _group_first(scores, starts)
+        student_completed = np.logical_or.reduceat(completed, starts)
+        assessed = np.add.reduceat((~np.isnan(scores)).astype(np.int64), starts, axis=0)
+
+        # 연속한 두 평가 사이 점수 변화 (같은 학생 안에서만, 차원별로 유효한 값끼리)
+        mean_delta = np.full((student_count, len(SCORE_FIELDS)), np.nan)
+        class_delta = np.full(len(SCORE_FIELDS), np.nan)
+        recent_change = np.full(student_count, np.nan)
+        for column in range(len(SCORE_FIELDS)):
+            valid = np.flatnonzero(~np.isnan(scores[:, column]))
+            values, owner = scores[valid, column], codes[valid]
+            same = owner[1:] == owner[:-1]
+            deltas = np.diff(values)[same]
+            if deltas.size:
+                class_delta[column] = deltas.mean()
+                sums = np.bincount(owner[1:][same], weights=deltas, minlength=student_count)
+                counts = np.bincount(owner[1:][same], minlength=student_count)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    mean_delta[:, column] = sums / counts
+
+            if column == 0 and values.size:
+                # overall_score의 최근 STUCK_WINDOW번 변화량: 마지막 값 - 창 시작 값
+                group_start = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+                per_student = np.diff(np.r_[group_start, len(owner)])
+                start_of = np.repeat(group_start, per_student)
+                from_end = np.repeat(per_student, per_student) - 1 - (np.arange(len(owner)) - start_of)
+                window = np.minimum(per_student, STUCK_WINDOW) - 1
+                anchor = from_end == np.repeat(window, per_student)
+                recent_change[owner[anchor]] = latest[owner[anchor], 0] - values[anchor]
+
+        stuck = (
+            ~student_completed
+            & (assessed[:, 0] >= STUCK_WINDOW)
+            & ~(recent_change > 0)
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # 값이 하나도 없는 차원은 NaN
+            percentiles = np.nanpercentile(latest, PERCENTILES, axis=0)
+
+        result["class"] = {
+            "student_count": student_count,
+            "completion_rate": round(float(student_completed.mean()), 4),
+            "percentiles": {
+                field: {f"p{p}": _float_or_none(percentiles[i, column]) for i, p in enumerate(PERCENTILES)}
+                for column, field in enumerate(SCORE_FIELDS)
+            },
+            "mean_delta_per_turn": {
+                field: _float_or_none(class_delta[column]) for column, field in enumerate(SCORE_FIELDS)
+            },
+        }
+
+        ends = np.r_[starts[1:], len(codes)]
+        student_rows = []
+        for index, name in enumerate(students):
+            item = {
+                "student_name": name,
+                "assessed_turns": int(assessed[index, 0]),
+                "completed": bool(student_completed[index]),
+                "latest": {field: _float_or_none(latest[index, c]) for c, field in enumerate(SCORE_FIELDS)},
+                "change": {
+                    field: _float_or_none(latest[index, c] - first[index, c]) for c, field in enumerate(SCORE_FIELDS)
+                },
+                "mean_delta_per_turn": {
+                    field: _float_or_none(mean_delta[index, c]) for c, field in enumerate(SCORE_FIELDS)
+                },
+                "recent_change": _float_or_none(recent_change[index]),
+                "stuck": bool(stuck[index]),
+            }
+            if trajectories:
+                span = slice(starts[index], ends[index])
+                overall = scores[span, 0]
+                keep = ~np.isnan(overall)
+                item["trajectory"] = {
+                    "turn_index": turns[span][keep].tolist(),
+                    "overall_score": overall[keep].tolist(),
+                }
+            student_rows.append(item)
+
+        result["students"] = student_rows
+        order = np.argsort(np.where(np.isnan(latest[:, 0]), np.inf, latest[:, 0]), kind="stable")
+        result["stuck_students"] = [students[i] for i in order if stuck[i]]
+        return result
+
+
+def students_below(db: Session, run_id: int, field: str, threshold: float) -> List[Dict[str, Any]]:
+    """
+    한 번이라도 field 점수가 threshold 미만이었던 학생 ((run_id, 점수) 인덱스 범위 검색)
+
+    Returns:
+        학생별 최저 점수와 미만이었던 턴 수 (최저 점수 순)
+    """
+    column = getattr(ActivityLog, field)
+    rows = db.query(
+        ActivityLog.student_name,
+        func.min(column).label("lowest"),
+        func.count().label("turns"),
+    ).filter(
+        ActivityLog.run_id == run_id, column < threshold
+    ).group_by(ActivityLog.student_name).order_by(func.min(column), ActivityLog.student_name).all()
+    return [
+        {"student_name": row.student_name, "lowest": row.lowest, "turns_below": row.turns}
+        for row in rows
+    ]
+
+
+class ScoreAnalyticsCache:
+    """run_id -> (세션 버전, 분석 결과) LRU"""
+
+    def __init__(self, max_runs: int = 256):
+        self.max_runs = max_runs
+        self._entries: "OrderedDict[Tuple[int, bool], Tuple[RunVersion, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, run_id: int, trajectories: bool = True) -> Dict[str, Any]:
+        """세션 버전이 같으면 캐시된 결과, 아니면 다시 계산"""
+        service = ScoreAnalyticsService(db)
+        version = service.run_version(run_id)
+        key = (run_id, trajectories)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+
+        self.misses += 1
+        result = service.get_analytics(run_id, trajectories)
+        result["version"] = {"logs": version[0], "last_log_id": version[1]}
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_runs:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+score_analytics_cache = ScoreAnalyticsCache(max_runs=settings.score_analytics_cache_max_runs)
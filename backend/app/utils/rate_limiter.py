@@ -1,52 +1,32 @@
 """
-간단한 인메모리 레이트 리미터
-운영환경에서는 Redis 등으로 교체 권장
+간단한 키 단위 레이트 리미터
+공용 레이트리밋 엔진(app.core.rate_limit)의 저장소 백엔드를 사용합니다
 """
-from datetime import datetime, timedelta
-from typing import Dict, List
-import threading
+from typing import Optional
+from app.core.rate_limit import RateLimitStore, rate_limit_store
 
 
 class RateLimiter:
-    def __init__(self, max_requests: int, window_minutes: int):
+    def __init__(self, max_requests: int, window_minutes: int,
+                 store: Optional[RateLimitStore] = None, namespace: str = "util"):
         self.max_requests = max_requests
         self.window_minutes = window_minutes
-        self.requests: Dict[str, List[datetime]] = {}
-        self.lock = threading.Lock()
+        self.store = store if store is not None else rate_limit_store
+        self.namespace = namespace
+    
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}|{key}"
     
     def is_allowed(self, key: str) -> bool:
         """
         키에 대한 요청이 허용되는지 확인
         """
-        now = datetime.now()
-        window_start = now - timedelta(minutes=self.window_minutes)
-        
-        with self.lock:
-            # 해당 키의 요청 기록 가져오기
-            if key not in self.requests:
-                self.requests[key] = []
-            
-            # 윈도우 외부의 오래된 요청들 정리
-            self.requests[key] = [
-                req_time for req_time in self.requests[key] 
-                if req_time > window_start
-            ]
-            
-            # 최대 요청 수 확인
-            if len(self.requests[key]) >= self.max_requests:
-                return False
-            
-            # 요청 기록
-            self.requests[key].append(now)
-            return True
+        return self.store.hit(self._key(key), self.max_requests, self.window_minutes * 60)
     
     def reset(self, key: str):
         """특정 키의 레이트리밋 리셋"""
-        with self.lock:
-            if key in self.requests:
-                del self.requests[key]
+        self.store.reset(self._key(key))
     
     def clear_all(self):
-        """모든 레이트리밋 기록 삭제"""
-        with self.lock:
-            self.requests.clear()
\ No newline at end of file
+        """이 리미터의 모든 레이트리밋 기록 삭제"""
+        self.store.clear(prefix=f"{self.namespace}|")
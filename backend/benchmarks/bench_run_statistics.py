@@ -0,0 +1,153 @@
+"""
+세션 통계 집계 벤치마크 (학생 60명 × 500턴)
+
+임시 SQLite DB에 한 세션 분량의 활동 로그를 만들고 이전 방식(쿼리 4번)과
+단일 집계 쿼리(include 조합별)의 지연시간을 비교합니다.
+
+    cd backend
+    python -m benchmarks.bench_run_statistics --students 60 --turns 500 --repeat 50
+
+출력 예 (SQLite 3.40, 1 vCPU):
+    variant                                      queries  p50(ms)  p95(ms)
+    legacy (4 queries)                                 4    33.44    36.63
+    single query (all)                                 1     6.77     9.72
+    single query (student_count,total_turns)           1     3.86     4.18
+    single query (latest_activity)                     1     0.65     0.80
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models import ActivityLog, Enrollment, Mode, RunStatus, SessionRun, SessionTemplate, Teacher
+from app.services.run_statistics_service import STATISTICS_PARTS, RunStatisticsService
+
+VARIANTS = [
+    ("single query (all)", set(STATISTICS_PARTS)),
+    ("single query (student_count,total_turns)", {"student_count", "total_turns"}),
+    ("single query (latest_activity)", {"latest_activity"}),
+]
+
+
+def seed(db, students: int, turns: int) -> int:
+    """세션 하나와 학생별 활동 로그 (10턴마다 한 번은 입력 없는 AI 턴)"""
+    teacher = Teacher(email="bench@teacher.com", password_hash="bench")
+    mode = Mode(id="bench_mode", name="Bench", options_schema={"type": "object"})
+    db.add_all([teacher, mode])
+    db.commit()
+    template = SessionTemplate(teacher_id=teacher.id, mode_id=mode.id, title="bench", settings_json={})
+    db.add(template)
+    db.commit()
+    run = SessionRun(template_id=template.id, name="bench", status=RunStatus.LIVE, settings_snapshot_json={})
+    db.add(run)
+    db.commit()
+
+    db.bulk_insert_mappings(Enrollment, [
+        {"run_id": run.id, "normalized_student_name": f"학생{s:02d}", "rejoin_pin_hash": "bench"}
+        for s in range(students)
+    ])
+    for s in range(students):
+        db.bulk_insert_mappings(ActivityLog, [
+            {
+                "run_id": run.id,
+                "student_name": f"학생{s:02d}",
+                "activity_key": "socratic.chat",
+                "turn_index": t,
+                "student_input": "" if t % 10 == 0 else "학생 응답 " * 20,
+                "ai_output": "AI 질문 " * 80,
+                "third_eval_json": {"overall_score": t % 100, "is_completed": False},
+            }
+            for t in range(turns)
+        ])
+    db.commit()
+    return run.id
+
+
+def legacy_statistics(db, run_id: int) -> dict:
+    """이전 구현 (쿼리 4번)"""
+    student_count = db.query(Enrollment).filter(Enrollment.run_id == run_id).count()
+    total_turns = db.query(ActivityLog).filter(
+        ActivityLog.run_id == run_id,
+        ActivityLog.student_input.isnot(None),
+        ActivityLog.student_input != ''
+    ).count()
+    student_turns = db.query(
+        ActivityLog.student_name,
+        func.count(ActivityLog.id).label('turn_count')
+    ).filter(
+        ActivityLog.run_id == run_id,
+        ActivityLog.student_input.isnot(None),
+        ActivityLog.student_input != ''
+    ).group_by(ActivityLog.student_name).all()
+    latest_activity = db.query(ActivityLog.created_at).filter(
+        ActivityLog.run_id == run_id
+    ).order_by(ActivityLog.created_at.desc()).first()
+    return {
+        "student_count": student_count,
+        "total_turns": total_turns,
+        "student_turns": [{"student_name": name, "turn_count": count} for name, count in student_turns],
+        "latest_activity": latest_activity[0].isoformat() if latest_activity else None,
+    }
+
+
+def measure(fn, repeat: int) -> dict:
+    fn()  # 캐시 워밍
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {"p50": statistics.median(timings), "p95": timings[max(int(len(timings) * 0.95) - 1, 0)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=60)
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        run_id = seed(db, args.students, args.turns)
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+        def count_queries(fn):
+            statements.clear()
+            fn()
+            return len(statements)
+
+        service = RunStatisticsService(db)
+        expected = legacy_statistics(db, run_id)
+        actual = service.get_statistics(run_id)
+        assert actual["total_turns"] == expected["total_turns"]
+        assert actual["student_count"] == expected["student_count"]
+        assert sorted(actual["student_turns"], key=lambda i: i["student_name"]) == \
+            sorted(expected["student_turns"], key=lambda i: i["student_name"])
+
+        print(f"rows: {args.students * args.turns} activity logs, {args.students} students")
+        print(f"{'variant':<44} {'queries':>7} {'p50(ms)':>8} {'p95(ms)':>8}")
+        runs = [("legacy (4 queries)", lambda: legacy_statistics(db, run_id))]
+        for label, parts in VARIANTS:
+            runs.append((label, lambda parts=parts: service.get_statistics(run_id, parts)))
+        for label, fn in runs:
+            queries = count_queries(fn)
+            r = measure(fn, args.repeat)
+            print(f"{label:<44} {queries:>7} {r['p50']:>8.2f} {r['p95']:>8.2f}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
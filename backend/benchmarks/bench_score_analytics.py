@@ -0,0 +1,99 @@
+"""
+세션 점수 분석 벤치마크 (학생 60명 × 500턴 = 평가 30,000개)
+
+임시 SQLite DB에 평가가 있는 활동 로그를 만들고 점수 분석 계산(로딩 + 배열 연산)과
+세션 버전이 같을 때의 캐시 조회 지연시간을 측정합니다.
+
+    cd backend
+    python -m benchmarks.bench_score_analytics --students 60 --turns 500 --repeat 10
+
+출력 예 (SQLite 3.40, 1 vCPU):
+    variant                               p50(ms)  p95(ms)
+    load only                              390.97   402.04
+    full analytics                         373.63   423.49
+    full analytics (no trajectories)       344.06   389.70
+    cached (same run version)                3.64     3.90
+(JSON을 파이썬에서 파싱해 dict 루프로 읽던 방식은 load만 830ms)
+"""
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models import ActivityLog, Mode, RunStatus, SessionRun, SessionTemplate, Teacher
+from app.services.assessment_scores import EVAL_DIMENSIONS
+from app.services.score_analytics_service import ScoreAnalyticsCache, ScoreAnalyticsService
+from benchmarks.bench_run_statistics import measure
+
+
+def seed(db, students: int, turns: int) -> int:
+    teacher = Teacher(email="bench@teacher.com", password_hash="bench")
+    db.add_all([teacher, Mode(id="bench_mode", name="Bench", options_schema={"type": "object"})])
+    db.commit()
+    template = SessionTemplate(teacher_id=teacher.id, mode_id="bench_mode", title="bench", settings_json={})
+    db.add(template)
+    db.commit()
+    run = SessionRun(template_id=template.id, name="bench", status=RunStatus.LIVE, settings_snapshot_json={})
+    db.add(run)
+    db.commit()
+
+    rng = random.Random(0)
+    for s in range(students):
+        level = rng.uniform(20, 60)
+        rows = []
+        for t in range(turns):
+            level = min(100.0, max(0.0, level + rng.uniform(-2, 3)))
+            rows.append({
+                "run_id": run.id,
+                "student_name": f"학생{s:02d}",
+                "activity_key": "socratic.chat",
+                "turn_index": t,
+                "student_input": "학생 응답",
+                "ai_output": "AI 질문",
+                "third_eval_json": {
+                    "understanding_score": round(level),
+                    "is_completed": level > 95,
+                    "dimensions": {d: round(level + rng.uniform(-10, 10)) for d in EVAL_DIMENSIONS},
+                    "insights": "설명 " * 10,
+                },
+            })
+        db.bulk_insert_mappings(ActivityLog, rows)
+    db.commit()
+    return run.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=60)
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        run_id = seed(db, args.students, args.turns)
+
+        service = ScoreAnalyticsService(db)
+        cache = ScoreAnalyticsCache()
+        print(f"rows: {args.students * args.turns} assessed turns, {args.students} students")
+        print(f"{'variant':<36} {'p50(ms)':>8} {'p95(ms)':>8}")
+        for label, fn in (
+            ("load only", lambda: service.load_scores(run_id)),
+            ("full analytics", lambda: service.get_analytics(run_id)),
+            ("full analytics (no trajectories)", lambda: service.get_analytics(run_id, trajectories=False)),
+            ("cached (same run version)", lambda: cache.get(db, run_id)),
+        ):
+            r = measure(fn, args.repeat)
+            print(f"{label:<36} {r['p50']:>8.2f} {r['p95']:>8.2f}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
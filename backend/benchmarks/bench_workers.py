@@ -0,0 +1,216 @@
+"""
+워커 수에 따른 처리량 벤치마크 (학생 입장 + 활동 로그)
+
+임시 SQLite DB와 공유 레이트리밋 저장소(SQLite)로 서버를 워커 1..N개로
+차례로 띄우고, 같은 부하를 걸어 처리량(req/s)과 지연시간을 측정합니다.
+
+    cd backend
+    python -m benchmarks.bench_workers --max-workers 4 --requests 2000 --concurrency 64
+
+출력 예:
+    workers  endpoint       req/s    p50(ms)  p95(ms)  errors
+    1        join           210.4    290.1    410.7    0
+    1        activity-log   950.2     62.3     98.0    0
+    ...
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+JOIN_CODE = "424242"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def bench_env(workdir: Path, workers: int) -> dict:
+    """벤치마크용 환경변수 - 레이트리밋은 측정에 영향이 없도록 충분히 크게"""
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{workdir / 'bench.db'}",
+        "RATE_LIMIT_STORAGE_URL": f"sqlite:///{workdir / 'rate_limit.db'}",
+        "WEB_CONCURRENCY": str(workers),
+        "MAX_STUDENTS_PER_RUN": "1000000",
+        "JOIN_ATTEMPT_RATE_PER_MIN": "1000000",
+        "JOIN_ATTEMPT_RATE_PER_STUDENT_PER_MIN": "1000000",
+        "JOIN_ATTEMPT_RATE_PER_RUN_PER_MIN": "1000000",
+        "ACTIVITY_WRITE_RATE_PER_MIN": "1000000",
+        "ACTIVITY_WRITE_RATE_PER_RUN_PER_MIN": "1000000",
+        "LOG_LEVEL": "warning",
+        "PYTHONPATH": str(BACKEND_DIR),
+    })
+    return env
+
+
+def seed_database(env: dict):
+    """교사/템플릿/LIVE 세션/입장 코드 생성 (별도 프로세스에서 실행)"""
+    script = f"""
+from app.core.database import Base, engine, SessionLocal
+from app.models import Teacher, Mode, SessionTemplate, SessionRun, RunStatus, JoinCode
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+db = SessionLocal()
+teacher = Teacher(email="bench@teacher.com", password_hash="bench")
+mode = Mode(id="bench_mode", name="Bench", options_schema={{"type": "object"}})
+db.add_all([teacher, mode])
+db.commit()
+template = SessionTemplate(teacher_id=teacher.id, mode_id=mode.id, title="bench", settings_json={{}})
+db.add(template)
+db.commit()
+run = SessionRun(template_id=template.id, name="bench", status=RunStatus.LIVE, settings_snapshot_json={{}})
+db.add(run)
+db.commit()
+db.add(JoinCode(run_id=run.id, code="{JOIN_CODE}", is_active=True))
+db.commit()
+db.close()
+"""
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, check=True)
+
+
+def start_server(env: dict, workers: int, port: int, log_path: Path) -> subprocess.Popen:
+    if workers > 1:
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+               "--bind", f"127.0.0.1:{port}", "app.main:app"]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "app.main:app",
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    # 서버 로그는 파이프가 차서 서버가 멈추지 않도록 파일로 기록
+    with open(log_path, "wb") as log:
+        return subprocess.Popen(
+            cmd, cwd=BACKEND_DIR, env=env,
+            stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+
+def wait_ready(base_url: str, proc: subprocess.Popen, log_path: Path, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited: {log_path.read_text(errors='replace')[-2000:]}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def stop_server(proc: subprocess.Popen):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=15)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(proc.pid, signal.SIGKILL)
+
+
+async def run_load(total: int, concurrency: int, make_request) -> dict:
+    """total개의 요청을 concurrency개의 동시 작업으로 실행"""
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                ok = await make_request(i)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def bench_endpoints(base_url: str, total: int, concurrency: int, label: str) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        tokens = []
+
+        async def join(i: int) -> bool:
+            response = await client.post("/api/join", json={
+                "code": JOIN_CODE,
+                "student_name": f"학생{label}x{i}",
+            })
+            if response.status_code == 200:
+                tokens.append(response.json()["activity_token"])
+                return True
+            return False
+
+        async def activity(i: int) -> bool:
+            token = tokens[i % len(tokens)]
+            response = await client.post(
+                "/api/activity-log",
+                json={
+                    "activity_key": "bench.step1",
+                    "turn_index": i,
+                    "student_input": "입력",
+                    "ai_output": "응답",
+                },
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            return response.status_code == 200
+
+        results = {"join": await run_load(total, concurrency, join)}
+        if not tokens:
+            raise RuntimeError("no successful joins - cannot benchmark activity-log")
+        results["activity-log"] = await run_load(total, concurrency, activity)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=1000, help="엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'workers':<8} {'endpoint':<14} {'req/s':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'errors':>7}")
+    for workers in range(1, args.max_workers + 1):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = bench_env(Path(tmp), workers)
+            seed_database(env)
+            port = free_port()
+            log_path = Path(tmp) / "server.log"
+            proc = start_server(env, workers, port, log_path)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                wait_ready(base_url, proc, log_path)
+                results = asyncio.run(bench_endpoints(base_url, args.requests, args.concurrency, str(workers)))
+            finally:
+                stop_server(proc)
+
+        for endpoint, r in results.items():
+            print(f"{workers:<8} {endpoint:<14} {r['rps']:>8.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+gunicorn 설정 - uvicorn 워커를 사용하는 pre-fork 모드
+
+    WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py app.main:app
+
+앱은 마스터에서 한 번 로드(preload)된 뒤 fork되어 워커 간에 메모리를
+copy-on-write로 공유합니다. 부모에게서 물려받은 DB 커넥션 풀과 레이트리밋
+저장소 연결은 post_fork에서 워커별로 다시 만듭니다.
+"""
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:3000")
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    """워커를 띄우기 전에 멀티 워커 실행 가능 여부 검사"""
+    from app.core.runtime import check_worker_safety
+
+    check_worker_safety(server.cfg.workers)
+
+
+def post_fork(server, worker):
+    """워커별 DB 엔진 풀과 레이트리밋 저장소 연결 재생성"""
+    from app.core.runtime import reinit_after_fork
+
+    reinit_after_fork()
+    server.log.info(f"Worker {worker.pid} initialized")
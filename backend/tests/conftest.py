@@ -6,10 +6,15 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.core.database import get_db, Base
+from app.core.database import get_db, get_write_db, Base, create_db_engine
+from app.core.deps import get_current_teacher
 from app.core.security import hash_password
 from app.models.teacher import Teacher
 from app.models.mode import Mode
+from app.services.mode_catalogue_service import mode_catalogue
+from app.services.ended_run_cache import ended_run_cache
+from app.services.run_count_cache import run_count_cache
+from app.services.score_analytics_service import score_analytics_cache
 
 
 # 테스트용 인메모리 데이터베이스
@@ -32,6 +37,7 @@ def override_get_db():
 
 # 의존성 오버라이드
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_write_db] = override_get_db
 
 
 @pytest.fixture(scope="session")
@@ -59,9 +65,87 @@ def db_session(test_db):
 @pytest.fixture(scope="function")
 def client(db_session):
     """테스트 클라이언트"""
+    clear_caches()
     return TestClient(app)
 
 
+def clear_caches():
+    """테스트마다 DB 내용이 다르므로 프로세스 내 캐시 초기화"""
+    mode_catalogue.invalidate()
+    run_count_cache.clear()
+    ended_run_cache.clear()
+    score_analytics_cache.clear()
+
+
+class FileDB:
+    """
+    tmp_path의 파일 SQLite DB (교사 둘과 socratic 모드를 미리 저장)
+
+    split=True면 운영과 같이 쓰기(BEGIN IMMEDIATE) / 읽기(query_only) 엔진을 나눔
+    """
+
+    def __init__(self, path, split: bool = False):
+        url = f"sqlite:///{path}"
+        if split:
+            self.engine = create_db_engine(url, role="writer")
+            self.read_engine = create_db_engine(url, role="reader")
+        else:
+            self.engine = self.read_engine = create_db_engine(url)
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.ReadSession = sessionmaker(autocommit=False, autoflush=False, bind=self.read_engine)
+        self._previous = None
+
+        # 쓰기 엔진은 연결이 하나뿐이므로 분리 모드의 시드 세션은 커밋 후 다시 읽지 않음
+        # (만료된 객체를 다시 읽으면 시드 세션이 쓰기 연결을 잡아 라우트의 쓰기가 대기)
+        self.db = sessionmaker(bind=self.engine, expire_on_commit=not split)()
+        self.teacher = Teacher(email="teacher@test.com", password_hash="hash")
+        self.other = Teacher(email="other@test.com", password_hash="hash")
+        self.db.add_all([
+            self.teacher, self.other,
+            Mode(id="socratic", name="소크라테스식 학습", options_schema={"type": "object"}),
+        ])
+        self.db.commit()
+        self.current_teacher = self.teacher
+
+    @staticmethod
+    def session_override(factory):
+        def override():
+            db = factory()
+            try:
+                yield db
+            finally:
+                db.close()
+        return override
+
+    def client(self) -> TestClient:
+        """이 DB를 쓰는 테스트 클라이언트 (current_teacher로 로그인한 상태)"""
+        if self._previous is None:
+            self._previous = {dep: app.dependency_overrides.get(dep) for dep in (get_db, get_write_db)}
+        app.dependency_overrides[get_db] = self.session_override(self.ReadSession)
+        app.dependency_overrides[get_write_db] = self.session_override(self.Session)
+        app.dependency_overrides[get_current_teacher] = lambda: self.current_teacher
+        clear_caches()
+        return TestClient(app)
+
+    def close(self):
+        if self._previous is not None:
+            app.dependency_overrides.pop(get_current_teacher, None)
+            app.dependency_overrides.update(self._previous)
+            clear_caches()
+        self.db.close()
+        self.engine.dispose()
+        self.read_engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def file_db(tmp_path, request):
+    """파일 DB (indirect 파라미터로 FileDB 옵션 지정, 예: {"split": True})"""
+    database = FileDB(tmp_path / "app.db", **getattr(request, "param", {}))
+    yield database
+    database.close()
+
+
 @pytest.fixture(scope="function")
 def test_teacher(db_session):
     """테스트용 교사 계정"""
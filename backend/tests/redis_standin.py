@@ -0,0 +1,165 @@
+"""
+테스트용 Redis 프로토콜 대역 서버
+
+실제 Redis 없이 RedisRateLimitStore를 검증하기 위한 최소 RESP 서버입니다.
+Lua 인터프리터가 없으므로 레이트리밋 스크립트는 SHA로 식별해 같은 로직의
+파이썬 구현으로 실행합니다. 프로토콜/스크립트 캐시(NOSCRIPT) 흐름과 여러
+클라이언트 간 상태 공유를 확인하는 용도입니다.
+"""
+import fnmatch
+import hashlib
+import math
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List
+
+from app.core.rate_limit_backends import SLIDING_WINDOW_SCRIPT_SHA, read_reply
+
+
+def encode_reply(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return b"-%s\r\n" % str(value).encode()
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(v) for v in value)
+    raise TypeError(type(value))
+
+
+class RedisStandIn:
+    """해시와 만료만 지원하는 인메모리 데이터 저장소"""
+
+    def __init__(self):
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self.expires: Dict[bytes, float] = {}
+        self.scripts: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.commands: List[str] = []
+        self.hold_replies = False  # True면 명령은 실행하고 응답은 보내지 않음 (응답 지연 재현)
+
+    def _expire_check(self, key: bytes):
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.time():
+            self.hashes.pop(key, None)
+            self.expires.pop(key, None)
+
+    def _sliding_window(self, key: bytes, args: List[bytes]) -> List[int]:
+        """SLIDING_WINDOW_SCRIPT의 파이썬 구현"""
+        self._expire_check(key)
+        state = self.hashes.get(key, {})
+        limit, window, now, cost = float(args[0]), float(args[1]), float(args[2]), int(args[3])
+        ws = float(state[b"ws"]) if b"ws" in state else now - (now % window)
+        cur = float(state.get(b"cur", 0))
+        prev = float(state.get(b"prev", 0))
+        elapsed = math.floor((now - ws) / window)
+        if elapsed >= 1:
+            prev = cur if elapsed == 1 else 0
+            cur = 0
+            ws = ws + elapsed * window
+        estimated = prev * (1 - (now - ws) / window) + cur
+        if cost == 0:
+            return [1, math.floor(estimated * 1000)]
+        allowed = 0
+        if estimated + cost - 1 < limit:
+            cur += cost
+            allowed = 1
+        self.hashes[key] = {b"ws": repr(ws).encode(), b"cur": repr(cur).encode(), b"prev": repr(prev).encode()}
+        self.expires[key] = time.time() + window * 2
+        return [allowed, math.floor(estimated * 1000)]
+
+    def execute(self, args: List[bytes]) -> Any:
+        command = args[0].decode().upper()
+        self.commands.append(command)
+        with self.lock:
+            if command == "PING":
+                return "PONG"
+            if command == "SELECT":
+                return "OK"
+            if command in ("EVAL", "EVALSHA"):
+                if command == "EVAL":
+                    script = args[1].decode()
+                    sha = hashlib.sha1(script.encode()).hexdigest()
+                    self.scripts[sha] = script
+                else:
+                    sha = args[1].decode()
+                    if sha not in self.scripts:
+                        return Exception("NOSCRIPT No matching script. Please use EVAL.")
+                if sha != SLIDING_WINDOW_SCRIPT_SHA:
+                    return Exception("ERR unknown script for stand-in")
+                numkeys = int(args[2])
+                return self._sliding_window(args[3], args[3 + numkeys:])
+            if command == "DEL":
+                removed = 0
+                for key in args[1:]:
+                    removed += self.hashes.pop(key, None) is not None
+                    self.expires.pop(key, None)
+                return removed
+            if command == "SCAN":
+                pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+                keys = [k for k in self.hashes if fnmatch.fnmatchcase(k.decode(), pattern)]
+                return [b"0", keys]
+            return Exception(f"ERR unknown command '{command}'")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.server.clients.append(self.connection)
+
+    def handle(self):
+        while True:
+            try:
+                args = read_reply(self.rfile)
+            except (ConnectionError, OSError):
+                return
+            reply = self.server.data.execute(args)
+            if self.server.data.hold_replies:
+                continue
+            self.wfile.write(encode_reply(reply))
+            self.wfile.flush()
+
+
+class RedisStandInServer(socketserver.ThreadingTCPServer):
+    """백그라운드 스레드에서 동작하는 대역 서버"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.data = RedisStandIn()
+        self.clients: List[socket.socket] = []
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"redis://{host}:{port}/0"
+
+    def close_clients(self):
+        """유휴 연결을 서버 쪽에서 끊음 (Redis의 timeout 설정 재현)"""
+        for sock in self.clients:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.clients.clear()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
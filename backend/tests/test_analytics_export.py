@@ -0,0 +1,142 @@
+"""
+분석용 컬럼형 내보내기 테스트
+"""
+import io
+import zipfile
+
+import pyarrow as pa
+import pyarrow.dataset as pds
+import pyarrow.parquet as pq
+import pytest
+
+from app.models import ActivityLog, Enrollment, RunStatus, SessionRun, SessionTemplate
+from app.services.analytics_export_service import AnalyticsExportService
+from app.services.assessment_scores import extract_scores
+from app.services.ended_run_cache import ended_run_cache
+
+EVALUATION = {
+    "understanding_score": 72,
+    "is_completed": False,
+    "dimensions": {"depth": 70, "breadth": 65, "application": 80, "metacognition": 60, "engagement": 90},
+    "insights": "근거를 들어 설명함",
+}
+
+
+@pytest.fixture
+def export_db(file_db):
+    """교사 둘, 세션 셋 (교사 1: LIVE/ENDED, 교사 2: 하나)"""
+    db = file_db.db
+    mine = SessionTemplate(teacher_id=file_db.teacher.id, mode_id="socratic", title="광합성", settings_json={})
+    theirs = SessionTemplate(teacher_id=file_db.other.id, mode_id="socratic", title="다른 교사", settings_json={})
+    db.add_all([mine, theirs])
+    db.commit()
+    runs = [
+        SessionRun(template_id=mine.id, name="1반", status=RunStatus.LIVE, settings_snapshot_json={"topic": "광합성"}),
+        SessionRun(template_id=mine.id, name="2반", status=RunStatus.ENDED, settings_snapshot_json={}),
+        SessionRun(template_id=theirs.id, name="3반", status=RunStatus.ENDED, settings_snapshot_json={}),
+    ]
+    db.add_all(runs)
+    db.commit()
+    for run in runs:
+        for student in ("민수", "지영"):
+            db.add(Enrollment(run_id=run.id, normalized_student_name=student, rejoin_pin_hash="secret-hash"))
+            db.add_all([
+                ActivityLog(run_id=run.id, student_name=student, activity_key="socratic.chat", turn_index=i,
+                            student_input="학생 응답", ai_output="AI 질문",
+                            third_eval_json=EVALUATION if i % 2 else None)
+                for i in range(5)
+            ])
+    db.commit()
+
+    return {"db": db, "teacher": file_db.teacher, "runs": [run.id for run in runs]}
+
+
+@pytest.fixture
+def client(file_db, export_db):
+    return file_db.client()
+
+
+class TestExtractScores:
+    def test_socratic_shape(self):
+        scores = extract_scores(EVALUATION)
+        assert scores["overall_score"] == 72.0
+        assert scores["is_completed"] is False
+        assert scores["engagement"] == 90.0
+
+    def test_flat_shape_and_bad_values(self):
+        scores = extract_scores({"overall_score": "55", "depth": "n/a", "breadth": True, "is_completed": "yes"})
+        assert scores["overall_score"] is None
+        assert scores["depth"] is None and scores["breadth"] is None
+        assert scores["is_completed"] is None
+
+    def test_missing(self):
+        assert all(value is None for value in extract_scores(None).values())
+
+
+class TestWriteDataset:
+    def test_partitioned_tables(self, export_db, tmp_path):
+        out = tmp_path / "export"
+        manifest = AnalyticsExportService(export_db["db"]).write_dataset(export_db["teacher"].id, str(out))
+
+        mine = export_db["runs"][:2]
+        assert manifest["run_ids"] == mine
+        assert manifest["rows"] == {"runs": 2, "enrollments": 4, "activity_logs": 20}
+        assert sorted(p.name for p in (out / "activity_logs").iterdir()) == [f"run_id={run_id}" for run_id in mine]
+
+        logs = pds.dataset(out / "activity_logs", format="parquet", partitioning="hive").to_table()
+        assert logs.num_rows == 20
+        assert pa.types.is_dictionary(logs.schema.field("student_name").type)
+        assert pa.types.is_dictionary(logs.schema.field("activity_key").type)
+        scored = logs.filter(pa.compute.is_valid(logs["overall_score"]))
+        assert scored.num_rows == 8
+        assert set(scored["depth"].to_pylist()) == {70.0}
+
+        runs = pq.read_table(out / "runs.parquet")
+        assert runs["template_title"].to_pylist() == ["광합성", "광합성"]
+        assert runs["status"].to_pylist() == ["LIVE", "ENDED"]
+
+        enrollments = pds.dataset(out / "enrollments", format="parquet", partitioning="hive").to_table()
+        assert "rejoin_pin_hash" not in enrollments.column_names
+        assert enrollments.num_rows == 4
+
+    def test_arrow_ipc(self, export_db, tmp_path):
+        out = tmp_path / "export"
+        AnalyticsExportService(export_db["db"]).write_dataset(
+            export_db["teacher"].id, str(out), [export_db["runs"][1]], fmt="arrow"
+        )
+        logs = pds.dataset(out / "activity_logs", format="ipc", partitioning="hive").to_table()
+        assert logs.num_rows == 10
+        assert set(logs["run_id"].to_pylist()) == {export_db["runs"][1]}
+
+    def test_unknown_format(self, export_db, tmp_path):
+        with pytest.raises(ValueError):
+            AnalyticsExportService(export_db["db"]).write_dataset(export_db["teacher"].id, str(tmp_path), fmt="csv")
+
+
+class TestExportEndpoints:
+    def test_teacher_export_excludes_other_teachers(self, client, export_db):
+        response = client.get("/api/runs/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        assert "runs.parquet" in names and "manifest.json" in names
+        assert not any(f"run_id={export_db['runs'][2]}/" in name for name in names)
+
+    def test_bad_params(self, client):
+        assert client.get("/api/runs/export?format=csv").status_code == 400
+        assert client.get("/api/runs/export?run_ids=a,b").status_code == 400
+
+    def test_other_teachers_run_is_404(self, client, export_db):
+        assert client.get(f"/api/runs/{export_db['runs'][2]}/export").status_code == 404
+
+    def test_ended_run_export_cached(self, client, export_db):
+        ended = export_db["runs"][1]
+        first = client.get(f"/api/runs/{ended}/export")
+        assert first.status_code == 200
+        assert "content-encoding" not in first.headers
+        assert "immutable" in first.headers["cache-control"]
+        assert "attachment" in first.headers["content-disposition"]
+
+        cached = client.get(f"/api/runs/{ended}/export", headers={"If-None-Match": first.headers["etag"]})
+        assert cached.status_code == 304
+        assert ended_run_cache.hits == 1
@@ -0,0 +1,231 @@
+"""
+온라인 백업 서비스 테스트
+"""
+import gzip
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.models import ActivityLog, Enrollment, Mode, RunStatus, SessionRun, SessionTemplate, Teacher
+from app.services.backup_service import BackupScheduler, BackupService, verify_checksum
+
+
+@pytest.fixture
+def database(tmp_path):
+    """파일 DB와 LIVE/ENDED 세션 하나씩"""
+    path = tmp_path / "app.db"
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    teacher = Teacher(email="backup@teacher.com", password_hash="hash")
+    mode = Mode(id="backup_mode", name="Backup", options_schema={"type": "object"})
+    db.add_all([teacher, mode])
+    db.commit()
+    template = SessionTemplate(teacher_id=teacher.id, mode_id=mode.id, title="backup", settings_json={})
+    db.add(template)
+    db.commit()
+    for status in (RunStatus.LIVE, RunStatus.ENDED):
+        run = SessionRun(template_id=template.id, name=status.value, status=status, settings_snapshot_json={})
+        db.add(run)
+        db.commit()
+        db.add(Enrollment(run_id=run.id, normalized_student_name="학생", rejoin_pin_hash="h"))
+        db.add_all([
+            ActivityLog(run_id=run.id, student_name="학생", activity_key="writing.step1",
+                        turn_index=i, student_input="x" * 500)
+            for i in range(50)
+        ])
+        db.commit()
+
+    yield {"path": path, "engine": engine, "session": Session, "db": db}
+
+    db.close()
+    engine.dispose()
+
+
+def make_service(database, tmp_path, **kwargs):
+    return BackupService(str(database["path"]), str(tmp_path / "backups"), **kwargs)
+
+
+class TestFullBackup:
+    """전체 백업"""
+
+    def test_compressed_checksummed_snapshot(self, database, tmp_path):
+        """압축/체크섬 백업에서 원본 데이터 복원 가능"""
+        service = make_service(database, tmp_path, pages_per_step=2, step_sleep=0)
+
+        result = service.full_backup(datetime(2026, 1, 2, 3, 0, 0))
+
+        path = tmp_path / "backups" / "app_backup_20260102_030000.db.gz"
+        assert result["path"] == str(path)
+        assert result["steps"] > 1  # 여러 단계로 나눠 복사
+        assert verify_checksum(path)
+
+        restored = tmp_path / "restored.db"
+        restored.write_bytes(gzip.decompress(path.read_bytes()))
+        conn = sqlite3.connect(restored)
+        assert conn.execute("SELECT count(*) FROM activity_logs").fetchone()[0] == 100
+        conn.close()
+
+    def test_writes_proceed_during_backup(self, database, tmp_path):
+        """백업 단계 사이에 쓰기가 진행됨"""
+        service = make_service(database, tmp_path, pages_per_step=1, step_sleep=0.01)
+        writes = []
+
+        def writer():
+            conn = sqlite3.connect(database["path"], timeout=0.5)
+            for i in range(5):
+                conn.execute(
+                    "INSERT INTO activity_logs (run_id, student_name, activity_key, turn_index) "
+                    "VALUES (1, '다른학생', 'writing.step1', ?)", (i,)
+                )
+                conn.commit()
+                writes.append(time.perf_counter())
+                time.sleep(0.01)
+            conn.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        service.full_backup()
+        thread.join()
+
+        assert len(writes) == 5
+
+    def test_falls_back_to_single_pass_when_budget_exceeded(self, database, tmp_path):
+        """단계별 복사가 시간 한도를 넘으면 한 번에 복사해 완료"""
+        service = make_service(database, tmp_path, pages_per_step=1, step_sleep=0, max_duration_sec=0)
+
+        result = service.full_backup(datetime(2026, 1, 2, 3, 0, 0))
+
+        assert result["single_pass"] is True
+        restored = tmp_path / "restored.db"
+        restored.write_bytes(gzip.decompress(open(result["path"], "rb").read()))
+        conn = sqlite3.connect(restored)
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT count(*) FROM activity_logs").fetchone()[0] == 100
+        conn.close()
+
+    def test_continuous_writes_do_not_stall_backup(self, database, tmp_path):
+        """쓰기가 끊이지 않아 계속 재시작되어도 재시작 한도 후 완료"""
+        service = make_service(database, tmp_path, pages_per_step=1, step_sleep=0.005, max_restarts=2)
+        stop = threading.Event()
+        writing = threading.Event()
+
+        def writer():
+            conn = sqlite3.connect(database["path"], timeout=1)
+            i = 0
+            while not stop.is_set():
+                conn.execute(
+                    "INSERT INTO activity_logs (run_id, student_name, activity_key, turn_index) "
+                    "VALUES (1, '다른학생', 'writing.step1', ?)", (i,)
+                )
+                conn.commit()
+                writing.set()
+                i += 1
+                time.sleep(0.001)
+            conn.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        writing.wait()
+        try:
+            result = service.full_backup()
+        finally:
+            stop.set()
+            thread.join()
+
+        assert result["single_pass"] is True
+        assert result["restarts"] == 3
+        assert verify_checksum(result["path"])
+
+    def test_checksum_detects_corruption(self, database, tmp_path):
+        """손상된 백업은 체크섬 검증 실패"""
+        service = make_service(database, tmp_path)
+        path = service.full_backup()["path"]
+
+        with open(path, "r+b") as f:
+            f.seek(20)
+            f.write(b"corrupt")
+
+        assert verify_checksum(path) is False
+
+
+class TestRetention:
+    """보관 기간"""
+
+    def test_old_backups_removed_keeping_minimum(self, database, tmp_path):
+        """기간이 지난 백업 삭제, 최근 keep_min개는 유지"""
+        service = make_service(database, tmp_path, retention_days=30, keep_min=2)
+        for day in range(1, 5):
+            path = service.full_backup(datetime(2026, 1, day))["path"]
+            old = time.time() - 90 * 86400
+            os.utime(path, (old, old))
+
+        assert service.apply_retention() == 2
+
+        remaining = [path.name for path in service.full_backups()]
+        assert remaining == ["app_backup_20260103_000000.db.gz", "app_backup_20260104_000000.db.gz"]
+        assert not (tmp_path / "backups" / "app_backup_20260101_000000.db.gz.sha256").exists()
+
+
+class TestIncrementalBackup:
+    """종료 세션 증분 백업"""
+
+    def test_archives_only_new_ended_runs(self, database, tmp_path):
+        """종료된 세션만 한 번씩 보관"""
+        service = make_service(database, tmp_path)
+        db = database["db"]
+
+        first = service.incremental_backup(db)
+        assert [item["run_id"] for item in first] == [2]
+        assert first[0]["activity_logs"] == 50
+        assert verify_checksum(first[0]["path"])
+        assert service.incremental_backup(db) == []
+
+        live_run = db.query(SessionRun).filter(SessionRun.status == RunStatus.LIVE).first()
+        live_run.status = RunStatus.ENDED
+        db.commit()
+
+        assert [item["run_id"] for item in service.incremental_backup(db)] == [live_run.id]
+
+
+class TestBackupScheduler:
+    """앱 내부 스케줄러"""
+
+    def test_runs_full_backup_once_per_day(self, database, tmp_path):
+        """지정 시각에 하루 한 번 전체 백업, 다른 워커가 락을 잡고 있으면 건너뜀"""
+        service = make_service(database, tmp_path)
+        scheduler = BackupScheduler(service, database["session"], full_hour=3, incremental_interval=3600)
+
+        scheduler.run_due(datetime(2026, 1, 1, 2, 0))
+        assert service.full_backups() == []
+
+        scheduler.run_due(datetime(2026, 1, 1, 3, 0))
+        scheduler.run_due(datetime(2026, 1, 1, 3, 30))
+        assert len(service.full_backups()) == 1
+        assert len(list(service.run_archive_dir.glob("run_*.json.gz"))) == 1
+
+        other_worker = BackupScheduler(service, database["session"], full_hour=3)
+        lock = other_worker._try_lock()
+        scheduler.run_due(datetime(2026, 1, 2, 3, 0))
+        assert len(service.full_backups()) == 1
+        lock.close()
+
+    def test_other_worker_skips_completed_full_backup(self, database, tmp_path):
+        """다른 워커가 오늘 전체 백업을 끝냈으면 락을 잡아도 다시 백업하지 않음"""
+        service = make_service(database, tmp_path)
+        workers = [BackupScheduler(service, database["session"], full_hour=3) for _ in range(3)]
+
+        for minute, worker in enumerate(workers):
+            worker.run_due(datetime(2026, 1, 1, 3, minute))
+
+        assert len(service.full_backups()) == 1
+        workers[1].run_due(datetime(2026, 1, 2, 3, 0))
+        assert len(service.full_backups()) == 2
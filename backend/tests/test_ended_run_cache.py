@@ -0,0 +1,152 @@
+"""
+종료된 세션 응답 캐시 테스트
+"""
+import gzip
+import json
+
+import pytest
+from sqlalchemy import event
+
+from app.models import ActivityLog, Enrollment, RunStatus, SessionRun, SessionTemplate
+from app.services.ended_run_cache import EndedRunCache, ended_run_cache
+
+
+@pytest.fixture
+def runs(file_db):
+    """LIVE/ENDED 세션 하나씩, 각각 활동 로그 40개"""
+    db = file_db.db
+    template = SessionTemplate(teacher_id=file_db.teacher.id, mode_id="socratic", title="캐시", settings_json={})
+    db.add(template)
+    db.commit()
+    live = SessionRun(template_id=template.id, name="live", status=RunStatus.LIVE, settings_snapshot_json={})
+    ended = SessionRun(template_id=template.id, name="ended", status=RunStatus.ENDED, settings_snapshot_json={})
+    db.add_all([live, ended])
+    db.commit()
+    for run in (live, ended):
+        db.add(Enrollment(run_id=run.id, normalized_student_name="학생", rejoin_pin_hash="h"))
+        db.add_all([
+            ActivityLog(run_id=run.id, student_name="학생", activity_key="socratic.chat", turn_index=i,
+                        student_input="질문 " * 20, ai_output="응답 " * 50)
+            for i in range(40)
+        ])
+    db.commit()
+
+    return {"client": file_db.client(), "engine": file_db.engine, "db": db, "live": live.id, "ended": ended.id,
+            "file_db": file_db}
+
+
+def count_log_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+class TestEndedRunEndpoints:
+    """종료된 세션 조회 엔드포인트"""
+
+    @pytest.mark.parametrize("path", ["statistics", "activity-logs?size=20", "statistics?include=total_turns"])
+    def test_computed_once(self, runs, path):
+        """두 번째 요청부터는 활동 로그를 다시 읽지 않음"""
+        client = runs["client"]
+        statements = count_log_queries(runs["engine"])
+
+        first = client.get(f"/api/runs/{runs['ended']}/{path}")
+        assert first.status_code == 200
+        assert any("activity_logs" in s for s in statements)
+
+        statements.clear()
+        second = client.get(f"/api/runs/{runs['ended']}/{path}")
+        assert second.json() == first.json()
+        assert not any("activity_logs" in s for s in statements)
+        assert "immutable" in second.headers["cache-control"]
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_not_modified(self, runs):
+        """ETag가 일치하면 304"""
+        client = runs["client"]
+        url = f"/api/runs/{runs['ended']}/activity-logs"
+        etag = client.get(url).headers["etag"]
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_gzip_negotiation(self, runs):
+        """압축 보관된 본문은 gzip을 받는 클라이언트에 그대로 전송"""
+        client = runs["client"]
+        url = f"/api/runs/{runs['ended']}/activity-logs?size=40"
+
+        compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert compressed.json() == plain.json()
+        assert len(plain.json()["logs"]) == 40
+
+    def test_etag_per_encoding(self, runs):
+        """gzip 본문과 원본은 서로 다른 ETag - 다른 인코딩의 ETag로는 304가 나지 않음"""
+        client = runs["client"]
+        url = f"/api/runs/{runs['ended']}/activity-logs?size=40"
+
+        compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert compressed.headers["etag"] != plain.headers["etag"]
+        assert "Accept-Encoding" in compressed.headers["vary"]
+
+        mismatched = client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": compressed.headers["etag"]})
+        assert mismatched.status_code == 200
+        matched = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]})
+        assert matched.status_code == 304
+
+    def test_live_run_not_cached(self, runs):
+        """진행 중인 세션은 매번 계산"""
+        client = runs["client"]
+        client.get(f"/api/runs/{runs['live']}/statistics")
+        response = client.get(f"/api/runs/{runs['live']}/statistics")
+
+        assert "etag" not in response.headers
+        assert ended_run_cache.metrics()["entries"] == 0
+
+    def test_ownership_checked_before_cache(self, runs):
+        """캐시된 세션도 다른 교사에게는 404"""
+        client = runs["client"]
+        assert client.get(f"/api/runs/{runs['ended']}/statistics").status_code == 200
+
+        runs["file_db"].current_teacher = runs["file_db"].other
+        assert client.get(f"/api/runs/{runs['ended']}/statistics").status_code == 404
+
+
+class TestEndedRunCache:
+    """LRU 동작"""
+
+    def test_evicts_least_recently_used(self):
+        cache = EndedRunCache(max_bytes=3000)
+        payload = lambda run_id: {"data": str(run_id) * 900}  # 압축 기준 미만 (약 900바이트)
+
+        for run_id in (1, 2, 3):
+            cache.get_or_compute((run_id, "statistics"), lambda run_id=run_id: payload(run_id))
+        cache.get_or_compute((1, "statistics"), lambda: pytest.fail("cached"))
+        cache.get_or_compute((4, "statistics"), lambda: payload(4))
+
+        metrics = cache.metrics()
+        assert metrics["evictions"] >= 1
+        assert metrics["size_bytes"] <= 3000
+        cache.get_or_compute((1, "statistics"), lambda: pytest.fail("recently used entry evicted"))
+
+    def test_invalidate_run(self):
+        cache = EndedRunCache()
+        cache.get_or_compute((1, "statistics"), lambda: {"a": 1})
+        cache.get_or_compute((1, "activity-logs", None, 1, 50), lambda: {"b": 2})
+        cache.get_or_compute((2, "statistics"), lambda: {"c": 3})
+
+        cache.invalidate_run(1)
+
+        assert cache.metrics()["entries"] == 1
+
+    def test_large_bodies_stored_compressed(self):
+        cache = EndedRunCache()
+        entry = cache.get_or_compute((1, "activity-logs"), lambda: {"logs": ["응답 " * 100] * 50})
+
+        assert entry.body is None
+        assert json.loads(gzip.decompress(entry.compressed))["logs"][0].startswith("응답")
+        assert entry.size < 5000
@@ -7,7 +7,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
-from app.core.database import get_db, Base
+from app.core.database import get_db, get_write_db, Base
 from app.models import Teacher, SessionTemplate, SessionRun, RunStatus, JoinCode, Enrollment
 from app.utils.pin_utils import hash_pin
 
@@ -27,6 +27,7 @@ def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_write_db] = override_get_db
 client = TestClient(app)
 
 
@@ -247,28 +248,45 @@ class TestJoinAPI:
 class TestRateLimit:
     """레이트리밋 테스트"""
     
+    @pytest.fixture(autouse=True)
+    def reset_rate_limits(self):
+        """다른 테스트의 카운터 영향 제거"""
+        from app.core.rate_limit import rate_limit_store, principal_tracker
+        rate_limit_store.clear()
+        principal_tracker.clear()
+        yield
+        rate_limit_store.clear()
+        principal_tracker.clear()
+    
     def test_rate_limit_enforcement(self, test_session):
-        """레이트리밋 적용 확인"""
-        # 30회 연속 요청 (설정된 한계)
-        for i in range(30):
+        """같은 학생 이름으로 반복 시도 시 레이트리밋 적용"""
+        # 10회까지는 정상 처리 (최초 입장 후 PIN 요구)
+        for i in range(10):
             response = client.post("/api/join", json={
                 "code": "123456",
-                "student_name": f"학생{i}"
+                "student_name": "반복학생"
             })
-            # 처음 몇 개는 성공해야 함
-            if i < 10:
-                assert response.status_code in [200, 409, 403]  # 정상 응답들
+            assert response.status_code in [200, 409]
         
-        # 31번째 요청은 레이트리밋에 걸려야 함
+        # 11번째 요청은 레이트리밋에 걸려야 함
         response = client.post("/api/join", json={
             "code": "123456",
-            "student_name": "마지막학생"
+            "student_name": "반복학생"
         })
         
         assert response.status_code == 429
         data = response.json()
         assert data["error"] == "rate_limit_exceeded"
         assert "너무 많은 요청입니다" in data["message"]
+    
+    def test_classroom_behind_shared_ip(self, test_session):
+        """같은 IP(학교 NAT)의 학생들은 IP 기본 한도를 넘어서도 입장 가능"""
+        for i in range(40):
+            response = client.post("/api/join", json={
+                "code": "123456",
+                "student_name": f"학생{i}"
+            })
+            assert response.status_code == 200
 
 
 class TestCacheHeaders:
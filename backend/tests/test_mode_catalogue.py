@@ -0,0 +1,93 @@
+"""
+모드 카탈로그 캐시 / ETag 테스트
+"""
+import json
+
+import pytest
+
+from app.models import Mode
+from app.services.mode_catalogue_service import ModeCatalogue, etag_matches, mode_catalogue
+
+
+@pytest.fixture
+def modes_db(file_db):
+    """모드 두 개가 있는 파일 DB"""
+    file_db.db.add(Mode(id="strategic_writing", name="전략적 글쓰기", options_schema={"type": "object"}))
+    file_db.db.commit()
+    return file_db
+
+
+@pytest.fixture
+def modes_client(modes_db):
+    """임시 DB를 읽는 클라이언트"""
+    return modes_db.client()
+
+
+class TestModesEndpoint:
+    """GET /api/modes/"""
+
+    def test_etag_and_not_modified(self, modes_client):
+        """ETag가 일치하면 본문 없이 304"""
+        response = modes_client.get("/api/modes/")
+        etag = response.headers["etag"]
+        assert response.status_code == 200
+        assert [mode["id"] for mode in response.json()] == ["socratic", "strategic_writing"]
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+        cached = modes_client.get("/api/modes/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        other = modes_client.get("/api/modes/", headers={"If-None-Match": '"modes-other"'})
+        assert other.status_code == 200
+        assert other.json() == response.json()
+
+    def test_served_from_memory(self, modes_client):
+        """캐시 유효 기간 동안 DB를 다시 읽지 않음"""
+        modes_client.get("/api/modes/")
+        loads = mode_catalogue.loads_total
+        for _ in range(5):
+            modes_client.get("/api/modes/")
+
+        assert mode_catalogue.loads_total == loads
+
+
+class TestModeCatalogue:
+    """카탈로그 버전 관리"""
+
+    def test_reseed_changes_etag(self, modes_db):
+        """모드 변경 후 무효화하면 새 버전으로 응답"""
+        catalogue = ModeCatalogue(ttl_sec=60)
+        db = modes_db.Session()
+        first = catalogue.get(db)
+        db.query(Mode).filter(Mode.id == "socratic").update({"version": "2.0"})
+        db.commit()
+
+        assert catalogue.get(db).etag == first.etag
+        catalogue.invalidate()
+
+        snapshot = catalogue.get(db)
+        assert snapshot.etag != first.etag
+        versions = {mode["id"]: mode["version"] for mode in json.loads(snapshot.body)}
+        assert versions["socratic"] == "2.0"
+        db.close()
+
+    def test_unchanged_reload_keeps_etag(self, modes_db):
+        """ttl이 지나 다시 읽어도 내용이 같으면 ETag 유지"""
+        catalogue = ModeCatalogue(ttl_sec=60)
+        db = modes_db.Session()
+        first = catalogue.get(db, now=1000)
+        second = catalogue.get(db, now=1100)
+
+        assert catalogue.loads_total == 2
+        assert second.etag == first.etag
+        db.close()
+
+    def test_if_none_match_parsing(self):
+        """여러 태그, 약한 태그, * 처리"""
+        assert etag_matches('"a", "modes-1"', '"modes-1"')
+        assert etag_matches('W/"modes-1"', '"modes-1"')
+        assert etag_matches("*", '"modes-1"')
+        assert not etag_matches(None, '"modes-1"')
+        assert not etag_matches('"modes-2"', '"modes-1"')
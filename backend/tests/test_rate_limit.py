@@ -0,0 +1,469 @@
+"""
+레이트리밋 미들웨어 테스트
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.core.rate_limit import (
+    InMemoryRateLimitStore,
+    PrincipalTracker,
+    SlidingWindowCounter,
+)
+
+
+def build_client(rates, store=None):
+    """레이트리밋 미들웨어만 적용된 테스트 앱"""
+    app = FastAPI()
+
+    @app.get("/api/join")
+    def join():
+        return {"ok": True}
+
+    @app.get("/api/runs/{run_id}/live-snapshot")
+    def live_snapshot(run_id: int):
+        return {"run_id": run_id}
+
+    @app.get("/api/other")
+    def other():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, rates=rates, store=store)
+    return TestClient(app)
+
+
+class TestSlidingWindowCounter:
+    """슬라이딩 윈도우 카운터 테스트"""
+
+    def test_limit_within_window(self):
+        """윈도우 내 제한 초과 시 거부"""
+        counter = SlidingWindowCounter(now=0.0, window_seconds=60)
+        assert all(counter.hit(1.0, 3, 60) for _ in range(3))
+        assert counter.hit(2.0, 3, 60) is False
+
+    def test_previous_window_weight(self):
+        """이전 윈도우 요청이 경과 시간에 비례해 반영됨"""
+        counter = SlidingWindowCounter(now=0.0, window_seconds=60)
+        for _ in range(4):
+            counter.hit(10.0, 4, 60)
+
+        # 다음 윈도우 시작 시점에는 이전 윈도우 요청이 그대로 반영
+        assert counter.hit(60.0, 4, 60) is False
+        # 다음 윈도우 중반에는 이전 요청의 절반만 반영
+        assert counter.hit(90.0, 4, 60) is True
+
+    def test_reset_after_two_windows(self):
+        """두 윈도우 이상 지나면 초기화"""
+        counter = SlidingWindowCounter(now=0.0, window_seconds=60)
+        for _ in range(4):
+            counter.hit(10.0, 4, 60)
+        assert counter.hit(200.0, 4, 60) is True
+
+    def test_cost_counts_all_items(self):
+        """cost만큼 차감하고 남은 한도보다 크면 거부"""
+        counter = SlidingWindowCounter(now=0.0, window_seconds=60)
+        assert counter.hit(1.0, 10, 60, cost=7) is True
+        assert counter.hit(2.0, 10, 60, cost=4) is False
+        assert counter.hit(3.0, 10, 60, cost=3) is True
+        assert counter.hit(4.0, 10, 60) is False
+
+
+class TestInMemoryStore:
+    """인메모리 저장소 테스트"""
+
+    def test_idle_keys_evicted(self):
+        """유휴 키는 스윕 시 제거"""
+        store = InMemoryRateLimitStore(max_keys=100, sweep_interval=1000)
+        store.hit("a", 5, 60, now=0.0)
+        store.hit("b", 5, 60, now=100.0)
+
+        evicted = store.sweep(now=130.0)
+
+        assert evicted == 1
+        assert "a" not in store.counters
+        assert "b" in store.counters
+
+    def test_memory_cap(self):
+        """키 수가 상한을 넘으면 가장 오래된 키부터 제거"""
+        store = InMemoryRateLimitStore(max_keys=3, sweep_interval=1000)
+        for i in range(5):
+            store.hit(f"ip{i}", 5, 60, now=float(i))
+
+        metrics = store.metrics()
+        assert metrics["keys"] == 3
+        assert metrics["evicted_capacity_total"] == 2
+        assert list(store.counters) == ["ip2", "ip3", "ip4"]
+
+
+class TestRateLimitMiddleware:
+    """미들웨어 테스트"""
+
+    def test_regex_pattern_matches(self):
+        """정규식 패턴 엔드포인트에 레이트리밋 적용"""
+        client = build_client({"/api/runs/[^/]+/live-snapshot": (2, 60)})
+
+        assert client.get("/api/runs/1/live-snapshot").status_code == 200
+        assert client.get("/api/runs/1/live-snapshot").status_code == 200
+        response = client.get("/api/runs/1/live-snapshot")
+
+        assert response.status_code == 429
+        assert response.json()["error"] == "rate_limit_exceeded"
+        assert response.headers["retry-after"] == "60"
+
+    def test_rule_aggregates_across_paths(self):
+        """그룹 없는 규칙은 여러 경로의 요청을 합산"""
+        client = build_client({"/api/runs/[^/]+/live-snapshot": (2, 60)})
+
+        client.get("/api/runs/1/live-snapshot")
+        client.get("/api/runs/2/live-snapshot")
+
+        assert client.get("/api/runs/3/live-snapshot").status_code == 429
+
+    def test_named_group_scopes_counter(self):
+        """이름 있는 그룹은 값별로 별도 카운터 사용"""
+        client = build_client({"/api/runs/(?P<run_id>[^/]+)/live-snapshot": (1, 60)})
+
+        assert client.get("/api/runs/1/live-snapshot").status_code == 200
+        assert client.get("/api/runs/2/live-snapshot").status_code == 200
+        assert client.get("/api/runs/1/live-snapshot").status_code == 429
+
+    def test_client_ip_header(self):
+        """CF-Connecting-IP 별로 카운터 분리"""
+        client = build_client({"/api/join": (1, 60)})
+
+        assert client.get("/api/join", headers={"CF-Connecting-IP": "1.1.1.1"}).status_code == 200
+        assert client.get("/api/join", headers={"CF-Connecting-IP": "2.2.2.2"}).status_code == 200
+        assert client.get("/api/join", headers={"CF-Connecting-IP": "1.1.1.1"}).status_code == 429
+
+    def test_unmatched_path_not_limited(self):
+        """규칙이 없는 경로는 제한하지 않음"""
+        client = build_client({"/api/join": (1, 60)})
+
+        for _ in range(3):
+            assert client.get("/api/other").status_code == 200
+
+    def test_no_cache_headers(self):
+        """join 경로 응답에 캐시 방지 헤더 추가"""
+        client = build_client({})
+
+        response = client.get("/api/join")
+
+        assert "no-store" in response.headers["cache-control"]
+        assert response.headers["pragma"] == "no-cache"
+        assert "cache-control" not in client.get("/api/other").headers
+
+    def test_metrics(self):
+        """허용/거부 요청 수 집계"""
+        store = InMemoryRateLimitStore()
+        client = build_client({"/api/join": (1, 60)}, store=store)
+
+        client.get("/api/join")
+        client.get("/api/join")
+
+        metrics = store.metrics()
+        assert metrics["allowed_total"] == 1
+        assert metrics["limited_total"] == 1
+        assert metrics["keys"] == 1
+
+
+class TestPrincipalTracker:
+    """IP별 주체 추적 테스트"""
+
+    def test_count_and_expiry(self):
+        """윈도우 내 주체만 집계"""
+        tracker = PrincipalTracker(window_seconds=300)
+        tracker.observe("10.0.0.1", "enrollment:1", now=0.0)
+        tracker.observe("10.0.0.1", "enrollment:2", now=100.0)
+        tracker.observe("10.0.0.1", "enrollment:1", now=200.0)
+
+        assert tracker.count("10.0.0.1", now=250.0) == 2
+        assert tracker.count("10.0.0.1", now=450.0) == 1
+        assert tracker.count("10.0.0.1", now=600.0) == 0
+        assert tracker.scale("10.0.0.2") == 1
+
+    def test_max_per_ip(self):
+        """IP당 주체 수 상한"""
+        tracker = PrincipalTracker(max_per_ip=3)
+        for i in range(5):
+            tracker.observe("10.0.0.1", f"enrollment:{i}", now=float(i))
+
+        assert tracker.count("10.0.0.1", now=10.0) == 3
+
+    def test_backstop_scales_with_principals(self):
+        """관측된 주체 수만큼 IP 백스톱 한도 확장"""
+        tracker = PrincipalTracker()
+        app = FastAPI()
+
+        @app.get("/api/activity-log")
+        def activity_log():
+            return {"ok": True}
+
+        app.add_middleware(
+            RateLimitMiddleware,
+            rates={"/api/activity-log": (1, 60)},
+            store=InMemoryRateLimitStore(),
+            principal_tracker=tracker
+        )
+        client = TestClient(app)
+
+        assert client.get("/api/activity-log").status_code == 200
+        assert client.get("/api/activity-log").status_code == 429
+
+        tracker.observe("testclient", "enrollment:1")
+        tracker.observe("testclient", "enrollment:2")
+        tracker.observe("testclient", "enrollment:3")
+
+        assert client.get("/api/activity-log").status_code == 200
+        assert client.get("/api/activity-log").status_code == 200
+
+
+class TestPrincipalRateLimit:
+    """주체 단위 레이트리밋 테스트"""
+
+    def test_principal_and_run_limits(self):
+        """주체별 한도와 세션 전체 상한"""
+        from fastapi import HTTPException
+        from app.core.rate_limit import check_principal_rate_limit, rate_limit_store
+
+        rate_limit_store.clear()
+        check_principal_rate_limit("test", "enrollment:1", 1, run_id=99, run_limit=2)
+        check_principal_rate_limit("test", "enrollment:2", 1, run_id=99, run_limit=2)
+
+        # 주체별 한도 초과
+        with pytest.raises(HTTPException) as exc_info:
+            check_principal_rate_limit("test", "enrollment:1", 1, run_id=99, run_limit=2)
+        assert exc_info.value.status_code == 429
+
+        # 세션 전체 상한 초과
+        with pytest.raises(HTTPException) as exc_info:
+            check_principal_rate_limit("test", "enrollment:3", 1, run_id=99, run_limit=2)
+        assert exc_info.value.status_code == 429
+        rate_limit_store.clear()
+
+    def test_batch_cost_shares_limit(self):
+        """배치 요청은 건수만큼 차감되어 단건 요청과 같은 한도를 씀"""
+        from fastapi import HTTPException
+        from app.core.rate_limit import check_principal_rate_limit, rate_limit_store
+
+        rate_limit_store.clear()
+        check_principal_rate_limit("test", "enrollment:1", 5, cost=4)
+        check_principal_rate_limit("test", "enrollment:1", 5)
+
+        with pytest.raises(HTTPException) as exc_info:
+            check_principal_rate_limit("test", "enrollment:1", 5, cost=2)
+        assert exc_info.value.status_code == 429
+        rate_limit_store.clear()
+
+    def test_rejected_batch_not_charged(self, file_db, monkeypatch):
+        """검증에 실패한 배치는 한도를 차감하지 않음"""
+        from app.core.config import settings
+        from app.core.rate_limit import rate_limit_store
+        from app.main import app
+        from app.models import Enrollment, RunStatus, SessionRun, SessionTemplate
+        from app.routers.activity_log import get_current_student
+
+        db = file_db.db
+        template = SessionTemplate(teacher_id=file_db.teacher.id, mode_id="socratic", title="배치", settings_json={})
+        db.add(template)
+        db.commit()
+        run = SessionRun(template_id=template.id, name="배치 세션", status=RunStatus.LIVE, settings_snapshot_json={})
+        db.add(run)
+        db.commit()
+        enrollment = Enrollment(run_id=run.id, normalized_student_name="학생", rejoin_pin_hash="h")
+        db.add(enrollment)
+        db.commit()
+
+        monkeypatch.setattr(settings, "activity_write_rate_per_min", 3)
+        rate_limit_store.clear()
+        client = file_db.client()
+        app.dependency_overrides[get_current_student] = lambda: {
+            "run_id": run.id, "enrollment_id": enrollment.id, "student_name": "학생"
+        }
+        try:
+            logs = [{"activity_key": "writing.step1", "turn_index": i} for i in range(3)]
+            invalid = logs[:2] + [{"activity_key": "writing.step1", "turn_index": -1}]
+            assert client.post("/api/activity-log/batch", json={"logs": invalid}).status_code == 400
+
+            accepted = client.post("/api/activity-log/batch", json={"logs": logs})
+            assert accepted.status_code == 200
+            assert accepted.json()["saved"] == 3
+        finally:
+            app.dependency_overrides.pop(get_current_student, None)
+            rate_limit_store.clear()
+
+
+class TestSharedBackends:
+    """워커 간 공유 저장소 테스트"""
+
+    def test_sqlite_store_shared_between_workers(self, tmp_path):
+        """같은 파일을 여는 두 저장소(워커)가 카운터를 공유"""
+        from app.core.rate_limit import SQLiteRateLimitStore
+
+        path = str(tmp_path / "rate_limit.db")
+        worker_a = SQLiteRateLimitStore(path)
+        worker_b = SQLiteRateLimitStore(path)
+
+        assert worker_a.hit("ip|1.1.1.1", 3, 60, now=1000.0) is True
+        assert worker_b.hit("ip|1.1.1.1", 3, 60, now=1000.5) is True
+        assert worker_a.hit("ip|1.1.1.1", 3, 60, now=1001.0) is True
+        assert worker_b.hit("ip|1.1.1.1", 3, 60, now=1001.5) is False
+        assert worker_a.remaining("ip|1.1.1.1", 3, 60, now=1002.0) == 0
+
+    def test_sqlite_store_sweep_and_cap(self, tmp_path):
+        """유휴 키 정리와 키 상한"""
+        from app.core.rate_limit import SQLiteRateLimitStore
+
+        store = SQLiteRateLimitStore(str(tmp_path / "rate_limit.db"), max_keys=2, sweep_interval=10000)
+        store.hit("old", 5, 60, now=0.0)
+        for i in range(3):
+            store.hit(f"new{i}", 5, 60, now=500.0 + i)
+
+        assert store.sweep(now=510.0) == 2
+        assert store.metrics()["keys"] == 2
+
+    def test_sqlite_store_fails_open_when_locked(self, tmp_path):
+        """다른 워커가 쓰기 잠금을 놓지 않으면 요청 허용 후 오류 집계"""
+        import sqlite3
+        from app.core.rate_limit import SQLiteRateLimitStore
+
+        path = str(tmp_path / "rate_limit.db")
+        store = SQLiteRateLimitStore(path)
+        store.conn.execute("PRAGMA busy_timeout=0")
+        holder = sqlite3.connect(path, isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            assert store.hit("ip|1.1.1.1", 1, 60, now=1000.0) is True
+            assert store.metrics()["errors_total"] == 1
+        finally:
+            holder.execute("ROLLBACK")
+            holder.close()
+
+        assert store.hit("ip|1.1.1.1", 1, 60, now=1000.0) is True
+        assert store.hit("ip|1.1.1.1", 1, 60, now=1000.5) is False
+
+    def test_redis_store_with_standin(self):
+        """Redis 프로토콜 저장소 - 스크립트 로드 및 클라이언트 간 공유"""
+        from app.core.rate_limit import RedisRateLimitStore
+        from tests.redis_standin import RedisStandInServer
+
+        with RedisStandInServer() as server:
+            worker_a = RedisRateLimitStore(server.url)
+            worker_b = RedisRateLimitStore(server.url)
+
+            assert worker_a.hit("join|1", 2, 60) is True
+            assert worker_b.hit("join|1", 2, 60) is True
+            assert worker_a.hit("join|1", 2, 60) is False
+            assert worker_b.remaining("join|1", 2, 60) == 0
+
+            # 첫 호출은 NOSCRIPT 후 EVAL, 이후에는 EVALSHA만 사용
+            assert server.data.commands[:3] == ["EVALSHA", "EVAL", "EVALSHA"]
+
+            worker_a.clear(prefix="join|")
+            assert worker_b.hit("join|1", 2, 60) is True
+
+            # 배치 요청은 건수만큼 차감
+            assert worker_a.hit("batch|1", 5, 60, cost=4) is True
+            assert worker_b.hit("batch|1", 5, 60, cost=2) is False
+            assert worker_b.hit("batch|1", 5, 60) is True
+
+    def test_redis_store_reconnects_closed_connection(self):
+        """서버가 닫은 유휴 연결은 보내기 전에 재연결"""
+        import time
+        from app.core.rate_limit import RedisRateLimitStore
+        from tests.redis_standin import RedisStandInServer
+
+        with RedisStandInServer() as server:
+            store = RedisRateLimitStore(server.url)
+            assert store.hit("join|1", 2, 60) is True
+
+            server.close_clients()
+            time.sleep(0.05)
+            assert store.hit("join|1", 2, 60) is True
+            assert store.hit("join|1", 2, 60) is False
+            assert store.metrics()["errors_total"] == 0
+
+    def test_redis_store_read_timeout_not_resent(self):
+        """응답 대기 시간 초과 시 다시 보내지 않고 연결을 닫은 뒤 요청 허용"""
+        from app.core.rate_limit import RedisRateLimitStore
+        from tests.redis_standin import RedisStandInServer
+
+        with RedisStandInServer() as server:
+            store = RedisRateLimitStore(server.url)
+            assert store.hit("join|1", 5, 60) is True
+            store.conn.timeout = 0.2
+            store.conn.sock.settimeout(0.2)
+
+            server.data.hold_replies = True
+            server.data.commands.clear()
+            assert store.hit("join|1", 5, 60) is True
+            assert server.data.commands == ["EVALSHA"]
+            assert store.conn.sock is None
+            assert store.metrics()["errors_total"] == 1
+
+            server.data.hold_replies = False
+            # 첫 요청과 응답이 지연된 요청이 한 번씩만 차감됨
+            assert store.remaining("join|1", 5, 60) == 3
+
+    def test_redis_store_fails_open(self):
+        """Redis 연결 실패 시 요청 허용"""
+        from app.core.rate_limit import RedisRateLimitStore
+
+        store = RedisRateLimitStore("redis://127.0.0.1:1/0")
+
+        assert store.hit("join|1", 1, 60) is True
+        assert store.metrics()["errors_total"] == 1
+
+    def test_create_store_from_url(self, tmp_path):
+        """URL로 백엔드 선택"""
+        from app.core.rate_limit import create_rate_limit_store
+
+        assert create_rate_limit_store("memory://").backend == "memory"
+        assert create_rate_limit_store(f"sqlite:///{tmp_path}/rl.db").shared is True
+        with pytest.raises(ValueError):
+            create_rate_limit_store("memcached://localhost")
+
+
+class TestWorkerSafety:
+    """멀티 워커 실행 검사 테스트"""
+
+    def test_refuses_process_local_store(self, monkeypatch):
+        """프로세스 로컬 저장소로는 멀티 워커 실행 거부"""
+        from app.core import runtime
+        from app.core.rate_limit import InMemoryRateLimitStore
+
+        monkeypatch.setattr(runtime, "rate_limit_store", InMemoryRateLimitStore())
+
+        runtime.check_worker_safety(1)
+        with pytest.raises(RuntimeError, match="process-local"):
+            runtime.check_worker_safety(4)
+
+    def test_allows_shared_store(self, monkeypatch, tmp_path):
+        """공유 저장소면 멀티 워커 허용, fork 후 연결 재생성"""
+        from app.core import runtime
+        from app.core.rate_limit import SQLiteRateLimitStore
+
+        store = SQLiteRateLimitStore(str(tmp_path / "rate_limit.db"))
+        store.hit("join|1", 5, 60, now=1000.0)
+        monkeypatch.setattr(runtime, "rate_limit_store", store)
+
+        runtime.check_worker_safety(4)
+        old_conn = store.conn
+        runtime.reinit_after_fork()
+
+        assert store.conn is not old_conn
+        assert store.remaining("join|1", 5, 60, now=1001.0) == 4
+
+    def test_warns_process_local_principal_tracker(self, monkeypatch, tmp_path):
+        """주체 추적은 워커마다 따로이므로 멀티 워커에서 경고"""
+        from app.core import runtime
+        from app.core.rate_limit import SQLiteRateLimitStore
+
+        warnings = []
+        monkeypatch.setattr(runtime, "rate_limit_store", SQLiteRateLimitStore(str(tmp_path / "rate_limit.db")))
+        monkeypatch.setattr(runtime.logger, "warning", warnings.append)
+
+        runtime.check_worker_safety(1)
+        assert warnings == []
+        runtime.check_worker_safety(4)
+        assert any("Principal tracker is process-local" in message for message in warnings)
@@ -0,0 +1,137 @@
+"""
+세션 실행 목록 (조인 프로젝션, 키셋 페이지네이션, 개수 캐시) 테스트
+"""
+import pytest
+from sqlalchemy import event
+
+from app.core.pagination import encode_cursor
+from app.models import RunStatus, SessionRun, SessionTemplate
+from app.services.run_count_cache import RunCountCache, run_count_cache
+
+
+@pytest.fixture
+def listing(file_db):
+    """템플릿 두 개에 세션 30개 (created_at 동일 - 동률 처리 확인)"""
+    db = file_db.db
+    templates = [
+        SessionTemplate(teacher_id=file_db.teacher.id, mode_id="socratic", title=f"템플릿 {i}", settings_json={})
+        for i in range(2)
+    ] + [SessionTemplate(teacher_id=file_db.other.id, mode_id="socratic", title="다른 교사", settings_json={})]
+    db.add_all(templates)
+    db.commit()
+    statuses = [RunStatus.READY, RunStatus.LIVE, RunStatus.ENDED]
+    db.add_all([
+        SessionRun(template_id=templates[i % 2].id, name=f"세션 {i:02d}", status=statuses[i % 3], settings_snapshot_json={})
+        for i in range(30)
+    ])
+    db.add(SessionRun(template_id=templates[2].id, name="다른 교사 세션", status=RunStatus.LIVE, settings_snapshot_json={}))
+    db.commit()
+
+    return {"client": file_db.client(), "engine": file_db.engine, "db": db, "templates": templates}
+
+
+def names(response):
+    return [run["name"] for run in response.json()["runs"]]
+
+
+class TestRunListing:
+    """목록/페이지네이션"""
+
+    def test_single_projection_query(self, listing):
+        """템플릿 제목까지 한 번의 조인 쿼리, 개수는 캐시"""
+        statements = []
+        event.listen(listing["engine"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+        client = listing["client"]
+
+        data = client.get("/api/runs/?size=30").json()
+        run_queries = [s for s in statements if "session_runs" in s]
+        assert len(run_queries) == 2  # 목록 + 개수
+        assert "settings_snapshot_json" not in run_queries[0]
+        assert data["total"] == 30
+        assert data["has_next"] is False
+        assert {run["template_title"] for run in data["runs"]} == {"템플릿 0", "템플릿 1"}
+
+        statements.clear()
+        assert client.get("/api/runs/?size=30").json()["total"] == 30
+        assert len([s for s in statements if "session_runs" in s]) == 1
+
+    @pytest.mark.parametrize("params", ["", "&status=LIVE", "&status=ended"])
+    def test_cursor_pages_cover_all_rows(self, listing, params):
+        """커서로 끝까지 넘기면 중복/누락 없이 페이지 번호 방식과 같은 순서"""
+        client = listing["client"]
+        expected = names(client.get(f"/api/runs/?size=100{params}"))
+
+        seen, cursor = [], None
+        while True:
+            response = client.get(f"/api/runs/?size=4{params}" + (f"&cursor={cursor}" if cursor else ""))
+            assert response.status_code == 200
+            seen += names(response)
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                assert response.json()["has_next"] is False
+                break
+
+        assert seen == expected
+        assert len(set(seen)) == len(expected)
+
+    def test_cursor_bound_to_filters(self, listing):
+        """필터가 바뀐 커서는 400"""
+        client = listing["client"]
+        cursor = client.get("/api/runs/?size=4&status=LIVE").json()["next_cursor"]
+
+        assert client.get(f"/api/runs/?size=4&status=LIVE&cursor={cursor}").status_code == 200
+        assert client.get(f"/api/runs/?size=4&status=READY&cursor={cursor}").status_code == 400
+
+    def test_cursor_with_deleted_anchor(self, listing):
+        """기준 행이 삭제된 커서는 빈 페이지 대신 400"""
+        client, db = listing["client"], listing["db"]
+        data = client.get("/api/runs/?size=4").json()
+        db.query(SessionRun).filter(SessionRun.id == data["runs"][-1]["id"]).delete()
+        db.commit()
+
+        assert client.get(f"/api/runs/?size=4&cursor={data['next_cursor']}").status_code == 400
+
+    def test_cursor_with_other_teachers_anchor(self, listing):
+        """다른 교사의 세션 id로 만든 커서는 없는 기준 행과 같이 400"""
+        client, db = listing["client"], listing["db"]
+        other_run = db.query(SessionRun).filter(SessionRun.template_id == listing["templates"][2].id).one()
+        cursor = encode_cursor(other_run.id, template_id=None, status=None)
+
+        assert client.get(f"/api/runs/?size=4&cursor={cursor}").status_code == 400
+
+    def test_total_optional(self, listing):
+        """include_total=false면 개수 쿼리 생략"""
+        misses = run_count_cache.misses
+        data = listing["client"].get("/api/runs/?include_total=false").json()
+
+        assert data["total"] is None
+        assert data["has_next"] is True
+        assert run_count_cache.misses == misses
+
+    def test_total_invalidated_on_create_start_end(self, listing):
+        """세션 생성/시작/종료 시 캐시된 개수 갱신"""
+        client = listing["client"]
+        template_id = listing["templates"][0].id
+        assert client.get("/api/runs/?status=LIVE").json()["total"] == 10
+
+        run = client.post("/api/runs/", json={"template_id": template_id, "name": "새 세션"}).json()
+        assert client.get("/api/runs/").json()["total"] == 31
+
+        assert client.post(f"/api/runs/{run['id']}/start").status_code == 200
+        assert client.get("/api/runs/?status=LIVE").json()["total"] == 11
+
+        assert client.post(f"/api/runs/{run['id']}/end").status_code == 200
+        assert client.get("/api/runs/?status=LIVE").json()["total"] == 10
+        assert client.get("/api/runs/?status=ENDED").json()["total"] == 11
+
+
+class TestRunCountCache:
+    """개수 캐시 만료"""
+
+    def test_expires_after_ttl(self):
+        cache = RunCountCache(ttl_sec=30)
+        counts = iter([5, 6])
+
+        assert cache.get_or_count(1, None, None, lambda: next(counts), now=0) == 5
+        assert cache.get_or_count(1, None, None, lambda: next(counts), now=10) == 5
+        assert cache.get_or_count(1, None, None, lambda: next(counts), now=31) == 6
@@ -0,0 +1,108 @@
+"""
+세션 통계 단일 쿼리 집계 테스트
+"""
+import pytest
+from sqlalchemy import event
+
+from app.models import ActivityLog, Enrollment, RunStatus, SessionRun, SessionTemplate
+from app.services.run_statistics_service import RunStatisticsService, parse_include
+
+
+@pytest.fixture
+def stats_db(file_db):
+    """학생 3명 입장, 2명만 대화 (입력 없는 턴 포함) + 빈 세션"""
+    db = file_db.db
+    template = SessionTemplate(teacher_id=file_db.teacher.id, mode_id="socratic", title="통계", settings_json={})
+    db.add(template)
+    db.commit()
+    run = SessionRun(template_id=template.id, name="통계", status=RunStatus.LIVE, settings_snapshot_json={})
+    empty = SessionRun(template_id=template.id, name="빈 세션", status=RunStatus.READY, settings_snapshot_json={})
+    db.add_all([run, empty])
+    db.commit()
+
+    db.add_all([Enrollment(run_id=run.id, normalized_student_name=name, rejoin_pin_hash="h") for name in ("가", "나", "다")])
+    inputs = {"가": ["a", "b", "", None, "c"], "나": ["d", ""]}
+    db.add_all([
+        ActivityLog(run_id=run.id, student_name=name, activity_key="socratic.chat", turn_index=i, student_input=text)
+        for name, texts in inputs.items() for i, text in enumerate(texts)
+    ])
+    db.commit()
+
+    return {"db": db, "engine": file_db.engine, "run_id": run.id, "empty_id": empty.id}
+
+
+class TestRunStatisticsService:
+    """집계 결과"""
+
+    def test_all_parts_in_one_query(self, stats_db):
+        """전체 항목을 쿼리 한 번으로 집계"""
+        statements = []
+        event.listen(stats_db["engine"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        result = RunStatisticsService(stats_db["db"]).get_statistics(stats_db["run_id"])
+
+        assert len(statements) == 1
+        assert result["student_count"] == 3
+        assert result["total_turns"] == 4
+        assert result["student_turns"] == [
+            {"student_name": "가", "turn_count": 3},
+            {"student_name": "나", "turn_count": 1},
+        ]
+        assert result["latest_activity"] is not None
+
+    def test_only_requested_parts(self, stats_db):
+        """요청한 항목만 반환"""
+        service = RunStatisticsService(stats_db["db"])
+
+        assert service.get_statistics(stats_db["run_id"], {"total_turns"}) == {"run_id": stats_db["run_id"], "total_turns": 4}
+        assert set(service.get_statistics(stats_db["run_id"], {"student_count", "latest_activity"})) == {
+            "run_id", "student_count", "latest_activity"
+        }
+
+    def test_empty_run(self, stats_db):
+        """활동이 없는 세션"""
+        result = RunStatisticsService(stats_db["db"]).get_statistics(stats_db["empty_id"])
+
+        assert result == {
+            "run_id": stats_db["empty_id"],
+            "student_count": 0,
+            "total_turns": 0,
+            "student_turns": [],
+            "latest_activity": None,
+        }
+
+    def test_activity_logs_read_from_covering_indexes(self, stats_db):
+        """턴 수는 입력 있는 턴만 담은 부분 인덱스, 최신 활동은 학생별 복합 인덱스에서 읽음"""
+        statements = []
+        event.listen(stats_db["engine"], "before_cursor_execute",
+                     lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters)))
+        RunStatisticsService(stats_db["db"]).get_statistics(stats_db["run_id"])
+
+        statement, parameters = statements[0]
+        plan = stats_db["db"].connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        activity_scans = [row[-1] for row in plan if "activity_logs" in row[-1]]
+        assert len(activity_scans) == 2
+        assert any("INDEX idx_activity_logs_run_student_input_turns" in detail for detail in activity_scans)
+        assert any("COVERING INDEX idx_activity_logs_run_student_created" in detail for detail in activity_scans)
+
+    def test_parse_include(self):
+        assert parse_include(None) == {"student_count", "total_turns", "student_turns", "latest_activity"}
+        assert parse_include(" total_turns, student_count ") == {"total_turns", "student_count"}
+        with pytest.raises(ValueError):
+            parse_include("total_turns,scores")
+
+
+class TestStatisticsEndpoint:
+    """GET /api/runs/{run_id}/statistics"""
+
+    @pytest.fixture
+    def client(self, file_db, stats_db):
+        return file_db.client()
+
+    def test_include_parameter(self, client, stats_db):
+        run_id = stats_db["run_id"]
+
+        assert client.get(f"/api/runs/{run_id}/statistics?include=total_turns").json() == {"run_id": run_id, "total_turns": 4}
+        assert client.get(f"/api/runs/{run_id}/statistics").json()["student_count"] == 3
+        assert client.get(f"/api/runs/{run_id}/statistics?include=scores").status_code == 400
+        assert client.get("/api/runs/999/statistics").status_code == 404
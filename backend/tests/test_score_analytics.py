@@ -0,0 +1,140 @@
+"""
+세션 평가 점수 분석 테스트
+"""
+import pytest
+
+from app.models import ActivityLog, Enrollment, RunStatus, SessionRun, SessionTemplate
+from app.services.live_snapshot_service import LiveSnapshotService
+from app.services.score_analytics_service import ScoreAnalyticsCache, ScoreAnalyticsService, students_below
+
+
+def evaluation(overall, depth=None, completed=False):
+    dimensions = {"depth": overall if depth is None else depth, "breadth": overall,
+                  "application": overall, "metacognition": overall, "engagement": overall}
+    return {"understanding_score": overall, "is_completed": completed, "dimensions": dimensions}
+
+
+# 학생별 overall 점수 (None은 평가 없는 턴)
+SCORES = {
+    "민수": [40, 50, 60, 70],           # 꾸준히 상승
+    "지영": [55, 50, 50, 45],           # 정체
+    "철수": [30, None, 80],             # 완료
+}
+
+
+@pytest.fixture
+def analytics_db(file_db):
+    db = file_db.db
+    template = SessionTemplate(teacher_id=file_db.teacher.id, mode_id="socratic", title="점수", settings_json={})
+    db.add(template)
+    db.commit()
+    live = SessionRun(template_id=template.id, name="live", status=RunStatus.LIVE, settings_snapshot_json={})
+    ended = SessionRun(template_id=template.id, name="ended", status=RunStatus.ENDED, settings_snapshot_json={})
+    db.add_all([live, ended])
+    db.commit()
+    for run in (live, ended):
+        for student, scores in SCORES.items():
+            db.add(Enrollment(run_id=run.id, normalized_student_name=student, rejoin_pin_hash="h"))
+            for turn, score in enumerate(scores):
+                completed = student == "철수" and turn == len(scores) - 1
+                db.add(ActivityLog(
+                    run_id=run.id, student_name=student, activity_key="socratic.chat", turn_index=turn,
+                    student_input="응답", ai_output="질문",
+                    third_eval_json=None if score is None else evaluation(score, completed=completed),
+                ))
+    db.commit()
+    return {"db": db, "live": live.id, "ended": ended.id}
+
+
+class TestScoreAnalyticsService:
+    def test_students(self, analytics_db):
+        result = ScoreAnalyticsService(analytics_db["db"]).get_analytics(analytics_db["live"])
+        students = {item["student_name"]: item for item in result["students"]}
+
+        assert result["assessed_turns"] == 10
+        assert students["민수"]["latest"]["overall_score"] == 70
+        assert students["민수"]["change"]["depth"] == 30
+        assert students["민수"]["mean_delta_per_turn"]["overall_score"] == 10
+        assert students["민수"]["trajectory"] == {"turn_index": [0, 1, 2, 3], "overall_score": [40, 50, 60, 70]}
+        assert students["철수"]["assessed_turns"] == 2
+        assert students["철수"]["trajectory"]["turn_index"] == [0, 2]
+        assert students["철수"]["completed"] is True
+        assert students["지영"]["recent_change"] == -5
+
+    def test_class_and_stuck(self, analytics_db):
+        result = ScoreAnalyticsService(analytics_db["db"]).get_analytics(analytics_db["live"], trajectories=False)
+        assert result["stuck_students"] == ["지영"]
+        assert result["class"]["completion_rate"] == pytest.approx(1 / 3, abs=1e-4)
+        assert result["class"]["percentiles"]["overall_score"]["p50"] == 70
+        # 변화: 민수 +10×3, 지영 -5,0,-5, 철수 +50 → 평균 70/7
+        assert result["class"]["mean_delta_per_turn"]["overall_score"] == 10
+        assert "trajectory" not in result["students"][0]
+
+    def test_empty_run(self, analytics_db):
+        db = analytics_db["db"]
+        result = ScoreAnalyticsService(db).get_analytics(9999)
+        assert result["students"] == [] and result["class"] is None
+
+
+class TestScoreColumns:
+    """third_eval_json 생성 열 조회"""
+
+    def test_students_below(self, analytics_db):
+        below = students_below(analytics_db["db"], analytics_db["live"], "overall_score", 50)
+        assert below == [
+            {"student_name": "철수", "lowest": 30, "turns_below": 1},
+            {"student_name": "민수", "lowest": 40, "turns_below": 1},
+            {"student_name": "지영", "lowest": 45, "turns_below": 1},
+        ]
+
+    def test_live_snapshot_latest_score(self, analytics_db):
+        snapshot = LiveSnapshotService(analytics_db["db"]).get_run_live_snapshot(analytics_db["live"])
+        students = {item["student_name"]: item for item in snapshot["students"]}
+        assert students["지영"]["latest_overall_score"] == 45
+        assert students["지영"]["is_completed"] is False
+        assert students["철수"]["latest_overall_score"] == 80
+        assert students["철수"]["is_completed"] is True
+
+
+class TestScoreAnalyticsCache:
+    def test_recomputed_only_when_logs_change(self, analytics_db):
+        db, run_id = analytics_db["db"], analytics_db["live"]
+        cache = ScoreAnalyticsCache()
+        first = cache.get(db, run_id)
+        assert cache.get(db, run_id) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        db.add(ActivityLog(run_id=run_id, student_name="지영", activity_key="socratic.chat", turn_index=4,
+                           student_input="응답", ai_output="질문", third_eval_json=evaluation(90)))
+        db.commit()
+        updated = cache.get(db, run_id)
+        assert cache.misses == 2
+        assert updated["version"]["logs"] == first["version"]["logs"] + 1
+        assert updated["stuck_students"] == []
+
+
+class TestScoreAnalyticsEndpoint:
+    @pytest.fixture
+    def client(self, file_db, analytics_db):
+        return file_db.client()
+
+    def test_live_and_ended(self, client, analytics_db):
+        live = client.get(f"/api/runs/{analytics_db['live']}/score-analytics")
+        assert live.status_code == 200
+        assert live.json()["stuck_students"] == ["지영"]
+
+        ended = client.get(f"/api/runs/{analytics_db['ended']}/score-analytics?trajectories=false")
+        assert ended.status_code == 200
+        assert "immutable" in ended.headers["cache-control"]
+        assert ended.json()["class"]["student_count"] == 3
+
+    def test_students_below_endpoint(self, client, analytics_db):
+        response = client.get(f"/api/runs/{analytics_db['live']}/score-analytics/below?field=depth&threshold=45")
+        assert response.status_code == 200
+        assert [item["student_name"] for item in response.json()["students"]] == ["철수", "민수"]
+        assert client.get(
+            f"/api/runs/{analytics_db['live']}/score-analytics/below?field=insights&threshold=45"
+        ).status_code == 400
+
+    def test_unknown_run(self, client):
+        assert client.get("/api/runs/9999/score-analytics").status_code == 404
@@ -0,0 +1,186 @@
+"""
+SQLite 성능 프로파일, WAL 체크포인트, 읽기/쓰기 연결 분리 테스트
+"""
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.database import create_db_engine, get_write_db
+from app.main import app
+from app.core.sqlite_maintenance import SQLiteMaintenance, create_sqlite_maintenance
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, body TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+def write_rows(engine, count, size=2000):
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO items (body) VALUES (:body)"),
+            [{"body": "x" * size} for _ in range(count)]
+        )
+
+
+class TestSQLiteProfile:
+    """연결별 PRAGMA 프로파일"""
+
+    def test_pragmas_applied(self, sqlite_engine):
+        """성능 프로파일이 모든 연결에 적용됨"""
+        with sqlite_engine.connect() as conn:
+            pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == settings.sqlite_busy_timeout_ms
+            assert pragma("cache_size") == -settings.sqlite_cache_size_kb
+            assert pragma("temp_store") == 2  # MEMORY
+            assert pragma("wal_autocheckpoint") == settings.sqlite_wal_autocheckpoint_pages
+            assert pragma("auto_vacuum") == 2  # INCREMENTAL (새 DB)
+            assert pragma("foreign_keys") == 1
+
+
+class TestSQLiteMaintenance:
+    """백그라운드 체크포인트"""
+
+    def test_skips_while_writes_active(self, sqlite_engine):
+        """최근 쓰기가 있으면 체크포인트 보류"""
+        maintenance = create_sqlite_maintenance(sqlite_engine)
+        write_rows(sqlite_engine, 10)
+
+        assert maintenance.run_once() is None
+        assert maintenance.skipped_active_total == 1
+
+        # 조용한 시간이 지나면 실행
+        assert maintenance.run_once(now=time.time() + 60) == "PASSIVE"
+        maintenance.stop()
+
+    def test_truncate_when_wal_large(self, sqlite_engine):
+        """WAL이 기준보다 크면 TRUNCATE로 파일을 비움"""
+        maintenance = SQLiteMaintenance(
+            sqlite_engine.url.database,
+            truncate_bytes=64 * 1024,
+            optimize_interval=10 ** 9,
+        )
+        write_rows(sqlite_engine, 100)
+        assert maintenance.wal_size() > 64 * 1024
+
+        assert maintenance.run_once(force=True) == "TRUNCATE"
+
+        metrics = maintenance.metrics()
+        assert metrics["wal_size_bytes"] == 0
+        assert metrics["checkpoint_lag_frames"] == 0
+        assert metrics["checkpoints_total"]["TRUNCATE"] == 1
+        maintenance.stop()
+
+    def test_optimize_reclaims_pages(self, sqlite_engine):
+        """주기가 되면 optimize와 incremental_vacuum으로 빈 페이지 회수"""
+        maintenance = SQLiteMaintenance(sqlite_engine.url.database, optimize_interval=0)
+        write_rows(sqlite_engine, 100)
+        with sqlite_engine.begin() as conn:
+            conn.execute(text("DELETE FROM items"))
+
+        maintenance.run_once(force=True)
+
+        assert maintenance.optimize_total == 1
+        assert maintenance.vacuum_pages_freed_total > 0
+        maintenance.stop()
+
+    def test_single_worker_runs_maintenance(self, sqlite_engine):
+        """여러 워커 중 잠금을 가진 한 곳만 실행, 그 워커가 멈추면 다른 워커가 이어받음"""
+        worker_a = create_sqlite_maintenance(sqlite_engine)
+        worker_b = create_sqlite_maintenance(sqlite_engine)
+
+        assert worker_a.run_if_leader(force=True) == "PASSIVE"
+        assert worker_b.run_if_leader(force=True) is None
+        assert worker_a.is_leader and not worker_b.is_leader
+
+        worker_a.stop()
+        assert worker_b.run_if_leader(force=True) == "PASSIVE"
+        assert worker_b.metrics()["maintenance_leader"] is True
+        worker_b.stop()
+
+    def test_not_created_for_memory_db(self):
+        """인메모리 DB는 유지보수 대상 아님"""
+        engine = create_db_engine("sqlite://")
+        assert create_sqlite_maintenance(engine) is None
+
+
+class TestReadWriteSplit:
+    """단일 쓰기 연결 / 읽기 전용 연결 풀"""
+
+    def test_reader_is_query_only(self, tmp_path):
+        """읽기 엔진으로는 쓰기 불가, 쓰기 결과는 바로 조회됨"""
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+        writer = create_db_engine(url, role="writer")
+        reader = create_db_engine(url, role="reader")
+
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, body TEXT)"))
+            conn.execute(text("INSERT INTO items (body) VALUES ('a')"))
+
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM items")).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                conn.execute(text("INSERT INTO items (body) VALUES ('b')"))
+
+        writer.dispose()
+        reader.dispose()
+
+    def test_reader_not_blocked_by_open_write(self, tmp_path):
+        """쓰기 트랜잭션이 열려 있어도 읽기는 대기 없이 마지막 커밋 내용을 조회"""
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+        writer = create_db_engine(url, role="writer")
+        reader = create_db_engine(url, role="reader")
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, body TEXT)"))
+
+        with writer.connect() as write_conn:
+            transaction = write_conn.begin()  # BEGIN IMMEDIATE - 쓰기 락 보유
+            write_conn.execute(text("INSERT INTO items (body) VALUES ('pending')"))
+
+            started = time.perf_counter()
+            with reader.connect() as read_conn:
+                assert read_conn.execute(text("SELECT count(*) FROM items")).scalar() == 0
+            assert time.perf_counter() - started < 1.0
+
+            transaction.commit()
+
+        with reader.connect() as read_conn:
+            assert read_conn.execute(text("SELECT count(*) FROM items")).scalar() == 1
+
+        writer.dispose()
+        reader.dispose()
+
+    def test_writer_pool_is_single_connection(self, tmp_path):
+        """쓰기 엔진은 연결 하나로 직렬화"""
+        writer = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}", role="writer")
+
+        assert writer.pool.size() == 1
+        assert writer.pool._max_overflow == 0
+        writer.dispose()
+
+    @pytest.mark.parametrize("file_db", [{"split": True}], indirect=True)
+    def test_routes_use_split_sessions(self, file_db):
+        """쓰기 라우트는 쓰기 엔진, 조회 라우트는 읽기 전용 엔진으로 동작"""
+        client = file_db.client()
+
+        created = client.post("/api/templates/", json={"mode_id": "socratic", "title": "분리 확인", "settings_json": {}})
+        assert created.status_code == 200
+
+        listed = client.get("/api/templates/")
+        assert listed.status_code == 200
+        assert [item["title"] for item in listed.json()["templates"]] == ["분리 확인"]
+
+        # 쓰기 라우트가 읽기 세션을 받으면 query_only로 거부됨
+        app.dependency_overrides[get_write_db] = file_db.session_override(file_db.ReadSession)
+        with pytest.raises(OperationalError, match="readonly"):
+            client.post("/api/templates/", json={"mode_id": "socratic", "title": "거부", "settings_json": {}})
@@ -0,0 +1,147 @@
+"""
+템플릿 목록 조회 (즉시 로딩, 키셋 페이지네이션, 제목 검색 인덱스) 테스트
+"""
+import pytest
+from sqlalchemy import event
+
+from app.models import Mode, SessionTemplate
+from app.models.session_template import SQLITE_TRIGRAM_AVAILABLE
+
+TITLES = ["환경 보호 글쓰기", "기후 변화 토론", "AI 윤리 탐구", "환경과 에너지", "독서 감상문"]
+
+
+@pytest.fixture
+def listing(file_db):
+    """교사 두 명, 첫 교사에게 템플릿 25개 (created_at 동일 - 동률 처리 확인)"""
+    db = file_db.db
+    db.add(Mode(id="strategic_writing", name="전략적 글쓰기", options_schema={"type": "object"}))
+    db.commit()
+    db.add_all([
+        SessionTemplate(
+            teacher_id=file_db.teacher.id,
+            mode_id="socratic" if i % 5 == 4 else "strategic_writing",
+            title=f"{TITLES[i % len(TITLES)]} {i:02d}",
+            settings_json={},
+        )
+        for i in range(25)
+    ])
+    db.add(SessionTemplate(teacher_id=file_db.other.id, mode_id="strategic_writing", title="환경 보호 글쓰기 (다른 교사)", settings_json={}))
+    db.commit()
+
+    return {"client": file_db.client(), "engine": file_db.engine, "db": db}
+
+
+def titles(response):
+    return [template["title"] for template in response.json()["templates"]]
+
+
+class TestTemplateListing:
+    """목록/페이지네이션"""
+
+    def test_mode_loaded_without_n_plus_one(self, listing):
+        """페이지 크기와 무관하게 쿼리 수 일정"""
+        statements = []
+        event.listen(listing["engine"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        response = listing["client"].get("/api/templates/?size=25")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 25
+        assert data["total_pages"] == 1
+        assert all(template["mode"]["id"] == template["mode_id"] for template in data["templates"])
+        # 개수, 목록, 모드(selectin) 세 번
+        assert len([s for s in statements if "session_templates" in s or "FROM modes" in s]) == 3
+
+    @pytest.mark.parametrize("sort,order", [("created_at", "desc"), ("title", "asc"), ("updated_at", "asc")])
+    def test_cursor_pages_cover_all_rows(self, listing, sort, order):
+        """커서로 끝까지 넘기면 중복/누락 없이 페이지 번호 방식과 같은 순서"""
+        client = listing["client"]
+        expected = titles(client.get(f"/api/templates/?size=25&sort={sort}&order={order}"))
+
+        seen, cursor = [], None
+        while True:
+            url = f"/api/templates/?size=7&sort={sort}&order={order}"
+            response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+            assert response.status_code == 200
+            data = response.json()
+            if cursor:
+                assert data["total"] is None
+            seen += titles(response)
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == expected
+        assert len(set(seen)) == 25
+
+    def test_page_mode_still_supported(self, listing):
+        """기존 page 파라미터 동작 유지"""
+        data = listing["client"].get("/api/templates/?page=3&size=10").json()
+
+        assert data["page"] == 3
+        assert data["total_pages"] == 3
+        assert len(data["templates"]) == 5
+        assert data["next_cursor"] is None
+
+    def test_invalid_cursor(self, listing):
+        """잘못된 커서나 정렬이 바뀐 커서는 400"""
+        client = listing["client"]
+        assert client.get("/api/templates/?cursor=not-a-cursor").status_code == 400
+
+        cursor = client.get("/api/templates/?size=5").json()["next_cursor"]
+        assert client.get(f"/api/templates/?size=5&cursor={cursor}").status_code == 200
+        assert client.get(f"/api/templates/?size=5&sort=title&cursor={cursor}").status_code == 400
+
+    def test_cursor_with_deleted_anchor(self, listing):
+        """기준 행이 삭제된 커서는 빈 페이지 대신 400"""
+        client, db = listing["client"], listing["db"]
+        data = client.get("/api/templates/?size=5").json()
+        db.query(SessionTemplate).filter(SessionTemplate.id == data["templates"][-1]["id"]).delete()
+        db.commit()
+
+        assert client.get(f"/api/templates/?size=5&cursor={data['next_cursor']}").status_code == 400
+
+
+class TestTemplateSearch:
+    """제목/모드 이름 검색"""
+
+    def test_title_substring_search(self, listing):
+        """3글자 이상은 trigram 인덱스, 짧은 검색어도 같은 결과 형태"""
+        client = listing["client"]
+
+        long_query = titles(client.get("/api/templates/?size=100&query=보호 글"))
+        assert len(long_query) == 5
+        assert all("보호 글" in title for title in long_query)
+
+        short_query = titles(client.get("/api/templates/?size=100&query=환경"))
+        assert len(short_query) == 10
+        assert "환경 보호 글쓰기 (다른 교사)" not in short_query
+
+    def test_mode_name_search(self, listing):
+        """모드 이름으로도 검색"""
+        result = listing["client"].get("/api/templates/?size=100&query=소크라테스").json()
+
+        assert result["total"] == 5
+        assert {template["mode_id"] for template in result["templates"]} == {"socratic"}
+
+    def test_query_is_not_fts_syntax(self, listing):
+        """FTS 연산자/따옴표가 그대로 문자열로 검색됨"""
+        response = listing["client"].get('/api/templates/?query=" OR 토론')
+        assert response.status_code == 200
+        assert response.json()["total"] == 0
+
+    @pytest.mark.skipif(not SQLITE_TRIGRAM_AVAILABLE, reason="SQLite trigram tokenizer unavailable")
+    def test_index_follows_updates(self, listing):
+        """제목 수정/삭제가 검색 인덱스에 반영됨"""
+        db, client = listing["db"], listing["client"]
+        template = db.query(SessionTemplate).filter(SessionTemplate.title == "독서 감상문 04").first()
+        template.title = "새로운 제목 04"
+        db.commit()
+
+        assert titles(client.get("/api/templates/?query=새로운 제목")) == ["새로운 제목 04"]
+        assert "독서 감상문 04" not in titles(client.get("/api/templates/?size=100&query=독서 감상"))
+
+        db.delete(template)
+        db.commit()
+        assert titles(client.get("/api/templates/?query=새로운 제목")) == []
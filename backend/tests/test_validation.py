@@ -0,0 +1,101 @@
+"""
+모드 스키마 검증 테스트
+"""
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core import validation
+from app.core.database import Base, create_db_engine
+from app.core.validation import (
+    clear_validator_cache,
+    get_schema_validator,
+    validate_settings_against_schema,
+    warm_validator_cache,
+)
+from app.models import Mode
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "topic": {"type": "string", "minLength": 1},
+        "difficulty": {"type": "string", "enum": ["초급", "중급", "고급"]},
+        "rounds": {"type": "integer", "minimum": 1},
+    },
+    "required": ["topic", "difficulty"],
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_validator_cache()
+    yield
+    clear_validator_cache()
+
+
+class TestValidatorCache:
+    """컴파일된 검증기 캐시"""
+
+    def test_reused_per_mode_version(self, monkeypatch):
+        """같은 (모드, 버전)은 한 번만 컴파일"""
+        compiled = []
+        original = validation.compile_schema
+        monkeypatch.setattr(validation, "compile_schema", lambda schema: compiled.append(1) or original(schema))
+
+        for _ in range(100):
+            assert validate_settings_against_schema(
+                {"topic": "환경", "difficulty": "초급"}, SCHEMA, "writing", "1.0"
+            ) == (True, [])
+
+        assert len(compiled) == 1
+        assert get_schema_validator(SCHEMA, "writing", "1.0") is get_schema_validator(SCHEMA, "writing", "1.0")
+        assert get_schema_validator(SCHEMA, "writing", "2.0") is not get_schema_validator(SCHEMA, "writing", "1.0")
+
+    def test_rebuilt_when_schema_changes(self):
+        """버전이 같아도 스키마가 바뀌면 새로 컴파일"""
+        validate_settings_against_schema({"topic": "a", "difficulty": "초급"}, SCHEMA, "writing", "1.0")
+        stricter = {**SCHEMA, "required": ["topic", "difficulty", "rounds"]}
+
+        is_valid, errors = validate_settings_against_schema(
+            {"topic": "a", "difficulty": "초급"}, stricter, "writing", "1.0"
+        )
+
+        assert is_valid is False
+        assert errors[0].path == "root"
+
+    def test_warm_from_database(self, tmp_path):
+        """시작 시 modes 테이블에서 미리 컴파일, 잘못된 스키마는 건너뜀"""
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        db.add_all([
+            Mode(id="warm_mode", name="Warm", version="3", options_schema=SCHEMA),
+            Mode(id="broken_mode", name="Broken", version="1", options_schema={"type": "not-a-type"}),
+        ])
+        db.commit()
+
+        assert warm_validator_cache(db) == 1
+        assert ("warm_mode", "3") in validation._validator_cache
+
+        db.close()
+        engine.dispose()
+
+
+class TestValidationErrors:
+    """오류 보고"""
+
+    def test_all_errors_reported(self):
+        """첫 번째 오류만이 아니라 모든 오류 반환"""
+        is_valid, errors = validate_settings_against_schema(
+            {"topic": "", "difficulty": "최상급", "rounds": 0}, SCHEMA, "writing", "1.0"
+        )
+
+        assert is_valid is False
+        assert [error.path for error in errors] == ["difficulty", "rounds", "topic"]
+
+    def test_invalid_schema(self):
+        """스키마 자체 오류는 schema 경로로 보고하고 캐시하지 않음"""
+        is_valid, errors = validate_settings_against_schema({}, {"type": "not-a-type"}, "broken", "1.0")
+
+        assert is_valid is False
+        assert errors[0].path == "schema"
+        assert ("broken", "1.0") not in validation._validator_cache
@@ -4,6 +4,7 @@ class SocraticChatPlatform {
         this.platformApiBase = window.PLATFORM_CONFIG?.platformApiBase || '/api';
         this.topic = '';
         this.messages = [];
+        this.conversationId = null; // 서버 저장 대화 ID (있으면 새 메시지만 전송)
         this.understandingScore = 0;
         this.isCompleted = false;
         this.showScore = true;
@@ -30,6 +31,9 @@ class SocraticChatPlatform {
         this.topic = settings.topic || '학습 주제';
         this.difficulty = settings.difficulty || 'normal';
         this.showScore = settings.score_display === 'show';
+        // 5차원 평가 정책 (없으면 proto4 서버 기본값)
+        this.assessmentPolicy = settings.assessment_policy;
+        this.assessmentInterval = settings.assessment_interval;
         
         if (!this.topic) {
             alert('주제가 설정되지 않았습니다.');
@@ -275,15 +279,19 @@ class SocraticChatPlatform {
     }
     
     async loadInitialMessage() {
+        let aiContent = null;
         try {
-            const response = await fetch(`${this.apiBase}/chat/initial`, {
+            // 토큰이 도착하는 대로 말풍선에 표시 (SSE)
+            const response = await fetch(`${this.apiBase}/chat/initial/stream`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({
                     topic: this.topic,
-                    difficulty: this.difficulty
+                    difficulty: this.difficulty,
+                    assessment_policy: this.assessmentPolicy,
+                    assessment_interval: this.assessmentInterval
                 })
             });
             
@@ -291,10 +299,30 @@ class SocraticChatPlatform {
                 throw new Error('초기 메시지 로드에 실패했습니다.');
             }
             
-            const data = await response.json();
+            let data = null;
+            await this.readEventStream(response, (eventName, payload) => {
+                if (eventName === 'token') {
+                    if (!aiContent) {
+                        this.hideLoadingMessage();
+                        aiContent = this.addMessage('ai', '');
+                    }
+                    this.appendToMessage(aiContent, payload.delta);
+                } else if (eventName === 'done') {
+                    data = payload;
+                }
+            });
             
+            if (!data) {
+                throw new Error('초기 메시지 스트림이 중단되었습니다.');
+            }
+            
+            this.conversationId = data.conversation_id || null;
             this.hideLoadingMessage();
-            this.addMessage('ai', data.initial_message);
+            if (aiContent) {
+                aiContent.textContent = data.initial_message;
+            } else {
+                this.addMessage('ai', data.initial_message);
+            }
             this.enableInput();
             
             // 플랫폼에 초기 메시지 로드 완료 알림
@@ -313,7 +341,11 @@ class SocraticChatPlatform {
         } catch (error) {
             console.error('Error loading initial message:', error);
             this.hideLoadingMessage();
-            this.addMessage('ai', '안녕하세요! 함께 탐구해볼까요?');
+            if (aiContent) {
+                aiContent.textContent = '안녕하세요! 함께 탐구해볼까요?';
+            } else {
+                this.addMessage('ai', '안녕하세요! 함께 탐구해볼까요?');
+            }
             this.enableInput();
             
             this.sendToPlatform('error', {
@@ -350,27 +382,38 @@ class SocraticChatPlatform {
         currentInput.value = '';
         this.disableInput();
         
+        let aiContent = null;
         try {
-            const response = await fetch(`${this.apiBase}/chat/socratic`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    topic: this.topic,
-                    messages: this.messages,
-                    understanding_level: this.understandingScore,
-                    difficulty: this.difficulty
-                })
-            });
+            // 응답 토큰은 도착하는 대로 표시하고, 평가는 마지막 done 이벤트로 받음 (SSE)
+            const response = await this.postChatTurn('/chat/socratic/stream', userMessage);
             
             if (!response.ok) {
                 throw new Error('AI 응답을 받아올 수 없습니다.');
             }
             
-            const data = await response.json();
+            let data = null;
+            await this.readEventStream(response, (eventName, payload) => {
+                if (eventName === 'token') {
+                    if (!aiContent) {
+                        aiContent = this.addMessage('ai', '');
+                    }
+                    this.appendToMessage(aiContent, payload.delta);
+                } else if (eventName === 'done') {
+                    data = payload;
+                } else if (eventName === 'error') {
+                    throw new Error(payload.detail);
+                }
+            });
+            
+            if (!data) {
+                throw new Error('AI 응답 스트림이 중단되었습니다.');
+            }
             
-            this.addMessage('ai', data.socratic_response);
+            if (aiContent) {
+                aiContent.textContent = data.socratic_response;
+            } else {
+                this.addMessage('ai', data.socratic_response);
+            }
             this.messages.push({ role: 'assistant', content: data.socratic_response });
             
             if (this.showScore) {
@@ -388,12 +431,12 @@ class SocraticChatPlatform {
                 this.understandingScore = data.understanding_score;
             }
             
-            // 활동 로그 저장
+            // 활동 로그 저장 (평가하지 않은 턴은 이전 점수가 중복 집계되지 않도록 점수 없이 기록)
             await this.saveActivityLog({
                 turn_index: this.turnIndex,
                 student_input: userMessage,
                 ai_output: data.socratic_response,
-                evaluation: {
+                evaluation: data.assessed === false ? { assessed: false } : {
                     understanding_score: data.understanding_score,
                     is_completed: data.is_completed,
                     dimensions: data.dimensions,
@@ -414,7 +457,11 @@ class SocraticChatPlatform {
             
         } catch (error) {
             console.error('Error:', error);
-            this.addMessage('ai', '죄송해요, 일시적인 오류가 발생했습니다. 다시 말씀해 주세요.');
+            if (aiContent) {
+                aiContent.textContent = '죄송해요, 일시적인 오류가 발생했습니다. 다시 말씀해 주세요.';
+            } else {
+                this.addMessage('ai', '죄송해요, 일시적인 오류가 발생했습니다. 다시 말씀해 주세요.');
+            }
             
             this.sendToPlatform('error', {
                 message: '대화 처리 실패',
@@ -425,6 +472,40 @@ class SocraticChatPlatform {
         }
     }
     
+    // 서버 저장 대화가 있으면 새 메시지만, 없으면(또는 만료되면) 전체 대화 기록 전송
+    async postChatTurn(path, userMessage) {
+        if (this.conversationId) {
+            const response = await fetch(`${this.apiBase}${path}`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    conversation_id: this.conversationId,
+                    message: userMessage
+                })
+            });
+            if (response.status !== 404) {
+                return response;
+            }
+            // 서버 재시작 등으로 대화가 사라지면 전체 기록 방식으로 전환
+            this.conversationId = null;
+        }
+        
+        return fetch(`${this.apiBase}${path}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                topic: this.topic,
+                messages: this.messages,
+                understanding_level: this.understandingScore,
+                difficulty: this.difficulty
+            })
+        });
+    }
+    
     addMessage(role, content) {
         const messagesContainer = document.getElementById('messagesContainer');
         if (!messagesContainer) return;
@@ -449,6 +530,54 @@ class SocraticChatPlatform {
         
         messagesContainer.appendChild(messageDiv);
         messagesContainer.scrollTop = messagesContainer.scrollHeight;
+        return messageContent;
+    }
+    
+    appendToMessage(messageContent, delta) {
+        if (!messageContent) return;
+        messageContent.textContent += delta;
+        
+        const messagesContainer = document.getElementById('messagesContainer');
+        if (messagesContainer) {
+            messagesContainer.scrollTop = messagesContainer.scrollHeight;
+        }
+    }
+    
+    // text/event-stream 응답을 읽어 이벤트마다 onEvent(이벤트 이름, JSON 데이터) 호출
+    async readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        try {
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    const rawEvent = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    
+                    let eventName = 'message';
+                    const dataLines = [];
+                    rawEvent.split('\n').forEach(line => {
+                        if (line.startsWith('event:')) {
+                            eventName = line.slice(6).trim();
+                        } else if (line.startsWith('data:')) {
+                            dataLines.push(line.slice(5).trim());
+                        }
+                    });
+                    if (dataLines.length) {
+                        onEvent(eventName, JSON.parse(dataLines.join('\n')));
+                    }
+                }
+            }
+        } finally {
+            // 중간에 처리를 멈추면 연결을 끊어 서버의 남은 생성/평가도 중단
+            reader.cancel().catch(() => {});
+        }
     }
     
     updateSocraticEvaluation(data) {
@@ -3,6 +3,7 @@
  */
 import React, { useState, useEffect, useRef } from 'react';
 import toast from 'react-hot-toast';
+import { readEventStream } from '../utils/eventStream';
 
 export default function SocraticChat({ 
   settings, 
@@ -14,14 +15,17 @@ export default function SocraticChat({
   const [messages, setMessages] = useState([]);
   const [currentMessage, setCurrentMessage] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
   const [initialLoading, setInitialLoading] = useState(true);
   const [understandingScore, setUnderstandingScore] = useState(0);
   const [isCompleted, setIsCompleted] = useState(false);
   const [turnIndex, setTurnIndex] = useState(1);
   
   const messagesEndRef = useRef(null);
+  // 서버 저장 대화 ID (있으면 새 메시지만 전송)
+  const conversationIdRef = useRef(null);
 
-  const { topic, difficulty = 'normal', score_display = 'show' } = settings;
+  const { topic, difficulty = 'normal', score_display = 'show', assessment_policy, assessment_interval } = settings;
   const showScore = score_display === 'show';
 
   // Proto4 API 기본 URL
@@ -32,17 +36,40 @@ export default function SocraticChat({
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   };
 
-  // 초기 메시지 로드
+  // 스트리밍 중인 마지막 AI 메시지 내용 갱신
+  const setStreamingContent = (content) => {
+    setMessages(prev => {
+      const last = prev[prev.length - 1];
+      if (last && last.role === 'ai' && last.streaming) {
+        return [...prev.slice(0, -1), { ...last, content }];
+      }
+      return [...prev, { role: 'ai', content, timestamp: new Date(), streaming: true }];
+    });
+  };
+
+  // 스트리밍이 끝나면 최종 내용으로 고정 (스트리밍 중이 아니면 새 메시지로 추가)
+  const finishStreamingMessage = (content) => {
+    setMessages(prev => {
+      const last = prev[prev.length - 1];
+      const base = last && last.role === 'ai' && last.streaming ? prev.slice(0, -1) : prev;
+      return [...base, { role: 'ai', content, timestamp: new Date() }];
+    });
+  };
+
+  // 초기 메시지 로드 (토큰이 도착하는 대로 표시)
   const loadInitialMessage = async () => {
     try {
       setInitialLoading(true);
       
-      const response = await fetch(`${PROTO4_API_BASE}/chat/initial`, {
+      const response = await fetch(`${PROTO4_API_BASE}/chat/initial/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
           topic: topic,
-          difficulty: difficulty
+          difficulty: difficulty,
+          // 5차원 평가 정책 (없으면 proto4 서버 기본값)
+          assessment_policy: assessment_policy,
+          assessment_interval: assessment_interval
         })
       });
       
@@ -50,16 +77,30 @@ export default function SocraticChat({
         throw new Error('초기 메시지 로드 실패');
       }
       
-      const data = await response.json();
+      let data = null;
+      let streamed = '';
+      await readEventStream(response, (eventName, payload) => {
+        if (eventName === 'token') {
+          streamed += payload.delta;
+          setStreamingContent(streamed);
+          setInitialLoading(false);
+        } else if (eventName === 'done') {
+          data = payload;
+        }
+      });
+      
+      if (!data) {
+        throw new Error('초기 메시지 스트림 중단');
+      }
+      
+      conversationIdRef.current = data.conversation_id || null;
       
-      // AI 첫 메시지 추가
-      const initialMessage = {
+      // AI 첫 메시지 확정
+      setMessages([{
         role: 'ai',
         content: data.initial_message,
         timestamp: new Date()
-      };
-      
-      setMessages([initialMessage]);
+      }]);
       
       // 활동 로그 저장 (초기 메시지)
       if (onActivityLog) {
@@ -87,6 +128,37 @@ export default function SocraticChat({
     }
   };
 
+  // 서버 저장 대화가 있으면 새 메시지만, 없으면(또는 만료되면) 전체 대화 기록 전송
+  const postChatTurn = async (path, userMessage) => {
+    if (conversationIdRef.current) {
+      const response = await fetch(`${PROTO4_API_BASE}${path}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          conversation_id: conversationIdRef.current,
+          message: userMessage
+        })
+      });
+      if (response.status !== 404) {
+        return response;
+      }
+      // 서버 재시작 등으로 대화가 사라지면 전체 기록 방식으로 전환
+      conversationIdRef.current = null;
+    }
+
+    return fetch(`${PROTO4_API_BASE}${path}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        topic: topic,
+        messages: [...messages.map(m => ({ role: m.role === 'ai' ? 'assistant' : 'user', content: m.content })), 
+                   { role: 'user', content: userMessage }],
+        understanding_level: understandingScore,
+        difficulty: difficulty
+      })
+    });
+  };
+
   // 메시지 전송
   const sendMessage = async (e) => {
     e.preventDefault();
@@ -107,33 +179,34 @@ export default function SocraticChat({
     setIsLoading(true);
     
     try {
-      // Proto4 API로 소크라테스식 응답 요청
-      const response = await fetch(`${PROTO4_API_BASE}/chat/socratic`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          topic: topic,
-          messages: [...messages.map(m => ({ role: m.role === 'ai' ? 'assistant' : 'user', content: m.content })), 
-                     { role: 'user', content: userMessage }],
-          understanding_level: understandingScore,
-          difficulty: difficulty
-        })
-      });
+      // Proto4 API로 소크라테스식 응답 요청 (SSE)
+      // 응답 토큰은 도착하는 대로 표시하고, 평가는 마지막 done 이벤트로 받음
+      const response = await postChatTurn('/chat/socratic/stream', userMessage);
       
       if (!response.ok) {
         throw new Error('AI 응답 요청 실패');
       }
       
-      const data = await response.json();
+      let data = null;
+      let streamed = '';
+      await readEventStream(response, (eventName, payload) => {
+        if (eventName === 'token') {
+          streamed += payload.delta;
+          setIsStreaming(true);
+          setStreamingContent(streamed);
+        } else if (eventName === 'done') {
+          data = payload;
+        } else if (eventName === 'error') {
+          throw new Error(payload.detail);
+        }
+      });
       
-      // AI 응답 메시지 추가
-      const aiMsg = {
-        role: 'ai',
-        content: data.socratic_response,
-        timestamp: new Date()
-      };
+      if (!data) {
+        throw new Error('AI 응답 스트림 중단');
+      }
       
-      setMessages(prev => [...prev, aiMsg]);
+      // AI 응답 메시지 확정
+      finishStreamingMessage(data.socratic_response);
       
       // 점수 업데이트 (표시 모드인 경우에만)
       if (showScore) {
@@ -141,14 +214,14 @@ export default function SocraticChat({
         setIsCompleted(data.is_completed);
       }
       
-      // 활동 로그 저장
+      // 활동 로그 저장 (평가하지 않은 턴은 이전 점수가 중복 집계되지 않도록 점수 없이 기록)
       if (onActivityLog) {
         await onActivityLog({
           activity_key: 'socratic_chat',
           turn_index: turnIndex,
           student_input: userMessage,
           ai_output: data.socratic_response,
-          third_eval_json: {
+          third_eval_json: data.assessed === false ? { assessed: false } : {
             understanding_score: data.understanding_score,
             is_completed: data.is_completed,
             dimensions: data.dimensions,
@@ -173,15 +246,11 @@ export default function SocraticChat({
       console.error('메시지 전송 오류:', error);
       toast.error('메시지 전송 중 오류가 발생했습니다.');
       
-      // 오류 시 폴백 응답
-      const fallbackMsg = {
-        role: 'ai',
-        content: '죄송해요, 일시적인 문제가 발생했습니다. 조금 전 답변을 다시 말씀해 주시거나, 다른 방식으로 접근해 보세요.',
-        timestamp: new Date()
-      };
-      setMessages(prev => [...prev, fallbackMsg]);
+      // 오류 시 폴백 응답 (스트리밍 중이던 메시지는 대체)
+      finishStreamingMessage('죄송해요, 일시적인 문제가 발생했습니다. 조금 전 답변을 다시 말씀해 주시거나, 다른 방식으로 접근해 보세요.');
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
 
@@ -373,7 +442,7 @@ export default function SocraticChat({
           </div>
         ))}
         
-        {isLoading && (
+        {isLoading && !isStreaming && (
           <div style={{
             display: 'flex',
             justifyContent: 'flex-start',
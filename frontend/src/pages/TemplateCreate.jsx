@@ -300,6 +300,60 @@ export default function TemplateCreate() {
         break;
         
         
+      case 'assessment_policy':
+        input = (
+          <div className="segment-control" data-name={fieldName}>
+            {[
+              { value: 'every_turn', icon: '🔁', label: '매 턴', desc: '답변마다 바로 평가' },
+              { value: 'adaptive', icon: '⚖️', label: '적응형', desc: '일정 간격 + 충분한 답변' },
+              { value: 'on_demand', icon: '✋', label: '요청 시', desc: '필요할 때만 평가' }
+            ].map(option => (
+              <Fragment key={option.value}>
+                <input
+                  type="radio"
+                  id={`${fieldName}_${option.value}`}
+                  name={fieldName}
+                  value={option.value}
+                  checked={value === option.value}
+                  onChange={(e) => handleFormChange(fieldName, e.target.value)}
+                />
+                <label htmlFor={`${fieldName}_${option.value}`} className="segment-option">
+                  <span className="segment-icon">{option.icon}</span>
+                  <span className="segment-text">{option.label}</span>
+                  <span className="segment-desc">{option.desc}</span>
+                </label>
+              </Fragment>
+            ))}
+          </div>
+        );
+        fieldHelp = "⚖️ 적응형은 짧은 답변이 이어질 때 평가를 건너뛰고 이전 점수를 유지해 응답이 빨라집니다.";
+        break;
+        
+      case 'assessment_interval':
+        input = (
+          <div className="range-input">
+            <input
+              type="range"
+              value={value || 3}
+              onChange={(e) => handleFormChange(fieldName, parseInt(e.target.value))}
+              min={1}
+              max={10}
+              step={1}
+              className="form-range"
+              required={isRequired}
+            />
+            <div className="range-value">
+              <span className="value-display">{value || 3}턴마다</span>
+              <div className="range-labels">
+                <span>1턴</span>
+                <span>10턴</span>
+              </div>
+            </div>
+          </div>
+        );
+        fieldHelp = "💡 적응형 평가에서 답변이 짧아도 이 간격마다는 평가합니다.";
+        break;
+        
       case 'max_turns':
         input = (
           <div className="range-input">
@@ -0,0 +1,44 @@
+/**
+ * Server-Sent Events 응답 읽기 (fetch + ReadableStream)
+ *
+ * EventSource는 GET만 지원하므로 POST 스트리밍 응답은 직접 파싱합니다.
+ */
+
+/**
+ * text/event-stream 응답을 읽어 이벤트마다 onEvent(이벤트 이름, JSON 데이터) 호출
+ * 중간에 onEvent가 예외를 던지면 연결을 끊고 예외를 그대로 전달
+ */
+export async function readEventStream(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  try {
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const rawEvent = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let eventName = 'message';
+        const dataLines = [];
+        rawEvent.split('\n').forEach((line) => {
+          if (line.startsWith('event:')) {
+            eventName = line.slice(6).trim();
+          } else if (line.startsWith('data:')) {
+            dataLines.push(line.slice(5).trim());
+          }
+        });
+        if (dataLines.length) {
+          onEvent(eventName, JSON.parse(dataLines.join('\n')));
+        }
+      }
+    }
+  } finally {
+    reader.cancel().catch(() => {});
+  }
+}
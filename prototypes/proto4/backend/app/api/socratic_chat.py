@@ -1,13 +1,26 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.models.request_models import (
     TopicInputRequest, 
     SocraticChatRequest, 
     SocraticChatResponse,
+    SocraticReplyResponse,
+    SocraticAssessmentResponse,
     InitialMessageRequest,
-    InitialMessageResponse
+    InitialMessageResponse,
+    ConversationResponse
 )
-from app.services.socratic_service import SocraticService
+from app.services.assessment_scheduler import AssessmentPolicy, assessment_batcher
+from app.services.socratic_service import SocraticResponseError, SocraticService
 from app.services.socratic_assessment_service import get_socratic_assessment_service
+from app.services.conversation_store import ChatTurn, Conversation, conversation_store
+from app.services.turn_assessment_store import turn_assessments
 
 router = APIRouter()
 
@@ -33,55 +46,328 @@ async def validate_topic(request: TopicInputRequest):
 
 @router.post("/chat/initial", response_model=InitialMessageResponse)
 async def get_initial_message(request: InitialMessageRequest):
-    """첫 대화 메시지 생성"""
+    """첫 대화 메시지 생성 (서버 저장 대화 시작)"""
     try:
         socratic_service = get_socratic_service()
-        initial_message = await socratic_service.generate_initial_message(request.topic)
+        initial_message = await socratic_service.generate_initial_message(request.topic, request.difficulty)
+        conversation = create_conversation(request, initial_message)
         
         return InitialMessageResponse(
             initial_message=initial_message,
-            understanding_score=0
+            understanding_score=0,
+            conversation_id=conversation.conversation_id
         )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def create_conversation(request: InitialMessageRequest, initial_message: str) -> Conversation:
+    policy = AssessmentPolicy.from_settings(request.assessment_policy, request.assessment_interval)
+    return conversation_store.create(request.topic, request.difficulty, initial_message, policy)
+
+def sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 한 건 (event 이름 + JSON data)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def sse_response(events) -> StreamingResponse:
+    # 프록시(nginx 등)가 버퍼링하면 토큰이 한꺼번에 도착하므로 버퍼링 해제
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/chat/initial/stream")
+async def stream_initial_message(request: InitialMessageRequest):
+    """
+    첫 대화 메시지 스트리밍 (SSE)
+    
+    event: token  {"delta": "..."}    토큰이 도착할 때마다
+    event: done   InitialMessageResponse 필드
+    """
+    socratic_service = get_socratic_service()
+    
+    async def events():
+        parts = []
+        async for delta in socratic_service.stream_initial_message(request.topic, request.difficulty):
+            parts.append(delta)
+            yield sse_event("token", {"delta": delta})
+        initial_message = "".join(parts).strip()
+        conversation = create_conversation(request, initial_message)
+        yield sse_event("done", InitialMessageResponse(
+            initial_message=initial_message,
+            understanding_score=0,
+            conversation_id=conversation.conversation_id
+        ).model_dump())
+    
+    return sse_response(events())
+
+def resolve_conversation(request: SocraticChatRequest) -> Optional[Conversation]:
+    """서버 저장 대화 조회 (conversation_id가 없으면 None - 요청의 messages를 그대로 사용)"""
+    if request.conversation_id is None:
+        return None
+    conversation = conversation_store.get(request.conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다.")
+    return conversation
+
+@asynccontextmanager
+async def chat_turn(request: SocraticChatRequest, conversation: Optional[Conversation]):
+    """요청을 한 턴으로 해석 (저장 대화는 같은 대화의 이전 턴 응답이 끝날 때까지 대기)"""
+    if conversation is None:
+        last_user_message = request.messages[-1]["content"] if request.messages else ""
+        yield ChatTurn(
+            topic=request.topic,
+            difficulty=request.difficulty,
+            understanding_level=request.understanding_level,
+            messages=request.messages,
+            student_message=last_user_message
+        )
+        return
+    
+    async with conversation.lock:
+        messages = conversation.messages + [{"role": "user", "content": request.message}]
+        yield ChatTurn(
+            topic=conversation.topic,
+            difficulty=conversation.difficulty,
+            understanding_level=conversation.understanding_level,
+            messages=messages,
+            student_message=request.message,
+            conversation=conversation,
+            # 이전 맥락 분석에 새 메시지만 반영
+            context=get_assessment_service().update_conversation_context(
+                conversation.context, request.message, messages
+            ),
+            assessed=conversation.should_assess(request.message, request.assess)
+        )
+
+def start_assessment(turn: ChatTurn):
+    """
+    5차원 평가 작업 시작 (평가 프롬프트는 학생 답변과 대화 기록만 사용하므로 응답 생성을 기다리지 않음)
+    
+    결과는 응답 모델 필드 - 평가 정책상 평가하지 않는 턴은 마지막 평가 결과를 바로 반환
+    """
+    if not turn.assessed:
+        skipped = asyncio.get_running_loop().create_future()
+        skipped.set_result(turn.conversation.carried_evaluation())
+        turn.set_evaluation(skipped.result())
+        return skipped
+    
+    assessment_service = get_assessment_service()
+    
+    async def assess():
+        # 같은 주제의 동시 평가는 배치로 묶어 한 번에 호출
+        evaluation_result = await assessment_batcher.evaluate(
+            assessment_service,
+            turn.topic, 
+            turn.student_message, 
+            turn.messages,  # 전체 대화 기록
+            turn.difficulty,
+            turn.context
+        )
+        if evaluation_result.get("failed"):
+            # 오류로 나온 기본 평가는 점수로 쓰지 않음
+            assessment_fields = turn.failed_evaluation()
+        else:
+            assessment_fields = to_assessment_fields(evaluation_result)
+        turn.set_evaluation(assessment_fields)
+        return assessment_fields
+    
+    return asyncio.ensure_future(assess())
+
+def failed_turn(turn: ChatTurn) -> asyncio.Future:
+    """응답 생성이 실패한 턴의 평가 결과 - 턴은 기록하지 않고 마지막 평가 결과를 바로 반환"""
+    failed = asyncio.get_running_loop().create_future()
+    failed.set_result(turn.failed_evaluation())
+    return failed
+
+def to_assessment_fields(evaluation_result: dict) -> dict:
+    return dict(
+        understanding_score=evaluation_result["overall_score"],
+        is_completed=evaluation_result["is_completed"],
+        dimensions=evaluation_result["dimensions"],
+        insights=evaluation_result["insights"],
+        growth_indicators=evaluation_result["growth_indicators"],
+        next_focus=evaluation_result["next_focus"]
+    )
+
 @router.post("/chat/socratic", response_model=SocraticChatResponse)
 async def socratic_chat(request: SocraticChatRequest):
-    """소크라테스식 대화 및 이해도 평가"""
+    """소크라테스식 대화 및 이해도 평가 (응답 생성과 평가를 동시에 실행)"""
     try:
+        conversation = resolve_conversation(request)
         socratic_service = get_socratic_service()
-        assessment_service = get_assessment_service()
         
-        # 병렬로 산파법 응답과 이해도 평가 실행
-        socratic_response = await socratic_service.generate_socratic_response(
-            request.topic, 
-            request.messages, 
-            request.understanding_level
-        )
+        async with chat_turn(request, conversation) as turn:
+            assessment = start_assessment(turn)
+            
+            try:
+                socratic_response = await socratic_service.generate_socratic_response(
+                    turn.topic, 
+                    turn.messages, 
+                    turn.understanding_level
+                )
+            except SocraticResponseError as e:
+                # 실패한 턴은 대화에 기록하지 않고 학생에게는 다시 말해달라는 메시지만 보냄
+                assessment.cancel()
+                return SocraticChatResponse(socratic_response=e.fallback, **turn.failed_evaluation())
+            except BaseException:
+                assessment.cancel()
+                raise
+            turn.complete(socratic_response)
+            assessment_fields = await assessment
         
-        # 사용자의 마지막 메시지와 AI 응답으로 5차원 소크라테스식 평가
-        last_user_message = request.messages[-1]["content"] if request.messages else ""
-        evaluation_result = await assessment_service.evaluate_socratic_dimensions(
-            request.topic, 
-            last_user_message, 
-            socratic_response,
-            request.messages,  # 전체 대화 기록
-            request.difficulty
-        )
+        return SocraticChatResponse(socratic_response=socratic_response, **assessment_fields)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/chat/socratic/stream")
+async def socratic_chat_stream(request: SocraticChatRequest):
+    """
+    소크라테스식 대화 스트리밍 (SSE) - 평가는 응답 생성과 동시에 실행
+    
+    event: token  {"delta": "..."}    토큰이 도착할 때마다
+    event: done   SocraticChatResponse 필드 (응답 전문 + 5차원 평가)
+    event: error  {"detail": "..."}   평가 실패 시 (응답 토큰은 이미 전달됨)
+    
+    응답 생성이 실패하면 보낸 조각(또는 폴백 메시지)으로 failed=true인 done을 보내고 턴은 기록하지 않습니다.
+    """
+    conversation = resolve_conversation(request)
+    socratic_service = get_socratic_service()
+    
+    async def events():
+        async with chat_turn(request, conversation) as turn:
+            assessment = start_assessment(turn)
+            try:
+                parts = []
+                try:
+                    async for delta in socratic_service.stream_socratic_response(
+                        turn.topic, 
+                        turn.messages, 
+                        turn.understanding_level
+                    ):
+                        parts.append(delta)
+                        yield sse_event("token", {"delta": delta})
+                except SocraticResponseError:
+                    yield sse_event("done", SocraticChatResponse(
+                        socratic_response="".join(parts).strip(), **turn.failed_evaluation()
+                    ).model_dump())
+                    return
+                socratic_response = "".join(parts).strip()
+                turn.complete(socratic_response)
+                
+                try:
+                    payload = SocraticChatResponse(socratic_response=socratic_response, **(await assessment))
+                except Exception as e:
+                    yield sse_event("error", {"detail": str(e)})
+                    return
+                yield sse_event("done", payload.model_dump())
+            finally:
+                # 클라이언트가 연결을 끊으면 남은 평가도 중단 (끊긴 턴은 대화에 기록되지 않음)
+                assessment.cancel()
+    
+    return sse_response(events())
+
+@router.post("/chat/socratic/reply", response_model=SocraticReplyResponse)
+async def socratic_reply(request: SocraticChatRequest):
+    """파이프라인 모드 - 산파법 응답만 먼저 반환하고 평가는 /chat/assessment/{turn_id}로 조회"""
+    try:
+        conversation = resolve_conversation(request)
+        socratic_service = get_socratic_service()
         
-        understanding_score = evaluation_result["overall_score"]
-        is_completed = evaluation_result["is_completed"]
+        async with chat_turn(request, conversation) as turn:
+            assessment = start_assessment(turn)
+            
+            try:
+                socratic_response = await socratic_service.generate_socratic_response(
+                    turn.topic, 
+                    turn.messages, 
+                    turn.understanding_level
+                )
+            except SocraticResponseError as e:
+                # 실패한 턴은 기록하지 않음 (turn_id로는 마지막 평가 결과를 failed로 조회)
+                assessment.cancel()
+                return SocraticReplyResponse(
+                    socratic_response=e.fallback,
+                    turn_id=turn_assessments.submit(failed_turn(turn))
+                )
+            except BaseException:
+                assessment.cancel()
+                raise
+            turn.complete(socratic_response)
+            turn_id = turn_assessments.submit(assessment)
         
-        return SocraticChatResponse(
-            socratic_response=socratic_response,
-            understanding_score=understanding_score,
-            is_completed=is_completed,
-            dimensions=evaluation_result["dimensions"],
-            insights=evaluation_result["insights"],
-            growth_indicators=evaluation_result["growth_indicators"],
-            next_focus=evaluation_result["next_focus"]
-        )
+        return SocraticReplyResponse(socratic_response=socratic_response, turn_id=turn_id)
     
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/chat/conversations/{conversation_id}", response_model=ConversationResponse)
+async def get_conversation(conversation_id: str):
+    """서버 저장 대화 기록 (ActivityLog 턴 형태)"""
+    conversation = conversation_store.get(conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다.")
+    return ConversationResponse(
+        conversation_id=conversation.conversation_id,
+        topic=conversation.topic,
+        difficulty=conversation.difficulty,
+        understanding_score=conversation.understanding_level,
+        turns=[asdict(turn) for turn in conversation.turns]
+    )
+
+@router.post("/chat/conversations/{conversation_id}/assess", response_model=SocraticAssessmentResponse)
+async def assess_conversation(conversation_id: str):
+    """서버 저장 대화의 마지막 학생 턴을 지금 평가 (on_demand 정책 또는 평가하지 않은 턴)"""
+    conversation = conversation_store.get(conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="대화를 찾을 수 없습니다.")
+    
+    async with conversation.lock:
+        record = conversation.turns[-1]
+        if record.student_input is None:
+            raise HTTPException(status_code=400, detail="평가할 학생 답변이 없습니다.")
+        if record.third_eval_json and record.third_eval_json.get("assessed", True):
+            return SocraticAssessmentResponse(**record.third_eval_json)
+        
+        try:
+            evaluation_result = await assessment_batcher.evaluate(
+                get_assessment_service(),
+                conversation.topic,
+                record.student_input,
+                conversation.messages,
+                conversation.difficulty,
+                conversation.context
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        if evaluation_result.get("failed"):
+            assessment_fields = conversation.failed_evaluation()
+        else:
+            assessment_fields = to_assessment_fields(evaluation_result)
+            conversation.last_scheduled_turn = record.turn_index
+        conversation.record_evaluation(record, assessment_fields)
+    
+    return SocraticAssessmentResponse(**assessment_fields)
+
+@router.get("/chat/assessment/{turn_id}", response_model=SocraticAssessmentResponse)
+async def get_turn_assessment(
+    turn_id: str,
+    wait: float = Query(10.0, ge=0, le=30, description="평가가 끝날 때까지 기다릴 최대 시간(초)")
+):
+    """파이프라인 모드 턴의 5차원 평가 결과 (아직 진행 중이면 202)"""
+    found, assessment_fields = await turn_assessments.result(turn_id, wait)
+    if not found:
+        raise HTTPException(status_code=404, detail="평가를 찾을 수 없습니다.")
+    if assessment_fields is None:
+        return JSONResponse(
+            status_code=202,
+            content={"status": "pending", "turn_id": turn_id},
+            headers={"Retry-After": "1"}
+        )
+    return SocraticAssessmentResponse(**assessment_fields)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import List, Dict, Any, Optional
 
 class TopicInputRequest(BaseModel):
@@ -6,10 +6,23 @@ class TopicInputRequest(BaseModel):
     content_type: str = "text"  # "text", "pdf", "url" (향후 확장)
 
 class SocraticChatRequest(BaseModel):
-    topic: str
-    messages: List[Dict[str, str]]
+    topic: Optional[str] = None
+    messages: List[Dict[str, str]] = []
     understanding_level: int = 0
     difficulty: str = "normal"  # "easy", "normal", "hard"
+    # 서버 저장 대화 - conversation_id가 있으면 topic/messages 대신 새 학생 메시지(message)만 보냄
+    conversation_id: Optional[str] = None
+    message: Optional[str] = None
+    assess: bool = False  # 평가 정책과 관계없이 이번 턴 평가 (서버 저장 대화)
+
+    @model_validator(mode="after")
+    def check_conversation_fields(self):
+        if self.conversation_id is not None:
+            if not self.message:
+                raise ValueError("conversation_id를 보낼 때는 message가 필요합니다.")
+        elif self.topic is None:
+            raise ValueError("topic 또는 conversation_id가 필요합니다.")
+        return self
 
 class SocraticChatResponse(BaseModel):
     socratic_response: str
@@ -20,11 +33,46 @@ class SocraticChatResponse(BaseModel):
     insights: Optional[Dict[str, str]] = None
     growth_indicators: Optional[List[str]] = None
     next_focus: Optional[str] = None
+    assessed: bool = True  # False면 이번 턴은 평가하지 않고 마지막 평가 결과를 그대로 반환
+    failed: bool = False  # True면 평가나 응답 생성이 실패해 마지막 평가 결과를 그대로 반환 (응답 생성 실패 턴은 기록되지 않음)
+
+class SocraticReplyResponse(BaseModel):
+    """파이프라인 모드 응답 - 평가는 turn_id로 따로 조회"""
+    socratic_response: str
+    turn_id: str
+
+class SocraticAssessmentResponse(BaseModel):
+    understanding_score: int
+    is_completed: bool = False
+    dimensions: Optional[Dict[str, int]] = None
+    insights: Optional[Dict[str, str]] = None
+    growth_indicators: Optional[List[str]] = None
+    next_focus: Optional[str] = None
+    assessed: bool = True
+    failed: bool = False
 
 class InitialMessageRequest(BaseModel):
     topic: str
     difficulty: str = "normal"
+    # 템플릿 설정의 평가 정책 (없으면 서버 기본값)
+    assessment_policy: Optional[str] = None  # "every_turn", "adaptive", "on_demand"
+    assessment_interval: Optional[int] = None
 
 class InitialMessageResponse(BaseModel):
     initial_message: str
-    understanding_score: int = 0
\ No newline at end of file
+    understanding_score: int = 0
+    conversation_id: Optional[str] = None  # 이후 턴에서 새 메시지만 보낼 때 사용
+
+class ConversationTurnRecord(BaseModel):
+    """ActivityLog 한 행과 같은 형태의 턴 기록"""
+    turn_index: int
+    student_input: Optional[str] = None
+    ai_output: str
+    third_eval_json: Optional[Dict[str, Any]] = None
+
+class ConversationResponse(BaseModel):
+    conversation_id: str
+    topic: str
+    difficulty: str
+    understanding_score: int
+    turns: List[ConversationTurnRecord]
\ No newline at end of file
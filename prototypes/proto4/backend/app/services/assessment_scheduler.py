@@ -0,0 +1,159 @@
+"""
+5차원 평가 스케줄링과 학생 간 배치
+
+평가(max_tokens 800)를 매 턴 실행하면 LLM 호출이 응답 생성의 두 배가 되므로
+서버 저장 대화는 템플릿 설정(settings_json)의 정책에 따라 평가할 턴을 고릅니다.
+    every_turn   매 턴 평가 (이전 방식)
+    adaptive     마지막 평가 후 interval턴이 지났거나 학생 답변이 충분히 길 때 (기본)
+    on_demand    요청할 때만 (SocraticChatRequest.assess 또는 POST /chat/conversations/{id}/assess)
+평가하지 않는 턴은 마지막 평가 점수를 그대로 돌려주고 assessed=false로 표시합니다.
+
+같은 주제·난이도의 평가가 window_ms 안에 여러 건 들어오면 (같은 세션의 학생들)
+한 번의 호출로 묶어 평가하고, 결과가 빠진 항목만 한 명씩 다시 평가합니다.
+
+환경 변수 (기본값)
+    ASSESSMENT_POLICY=adaptive           템플릿에 정책이 없을 때
+    ASSESSMENT_INTERVAL=3                adaptive 평가 간격(턴)
+    ASSESSMENT_SUBSTANTIVE_CHARS=40      이 글자 수(공백 제외) 이상이면 간격과 관계없이 평가
+    ASSESSMENT_BATCH_WINDOW_MS=50        배치로 모으는 시간 (0이면 배치하지 않음)
+    ASSESSMENT_BATCH_MAX=6               한 번에 묶는 최대 평가 수 (1이면 배치하지 않음)
+"""
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.response_cache import normalize_topic
+
+ASSESSMENT_POLICIES = ("every_turn", "adaptive", "on_demand")
+
+
+@dataclass
+class AssessmentPolicy:
+    mode: str = "adaptive"
+    interval: int = 3
+    substantive_chars: int = 40
+
+    @classmethod
+    def from_settings(cls, mode: Optional[str] = None, interval: Optional[int] = None) -> "AssessmentPolicy":
+        """템플릿 설정값 (없거나 잘못된 값이면 환경 변수 기본값)"""
+        default = default_policy()
+        return cls(
+            mode=mode if mode in ASSESSMENT_POLICIES else default.mode,
+            interval=interval if isinstance(interval, int) and interval >= 1 else default.interval,
+            substantive_chars=default.substantive_chars,
+        )
+
+    def should_assess(self, turn_index: int, last_scheduled_turn: int, student_message: str,
+                      requested: bool = False) -> bool:
+        """
+        이번 턴을 평가할지
+
+        Args:
+            turn_index: 이번 턴 번호 (첫 학생 턴이 1)
+            last_scheduled_turn: 마지막으로 평가를 시작한 턴 (없으면 0)
+            student_message: 이번 학생 메시지
+            requested: 클라이언트가 평가를 요청했는지
+        """
+        if requested or self.mode == "every_turn":
+            return True
+        if self.mode == "on_demand":
+            return False
+        if turn_index - last_scheduled_turn >= self.interval:
+            return True
+        return len(re.sub(r"\s+", "", student_message or "")) >= self.substantive_chars
+
+
+def default_policy() -> AssessmentPolicy:
+    mode = os.getenv("ASSESSMENT_POLICY", "adaptive")
+    return AssessmentPolicy(
+        mode=mode if mode in ASSESSMENT_POLICIES else "adaptive",
+        interval=max(1, int(os.getenv("ASSESSMENT_INTERVAL", 3))),
+        substantive_chars=int(os.getenv("ASSESSMENT_SUBSTANTIVE_CHARS", 40)),
+    )
+
+
+class AssessmentBatcher:
+    def __init__(self, window_ms: float = 50, max_items: int = 6):
+        self.window_ms = window_ms
+        self.max_items = max_items
+        # (정규화 주제, 난이도) -> [(평가 입력, future)]
+        self._queues: Dict[Tuple[str, str], List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self._tasks = set()  # 실행 중인 배치 (완료 전에 가비지 컬렉션되지 않도록)
+        self.batches = 0
+        self.batched_items = 0
+
+    async def evaluate(self, service, topic: str, student_response: str, conversation_history: List[Dict],
+                       difficulty: str = "normal", context_analysis: Optional[Dict] = None) -> Dict[str, Any]:
+        """evaluate_socratic_dimensions와 같은 결과 (같은 주제의 동시 요청은 한 번의 호출로)"""
+        item = dict(
+            topic=topic,
+            student_response=student_response,
+            ai_response="",
+            conversation_history=conversation_history,
+            difficulty=difficulty,
+            context_analysis=context_analysis,
+        )
+        if self.max_items <= 1 or self.window_ms <= 0:
+            return await service.evaluate_socratic_dimensions(**item)
+
+        loop = asyncio.get_running_loop()
+        key = (normalize_topic(topic), difficulty)
+        future = loop.create_future()
+        queue = self._queues.setdefault(key, [])
+        queue.append((item, future))
+        if len(queue) >= self.max_items:
+            self._flush(service, key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window_ms / 1000, self._flush, service, key)
+        return await future
+
+    def _flush(self, service, key: Tuple[str, str]):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._queues.pop(key, [])
+        if batch:
+            task = asyncio.ensure_future(self._run(service, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, service, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        if len(batch) > 1:
+            self.batches += 1
+            self.batched_items += len(batch)
+            first = batch[0][0]
+            try:
+                results = await service.evaluate_batch(first["topic"], first["difficulty"], [
+                    {key: item[key] for key in ("student_response", "conversation_history", "context_analysis")}
+                    for item, _ in batch
+                ])
+            except Exception as e:
+                print(f"❌ 배치 평가 오류: {e}")
+
+        # 배치 결과가 없거나 빠진 항목은 한 명씩 평가
+        missing = [index for index, result in enumerate(results) if result is None]
+        singles = await asyncio.gather(
+            *(service.evaluate_socratic_dimensions(**batch[index][0]) for index in missing),
+            return_exceptions=True
+        )
+        for index, result in zip(missing, singles):
+            results[index] = result
+
+        for (_, future), result in zip(batch, results):
+            if future.done():  # 기다리던 요청이 취소된 경우
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+assessment_batcher = AssessmentBatcher(
+    window_ms=float(os.getenv("ASSESSMENT_BATCH_WINDOW_MS", 50)),
+    max_items=int(os.getenv("ASSESSMENT_BATCH_MAX", 6)),
+)
@@ -1,11 +1,13 @@
 from openai import AsyncOpenAI
 import os
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from app.services.llm_client import get_llm_client
 
 class AssessmentService:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        self.client = client or get_llm_client()
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     
     async def evaluate_understanding(self, topic: str, user_message: str, ai_response: str, current_level: int, difficulty: str = "normal", conversation_history: list = None) -> int:
@@ -0,0 +1,146 @@
+"""
+대화 맥락 관리 (최근 턴 원문 + 이전 턴 요약)
+
+매 턴 전체 대화를 프롬프트에 넣으면 프롬프트가 턴 수에 비례해 커지고 대화 전체 토큰은 제곱으로 늘어납니다.
+    최근 턴    마지막 keep_turns개 턴은 원문 그대로
+    이전 턴    턴마다 한 줄(학생 답변 앞부분 + 튜터의 마지막 질문)로 접어 요약에 추가
+    예산      시스템 프롬프트 + 요약 + 최근 턴이 prompt_budget 토큰을 넘으면 오래된 최근 턴부터 요약으로 접고,
+              요약이 summary_max_tokens를 넘으면 첫 턴(학생의 처음 생각)과 최근 줄만 남김
+턴은 학생 메시지 하나와 그 뒤의 튜터 응답입니다 (학생 메시지 전의 초기 메시지는 0번 턴).
+각 턴의 요약 줄은 그 턴 내용에만 의존하므로 턴이 늘어나도 기존 줄은 바뀌지 않고 새 줄만 추가됩니다.
+
+토큰 수는 tokenizer 없이 추정합니다 (한글 등 ASCII 밖 글자는 글자당 1, ASCII는 4글자당 1, 메시지당 4).
+
+환경 변수 (기본값)
+    CONTEXT_KEEP_TURNS=6             원문으로 유지할 최근 턴 수
+    CONTEXT_PROMPT_BUDGET=3000       대화 프롬프트 토큰 예산 (시스템 프롬프트 포함)
+    CONTEXT_SUMMARY_MAX_TOKENS=600   이전 턴 요약의 토큰 상한
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+MESSAGE_OVERHEAD_TOKENS = 4
+STUDENT_CLIP_CHARS = 80
+TUTOR_CLIP_CHARS = 60
+
+_SENTENCE_END = re.compile(r"(?<=[.?!])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """tokenizer 없이 토큰 수 추정 (한국어는 글자당 약 1토큰으로 넉넉하게)"""
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))  # 정규식으로 세는 것보다 수십 배 빠름
+    return len(text) - ascii_chars + math.ceil(ascii_chars / 4)
+
+
+def estimate_message_tokens(messages: List[Dict]) -> int:
+    return sum(estimate_tokens(msg.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for msg in messages)
+
+
+def _clip(text: str, limit: int) -> str:
+    text = re.sub(r"\s+", " ", text or "").strip()
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _last_question(text: str) -> str:
+    """튜터 응답에서 마지막 질문 문장 (없으면 마지막 문장)"""
+    sentences = [s for s in _SENTENCE_END.split((text or "").strip()) if s]
+    if not sentences:
+        return ""
+    questions = [s for s in sentences if s.endswith("?")]
+    return (questions or sentences)[-1]
+
+
+@dataclass
+class ContextWindow:
+    summary_lines: List[str] = field(default_factory=list)
+    recent_messages: List[Dict] = field(default_factory=list)
+    first_recent_turn: int = 0  # recent_messages 첫 턴의 번호
+    folded_turns: int = 0
+    estimated_tokens: int = 0
+
+    @property
+    def summary(self) -> str:
+        return "\n".join(self.summary_lines)
+
+
+class ConversationContextManager:
+    def __init__(self, keep_turns: int = 6, prompt_budget: int = 3000, summary_max_tokens: int = 600):
+        self.keep_turns = max(1, keep_turns)
+        self.prompt_budget = prompt_budget
+        self.summary_max_tokens = summary_max_tokens
+
+    def split_turns(self, messages: List[Dict]) -> List[List[Dict]]:
+        """[0번 턴(첫 학생 메시지 전, 비어 있을 수 있음), 1번 턴, ...] - 학생 메시지마다 새 턴"""
+        turns: List[List[Dict]] = [[]]
+        for msg in messages:
+            if msg.get("role") == "user":
+                turns.append([])
+            turns[-1].append(msg)
+        return turns
+
+    def summarize_turn(self, number: int, turn: List[Dict]) -> str:
+        """턴 하나를 요약 한 줄로"""
+        student = " ".join(msg["content"] for msg in turn if msg.get("role") == "user")
+        tutor = " ".join(msg["content"] for msg in turn if msg.get("role") != "user")
+        question = _clip(_last_question(tutor), TUTOR_CLIP_CHARS)
+        if number == 0:
+            return f"시작 질문: {question}"
+        line = f"턴 {number} - 학생: {_clip(student, STUDENT_CLIP_CHARS)}"
+        return f"{line} / 튜터: {question}" if question else line
+
+    def compact_summary(self, lines: List[str], max_tokens: int) -> List[str]:
+        """요약이 상한을 넘으면 첫 줄과 최근 줄만 남기고 가운데를 생략 표시로"""
+        line_tokens = [estimate_tokens(line) + 1 for line in lines]  # 줄바꿈 포함
+        total = sum(line_tokens)
+        if total <= max_tokens or len(lines) <= 2:
+            return lines
+        # 둘째 줄부터 하나씩 빼면서 남은 양 계산 (생략 표시 한 줄 추가)
+        marker_tokens = estimate_tokens("(이전 00개 턴 생략)") + 1
+        total += marker_tokens
+        skipped = 0
+        while skipped < len(lines) - 2:
+            total -= line_tokens[1 + skipped]
+            skipped += 1
+            if total <= max_tokens:
+                break
+        return [lines[0], f"(이전 {skipped}개 턴 생략)"] + lines[1 + skipped:]
+
+    def build(self, messages: List[Dict], system_prompt: str = "") -> ContextWindow:
+        """최근 keep_turns개 턴 원문 + 이전 턴 요약 (토큰 예산 이내)"""
+        turns = self.split_turns(messages)
+        # 학생 턴이 keep_turns개 이하면 0번 턴(초기 메시지)까지 원문 유지
+        split = 0 if len(turns) - 1 <= self.keep_turns else len(turns) - self.keep_turns
+        base_tokens = estimate_tokens(system_prompt) + MESSAGE_OVERHEAD_TOKENS if system_prompt else 0
+        turn_tokens = [estimate_message_tokens(turn) for turn in turns]
+        turn_lines = [self.summarize_turn(number, turn) if turn else None for number, turn in enumerate(turns)]
+
+        while True:
+            folded = [line for line in turn_lines[:split] if line is not None]
+            recent_tokens = sum(turn_tokens[split:])
+            summary_budget = min(self.summary_max_tokens, max(0, self.prompt_budget - base_tokens - recent_tokens))
+            lines = self.compact_summary(folded, summary_budget)
+            summary_tokens = estimate_tokens("\n".join(lines)) + MESSAGE_OVERHEAD_TOKENS if lines else 0
+            total = base_tokens + summary_tokens + recent_tokens
+            # 예산을 넘으면 최근 턴을 하나 더 접음 (학생의 마지막 턴은 항상 원문 유지)
+            if total <= self.prompt_budget or split >= len(turns) - 1:
+                return ContextWindow(
+                    summary_lines=lines,
+                    recent_messages=[msg for turn in turns[split:] for msg in turn],
+                    first_recent_turn=split,
+                    folded_turns=len(folded),
+                    estimated_tokens=total,
+                )
+            split += 1
+
+
+conversation_context = ConversationContextManager(
+    keep_turns=int(os.getenv("CONTEXT_KEEP_TURNS", 6)),
+    prompt_budget=int(os.getenv("CONTEXT_PROMPT_BUDGET", 3000)),
+    summary_max_tokens=int(os.getenv("CONTEXT_SUMMARY_MAX_TOKENS", 600)),
+)
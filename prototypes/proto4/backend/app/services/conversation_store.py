@@ -0,0 +1,187 @@
+"""
+서버 측 대화 상태 저장소
+
+/chat/initial에서 conversation_id를 발급하고 대화 기록을 서버에 보관합니다.
+클라이언트는 이후 턴마다 conversation_id와 새 학생 메시지만 보내면 되고
+(요청 본문과 파싱 시간이 대화 길이와 무관), 대화 맥락 분석(턴 수, 개념 진행)도
+이전 결과에 새 메시지만 반영해 갱신합니다.
+턴 기록은 ActivityLog와 같은 형태(turn_index, student_input, ai_output, third_eval_json)로 보관해
+GET /chat/conversations/{conversation_id}로 그대로 저장할 수 있습니다.
+평가 정책(assessment_scheduler)에 따라 평가하지 않은 턴은 third_eval_json에 점수 없이
+{"assessed": false, "carried_from_turn": 마지막 평가 턴}만 기록합니다 (분석에서 같은 점수가 중복 집계되지 않도록).
+평가가 실패한 턴(LLM 오류로 기본 평가가 나온 경우)도 같은 형태에 "failed": true를 더해 기록하고,
+평가 간격에서도 빼서 다음 턴에 다시 평가합니다.
+프로세스 메모리에만 보관하고 마지막 사용 후 ttl_sec이 지나면 정리합니다.
+
+환경 변수 (기본값)
+    CONVERSATION_TTL_SEC=7200        마지막 사용 후 보관 시간(초)
+    CONVERSATION_MAX_ITEMS=10000     최대 대화 수 (넘으면 오래 안 쓴 것부터 정리)
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.services.assessment_scheduler import AssessmentPolicy, default_policy
+
+
+@dataclass
+class ConversationTurn:
+    turn_index: int
+    student_input: Optional[str]
+    ai_output: str
+    third_eval_json: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class Conversation:
+    conversation_id: str
+    topic: str
+    difficulty: str
+    messages: List[Dict[str, str]] = field(default_factory=list)  # LLM에 보낼 대화 기록
+    turns: List[ConversationTurn] = field(default_factory=list)
+    context: Dict[str, Any] = field(default_factory=dict)  # 대화 맥락 분석 (턴마다 증분 갱신)
+    understanding_level: int = 0  # 마지막 평가의 종합 점수
+    scored_turn: int = 0  # understanding_level을 평가한 턴
+    last_evaluation: Optional[Dict[str, Any]] = None  # 마지막 평가 결과 (평가하지 않는 턴에 그대로 반환)
+    policy: AssessmentPolicy = field(default_factory=default_policy)
+    last_scheduled_turn: int = 0  # 마지막으로 평가를 시작한 턴 (평가 간격 계산용)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # 같은 대화의 턴은 순서대로 처리
+
+    def record_turn(self, student_input: str, ai_output: str, context: Dict[str, Any]) -> ConversationTurn:
+        """응답 생성이 끝난 턴 반영 (실패한 턴은 기록하지 않음)"""
+        self.messages.append({"role": "user", "content": student_input})
+        self.messages.append({"role": "assistant", "content": ai_output})
+        self.context = context
+        turn = ConversationTurn(turn_index=len(self.turns), student_input=student_input, ai_output=ai_output)
+        self.turns.append(turn)
+        return turn
+
+    def should_assess(self, student_message: str, requested: bool = False) -> bool:
+        """다음 턴을 평가할지 (평가 정책 기준)"""
+        return self.policy.should_assess(len(self.turns), self.last_scheduled_turn, student_message, requested)
+
+    def carried_evaluation(self) -> Dict[str, Any]:
+        """평가하지 않는 턴의 결과 - 마지막 평가를 그대로 (아직 없으면 0점)"""
+        evaluation = self.last_evaluation or {"understanding_score": 0, "is_completed": False}
+        return dict(evaluation, assessed=False)
+
+    def failed_evaluation(self) -> Dict[str, Any]:
+        """평가가 실패한 턴의 결과 - 마지막 평가를 그대로 (failed로 표시)"""
+        return dict(self.carried_evaluation(), failed=True)
+
+    def record_evaluation(self, turn: ConversationTurn, evaluation: Dict[str, Any]):
+        if evaluation.get("assessed") is False:
+            turn.third_eval_json = {"assessed": False, "carried_from_turn": self.scored_turn}
+            if evaluation.get("failed"):
+                turn.third_eval_json["failed"] = True
+                # 실패한 평가는 평가 간격에 넣지 않음 (다음 턴에 다시 평가)
+                if self.last_scheduled_turn == turn.turn_index:
+                    self.last_scheduled_turn = self.scored_turn
+            return
+        turn.third_eval_json = evaluation
+        # 파이프라인 모드에서는 이전 턴 평가가 늦게 끝날 수 있으므로 더 최근 턴의 점수를 덮어쓰지 않음
+        if turn.turn_index >= self.scored_turn:
+            self.scored_turn = turn.turn_index
+            self.understanding_level = evaluation["understanding_score"]
+            self.last_evaluation = evaluation
+
+
+@dataclass
+class ChatTurn:
+    """처리 중인 한 턴 (저장 대화가 아니면 conversation은 None)"""
+    topic: str
+    difficulty: str
+    understanding_level: int
+    messages: List[Dict[str, str]]  # 새 학생 메시지까지 포함한 대화 기록
+    student_message: str
+    conversation: Optional[Conversation] = None
+    context: Optional[Dict[str, Any]] = None  # 새 메시지를 반영한 대화 맥락 분석
+    record: Optional[ConversationTurn] = None
+    evaluation: Optional[Dict[str, Any]] = None
+    assessed: bool = True  # 이번 턴을 평가하는지 (False면 마지막 평가 결과를 그대로 사용)
+
+    def complete(self, ai_output: str):
+        """응답 생성 완료 - 저장 대화에 턴 기록 (평가가 먼저 끝났으면 함께 기록)"""
+        if self.conversation is None:
+            return
+        self.record = self.conversation.record_turn(self.student_message, ai_output, self.context)
+        if self.assessed:
+            # 실패한 턴은 기록되지 않으므로 평가 간격도 기록된 턴 기준으로 셈
+            self.conversation.last_scheduled_turn = self.record.turn_index
+        if self.evaluation is not None:
+            self.conversation.record_evaluation(self.record, self.evaluation)
+
+    def carried_evaluation(self) -> Dict[str, Any]:
+        """마지막 평가 결과 (저장 대화가 아니면 요청의 이해도)"""
+        if self.conversation is not None:
+            return self.conversation.carried_evaluation()
+        return {"understanding_score": self.understanding_level, "is_completed": False, "assessed": False}
+
+    def failed_evaluation(self) -> Dict[str, Any]:
+        """평가나 응답 생성이 실패한 턴의 결과 - 마지막 평가를 그대로 (failed로 표시)"""
+        return dict(self.carried_evaluation(), failed=True)
+
+    def set_evaluation(self, evaluation: Dict[str, Any]):
+        """평가 완료 - 턴이 이미 기록되었으면 바로 반영"""
+        self.evaluation = evaluation
+        if self.conversation is not None and self.record is not None:
+            self.conversation.record_evaluation(self.record, evaluation)
+
+
+class ConversationStore:
+    def __init__(self, ttl_sec: float = 7200, max_items: int = 10000):
+        self.ttl_sec = ttl_sec
+        self.max_items = max_items
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()  # id -> (Conversation, 마지막 사용 시각)
+
+    def create(self, topic: str, difficulty: str, initial_message: str,
+               policy: Optional[AssessmentPolicy] = None) -> Conversation:
+        """초기 메시지로 새 대화 시작 (0번 턴)"""
+        self._cleanup()
+        conversation = Conversation(
+            conversation_id=uuid.uuid4().hex,
+            topic=topic,
+            difficulty=difficulty,
+            policy=policy or default_policy()
+        )
+        conversation.messages.append({"role": "assistant", "content": initial_message})
+        conversation.turns.append(ConversationTurn(
+            turn_index=0,
+            student_input=None,
+            ai_output=initial_message,
+            third_eval_json={"initial": True, "understanding_score": 0}
+        ))
+        self._items[conversation.conversation_id] = (conversation, time.monotonic())
+        return conversation
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        entry = self._items.get(conversation_id)
+        if entry is None:
+            return None
+        conversation, last_used = entry
+        if time.monotonic() - last_used > self.ttl_sec:
+            self._items.pop(conversation_id)
+            return None
+        self._items[conversation_id] = (conversation, time.monotonic())
+        self._items.move_to_end(conversation_id)
+        return conversation
+
+    def _cleanup(self):
+        now = time.monotonic()
+        # 오래 안 쓴 순서로 정렬되어 있으므로 만료되었거나 상한을 넘으면 앞에서부터 정리
+        while self._items:
+            oldest, (_, last_used) = next(iter(self._items.items()))
+            if now - last_used <= self.ttl_sec and len(self._items) < self.max_items:
+                break
+            self._items.pop(oldest)
+
+
+conversation_store = ConversationStore(
+    ttl_sec=float(os.getenv("CONVERSATION_TTL_SEC", 7200)),
+    max_items=int(os.getenv("CONVERSATION_MAX_ITEMS", 10000)),
+)
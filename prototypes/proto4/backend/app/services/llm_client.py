@@ -0,0 +1,74 @@
+"""
+공유 LLM 클라이언트
+
+요청마다 AsyncOpenAI를 새로 만들면 매 턴 TCP/TLS 연결을 다시 맺어야 하므로
+앱 전체에서 하나의 클라이언트(연결 풀)를 사용합니다.
+main.py의 lifespan에서 생성/종료하고, 서비스는 get_llm_client()로 가져옵니다.
+
+환경 변수 (기본값)
+    OPENAI_BASE_URL            OpenAI 호환 서버 주소 (벤치마크용 mock 등)
+    LLM_HTTP2=true             HTTP/2 사용 (한 연결로 여러 요청 동시 처리)
+    LLM_MAX_CONNECTIONS=100    최대 동시 연결 수
+    LLM_MAX_KEEPALIVE=20       유지할 유휴 연결 수
+    LLM_KEEPALIVE_EXPIRY=30    유휴 연결 유지 시간(초)
+    LLM_CONNECT_TIMEOUT=5      연결 제한 시간(초)
+    LLM_READ_TIMEOUT=60        응답 제한 시간(초)
+    LLM_POOL_TIMEOUT=10        연결 풀 대기 제한 시간(초)
+    LLM_MAX_RETRIES=2          실패 시 재시도 횟수 (429/5xx/연결 오류)
+"""
+
+import os
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+_client: Optional[AsyncOpenAI] = None
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """연결 유지/HTTP2/제한 시간을 설정한 httpx 클라이언트"""
+    return httpx.AsyncClient(
+        http2=os.getenv("LLM_HTTP2", "true").lower() == "true",
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", 20)),
+            keepalive_expiry=_env_float("LLM_KEEPALIVE_EXPIRY", 30),
+        ),
+        timeout=httpx.Timeout(
+            connect=_env_float("LLM_CONNECT_TIMEOUT", 5),
+            read=_env_float("LLM_READ_TIMEOUT", 60),
+            write=_env_float("LLM_CONNECT_TIMEOUT", 5),
+            pool=_env_float("LLM_POOL_TIMEOUT", 10),
+        ),
+    )
+
+
+def create_llm_client() -> AsyncOpenAI:
+    """새 AsyncOpenAI 클라이언트 (연결 풀 포함)"""
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL") or None,
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", 2)),
+        http_client=build_http_client(),
+    )
+
+
+def get_llm_client() -> AsyncOpenAI:
+    """앱 공유 클라이언트 (lifespan 밖에서 호출되면 처음 한 번 생성)"""
+    global _client
+    if _client is None:
+        _client = create_llm_client()
+    return _client
+
+
+async def close_llm_client():
+    """공유 클라이언트의 연결 풀 정리 (앱 종료 시)"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,153 @@
+"""
+주제 검증/초기 메시지 응답 캐시
+
+같은 템플릿으로 참여한 학생들은 모두 같은 주제로 주제 검증과 초기 메시지를 요청하므로
+(주제, 난이도, 모델, 프롬프트 버전)이 같으면 LLM을 다시 호출하지 않고 저장된 결과를 씁니다.
+    키        정규화한 주제(유니코드 NFC, 공백 정리, 대소문자 무시) 등을 묶은 sha256
+    만료      ttl_sec 경과 시 (저장 시각 기준), 개수 상한을 넘으면 오래 안 쓴 것부터 (LRU)
+    동시 요청  같은 키의 첫 생성이 끝나기 전 들어온 요청은 그 결과를 함께 기다림
+    영속화    path를 지정하면 JSON 파일에 저장하고 재시작 시 다시 읽음
+
+환경 변수 (기본값)
+    RESPONSE_CACHE_TTL_SEC=86400     캐시 유지 시간(초)
+    RESPONSE_CACHE_MAX_ITEMS=1000    최대 항목 수
+    RESPONSE_CACHE_PATH              JSON 파일 경로 (없으면 메모리에만 보관)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+def normalize_topic(topic: str) -> str:
+    """표기만 다른 같은 주제를 하나로 (NFC, 공백 정리, 대소문자 무시)"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", topic or "")).strip().casefold()
+
+
+def cache_key(kind: str, topic: str, difficulty: str, model: str, prompt_version: str) -> str:
+    raw = json.dumps(
+        [kind, normalize_topic(topic), difficulty or "", model, prompt_version],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, ttl_sec: float = 86400, max_items: int = 1000, path: Optional[str] = None):
+        self.ttl_sec = ttl_sec
+        self.max_items = max_items
+        self.path = path
+        # key -> (값, 만료 시각) - 파일로 옮길 수 있도록 벽시계 시간 사용
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self._load()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            self._entries.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def is_pending(self, key: str) -> bool:
+        """같은 키의 값을 생성 중인지"""
+        return key in self._pending
+
+    def set(self, key: str, value: Any):
+        self._entries[key] = (value, time.time() + self.ttl_sec)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+        if self.path:
+            self._save()
+
+    async def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Tuple[Any, bool]]]
+    ) -> Any:
+        """
+        캐시된 값 또는 factory 결과
+
+        factory는 (값, 저장 여부)를 반환합니다 - 폴백 응답처럼 저장하면 안 되는 값은 False.
+        같은 키로 동시에 들어온 요청은 LLM을 한 번만 호출합니다.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value, cacheable = await factory()
+            if cacheable:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없으면 "예외를 꺼내지 않았다" 경고가 남지 않도록
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        if self.path:
+            self._save()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, (value, expires_at) in sorted(stored.items(), key=lambda item: item[1][1]):
+            if expires_at > now:
+                self._entries[key] = (value, expires_at)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        # 임시 파일에 쓴 뒤 교체 (쓰는 도중 종료되어도 기존 파일 유지)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(dict(self._entries), f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Response cache save error: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+response_cache = ResponseCache(
+    ttl_sec=float(os.getenv("RESPONSE_CACHE_TTL_SEC", 86400)),
+    max_items=int(os.getenv("RESPONSE_CACHE_MAX_ITEMS", 1000)),
+    path=os.getenv("RESPONSE_CACHE_PATH") or None,
+)
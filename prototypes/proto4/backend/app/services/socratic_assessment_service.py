@@ -12,11 +12,15 @@ from openai import AsyncOpenAI
 import os
 from dotenv import load_dotenv
 
+from app.services.conversation_context import ConversationContextManager, conversation_context
+from app.services.llm_client import get_llm_client
+
 load_dotenv()
 
 class SocraticAssessmentService:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(self, client: Optional[AsyncOpenAI] = None, context: Optional[ConversationContextManager] = None):
+        self.client = client or get_llm_client()
+        self.context = context or conversation_context
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         
         # 5차원 평가 가중치 (총합 100%)
@@ -59,14 +63,18 @@ class SocraticAssessmentService:
         student_response: str,
         ai_response: str,
         conversation_history: List[Dict],
-        difficulty: str = "normal"
+        difficulty: str = "normal",
+        context_analysis: Optional[Dict] = None
     ) -> Dict[str, Any]:
         """
         소크라테스식 5차원 평가 수행
+        
+        context_analysis: 서버 저장 대화에서 증분 갱신한 맥락 분석 (없으면 대화 기록 전체에서 계산)
         """
         
         # 대화 맥락 분석
-        context_analysis = self._analyze_conversation_context(conversation_history)
+        if context_analysis is None:
+            context_analysis = self._analyze_conversation_context(conversation_history)
         
         # 5차원 평가 프롬프트 생성
         evaluation_prompt = self._build_multidimensional_prompt(
@@ -86,26 +94,11 @@ class SocraticAssessmentService:
             print(f"🤖 AI 평가 응답 원본: {response_content[:200]}...")
             
             # JSON 응답 파싱
-            evaluation_result = json.loads(response_content)
-            
-            # 종합 점수 계산
-            overall_score = self._calculate_weighted_score(evaluation_result["dimensions"])
-            
-            # 완성도 체크
-            is_completed = self._check_completion_criteria(
-                evaluation_result["dimensions"], difficulty
-            )
+            evaluation_result = self._finalize_evaluation(json.loads(response_content), difficulty)
             
-            print(f"✅ 5차원 평가 완료 - 종합점수: {overall_score}")
+            print(f"✅ 5차원 평가 완료 - 종합점수: {evaluation_result['overall_score']}")
             
-            return {
-                "dimensions": evaluation_result["dimensions"],
-                "overall_score": overall_score,
-                "is_completed": is_completed,
-                "insights": evaluation_result["insights"],
-                "growth_indicators": evaluation_result["growth_indicators"],
-                "next_focus": evaluation_result["next_focus"]
-            }
+            return evaluation_result
             
         except json.JSONDecodeError as e:
             print(f"❌ JSON 파싱 오류: {e}")
@@ -118,7 +111,7 @@ class SocraticAssessmentService:
     def _analyze_conversation_context(self, conversation_history: List[Dict]) -> Dict:
         """대화 맥락 분석"""
         if not conversation_history:
-            return {"turn_count": 0, "question_evolution": [], "concept_progression": []}
+            return {"turn_count": 0, "question_evolution": [], "concept_progression": [], "history": []}
         
         # 대화 턴 수
         turn_count = len([msg for msg in conversation_history if msg.get("role") == "user"])
@@ -133,25 +126,55 @@ class SocraticAssessmentService:
             "turn_count": turn_count,
             "question_evolution": user_messages,
             "concept_progression": concept_progression,
-            "conversation_depth": min(turn_count * 10, 50)  # 대화 깊이 보너스
+            "conversation_depth": min(turn_count * 10, 50),  # 대화 깊이 보너스
+            "history": conversation_history
+        }
+
+    def update_conversation_context(
+        self,
+        context: Dict,
+        user_message: str,
+        conversation_history: List[Dict]
+    ) -> Dict:
+        """
+        이전 맥락 분석에 새 학생 메시지 하나만 반영 (서버 저장 대화용)
+        
+        이전 결과는 수정하지 않으므로 응답 생성이 실패하면 그대로 버릴 수 있습니다.
+        """
+        question_evolution = context.get("question_evolution", []) + [user_message]
+        concept_progression = context.get("concept_progression", []) + self._extract_concept_progression(
+            [user_message], start=len(question_evolution) - 1
+        )
+        turn_count = len(question_evolution)
+        
+        return {
+            "turn_count": turn_count,
+            "question_evolution": question_evolution,
+            "concept_progression": concept_progression,
+            "conversation_depth": min(turn_count * 10, 50),  # 대화 깊이 보너스
+            "history": conversation_history
         }
 
-    def _extract_concept_progression(self, messages: List[str]) -> List[str]:
-        """학생 답변에서 개념 이해의 진행 과정 추출"""
+    def _extract_concept_progression(self, messages: List[str], start: int = 0) -> List[str]:
+        """학생 답변에서 개념 이해의 진행 과정 추출 (start: 첫 메시지의 순번)"""
         progressions = []
-        for i, msg in enumerate(messages):
+        for i, msg in enumerate(messages, start):
             if len(msg) > 20:  # 의미있는 답변만
                 stage = "초기" if i < 3 else "중기" if i < 6 else "심화"
                 progressions.append(f"{stage}: {msg[:50]}...")
         return progressions
 
-    def _build_conversation_summary(self, user_messages: List[str]) -> str:
-        """전체 대화 과정을 요약하여 맥락 제공"""
-        if not user_messages:
+    def _build_conversation_summary(self, conversation_history: List[Dict]) -> str:
+        """대화 과정 맥락 - 오래된 턴은 요약, 최근 턴은 학생 답변 (토큰 예산 이내)"""
+        if not any(msg.get("role") == "user" for msg in conversation_history):
             return "대화가 시작되지 않았습니다."
         
-        summary_parts = []
-        for i, msg in enumerate(user_messages, 1):
+        window = self.context.build(conversation_history)
+        summary_parts = list(window.summary_lines)
+        turns = self.context.split_turns(window.recent_messages)
+        first_turn = window.first_recent_turn if window.first_recent_turn > 0 else 1
+        for i, turn in enumerate(turns[1:], first_turn):
+            msg = " ".join(m["content"] for m in turn if m.get("role") == "user")
             # 각 턴별로 학생 답변 요약 (너무 길면 자름)
             truncated_msg = msg[:100] + "..." if len(msg) > 100 else msg
             summary_parts.append(f"턴 {i}: {truncated_msg}")
@@ -171,7 +194,7 @@ class SocraticAssessmentService:
         criteria = self.difficulty_criteria[difficulty]
         
         # 전체 대화 내용을 맥락으로 포함
-        conversation_summary = self._build_conversation_summary(context['question_evolution'])
+        conversation_summary = self._build_conversation_summary(context['history'])
         
         return f"""당신은 소크라테스식 5차원 평가 전문가입니다.
 
@@ -220,6 +243,126 @@ class SocraticAssessmentService:
     "next_focus": "다음 학습 방향 제안"
 }}"""
 
+    async def evaluate_batch(self, topic: str, difficulty: str, items: List[Dict]) -> List[Optional[Dict[str, Any]]]:
+        """
+        같은 주제·난이도의 여러 학생을 한 번의 호출로 평가
+        
+        items: [{"student_response", "conversation_history", "context_analysis"}]
+        결과는 items 순서이며, 응답에서 빠지거나 형식이 잘못된 항목은 None (호출한 쪽에서 따로 평가)
+        """
+        contexts = [
+            item.get("context_analysis") or self._analyze_conversation_context(item["conversation_history"])
+            for item in items
+        ]
+        batch_prompt = self._build_batch_prompt(
+            topic, difficulty, [item["student_response"] for item in items], contexts
+        )
+        
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "system", "content": batch_prompt}],
+            temperature=0.3,
+            max_tokens=min(800 * len(items), 4000)
+        )
+        
+        response_content = response.choices[0].message.content.strip()
+        try:
+            evaluations = json.loads(response_content)["results"]
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"❌ 배치 평가 JSON 파싱 오류: {e}")
+            return [None] * len(items)
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        for position, evaluation in enumerate(evaluations if isinstance(evaluations, list) else []):
+            try:
+                index = int(evaluation.get("student", position + 1)) - 1
+                if 0 <= index < len(items) and results[index] is None:
+                    results[index] = self._finalize_evaluation(evaluation, difficulty)
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        
+        print(f"✅ 배치 5차원 평가 완료 - {sum(r is not None for r in results)}/{len(items)}명")
+        return results
+
+    def _finalize_evaluation(self, evaluation_result: Dict[str, Any], difficulty: str) -> Dict[str, Any]:
+        """LLM 평가 응답에 종합 점수와 완성도 추가 (필드가 빠져 있으면 KeyError)"""
+        dimensions = evaluation_result["dimensions"]
+        return {
+            "dimensions": dimensions,
+            "overall_score": self._calculate_weighted_score(dimensions),
+            "is_completed": self._check_completion_criteria(dimensions, difficulty),
+            "insights": evaluation_result["insights"],
+            "growth_indicators": evaluation_result["growth_indicators"],
+            "next_focus": evaluation_result["next_focus"]
+        }
+
+    def _build_batch_prompt(
+        self,
+        topic: str,
+        difficulty: str,
+        student_responses: List[str],
+        contexts: List[Dict]
+    ) -> str:
+        """여러 학생의 5차원 평가를 한 번에 요청하는 프롬프트"""
+        
+        students = "\n\n".join(
+            f"[학생 {number}]\n"
+            f"대화 턴: {context['turn_count']}회\n\n"
+            f"전체 대화 과정:\n{self._build_conversation_summary(context['history'])}\n\n"
+            f'학생의 최신 답변: "{student_response}"'
+            for number, (student_response, context) in enumerate(zip(student_responses, contexts), 1)
+        )
+        
+        return f"""당신은 소크라테스식 5차원 평가 전문가입니다.
+아래 학생들은 같은 주제로 각자 따로 대화하고 있습니다. 학생마다 자신의 대화만 보고 독립적으로 평가하세요.
+
+주제: {topic}
+난이도: {difficulty}
+평가 대상 수: {len(student_responses)}
+
+{students}
+
+**중요**: 각 학생의 최신 답변만이 아니라, 그 학생의 전체 대화 과정을 통해 나타난 누적된 이해도와 성장을 종합적으로 평가하세요.
+
+**평가 원칙**:
+- 대화가 진행될수록 점수는 점진적으로 상승해야 합니다
+- 한 번 달성한 이해도는 쉽게 후퇴하지 않습니다
+- 급격한 점수 변동보다는 안정적인 성장을 반영하세요
+- 학습자의 전반적인 발전 궤도를 고려하세요
+
+다음 5차원으로 평가하세요:
+1. 사고 깊이 (0-100): 표면적 → 본질적 이해 (누적적 평가)
+2. 사고 확장 (0-100): 단일 → 다각적 관점 (누적적 평가)  
+3. 실생활 적용 (0-100): 추상적 → 구체적 연결 (누적적 평가)
+4. 메타인지 (0-100): 사고 과정 인식 (누적적 평가)
+5. 소크라테스적 참여 (0-100): 수동적 → 능동적 탐구 (누적적 평가)
+
+반드시 아래 JSON 형식으로만 응답하세요 (results에 학생 번호 순서대로 {len(student_responses)}개):
+
+{{
+    "results": [
+        {{
+            "student": 학생 번호,
+            "dimensions": {{
+                "depth": 점수,
+                "breadth": 점수,
+                "application": 점수,
+                "metacognition": 점수,
+                "engagement": 점수
+            }},
+            "insights": {{
+                "depth": "깊이 평가 설명",
+                "breadth": "확장 평가 설명",
+                "application": "적용 평가 설명", 
+                "metacognition": "메타인지 평가 설명",
+                "engagement": "참여 평가 설명"
+            }},
+            "growth_indicators": ["성장지표1", "성장지표2"],
+            "next_focus": "다음 학습 방향 제안"
+        }}
+    ]
+}}"""
+
     def _calculate_weighted_score(self, dimensions: Dict[str, int]) -> int:
         """가중치를 적용한 종합 점수 계산"""
         total_score = 0
@@ -242,8 +385,9 @@ class SocraticAssessmentService:
         )
 
     def _get_default_evaluation(self) -> Dict[str, Any]:
-        """오류 시 기본 평가 반환"""
+        """오류 시 기본 평가 반환 (failed=True - 점수로 기록하지 않음)"""
         return {
+            "failed": True,
             "dimensions": {
                 "depth": 30,
                 "breadth": 25,
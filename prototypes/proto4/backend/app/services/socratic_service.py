@@ -1,14 +1,46 @@
 from openai import AsyncOpenAI
+import asyncio
 import os
-from typing import List, Dict
+import random
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+
+from app.services.conversation_context import ConversationContextManager, conversation_context
+from app.services.llm_client import get_llm_client
+from app.services.response_cache import ResponseCache, cache_key, response_cache
+
+SOCRATIC_FALLBACK = "죄송해요, 일시적인 오류가 발생했습니다. 다시 말씀해 주세요."
+# 주제 검증/초기 메시지 프롬프트를 바꾸면 올려서 이전 캐시를 무효화
+PROMPT_VERSION = "2.0"
+# 주제마다 미리 만들어 두는 초기 메시지 수 (학생마다 그중 하나를 사용)
+INITIAL_MESSAGE_POOL_SIZE = int(os.getenv("INITIAL_MESSAGE_POOL_SIZE", 3))
+
+# 백그라운드 작업 참조 (완료 전에 가비지 컬렉션되지 않도록)
+_background_tasks = set()
+
+
+class SocraticResponseError(Exception):
+    """산파법 응답 생성 실패 - 대화에 기록하지 않고 학생에게는 fallback 메시지를 보여줌"""
+    fallback = SOCRATIC_FALLBACK
 
 class SocraticService:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        cache: Optional[ResponseCache] = None,
+        context: Optional[ConversationContextManager] = None
+    ):
+        self.client = client or get_llm_client()
+        self.cache = cache or response_cache
+        self.context = context or conversation_context
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     
     async def validate_topic(self, topic_content: str) -> bool:
-        """주제의 교육적 적합성 검증"""
+        """주제의 교육적 적합성 검증 (같은 주제는 캐시된 결과 사용)"""
+        key = cache_key("validate", topic_content, "", self.model, PROMPT_VERSION)
+        return await self.cache.get_or_create(key, lambda: self._validate_topic(topic_content))
+    
+    async def _validate_topic(self, topic_content: str) -> Tuple[bool, bool]:
+        """(적합 여부, 캐시 저장 여부) - 호출 실패로 인한 False는 저장하지 않음"""
         validation_prompt = f"""
 다음 학습 주제가 중학생에게 교육적으로 적합한지 판단해주세요:
 
@@ -32,59 +64,74 @@ class SocraticService:
             )
             
             result = response.choices[0].message.content.strip().upper()
-            return result == "YES"
+            return result == "YES", True
             
         except Exception as e:
             print(f"Topic validation error: {e}")
-            return False
+            return False, False
     
-    async def generate_initial_message(self, topic: str) -> str:
-        """주제 기반 첫 대화 메시지 생성"""
-        system_prompt = self._build_socratic_system_prompt(topic)
+    async def generate_initial_message(self, topic: str, difficulty: str = "normal") -> str:
+        """주제 기반 첫 대화 메시지 (주제별로 미리 만든 메시지 중 하나)"""
+        pool = await self._initial_message_pool(topic, difficulty)
+        return random.choice(pool)
+    
+    async def stream_initial_message(self, topic: str, difficulty: str = "normal") -> AsyncIterator[str]:
+        """
+        첫 대화 메시지를 토큰 단위로 생성 (SSE 전달용)
         
-        initial_prompt = f"""
-학생이 '{topic}' 주제로 학습을 시작합니다. 
-소크라테스식 산파법에 따라 첫 대화를 시작해주세요.
-
-규칙:
-1. 학생의 기존 지식을 탐구하는 질문으로 시작
-2. 친근하고 격려하는 어조
-3. 답을 직접 제공하지 말고 사고를 유도
-4. 중학생 수준에 맞는 언어 사용
-"""
+        캐시된 메시지가 있거나 생성 중이면 그 결과를 한 번에 보내고,
+        주제의 첫 요청만 직접 스트리밍하면서 다음 학생들을 위한 메시지 묶음을 백그라운드로 만듭니다.
+        """
+        key = self._initial_pool_key(topic, difficulty)
+        if self.cache.get(key) is not None or self.cache.is_pending(key):
+            yield await self.generate_initial_message(topic, difficulty)
+            return
         
+        task = asyncio.ensure_future(self._initial_message_pool(topic, difficulty))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+        async for delta in self._stream_completion(
+            self._build_initial_messages(topic), 300, self._initial_fallback(topic)
+        ):
+            yield delta
+    
+    def _initial_pool_key(self, topic: str, difficulty: str) -> str:
+        return cache_key(f"initial:{INITIAL_MESSAGE_POOL_SIZE}", topic, difficulty, self.model, PROMPT_VERSION)
+    
+    async def _initial_message_pool(self, topic: str, difficulty: str) -> List[str]:
+        key = self._initial_pool_key(topic, difficulty)
+        return await self.cache.get_or_create(key, lambda: self._generate_initial_messages(topic))
+    
+    async def _generate_initial_messages(self, topic: str) -> Tuple[List[str], bool]:
+        """한 번의 호출로 서로 다른 초기 메시지 여러 개 생성 (n개 선택지)"""
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": initial_prompt}
-                ],
+                messages=self._build_initial_messages(topic),
                 max_tokens=300,
-                temperature=0.7
+                temperature=0.9,  # 학생마다 다른 첫 질문이 나오도록 조금 높게
+                n=INITIAL_MESSAGE_POOL_SIZE
             )
             
-            return response.choices[0].message.content.strip()
+            pool = list(dict.fromkeys(
+                choice.message.content.strip()
+                for choice in response.choices
+                if choice.message.content and choice.message.content.strip()
+            ))
+            if pool:
+                return pool, True
+            return [self._initial_fallback(topic)], False
             
         except Exception as e:
             print(f"Initial message generation error: {e}")
-            return f"안녕하세요! 오늘은 '{topic}'에 대해 함께 탐구해볼까요? 먼저 이 주제에 대해 어떤 생각이 드시나요?"
+            return [self._initial_fallback(topic)], False
     
     async def generate_socratic_response(self, topic: str, messages: List[Dict], understanding_level: int) -> str:
-        """소크라테스식 응답 생성"""
-        system_prompt = self._build_socratic_system_prompt(topic, understanding_level)
-        
+        """소크라테스식 응답 생성 (실패하면 SocraticResponseError)"""
         try:
-            # 대화 히스토리 구성
-            conversation_messages = [{"role": "system", "content": system_prompt}]
-            
-            for msg in messages:
-                role = "user" if msg["role"] == "user" else "assistant"
-                conversation_messages.append({"role": role, "content": msg["content"]})
-            
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=conversation_messages,
+                messages=self._build_conversation_messages(topic, messages, understanding_level),
                 max_tokens=400,
                 temperature=0.7
             )
@@ -93,7 +140,91 @@ class SocraticService:
             
         except Exception as e:
             print(f"Socratic response generation error: {e}")
-            return "죄송해요, 일시적인 오류가 발생했습니다. 다시 말씀해 주세요."
+            raise SocraticResponseError(str(e)) from e
+    
+    async def stream_socratic_response(self, topic: str, messages: List[Dict], understanding_level: int) -> AsyncIterator[str]:
+        """소크라테스식 응답을 토큰 단위로 생성 (SSE 전달용, 실패하면 보낸 조각 뒤에 SocraticResponseError)"""
+        async for delta in self._stream_completion(
+            self._build_conversation_messages(topic, messages, understanding_level), 400, SOCRATIC_FALLBACK,
+            raise_on_error=True
+        ):
+            yield delta
+    
+    async def _stream_completion(self, messages: List[Dict], max_tokens: int, fallback: str,
+                                 raise_on_error: bool = False) -> AsyncIterator[str]:
+        """
+        stream=True로 받은 조각을 도착하는 대로 전달
+        
+        첫 조각 전에 실패하면 폴백 메시지를 대신 보내고,
+        중간에 실패하면 이미 보낸 부분까지만 응답으로 남깁니다.
+        raise_on_error면 그 뒤에 SocraticResponseError를 올려 호출자가 실패한 응답을 기록하지 않게 합니다.
+        """
+        started = False
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.7,
+                stream=True
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if not started:
+                    # 비스트리밍 응답의 strip()과 맞추기 위해 앞 공백 제거
+                    delta = delta.lstrip()
+                    if not delta:
+                        continue
+                    started = True
+                yield delta
+        except Exception as e:
+            print(f"Streaming generation error: {e}")
+            if not started:
+                yield fallback
+            if raise_on_error:
+                raise SocraticResponseError(str(e)) from e
+    
+    def _build_initial_messages(self, topic: str) -> List[Dict]:
+        system_prompt = self._build_socratic_system_prompt(topic)
+        
+        initial_prompt = f"""
+학생이 '{topic}' 주제로 학습을 시작합니다. 
+소크라테스식 산파법에 따라 첫 대화를 시작해주세요.
+
+규칙:
+1. 학생의 기존 지식을 탐구하는 질문으로 시작
+2. 친근하고 격려하는 어조
+3. 답을 직접 제공하지 말고 사고를 유도
+4. 중학생 수준에 맞는 언어 사용
+"""
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": initial_prompt}
+        ]
+    
+    def _initial_fallback(self, topic: str) -> str:
+        return f"안녕하세요! 오늘은 '{topic}'에 대해 함께 탐구해볼까요? 먼저 이 주제에 대해 어떤 생각이 드시나요?"
+    
+    def _build_conversation_messages(self, topic: str, messages: List[Dict], understanding_level: int) -> List[Dict]:
+        """시스템 프롬프트 + 이전 턴 요약 + 최근 턴 원문 (토큰 예산 이내)"""
+        system_prompt = self._build_socratic_system_prompt(topic, understanding_level)
+        conversation_messages = [{"role": "system", "content": system_prompt}]
+        
+        window = self.context.build(messages, system_prompt)
+        if window.summary_lines:
+            conversation_messages.append({
+                "role": "system",
+                "content": f"이전 대화 요약 (오래된 {window.folded_turns}개 턴):\n{window.summary}"
+            })
+        
+        for msg in window.recent_messages:
+            role = "user" if msg["role"] == "user" else "assistant"
+            conversation_messages.append({"role": role, "content": msg["content"]})
+        return conversation_messages
     
     def _build_socratic_system_prompt(self, topic: str, understanding_level: int = 0) -> str:
         """소크라테스식 산파법 시스템 프롬프트 구축"""
@@ -0,0 +1,60 @@
+"""
+턴별 평가 작업 저장소 (파이프라인 모드)
+
+응답을 먼저 돌려주고 5차원 평가는 백그라운드 작업으로 계속 진행합니다.
+클라이언트는 응답과 함께 받은 turn_id로 GET /chat/assessment/{turn_id}를 호출해
+평가 결과를 받습니다 (완료될 때까지 최대 wait초 대기).
+결과는 프로세스 메모리에만 보관하고 ttl_sec이 지나면 정리합니다.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+
+class TurnAssessmentStore:
+    def __init__(self, ttl_sec: float = 600, max_items: int = 10000):
+        self.ttl_sec = ttl_sec
+        self.max_items = max_items
+        self._tasks: Dict[str, Tuple[asyncio.Task, float]] = {}
+
+    def submit(self, coroutine: Awaitable[Dict[str, Any]]) -> str:
+        """평가 작업 시작 후 turn_id 반환"""
+        self._cleanup()
+        turn_id = uuid.uuid4().hex
+        # 작업 참조를 보관해야 완료 전에 가비지 컬렉션되지 않음
+        self._tasks[turn_id] = (asyncio.ensure_future(coroutine), time.monotonic())
+        return turn_id
+
+    async def result(self, turn_id: str, wait: float = 0) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        평가 결과 조회
+
+        Returns:
+            (존재 여부, 결과 - 아직 진행 중이면 None)
+        """
+        entry = self._tasks.get(turn_id)
+        if entry is None:
+            return False, None
+        task = entry[0]
+        if not task.done() and wait > 0:
+            # 대기 시간이 지나도 작업은 취소하지 않음 (다음 조회에서 다시 대기)
+            await asyncio.wait({task}, timeout=wait)
+        if not task.done():
+            return True, None
+        return True, task.result()
+
+    def _cleanup(self):
+        now = time.monotonic()
+        expired = [key for key, (_, created) in self._tasks.items() if now - created > self.ttl_sec]
+        for key in expired:
+            task = self._tasks.pop(key)[0]
+            task.cancel()
+        # 상한을 넘으면 오래된 것부터 정리
+        while len(self._tasks) >= self.max_items:
+            oldest = next(iter(self._tasks))
+            self._tasks.pop(oldest)[0].cancel()
+
+
+turn_assessments = TurnAssessmentStore()
@@ -0,0 +1,182 @@
+"""
+proto4 API 부하 벤치마크
+
+mock LLM(MockProfile)과 proto4 앱을 같은 프로세스의 uvicorn으로 띄운 뒤 동시 학생 수(concurrency)마다
+학생 한 명이
+    /api/v1/chat/initial      대화 시작 (주제는 --topics개 중 하나 - 적을수록 초기 메시지 캐시 적중)
+    /api/v1/chat/socratic     서버 저장 대화로 --turns턴 (짧은 답변과 긴 답변을 번갈아)
+을 --sessions번 반복하게 하고 엔드포인트별 p50/p95/p99 지연시간과 처리량, mock LLM 호출·토큰·오류 수를 출력합니다.
+--stream이면 /stream 엔드포인트를 쓰고 첫 토큰까지의 시간(ttft)도 측정합니다.
+--target-url을 주면 이미 실행 중인 proto4 서버를 측정합니다 (서버의 OPENAI_BASE_URL은 직접 설정, mock 통계 없음).
+
+    cd prototypes/proto4/backend
+    python -m benchmarks.bench_api --concurrency 1,8,32 --turns 4 --latency-ms 200 --latency-dist lognormal
+    python -m benchmarks.bench_api --concurrency 32 --stream --tokens-per-sec 80 --rate-limit-rate 0.05
+
+출력 예 (1 vCPU, --concurrency 1,16 --turns 4 --latency-ms 200 --latency-dist lognormal --seed 1):
+    concurrency 1: 1 students, 5 requests in 1.33s
+      endpoint     count  fail  p50(ms)  p95(ms)  p99(ms)   req/s
+      initial          1     0   344.75   344.75   344.75    0.75
+      socratic         4     0   227.05   356.41   356.41    3.02
+      llm calls 7 (ok 7, 429 0, 5xx 0), tokens prompt 4661 / completion 265
+    concurrency 16: 16 students, 80 requests in 2.43s
+      endpoint     count  fail  p50(ms)  p95(ms)  p99(ms)   req/s
+      initial         16     0   237.26   383.16   383.16    6.58
+      socratic        64     0   335.47   624.96   914.62   26.31
+      llm calls 92 (ok 92, 429 0, 5xx 0), tokens prompt 63566 / completion 4132
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.mock_llm import add_profile_arguments, create_mock_app, profile_from_args, running_server
+
+TOPICS = ["광합성", "유니버설 디자인", "민주주의", "생태계", "확률", "기후 변화", "인공지능 윤리", "전기 회로"]
+SHORT_ANSWER = "잘 모르겠어요"
+LONG_ANSWER = "식물은 햇빛과 물, 이산화탄소를 이용해서 양분을 만든다고 생각해요. 잎의 엽록체에서 일어나는 것 같아요."
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[max(0, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.failures: Counter = Counter()
+
+    def add(self, endpoint: str, started: float, ok: bool):
+        if ok:
+            self.timings[endpoint].append((time.perf_counter() - started) * 1000)
+        else:
+            self.failures[endpoint] += 1
+
+    def report(self, wall_sec: float):
+        print(f"  {'endpoint':<10} {'count':>7} {'fail':>5} {'p50(ms)':>8} {'p95(ms)':>8} {'p99(ms)':>8} {'req/s':>7}")
+        for endpoint in sorted(set(self.timings) | set(self.failures)):
+            timings = sorted(self.timings[endpoint])
+            print(f"  {endpoint:<10} {len(timings):>7} {self.failures[endpoint]:>5} "
+                  f"{percentile(timings, 50):>8.2f} {percentile(timings, 95):>8.2f} {percentile(timings, 99):>8.2f} "
+                  f"{len(timings) / wall_sec:>7.2f}")
+
+
+async def post_json(client: httpx.AsyncClient, recorder: Recorder, endpoint: str, path: str, body: dict):
+    started = time.perf_counter()
+    try:
+        response = await client.post(path, json=body)
+    except httpx.HTTPError:
+        recorder.add(endpoint, started, False)
+        return None
+    recorder.add(endpoint, started, response.status_code == 200)
+    return response.json() if response.status_code == 200 else None
+
+
+async def post_stream(client: httpx.AsyncClient, recorder: Recorder, endpoint: str, path: str, body: dict):
+    """SSE 엔드포인트 - 첫 token 이벤트까지(ttft)와 done 이벤트까지 측정"""
+    started = time.perf_counter()
+    first_token = True
+    event = done = None
+    try:
+        async with client.stream("POST", path, json=body) as response:
+            if response.status_code == 200:
+                async for line in response.aiter_lines():
+                    if line.startswith("event: "):
+                        event = line[len("event: "):]
+                        if event == "token" and first_token:
+                            recorder.add("ttft", started, True)
+                            first_token = False
+                    elif line.startswith("data: ") and event == "done":
+                        done = json.loads(line[len("data: "):])
+    except httpx.HTTPError:
+        pass
+    recorder.add(endpoint, started, done is not None)
+    return done
+
+
+async def student(client: httpx.AsyncClient, recorder: Recorder, args, index: int):
+    post = post_stream if args.stream else post_json
+    suffix = "/stream" if args.stream else ""
+    for _ in range(args.sessions):
+        initial = await post(client, recorder, "initial", f"/api/v1/chat/initial{suffix}", {
+            "topic": TOPICS[index % args.topics],
+            "difficulty": "normal",
+            "assessment_policy": args.assessment_policy,
+        })
+        if initial is None:
+            continue
+        for turn in range(args.turns):
+            await post(client, recorder, "socratic", f"/api/v1/chat/socratic{suffix}", {
+                "conversation_id": initial["conversation_id"],
+                "message": LONG_ANSWER if turn % 2 else SHORT_ANSWER,
+            })
+
+
+async def run_level(base_url: str, args, concurrency: int):
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(student(client, recorder, args, index) for index in range(concurrency)))
+        wall_sec = time.perf_counter() - started
+    requests = sum(len(timings) for name, timings in recorder.timings.items() if name != "ttft")
+    requests += sum(count for name, count in recorder.failures.items() if name != "ttft")
+    print(f"concurrency {concurrency}: {concurrency * args.sessions} students, {requests} requests in {wall_sec:.2f}s")
+    recorder.report(wall_sec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="proto4 API 부하 벤치마크")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시 학생 수 (쉼표로 여러 단계)")
+    parser.add_argument("--sessions", type=int, default=1, help="학생마다 반복할 대화 수")
+    parser.add_argument("--turns", type=int, default=4, help="대화마다 학생 턴 수")
+    parser.add_argument("--topics", type=int, default=4, help=f"사용할 주제 수 (1-{len(TOPICS)})")
+    parser.add_argument("--assessment-policy", default=None, choices=["every_turn", "adaptive", "on_demand"])
+    parser.add_argument("--stream", action="store_true", help="SSE 엔드포인트 사용 (첫 토큰 시간 측정)")
+    parser.add_argument("--keep-cache", action="store_true", help="단계 사이에 응답 캐시를 비우지 않음")
+    parser.add_argument("--target-url", default=None, help="이미 실행 중인 proto4 서버 (예: http://127.0.0.1:8000)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    args.topics = min(max(1, args.topics), len(TOPICS))
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    if args.target_url:
+        for concurrency in levels:
+            asyncio.run(run_level(args.target_url, args, concurrency))
+        return
+
+    mock_app = create_mock_app(profile=profile_from_args(args))
+    with running_server(mock_app) as mock_url:
+        # proto4 서비스는 import 시점/첫 호출 때 환경 변수를 읽으므로 앱을 불러오기 전에 설정
+        os.environ["OPENAI_BASE_URL"] = f"{mock_url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "mock")
+        os.environ.pop("RESPONSE_CACHE_PATH", None)
+        from main import app as proto4_app
+        from app.services.response_cache import response_cache
+
+        with running_server(proto4_app) as base_url:
+            for concurrency in levels:
+                if not args.keep_cache:
+                    response_cache.clear()
+                before = Counter(mock_app.state.stats)
+                calls_before = mock_app.state.requests
+                asyncio.run(run_level(base_url, args, concurrency))
+                stats = Counter(mock_app.state.stats)
+                stats.subtract(before)
+                print(f"  llm calls {mock_app.state.requests - calls_before} "
+                      f"(ok {stats['ok']}, 429 {stats['rate_limited']}, 5xx {stats['errors']}), "
+                      f"tokens prompt {stats['prompt_tokens']} / completion {stats['completion_tokens']}")
+
+
+if __name__ == "__main__":
+    main()
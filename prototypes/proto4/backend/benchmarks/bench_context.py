@@ -0,0 +1,68 @@
+"""
+대화 맥락 크기 벤치마크
+
+긴 대화(기본 30턴)를 흉내 내어 턴마다 산파법 응답 프롬프트의 추정 토큰 수를
+    full      전체 대화 기록 (이전 방식)
+    bounded   최근 턴 원문 + 이전 턴 요약 (ConversationContextManager)
+로 비교하고 대화 전체 누적 토큰과 맥락 구성 시간을 출력합니다. LLM은 호출하지 않습니다.
+
+    cd prototypes/proto4/backend
+    python -m benchmarks.bench_context --turns 30 --keep-turns 6 --budget 3000
+
+출력 예:
+    turn    full  bounded
+       1     700      700
+      10    2708     2137
+      20    4948     2389
+      30    7188     2389
+    total tokens: full 118236, bounded 62965 (-46.7%)
+    context build: 0.503 ms/turn
+"""
+
+import argparse
+import time
+
+from app.services.conversation_context import ConversationContextManager, estimate_message_tokens
+from app.services.socratic_service import SocraticService
+
+TOPIC = "광합성"
+OPENING = "안녕하세요! 광합성에 대해 어떻게 생각하나요? 식물은 무엇을 먹고 살까요?"
+STUDENT = "식물은 햇빛과 물, 이산화탄소를 이용해서 양분을 만든다고 생각해요. 잎의 엽록체에서 일어나는 것 같아요. "
+TUTOR = "좋은 생각이에요. 그렇다면 햇빛이 없으면 어떤 일이 일어날까요? 왜 그렇게 생각하나요? "
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대화 맥락 크기 벤치마크")
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--keep-turns", type=int, default=6)
+    parser.add_argument("--budget", type=int, default=3000)
+    parser.add_argument("--summary-max-tokens", type=int, default=600)
+    args = parser.parse_args()
+
+    context = ConversationContextManager(args.keep_turns, args.budget, args.summary_max_tokens)
+    service = SocraticService(client=object(), context=context)  # 프롬프트 구성만 사용
+    system_prompt = service._build_socratic_system_prompt(TOPIC)
+
+    messages = [{"role": "assistant", "content": OPENING}]
+    totals = {"full": 0, "bounded": 0}
+    build_sec = 0.0
+    print(f"{'turn':>4} {'full':>7} {'bounded':>8}")
+    for turn in range(1, args.turns + 1):
+        messages.append({"role": "user", "content": f"{turn}번째 답변: " + STUDENT * 2})
+        full = estimate_message_tokens([{"role": "system", "content": system_prompt}] + messages)
+        started = time.perf_counter()
+        bounded = estimate_message_tokens(service._build_conversation_messages(TOPIC, messages, 0))
+        build_sec += time.perf_counter() - started
+        totals["full"] += full
+        totals["bounded"] += bounded
+        if turn == 1 or turn % 10 == 0:
+            print(f"{turn:>4} {full:>7} {bounded:>8}")
+        messages.append({"role": "assistant", "content": TUTOR * 3})
+
+    saved = 1 - totals["bounded"] / totals["full"]
+    print(f"total tokens: full {totals['full']}, bounded {totals['bounded']} (-{saved:.1%})")
+    print(f"context build: {build_sec / args.turns * 1000:.3f} ms/turn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+공유 LLM 클라이언트 벤치마크
+
+mock 서버(고정 지연)에 대해 한 턴(응답 생성 + 평가, LLM 호출 2번)을
+    per-request  요청마다 AsyncOpenAI 2개 생성 (이전 방식)
+    shared       앱 공유 클라이언트 (연결 재사용)
+로 처리할 때 턴당 지연시간을 비교합니다. 지연시간 차이가 턴당 절약되는 연결/클라이언트 생성 비용입니다.
+(로컬 HTTP라 TLS 핸드셰이크 비용은 포함되지 않음 - 실제 API에서는 차이가 더 큼)
+
+    cd prototypes/proto4/backend
+    python -m benchmarks.bench_llm_client --turns 200 --latency-ms 20
+
+출력 예 (1 vCPU):
+    variant         p50(ms)  p95(ms)   (turn = LLM 2 calls, mock latency 20.0ms)
+    per-request      146.22   236.18
+    shared            54.84    57.25
+    saved per turn: 91.38 ms
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from app.services.llm_client import build_http_client
+from benchmarks.mock_llm import running_mock_server
+
+MESSAGES = [{"role": "user", "content": "광합성은 빛으로 양분을 만드는 과정인가요?"}]
+
+
+async def turn(client_factory):
+    for _ in range(2):  # 응답 생성 + 5차원 평가
+        client = client_factory()
+        await client.chat.completions.create(model="mock", messages=MESSAGES, max_tokens=10)
+
+
+async def run(label: str, client_factory, turns: int, cleanup=None):
+    await turn(client_factory)  # 워밍업
+    timings = []
+    for _ in range(turns):
+        started = time.perf_counter()
+        await turn(client_factory)
+        timings.append((time.perf_counter() - started) * 1000)
+    if cleanup:
+        await cleanup()
+    timings.sort()
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(f"{label:<14} {statistics.median(timings):>8.2f} {p95:>8.2f}")
+    return statistics.median(timings)
+
+
+async def main_async(args, base_url: str):
+    print(f"{'variant':<14} {'p50(ms)':>8} {'p95(ms)':>8}   (turn = LLM 2 calls, mock latency {args.latency_ms}ms)")
+    created = []
+
+    def per_request():
+        # 이전 방식: 서비스 생성마다 새 클라이언트 (연결 풀도 새로 생성, 닫히지 않음)
+        client = AsyncOpenAI(api_key="mock", base_url=base_url)
+        created.append(client)
+        return client
+
+    async def close_created():
+        for client in created:
+            await client.close()
+
+    shared_client = AsyncOpenAI(api_key="mock", base_url=base_url, http_client=build_http_client())
+    old = await run("per-request", per_request, args.turns, close_created)
+    new = await run("shared", lambda: shared_client, args.turns, shared_client.close)
+    print(f"saved per turn: {old - new:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 LLM 클라이언트 벤치마크")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    with running_mock_server(latency_ms=args.latency_ms) as base_url:
+        asyncio.run(main_async(args, base_url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+OpenAI 호환 mock LLM 서버 (네트워크 없이 벤치마크하기 위한 로컬 대역)
+
+    from benchmarks.mock_llm import running_mock_server
+    with running_mock_server(latency_ms=50) as base_url:
+        ...  # OPENAI_BASE_URL=base_url
+
+    python -m benchmarks.mock_llm --port 9100 --latency-ms 50   # 단독 실행
+    python -m benchmarks.mock_llm --latency-dist lognormal --jitter 0.5 --tokens-per-sec 80 \\
+        --error-rate 0.01 --rate-limit-rate 0.02 --max-concurrency 64
+
+MockProfile로 실제 API와 비슷한 조건을 흉내 냅니다.
+    latency_ms, latency_dist, jitter   첫 토큰까지의 지연 (fixed / uniform ±jitter 비율 / lognormal 중앙값, sigma=jitter)
+    tokens_per_sec                     생성 속도 (0이면 즉시) - 스트리밍은 조각마다, 아니면 전체 응답 후 한 번에
+    error_rate                         500 응답 비율 (지연 후)
+    rate_limit_rate, max_concurrency   429 응답 비율 / 동시 처리 상한 (넘으면 바로 429, Retry-After 포함)
+    seed                               난수 시드 (같은 시드면 같은 지연·오류 순서)
+usage의 토큰 수는 conversation_context.estimate_tokens로 추정한 값이며 app.state.stats에 누적됩니다.
+
+소켓 없이 같은 프로세스에서 쓰려면 in_process_client()로 ASGI 앱에 직접 연결된 AsyncOpenAI를 받습니다
+(httpx ASGITransport는 응답 본문을 모아서 돌려주므로 스트리밍 첫 토큰 시간은 running_mock_server로 측정).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from openai import AsyncOpenAI
+
+from app.services.conversation_context import estimate_message_tokens, estimate_tokens
+
+
+ASSESSMENT = {
+    "dimensions": {"depth": 62, "breadth": 55, "application": 48, "metacognition": 40, "engagement": 70},
+    "insights": {"depth": "근거를 들어 설명함", "breadth": "", "application": "", "metacognition": "", "engagement": ""},
+    "growth_indicators": ["자신의 말로 설명하기 시작함"],
+    "next_focus": "실생활 예시로 확장해보기",
+}
+ASSESSMENT_REPLY = json.dumps(ASSESSMENT, ensure_ascii=False)
+SOCRATIC_REPLY = "그렇게 생각한 이유는 무엇인가요?"
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+_BATCH_SIZE = re.compile(r"평가 대상 수: (\d+)")
+
+
+@dataclass
+class MockProfile:
+    latency_ms: float = 50.0
+    latency_dist: str = "fixed"
+    jitter: float = 0.5
+    tokens_per_sec: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    max_concurrency: int = 0  # 0이면 제한 없음
+    retry_after_sec: float = 0.1
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_dist는 {LATENCY_DISTRIBUTIONS} 중 하나여야 합니다: {self.latency_dist}")
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """첫 토큰까지의 지연(초)"""
+        if self.latency_dist == "uniform":
+            latency_ms = rng.uniform(self.latency_ms * (1 - self.jitter), self.latency_ms * (1 + self.jitter))
+        elif self.latency_dist == "lognormal":
+            latency_ms = self.latency_ms * math.exp(rng.gauss(0, self.jitter))
+        else:
+            latency_ms = self.latency_ms
+        return max(0.0, latency_ms) / 1000
+
+    def generation_time(self, tokens: int) -> float:
+        """tokens개를 생성하는 시간(초)"""
+        return tokens / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+
+def reply_for(messages) -> str:
+    """5차원 평가 프롬프트면 평가 JSON (배치 평가면 학생 수만큼), 아니면 질문 하나"""
+    prompt = messages[0].get("content", "") if messages else ""
+    if "5차원 평가" not in prompt:
+        return SOCRATIC_REPLY
+    batch = _BATCH_SIZE.search(prompt)
+    if batch is None:
+        return ASSESSMENT_REPLY
+    return json.dumps({
+        "results": [dict(ASSESSMENT, student=number) for number in range(1, int(batch.group(1)) + 1)]
+    }, ensure_ascii=False)
+
+
+async def stream_chunks(reply: str, model: str, chunk_chars: int = 4, profile: Optional[MockProfile] = None):
+    """stream=True 요청용 chat.completion.chunk 조각들 (SSE data 줄, 생성 속도에 맞춰 조각마다 대기)"""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    def chunk(delta, finish_reason=None):
+        return "data: " + json.dumps({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }, ensure_ascii=False) + "\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    for start in range(0, len(reply), chunk_chars):
+        piece = reply[start:start + chunk_chars]
+        if profile is not None and profile.tokens_per_sec > 0:
+            await asyncio.sleep(profile.generation_time(estimate_tokens(piece)))
+        yield chunk({"content": piece})
+    yield chunk({}, "stop")
+    yield "data: [DONE]\n\n"
+
+
+def _error(status_code: int, message: str, error_type: str, headers=None) -> JSONResponse:
+    """OpenAI API 형식의 오류 응답"""
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "param": None, "code": None}},
+        headers=headers,
+    )
+
+
+def create_mock_app(latency_ms: float = 50.0, profile: Optional[MockProfile] = None, **options) -> FastAPI:
+    """
+    /v1/chat/completions mock (stream=True면 첫 조각 전에 지연, n개 선택지 지원)
+
+    profile이 없으면 latency_ms와 나머지 MockProfile 필드(options)로 만듦 (기본은 고정 지연, 오류 없음)
+    """
+    profile = profile or MockProfile(latency_ms=latency_ms, **options)
+    rng = random.Random(profile.seed)
+    app = FastAPI()
+    app.state.profile = profile
+    app.state.requests = 0
+    app.state.in_flight = 0
+    app.state.peak_in_flight = 0
+    app.state.stats = Counter()  # ok, rate_limited, errors, prompt_tokens, completion_tokens
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        stats = app.state.stats
+
+        # 동시 처리 상한/무작위 429는 지연 없이 바로 거절 (클라이언트는 Retry-After 후 재시도)
+        if (profile.max_concurrency and app.state.in_flight >= profile.max_concurrency) or \
+                rng.random() < profile.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return _error(429, "Rate limit reached (mock)", "requests",
+                          headers={"Retry-After": str(profile.retry_after_sec)})
+
+        app.state.in_flight += 1
+        app.state.peak_in_flight = max(app.state.peak_in_flight, app.state.in_flight)
+        try:
+            await asyncio.sleep(profile.sample_latency(rng))
+            if rng.random() < profile.error_rate:
+                stats["errors"] += 1
+                return _error(500, "The server had an error while processing your request (mock)", "server_error")
+
+            messages = body.get("messages") or []
+            reply = reply_for(messages)
+            model = body.get("model", "mock")
+            prompt_tokens = estimate_message_tokens(messages)
+            completion_tokens = estimate_tokens(reply)
+            stats["ok"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            if body.get("stream"):
+                return StreamingResponse(stream_chunks(reply, model, profile=profile), media_type="text/event-stream")
+
+            await asyncio.sleep(profile.generation_time(completion_tokens))
+            choices = body.get("n") or 1
+            return {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": index,
+                    "message": {"role": "assistant", "content": reply if index == 0 else f"{reply} ({index + 1})"},
+                    "finish_reason": "stop",
+                } for index in range(choices)],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens * choices,
+                    "total_tokens": prompt_tokens + completion_tokens * choices,
+                },
+            }
+        finally:
+            # 스트리밍 응답은 첫 조각 전에 빠지므로 동시 처리 수는 첫 토큰까지 기준
+            app.state.in_flight -= 1
+
+    return app
+
+
+def in_process_client(app: FastAPI = None, **options) -> AsyncOpenAI:
+    """소켓 없이 mock ASGI 앱에 직접 연결된 AsyncOpenAI (options는 create_mock_app 인자)"""
+    app = app or create_mock_app(**options)
+    return AsyncOpenAI(
+        api_key="mock",
+        base_url="http://mock-llm/v1",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=app)),
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def running_server(app):
+    """ASGI 앱을 백그라운드 스레드의 uvicorn으로 실행하고 base_url(http://127.0.0.1:포트) 반환"""
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+@contextlib.contextmanager
+def running_mock_server(app: FastAPI = None, **options):
+    """mock 서버를 백그라운드 스레드에서 실행하고 OpenAI base_url 반환"""
+    with running_server(app or create_mock_app(**options)) as base_url:
+        yield f"{base_url}/v1"
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """MockProfile 옵션 (벤치마크 스크립트에서도 사용)"""
+    default = MockProfile()
+    parser.add_argument("--latency-ms", type=float, default=default.latency_ms)
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default=default.latency_dist)
+    parser.add_argument("--jitter", type=float, default=default.jitter)
+    parser.add_argument("--tokens-per-sec", type=float, default=default.tokens_per_sec)
+    parser.add_argument("--error-rate", type=float, default=default.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=default.rate_limit_rate)
+    parser.add_argument("--max-concurrency", type=int, default=default.max_concurrency)
+    parser.add_argument("--retry-after-sec", type=float, default=default.retry_after_sec)
+    parser.add_argument("--seed", type=int, default=default.seed)
+
+
+def profile_from_args(args: argparse.Namespace) -> MockProfile:
+    return MockProfile(**{name: getattr(args, name) for name in asdict(MockProfile())})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 호환 mock LLM 서버")
+    parser.add_argument("--port", type=int, default=9100)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_mock_app(profile=profile_from_args(args)), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
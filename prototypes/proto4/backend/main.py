@@ -1,17 +1,30 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from dotenv import load_dotenv
 
+load_dotenv()
+
 from app.api.socratic_chat import router as chat_router
+from app.services.llm_client import close_llm_client, get_llm_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 앱 전체에서 공유하는 LLM 클라이언트 (연결 풀 재사용)
+    get_llm_client()
+    yield
+    await close_llm_client()
 
-load_dotenv()
 
 app = FastAPI(
     title="LLM Classroom Proto4 - Socratic Method",
     description="Socratic Method AI Learning System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
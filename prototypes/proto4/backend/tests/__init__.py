@@ -0,0 +1,3 @@
+"""
+테스트 패키지
+"""
@@ -0,0 +1,32 @@
+"""
+pytest 설정 및 공통 픽스처
+"""
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app.api.socratic_chat import router
+from app.services import llm_client
+from app.services.response_cache import response_cache
+from benchmarks.mock_llm import in_process_client
+
+
+@pytest.fixture
+def mock_llm():
+    """공유 LLM 클라이언트를 소켓 없이 mock LLM 앱에 연결 (지연 없음)"""
+    previous = llm_client._client
+    llm_client._client = in_process_client(latency_ms=0)
+    response_cache.clear()
+    yield llm_client._client
+    llm_client._client = previous
+    response_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def api(mock_llm):
+    """채팅 라우터만 올린 앱의 비동기 클라이언트 (정적 파일 마운트 없이)"""
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
@@ -0,0 +1,52 @@
+"""
+테스트용 대본 LLM 클라이언트
+
+AsyncOpenAI의 chat.completions.create만 흉내 내며, 프롬프트를 받아 응답 문자열(또는 예외)을
+돌려주는 함수로 응답을 정합니다. 배치 평가 응답에서 일부 학생이 빠지거나 형식이 잘못된
+경우처럼 mock LLM 서버가 만들지 않는 응답을 재현하는 용도입니다.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Callable, List, Union
+
+from benchmarks.mock_llm import ASSESSMENT, ASSESSMENT_REPLY
+
+BATCH_MARKER = "평가 대상 수:"
+
+
+def batch_reply(*students: int, **overrides) -> str:
+    """배치 평가 응답 JSON (지정한 학생 번호만, overrides는 각 결과에 덮어쓸 필드)"""
+    return json.dumps({
+        "results": [dict(ASSESSMENT, student=number, **overrides) for number in students]
+    }, ensure_ascii=False)
+
+
+class ScriptedLLM:
+    def __init__(self, batch: Union[str, Callable[[str], str], Exception] = None,
+                 single: Union[str, Exception] = ASSESSMENT_REPLY, delay: float = 0):
+        self.batch = batch
+        self.single = single
+        self.delay = delay
+        self.prompts: List[str] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    @property
+    def batch_calls(self) -> int:
+        return sum(BATCH_MARKER in prompt for prompt in self.prompts)
+
+    @property
+    def single_calls(self) -> int:
+        return len(self.prompts) - self.batch_calls
+
+    async def create(self, messages, **kwargs):
+        prompt = messages[0]["content"]
+        self.prompts.append(prompt)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        reply = self.batch if BATCH_MARKER in prompt else self.single
+        if callable(reply):
+            reply = reply(prompt)
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))])
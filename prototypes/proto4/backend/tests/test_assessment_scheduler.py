@@ -0,0 +1,166 @@
+"""
+평가 정책과 학생 간 배치 평가 테스트
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.services.assessment_scheduler import AssessmentBatcher, AssessmentPolicy
+from app.services.socratic_assessment_service import SocraticAssessmentService
+from tests.scripted_llm import ScriptedLLM, batch_reply
+
+
+class TestAssessmentPolicy:
+    """AssessmentPolicy.should_assess"""
+
+    def test_every_turn(self):
+        policy = AssessmentPolicy(mode="every_turn", interval=3)
+        assert all(policy.should_assess(turn, turn - 1, "네") for turn in range(1, 6))
+
+    def test_on_demand_only_when_requested(self):
+        policy = AssessmentPolicy(mode="on_demand", interval=1, substantive_chars=1)
+        assert policy.should_assess(5, 0, "아주 길고 충분한 답변입니다") is False
+        assert policy.should_assess(5, 0, "네", requested=True) is True
+
+    def test_adaptive_interval(self):
+        """마지막 평가 후 interval턴이 지나면 평가"""
+        policy = AssessmentPolicy(mode="adaptive", interval=3, substantive_chars=40)
+        assert policy.should_assess(1, 0, "네") is False
+        assert policy.should_assess(2, 0, "네") is False
+        assert policy.should_assess(3, 0, "네") is True
+        assert policy.should_assess(4, 3, "네") is False
+
+    def test_adaptive_substantive_answer(self):
+        """공백을 뺀 글자 수가 기준 이상이면 간격과 관계없이 평가"""
+        policy = AssessmentPolicy(mode="adaptive", interval=10, substantive_chars=10)
+        assert policy.should_assess(1, 0, "가나다라마 바사아자차") is True
+        assert policy.should_assess(1, 0, "가 나 다 라 마 바 사 아 자") is False
+        assert policy.should_assess(1, 0, None) is False
+
+    def test_from_settings_falls_back_on_invalid_values(self, monkeypatch):
+        monkeypatch.setenv("ASSESSMENT_POLICY", "every_turn")
+        monkeypatch.setenv("ASSESSMENT_INTERVAL", "4")
+
+        assert AssessmentPolicy.from_settings("on_demand", 2) == AssessmentPolicy("on_demand", 2, 40)
+        assert AssessmentPolicy.from_settings("sometimes", 0) == AssessmentPolicy("every_turn", 4, 40)
+        assert AssessmentPolicy.from_settings(None, "3") == AssessmentPolicy("every_turn", 4, 40)
+
+
+async def evaluate_all(batcher, service, answers, topic="광합성"):
+    return await asyncio.gather(*(
+        batcher.evaluate(service, topic, answer, [{"role": "user", "content": answer}])
+        for answer in answers
+    ))
+
+
+class TestAssessmentBatcher:
+    """같은 주제 평가 묶기와 한 명씩 다시 평가하기"""
+
+    @pytest.mark.asyncio
+    async def test_batches_concurrent_items(self):
+        llm = ScriptedLLM(batch=batch_reply(1, 2, 3))
+        batcher = AssessmentBatcher(window_ms=20, max_items=6)
+
+        results = await evaluate_all(batcher, SocraticAssessmentService(client=llm), ["가", "나", "다"])
+
+        assert (llm.batch_calls, llm.single_calls) == (1, 0)
+        assert all(result["overall_score"] > 0 for result in results)
+        assert batcher.batched_items == 3
+
+    @pytest.mark.asyncio
+    async def test_missing_items_evaluated_singly(self):
+        """배치 응답에서 빠진 학생만 따로 평가"""
+        llm = ScriptedLLM(batch=batch_reply(1, 3))
+        batcher = AssessmentBatcher(window_ms=20, max_items=6)
+
+        results = await evaluate_all(batcher, SocraticAssessmentService(client=llm), ["가", "나", "다"])
+
+        assert (llm.batch_calls, llm.single_calls) == (1, 1)
+        assert '"나"' in llm.prompts[-1]
+        assert all("failed" not in result for result in results)
+
+    @pytest.mark.parametrize("reply", [
+        "평가 결과입니다",  # JSON 아님
+        json.dumps({"evaluations": []}),  # results 없음
+        json.dumps({"results": "없음"}),  # results가 목록이 아님
+    ])
+    @pytest.mark.asyncio
+    async def test_malformed_batch_reply(self, reply):
+        """배치 응답을 해석할 수 없으면 모두 한 명씩 평가"""
+        llm = ScriptedLLM(batch=reply)
+        batcher = AssessmentBatcher(window_ms=20, max_items=6)
+
+        results = await evaluate_all(batcher, SocraticAssessmentService(client=llm), ["가", "나"])
+
+        assert (llm.batch_calls, llm.single_calls) == (1, 2)
+        assert all("failed" not in result for result in results)
+
+    @pytest.mark.asyncio
+    async def test_malformed_items_evaluated_singly(self):
+        """필드가 빠졌거나 학생 번호가 잘못된 항목만 따로 평가"""
+        def reply(prompt):
+            results = json.loads(batch_reply(1, 2))["results"]
+            del results[1]["dimensions"]
+            results.append(dict(results[0], student="셋"))
+            results.append(dict(results[0], student=9))
+            return json.dumps({"results": results}, ensure_ascii=False)
+
+        llm = ScriptedLLM(batch=reply)
+        batcher = AssessmentBatcher(window_ms=20, max_items=6)
+
+        results = await evaluate_all(batcher, SocraticAssessmentService(client=llm), ["가", "나", "다"])
+
+        assert (llm.batch_calls, llm.single_calls) == (1, 2)
+        assert all("failed" not in result for result in results)
+
+    @pytest.mark.asyncio
+    async def test_batch_call_error_falls_back(self):
+        """배치 호출이 실패하면 한 명씩 평가 (한 명씩도 실패하면 failed 기본 평가)"""
+        llm = ScriptedLLM(batch=RuntimeError("연결 끊김"), single=RuntimeError("연결 끊김"))
+        batcher = AssessmentBatcher(window_ms=20, max_items=6)
+
+        results = await evaluate_all(batcher, SocraticAssessmentService(client=llm), ["가", "나"])
+
+        assert (llm.batch_calls, llm.single_calls) == (1, 2)
+        assert all(result["failed"] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_full(self):
+        """max_items가 차면 대기 시간을 기다리지 않고 바로 평가"""
+        llm = ScriptedLLM(batch=batch_reply(1, 2))
+        batcher = AssessmentBatcher(window_ms=10_000, max_items=2)
+
+        results = await asyncio.wait_for(
+            evaluate_all(batcher, SocraticAssessmentService(client=llm), ["가", "나"]), timeout=2
+        )
+
+        assert len(results) == 2 and llm.batch_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_different_topics_not_batched(self):
+        llm = ScriptedLLM(batch=batch_reply(1, 2))
+        batcher = AssessmentBatcher(window_ms=20, max_items=6)
+        service = SocraticAssessmentService(client=llm)
+
+        await asyncio.gather(
+            batcher.evaluate(service, "광합성", "가", []),
+            batcher.evaluate(service, "민주주의", "나", []),
+        )
+
+        assert (llm.batch_calls, llm.single_calls) == (0, 2)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_break_batch(self):
+        """기다리던 요청 하나가 취소되어도 나머지는 결과를 받음"""
+        llm = ScriptedLLM(batch=batch_reply(1, 2), delay=0.05)
+        batcher = AssessmentBatcher(window_ms=10, max_items=6)
+        service = SocraticAssessmentService(client=llm)
+
+        cancelled = asyncio.ensure_future(batcher.evaluate(service, "광합성", "가", []))
+        kept = asyncio.ensure_future(batcher.evaluate(service, "광합성", "나", []))
+        await asyncio.sleep(0.03)
+        cancelled.cancel()
+
+        assert (await kept)["overall_score"] > 0
+        assert cancelled.cancelled()
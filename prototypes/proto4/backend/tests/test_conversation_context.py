@@ -0,0 +1,80 @@
+"""
+대화 맥락 (최근 턴 원문 + 이전 턴 요약, 토큰 예산) 테스트
+"""
+from app.services.conversation_context import (
+    ConversationContextManager,
+    estimate_message_tokens,
+    estimate_tokens,
+)
+
+
+def conversation(turns, student="학생 답변 " * 5, tutor="튜터 설명입니다. 왜 그렇게 생각하나요?"):
+    messages = [{"role": "assistant", "content": "식물은 무엇을 먹고 살까요?"}]
+    for number in range(1, turns + 1):
+        messages.append({"role": "user", "content": f"{number}번째 {student}"})
+        messages.append({"role": "assistant", "content": f"{number}번째 {tutor}"})
+    return messages
+
+
+class TestContextBuild:
+    """ConversationContextManager.build"""
+
+    def test_short_conversation_kept_verbatim(self):
+        messages = conversation(3)
+        window = ConversationContextManager(keep_turns=6).build(messages, "시스템")
+
+        assert window.recent_messages == messages
+        assert (window.summary_lines, window.folded_turns, window.first_recent_turn) == ([], 0, 0)
+
+    def test_old_turns_folded_into_summary(self):
+        """keep_turns보다 오래된 턴은 한 줄씩 요약 (0번 턴은 시작 질문)"""
+        messages = conversation(10)
+        window = ConversationContextManager(keep_turns=4, prompt_budget=100_000).build(messages)
+
+        assert window.first_recent_turn == 7
+        assert window.recent_messages == messages[-8:]
+        assert window.folded_turns == 7
+        assert window.summary_lines[0] == "시작 질문: 식물은 무엇을 먹고 살까요?"
+        assert window.summary_lines[1].startswith("턴 1 - 학생: 1번째")
+        assert window.summary_lines[1].endswith("튜터: 왜 그렇게 생각하나요?")
+
+    def test_summary_lines_stable_as_turns_grow(self):
+        """턴이 늘어도 기존 요약 줄은 그대로 (프롬프트 앞부분 재사용)"""
+        manager = ConversationContextManager(keep_turns=2, prompt_budget=100_000, summary_max_tokens=100_000)
+        before = manager.build(conversation(6)).summary_lines
+        after = manager.build(conversation(7)).summary_lines
+
+        assert after[:len(before)] == before and len(after) == len(before) + 1
+
+    def test_budget_folds_recent_turns(self):
+        """예산을 넘으면 최근 턴도 접어서 예산 안으로"""
+        messages = conversation(8, student="아주 긴 학생 답변 " * 30)
+        system_prompt = "시스템 프롬프트 " * 20
+        manager = ConversationContextManager(keep_turns=6, prompt_budget=600, summary_max_tokens=200)
+
+        window = manager.build(messages, system_prompt)
+
+        assert window.first_recent_turn > 8 - 6
+        assert window.estimated_tokens <= 600
+        expected = (estimate_tokens(system_prompt) + 4 + estimate_message_tokens(window.recent_messages)
+                    + estimate_tokens(window.summary) + 4)
+        assert window.estimated_tokens == expected
+
+    def test_last_student_turn_always_verbatim(self):
+        """예산이 아무리 작아도 마지막 학생 턴은 원문 유지"""
+        messages = conversation(5)
+        window = ConversationContextManager(keep_turns=6, prompt_budget=10).build(messages)
+
+        assert window.recent_messages == messages[-2:]
+        assert window.first_recent_turn == 5
+
+    def test_summary_compacted_to_first_and_recent_lines(self):
+        """요약이 상한을 넘으면 첫 줄(처음 생각)과 최근 줄만 남김"""
+        manager = ConversationContextManager(keep_turns=1, prompt_budget=100_000, summary_max_tokens=120)
+        window = manager.build(conversation(20))
+
+        assert window.summary_lines[0].startswith("시작 질문")
+        assert window.summary_lines[1].startswith("(이전 ") and window.summary_lines[1].endswith("개 턴 생략)")
+        assert window.summary_lines[-1].startswith("턴 19 - ")
+        assert estimate_tokens(window.summary) <= 120
+        assert window.folded_turns == 20
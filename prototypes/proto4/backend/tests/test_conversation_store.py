@@ -0,0 +1,153 @@
+"""
+서버 저장 대화의 평가 기록 테스트 (늦게 끝난 평가, 실패한 평가, 같은 대화의 동시 턴)
+"""
+import asyncio
+
+import pytest
+
+from app.services.assessment_scheduler import AssessmentPolicy
+from app.services.conversation_store import ChatTurn, ConversationStore, conversation_store
+
+
+def scored(score):
+    return {"understanding_score": score, "is_completed": False, "dimensions": {"depth": score}}
+
+
+@pytest.fixture
+def conversation():
+    store = ConversationStore()
+    return store.create("광합성", "normal", "식물은 무엇을 먹고 살까요?",
+                        AssessmentPolicy(mode="adaptive", interval=2, substantive_chars=1000))
+
+
+def add_turn(conversation, message="네", assessed=True):
+    """응답 생성까지 끝난 턴 (평가는 아직)"""
+    turn = ChatTurn(topic=conversation.topic, difficulty=conversation.difficulty,
+                    understanding_level=conversation.understanding_level,
+                    messages=conversation.messages + [{"role": "user", "content": message}],
+                    student_message=message, conversation=conversation,
+                    context=conversation.context, assessed=assessed)
+    turn.complete("왜 그렇게 생각하나요?")
+    return turn
+
+
+class TestRecordEvaluation:
+    """Conversation.record_evaluation"""
+
+    def test_late_evaluation_does_not_overwrite_newer_score(self, conversation):
+        """이전 턴 평가가 늦게 끝나면 그 턴에만 기록하고 최신 점수는 유지"""
+        first, second = add_turn(conversation), add_turn(conversation)
+
+        second.set_evaluation(scored(70))
+        first.set_evaluation(scored(40))
+
+        assert first.record.third_eval_json["understanding_score"] == 40
+        assert second.record.third_eval_json["understanding_score"] == 70
+        assert (conversation.understanding_level, conversation.scored_turn) == (70, 2)
+        assert conversation.carried_evaluation()["understanding_score"] == 70
+
+    def test_evaluation_before_reply_recorded_on_complete(self, conversation):
+        """응답보다 평가가 먼저 끝나면 턴 기록 시 함께 반영"""
+        messages = conversation.messages + [{"role": "user", "content": "햇빛"}]
+        turn = ChatTurn(topic="광합성", difficulty="normal", understanding_level=0, messages=messages,
+                        student_message="햇빛", conversation=conversation, context={})
+        turn.set_evaluation(scored(55))
+        assert turn.record is None
+
+        turn.complete("햇빛만 있으면 될까요?")
+
+        assert turn.record.third_eval_json["understanding_score"] == 55
+        assert conversation.understanding_level == 55
+
+    def test_carried_turn_points_to_scored_turn(self, conversation):
+        """평가하지 않은 턴은 점수 없이 마지막 평가 턴만 기록"""
+        add_turn(conversation).set_evaluation(scored(60))
+        skipped = add_turn(conversation, assessed=False)
+
+        skipped.set_evaluation(conversation.carried_evaluation())
+
+        assert skipped.record.third_eval_json == {"assessed": False, "carried_from_turn": 1}
+        assert conversation.understanding_level == 60
+
+    def test_failed_evaluation_not_counted(self, conversation):
+        """실패한 평가는 점수로 쓰지 않고 평가 간격에서도 빼서 다음 턴에 다시 평가"""
+        add_turn(conversation).set_evaluation(scored(60))
+        assert conversation.should_assess("네") is False
+
+        add_turn(conversation)  # 2번 턴 - 간격이 되어 평가 시작
+        assert conversation.last_scheduled_turn == 2
+        failing = add_turn(conversation)  # 3번 턴 평가 실패
+        failing.set_evaluation(conversation.failed_evaluation())
+
+        assert failing.record.third_eval_json == {"assessed": False, "carried_from_turn": 1, "failed": True}
+        assert conversation.last_scheduled_turn == 1
+        assert (conversation.understanding_level, conversation.scored_turn) == (60, 1)
+        assert conversation.should_assess("네") is True
+
+    def test_late_failed_evaluation_keeps_newer_schedule(self, conversation):
+        """이전 턴 평가가 늦게 실패해도 그 뒤에 시작한 평가의 간격은 유지"""
+        first = add_turn(conversation)
+        second = add_turn(conversation)
+        assert conversation.last_scheduled_turn == 2
+
+        first.set_evaluation(conversation.failed_evaluation())
+
+        assert conversation.last_scheduled_turn == 2
+        assert second.record.third_eval_json is None
+
+
+class TestChatEndpoints:
+    """저장 대화 API (mock LLM)"""
+
+    async def start(self, api, policy="every_turn"):
+        response = await api.post("/api/v1/chat/initial", json={
+            "topic": "광합성", "difficulty": "normal", "assessment_policy": policy
+        })
+        assert response.status_code == 200
+        return response.json()["conversation_id"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_turns_recorded_in_order(self, api):
+        """같은 대화의 동시 요청은 대화 잠금으로 한 턴씩 처리"""
+        conversation_id = await self.start(api)
+
+        responses = await asyncio.gather(*(
+            api.post("/api/v1/chat/socratic", json={"conversation_id": conversation_id, "message": f"답변 {i}"})
+            for i in range(3)
+        ))
+
+        assert all(response.status_code == 200 for response in responses)
+        turns = (await api.get(f"/api/v1/chat/conversations/{conversation_id}")).json()["turns"]
+        assert [turn["turn_index"] for turn in turns] == [0, 1, 2, 3]
+        assert sorted(turn["student_input"] for turn in turns[1:]) == ["답변 0", "답변 1", "답변 2"]
+        assert all(turn["third_eval_json"]["understanding_score"] > 0 for turn in turns[1:])
+
+    @pytest.mark.asyncio
+    async def test_pipelined_evaluation_recorded_later(self, api):
+        """파이프라인 모드 - 응답 후 끝난 평가가 턴 기록과 대화 점수에 반영"""
+        conversation_id = await self.start(api)
+
+        reply = await api.post("/api/v1/chat/socratic/reply", json={"conversation_id": conversation_id, "message": "햇빛"})
+        assessment = await api.get(f"/api/v1/chat/assessment/{reply.json()['turn_id']}")
+
+        assert assessment.status_code == 200
+        conversation = conversation_store.get(conversation_id)
+        assert conversation.turns[1].third_eval_json["understanding_score"] == assessment.json()["understanding_score"]
+        assert conversation.understanding_level == assessment.json()["understanding_score"]
+
+    @pytest.mark.asyncio
+    async def test_failed_evaluation_via_api(self, api, monkeypatch):
+        """평가 호출이 실패하면 failed로 응답하고 점수는 이전 값 유지"""
+        from app.services.socratic_assessment_service import SocraticAssessmentService
+
+        conversation_id = await self.start(api)
+
+        async def failing_evaluation(self, *args, **kwargs):
+            return self._get_default_evaluation()
+
+        monkeypatch.setattr(SocraticAssessmentService, "evaluate_socratic_dimensions", failing_evaluation)
+        response = await api.post("/api/v1/chat/socratic", json={"conversation_id": conversation_id, "message": "햇빛"})
+
+        assert response.json()["failed"] is True
+        record = conversation_store.get(conversation_id).turns[1]
+        assert record.third_eval_json == {"assessed": False, "carried_from_turn": 0, "failed": True}
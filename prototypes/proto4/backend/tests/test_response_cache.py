@@ -0,0 +1,108 @@
+"""
+주제 검증/초기 메시지 응답 캐시 테스트
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.response_cache import ResponseCache, cache_key
+
+
+def counting_factory(value="초기 메시지", cacheable=True, delay=0.02, error=None):
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return value, cacheable
+
+    return factory, calls
+
+
+class TestGetOrCreate:
+    """ResponseCache.get_or_create 동시 요청"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        cache = ResponseCache()
+        factory, calls = counting_factory()
+
+        results = await asyncio.gather(*(cache.get_or_create("k", factory) for _ in range(10)))
+
+        assert results == ["초기 메시지"] * 10
+        assert len(calls) == 1
+        assert (cache.misses, cache.hits) == (1, 9)
+        assert await cache.get_or_create("k", factory) == "초기 메시지" and len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_value_shared_but_not_stored(self):
+        """폴백 응답은 동시 요청끼리만 나누고 저장하지 않음"""
+        cache = ResponseCache()
+        factory, calls = counting_factory(value=False, cacheable=False)
+
+        results = await asyncio.gather(*(cache.get_or_create("k", factory) for _ in range(3)))
+
+        assert results == [False] * 3 and len(calls) == 1
+        assert cache.get("k") is None
+        await cache.get_or_create("k", factory)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_waiters(self):
+        """생성이 실패하면 기다리던 요청도 같은 예외를 받고 다음 요청은 다시 생성"""
+        cache = ResponseCache()
+        factory, calls = counting_factory(error=RuntimeError("LLM 오류"))
+
+        results = await asyncio.gather(*(cache.get_or_create("k", factory) for _ in range(3)),
+                                       return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(calls) == 1 and not cache.is_pending("k")
+
+        retry, retry_calls = counting_factory()
+        assert await cache.get_or_create("k", retry) == "초기 메시지" and len(retry_calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_creation(self):
+        """기다리던 요청이 취소되어도 생성 중인 요청은 계속"""
+        cache = ResponseCache()
+        factory, calls = counting_factory(delay=0.05)
+
+        first = asyncio.ensure_future(cache.get_or_create("k", factory))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_create("k", factory))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+
+        assert await first == "초기 메시지"
+        assert cache.get("k") == "초기 메시지" and len(calls) == 1
+
+
+class TestResponseCache:
+    """키 정규화, 만료, 상한, 파일 저장"""
+
+    def test_key_normalizes_topic(self):
+        assert cache_key("initial", "  광합성  과정 ", "normal", "m", "1") == cache_key("initial", "광합성 과정", "normal", "m", "1")
+        assert cache_key("initial", "Photosynthesis", "normal", "m", "1") == cache_key("initial", "photosynthesis", "normal", "m", "1")
+        assert cache_key("initial", "광합성", "easy", "m", "1") != cache_key("initial", "광합성", "hard", "m", "1")
+
+    def test_expiry_and_lru(self, monkeypatch):
+        cache = ResponseCache(ttl_sec=10, max_items=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+        now = time.time()
+        monkeypatch.setattr("app.services.response_cache.time.time", lambda: now + 11)
+        assert cache.get("a") is None
+
+    def test_persisted_between_instances(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+        ResponseCache(path=path).set("k", ["질문 1", "질문 2"])
+
+        assert ResponseCache(path=path).get("k") == ["질문 1", "질문 2"]
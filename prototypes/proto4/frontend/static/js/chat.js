@@ -3,6 +3,7 @@ class SocraticChatHandler {
         this.apiBase = this.getApiBase();
         this.topic = '';
         this.messages = [];
+        this.conversationId = null; // 서버 저장 대화 ID (있으면 새 메시지만 전송)
         this.understandingScore = 0;
         this.isCompleted = false;
         this.showScore = true; // 점수 표시 여부
@@ -289,6 +290,7 @@ class SocraticChatHandler {
             }
             
             const data = await response.json();
+            this.conversationId = data.conversation_id || null;
             
             // 로딩 메시지 제거
             this.hideLoadingMessage();
@@ -339,19 +341,8 @@ class SocraticChatHandler {
         this.disableInput();
         
         try {
-            // AI 응답 요청
-            const response = await fetch(`${this.apiBase}/chat/socratic`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    topic: this.topic,
-                    messages: this.messages,
-                    understanding_level: this.understandingScore,
-                    difficulty: this.difficulty
-                })
-            });
+            // AI 응답 요청 (파이프라인 모드 - 평가는 응답 표시 후 따로 받음)
+            const response = await this.postChatTurn('/chat/socratic/reply', userMessage);
             
             if (!response.ok) {
                 throw new Error('AI 응답을 받아올 수 없습니다.');
@@ -363,19 +354,9 @@ class SocraticChatHandler {
             this.addMessage('ai', data.socratic_response);
             this.messages.push({ role: 'assistant', content: data.socratic_response });
             
-            // 점수 표시가 활성화된 경우에만 이해도 업데이트
-            if (this.showScore) {
-                this.updateSocraticEvaluation(data);
-                
-                // 완료 체크
-                if (data.is_completed && !this.isCompleted) {
-                    this.showCompletionCelebration();
-                    this.isCompleted = true;
-                }
-            } else {
-                // 점수 숨김 모드에서는 내부적으로만 점수 추적
-                this.understandingScore = data.understanding_score;
-            }
+            // 응답을 보여준 뒤 입력을 바로 열고 평가는 이어서 반영
+            this.enableInput();
+            this.loadTurnAssessment(data.turn_id);
             
         } catch (error) {
             console.error('Error:', error);
@@ -386,6 +367,73 @@ class SocraticChatHandler {
         }
     }
     
+    // 서버 저장 대화가 있으면 새 메시지만, 없으면(또는 만료되면) 전체 대화 기록 전송
+    async postChatTurn(path, userMessage) {
+        if (this.conversationId) {
+            const response = await fetch(`${this.apiBase}${path}`, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    conversation_id: this.conversationId,
+                    message: userMessage
+                })
+            });
+            if (response.status !== 404) {
+                return response;
+            }
+            // 서버 재시작 등으로 대화가 사라지면 전체 기록 방식으로 전환
+            this.conversationId = null;
+        }
+        
+        return fetch(`${this.apiBase}${path}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                topic: this.topic,
+                messages: this.messages,
+                understanding_level: this.understandingScore,
+                difficulty: this.difficulty
+            })
+        });
+    }
+    
+    async loadTurnAssessment(turnId) {
+        try {
+            // 평가가 끝날 때까지 대기 (202면 다시 요청)
+            for (let attempt = 0; attempt < 5; attempt++) {
+                const response = await fetch(`${this.apiBase}/chat/assessment/${turnId}?wait=10`);
+                if (response.status === 202) continue;
+                if (!response.ok) return;
+                
+                const data = await response.json();
+                this.applyAssessment(data);
+                return;
+            }
+        } catch (error) {
+            console.error('Error loading assessment:', error);
+        }
+    }
+    
+    applyAssessment(data) {
+        // 점수 표시가 활성화된 경우에만 이해도 업데이트
+        if (this.showScore) {
+            this.updateSocraticEvaluation(data);
+            
+            // 완료 체크
+            if (data.is_completed && !this.isCompleted) {
+                this.showCompletionCelebration();
+                this.isCompleted = true;
+            }
+        } else {
+            // 점수 숨김 모드에서는 내부적으로만 점수 추적
+            this.understandingScore = data.understanding_score;
+        }
+    }
+    
     addMessage(role, content) {
         const messagesContainer = document.getElementById('messagesContainer');
         if (!messagesContainer) return;
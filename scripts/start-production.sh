@@ -36,9 +36,17 @@ PROTO4_PID=$!
 sleep 10
 
 # Start main platform backend
-echo "🏫 Starting Platform Backend (Port 3000)..."
+# WEB_CONCURRENCY > 1 이면 gunicorn pre-fork 모드 (워커당 1코어, 공유 레이트리밋 저장소 필요)
+WEB_CONCURRENCY=${WEB_CONCURRENCY:-1}
 cd /app
-python -m uvicorn app.main:app --host 0.0.0.0 --port 3000 --env-file .env.production &
+if [ "$WEB_CONCURRENCY" -gt 1 ]; then
+    echo "🏫 Starting Platform Backend (Port 3000, $WEB_CONCURRENCY workers)..."
+    set -a; . ./.env.production; set +a
+    python -m gunicorn -c gunicorn.conf.py --bind 0.0.0.0:3000 app.main:app &
+else
+    echo "🏫 Starting Platform Backend (Port 3000)..."
+    python -m uvicorn app.main:app --host 0.0.0.0 --port 3000 --env-file .env.production &
+fi
 PLATFORM_PID=$!
 
 # Function to handle shutdown
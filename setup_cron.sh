@@ -39,9 +39,10 @@ if [ $? -eq 0 ]; then
     crontab -l | grep "backup_script.sh"
     echo ""
     echo "📝 참고사항:"
-    echo "- 백업 파일은 backups/ 폴더에 저장됩니다"
+    echo "- 백업 파일은 backend/data/backups/ 폴더에 저장됩니다"
     echo "- 백업 로그는 logs/backup.log에서 확인할 수 있습니다"
-    echo "- 30일 이상된 백업은 자동으로 삭제됩니다"
+    echo "- 180일 이상된 백업은 자동으로 삭제됩니다 (최근 7개는 유지)"
+    echo "- 앱 서버가 실행 중이면 앱 내부 스케줄러도 백업하므로 BACKUP_ENABLED=false로 중복을 피하세요"
     echo ""
     echo "수동 백업 실행: make backup"
     echo "백업 로그 확인: tail -f logs/backup.log"